@@ -0,0 +1,68 @@
+"""Add venda, venda_item and venda_rollup tables
+
+Revision ID: 7c2e91d4a5b3
+Revises: 418885b9239e
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e91d4a5b3'
+down_revision = '418885b9239e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('venda',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('criada_em', sa.DateTime(), nullable=False),
+    sa.Column('dia', sa.Date(), nullable=False),
+    sa.Column('canal', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('vendedor_id', sa.Integer(), nullable=True),
+    sa.Column('total', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('custo_total', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_venda_dia'), 'venda', ['dia'], unique=False)
+    op.create_index(op.f('ix_venda_canal'), 'venda', ['canal'], unique=False)
+    op.create_index(op.f('ix_venda_vendedor_id'), 'venda', ['vendedor_id'], unique=False)
+
+    op.create_table('vendaitem',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('venda_id', sa.Uuid(), nullable=False),
+    sa.Column('sku', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.Column('preco_unitario', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('custo_unitario', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['venda_id'], ['venda.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vendaitem_venda_id'), 'vendaitem', ['venda_id'], unique=False)
+    op.create_index(op.f('ix_vendaitem_sku'), 'vendaitem', ['sku'], unique=False)
+
+    op.create_table('vendarollup',
+    sa.Column('dia', sa.Date(), nullable=False),
+    sa.Column('dimensao', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('chave', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('num_vendas', sa.Integer(), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.Column('faturamento', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('custo', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('dia', 'dimensao', 'chave')
+    )
+
+
+def downgrade():
+    op.drop_table('vendarollup')
+    op.drop_index(op.f('ix_vendaitem_sku'), table_name='vendaitem')
+    op.drop_index(op.f('ix_vendaitem_venda_id'), table_name='vendaitem')
+    op.drop_table('vendaitem')
+    op.drop_index(op.f('ix_venda_vendedor_id'), table_name='venda')
+    op.drop_index(op.f('ix_venda_canal'), table_name='venda')
+    op.drop_index(op.f('ix_venda_dia'), table_name='venda')
+    op.drop_table('venda')
@@ -0,0 +1,34 @@
+"""Add vendedordia table
+
+Revision ID: 9a4f3b6c2d81
+Revises: 7c2e91d4a5b3
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4f3b6c2d81'
+down_revision = '7c2e91d4a5b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('vendedordia',
+    sa.Column('vendedor_id', sa.Integer(), nullable=False),
+    sa.Column('dia', sa.Date(), nullable=False),
+    sa.Column('num_vendas', sa.Integer(), nullable=False),
+    sa.Column('vendas_valor', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('orcamentos_enviados', sa.Integer(), nullable=False),
+    sa.Column('orcamentos_fechados', sa.Integer(), nullable=False),
+    sa.Column('orcamentos_perdidos', sa.Integer(), nullable=False),
+    sa.Column('novos_clientes', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('vendedor_id', 'dia')
+    )
+
+
+def downgrade():
+    op.drop_table('vendedordia')
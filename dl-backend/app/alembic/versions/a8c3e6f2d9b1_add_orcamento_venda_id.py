@@ -0,0 +1,26 @@
+"""Add venda_id to orcamento (sale created on conversion)
+
+Revision ID: a8c3e6f2d9b1
+Revises: f1b7d4c8a3e6
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c3e6f2d9b1'
+down_revision = 'f1b7d4c8a3e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('orcamento', sa.Column('venda_id', sa.Uuid(), nullable=True))
+    op.create_foreign_key('orcamento_venda_id_fkey', 'orcamento', 'venda', ['venda_id'], ['id'])
+
+
+def downgrade():
+    op.drop_constraint('orcamento_venda_id_fkey', 'orcamento', type_='foreignkey')
+    op.drop_column('orcamento', 'venda_id')
@@ -0,0 +1,41 @@
+"""Add reservaestoque table
+
+Revision ID: b2d7f4a9c6e3
+Revises: a8c3e6f2d9b1
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2d7f4a9c6e3'
+down_revision = 'a8c3e6f2d9b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('reservaestoque',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('sku', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.Column('expira_em', sa.DateTime(), nullable=False),
+    sa.Column('origem', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('referencia', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('vendedor_id', sa.Integer(), nullable=True),
+    sa.Column('criada_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reservaestoque_expira_em'), 'reservaestoque', ['expira_em'], unique=False)
+    op.create_index(op.f('ix_reservaestoque_referencia'), 'reservaestoque', ['referencia'], unique=False)
+    op.create_index('ix_reservaestoque_sku_expira_em', 'reservaestoque', ['sku', 'expira_em'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_reservaestoque_sku_expira_em', table_name='reservaestoque')
+    op.drop_index(op.f('ix_reservaestoque_referencia'), table_name='reservaestoque')
+    op.drop_index(op.f('ix_reservaestoque_expira_em'), table_name='reservaestoque')
+    op.drop_table('reservaestoque')
@@ -0,0 +1,39 @@
+"""Add anuncioml table
+
+Revision ID: b3d8e1f0a6c2
+Revises: 9a4f3b6c2d81
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d8e1f0a6c2'
+down_revision = '9a4f3b6c2d81'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('anuncioml',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(length=30), nullable=False),
+    sa.Column('sku', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('titulo', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('preco', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('estoque', sa.Integer(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=30), nullable=False),
+    sa.Column('permalink', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.Column('thumbnail', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.Column('atualizado_ml_em', sa.DateTime(), nullable=False),
+    sa.Column('sincronizado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_anuncioml_sku'), 'anuncioml', ['sku'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_anuncioml_sku'), table_name='anuncioml')
+    op.drop_table('anuncioml')
@@ -0,0 +1,33 @@
+"""Add snapshotcanal table
+
+Revision ID: c7a2f9e4b1d5
+Revises: b3d8e1f0a6c2
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a2f9e4b1d5'
+down_revision = 'b3d8e1f0a6c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('snapshotcanal',
+    sa.Column('canal', sqlmodel.sql.sqltypes.AutoString(length=30), nullable=False),
+    sa.Column('sku', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('hash', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+    sa.Column('preco', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('estoque', sa.Integer(), nullable=False),
+    sa.Column('enviado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('canal', 'sku')
+    )
+
+
+def downgrade():
+    op.drop_table('snapshotcanal')
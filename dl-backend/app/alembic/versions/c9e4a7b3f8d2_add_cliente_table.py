@@ -0,0 +1,60 @@
+"""Add cliente table
+
+Revision ID: c9e4a7b3f8d2
+Revises: b2d7f4a9c6e3
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e4a7b3f8d2'
+down_revision = 'b2d7f4a9c6e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Trigramas para a busca por trecho do nome (LIKE '%...%')
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_table('cliente',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('nome_normalizado', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('telefone', sqlmodel.sql.sqltypes.AutoString(length=30), nullable=True),
+    sa.Column('telefone_digitos', sqlmodel.sql.sqltypes.AutoString(length=15), nullable=True),
+    sa.Column('email', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('cpf_cnpj', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=True),
+    sa.Column('documento', sqlmodel.sql.sqltypes.AutoString(length=14), nullable=True),
+    sa.Column('rua', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('numero', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=True),
+    sa.Column('bairro', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('cidade', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('uf', sqlmodel.sql.sqltypes.AutoString(length=2), nullable=True),
+    sa.Column('cep', sqlmodel.sql.sqltypes.AutoString(length=9), nullable=True),
+    sa.Column('modelo_carro', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('placa_veiculo', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=True),
+    sa.Column('observacoes', sqlmodel.sql.sqltypes.AutoString(length=2000), nullable=True),
+    sa.Column('vendedor_id', sa.Integer(), nullable=True),
+    sa.Column('data_cadastro', sa.DateTime(), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cliente_vendedor_id'), 'cliente', ['vendedor_id'], unique=False)
+    op.create_index('ix_cliente_nome_trgm', 'cliente', ['nome_normalizado'], unique=False, postgresql_using='gin', postgresql_ops={'nome_normalizado': 'gin_trgm_ops'})
+    op.create_index('ix_cliente_nome_normalizado_id', 'cliente', ['nome_normalizado', 'id'], unique=False)
+    op.create_index('ix_cliente_telefone_digitos', 'cliente', ['telefone_digitos'], unique=False, postgresql_ops={'telefone_digitos': 'varchar_pattern_ops'})
+    op.create_index('ix_cliente_documento', 'cliente', ['documento'], unique=False, postgresql_ops={'documento': 'varchar_pattern_ops'})
+
+
+def downgrade():
+    op.drop_index('ix_cliente_documento', table_name='cliente')
+    op.drop_index('ix_cliente_telefone_digitos', table_name='cliente')
+    op.drop_index('ix_cliente_nome_normalizado_id', table_name='cliente')
+    op.drop_index('ix_cliente_nome_trgm', table_name='cliente')
+    op.drop_index(op.f('ix_cliente_vendedor_id'), table_name='cliente')
+    op.drop_table('cliente')
@@ -0,0 +1,37 @@
+"""Add sugestaomesclagemcliente table
+
+Revision ID: d3f8b6c1a5e7
+Revises: c9e4a7b3f8d2
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3f8b6c1a5e7'
+down_revision = 'c9e4a7b3f8d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sugestaomesclagemcliente',
+    sa.Column('cliente_id', sa.Integer(), nullable=False),
+    sa.Column('duplicado_id', sa.Integer(), nullable=False),
+    sa.Column('pontuacao', sa.Float(), nullable=False),
+    sa.Column('motivos', sqlmodel.sql.sqltypes.AutoString(length=200), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('atualizada_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('cliente_id', 'duplicado_id')
+    )
+    op.create_index(op.f('ix_sugestaomesclagemcliente_duplicado_id'), 'sugestaomesclagemcliente', ['duplicado_id'], unique=False)
+    op.create_index('ix_sugestaomesclagemcliente_status_pontuacao', 'sugestaomesclagemcliente', ['status', 'pontuacao'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_sugestaomesclagemcliente_status_pontuacao', table_name='sugestaomesclagemcliente')
+    op.drop_index(op.f('ix_sugestaomesclagemcliente_duplicado_id'), table_name='sugestaomesclagemcliente')
+    op.drop_table('sugestaomesclagemcliente')
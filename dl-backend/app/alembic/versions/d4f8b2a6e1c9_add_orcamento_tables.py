@@ -0,0 +1,75 @@
+"""Add orcamento and orcamentoitem tables
+
+Revision ID: d4f8b2a6e1c9
+Revises: c7a2f9e4b1d5
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f8b2a6e1c9'
+down_revision = 'c7a2f9e4b1d5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('orcamento',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('numero', sqlmodel.sql.sqltypes.AutoString(length=30), nullable=True),
+    sa.Column('cliente_id', sa.Integer(), nullable=True),
+    sa.Column('vendedor_id', sa.Integer(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('prioridade', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False),
+    sa.Column('observacoes', sqlmodel.sql.sqltypes.AutoString(length=2000), nullable=True),
+    sa.Column('marca_veiculo', sqlmodel.sql.sqltypes.AutoString(length=60), nullable=True),
+    sa.Column('modelo_veiculo', sqlmodel.sql.sqltypes.AutoString(length=60), nullable=True),
+    sa.Column('ano_veiculo', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=True),
+    sa.Column('placa_veiculo', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=True),
+    sa.Column('versao', sa.Integer(), nullable=False),
+    sa.Column('total_itens', sa.Integer(), nullable=False),
+    sa.Column('subtotal', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('desconto_total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('frete_valor', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('valor_total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('validade', sa.Date(), nullable=False),
+    sa.Column('criado_em', sa.DateTime(), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('numero')
+    )
+    op.create_index(op.f('ix_orcamento_cliente_id'), 'orcamento', ['cliente_id'], unique=False)
+    op.create_index(op.f('ix_orcamento_vendedor_id'), 'orcamento', ['vendedor_id'], unique=False)
+    op.create_index(op.f('ix_orcamento_status'), 'orcamento', ['status'], unique=False)
+
+    op.create_table('orcamentoitem',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('orcamento_id', sa.Integer(), nullable=False),
+    sa.Column('posicao', sa.Integer(), nullable=False),
+    sa.Column('produto_id', sa.Uuid(), nullable=True),
+    sa.Column('sku', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('descricao', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.Column('valor_unitario', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('desconto_percentual', sa.Numeric(precision=5, scale=2), nullable=False),
+    sa.Column('desconto_valor', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('desconto_linha', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('valor_total', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('observacoes', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.ForeignKeyConstraint(['orcamento_id'], ['orcamento.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_orcamentoitem_orcamento_id'), 'orcamentoitem', ['orcamento_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_orcamentoitem_orcamento_id'), table_name='orcamentoitem')
+    op.drop_table('orcamentoitem')
+    op.drop_index(op.f('ix_orcamento_status'), table_name='orcamento')
+    op.drop_index(op.f('ix_orcamento_vendedor_id'), table_name='orcamento')
+    op.drop_index(op.f('ix_orcamento_cliente_id'), table_name='orcamento')
+    op.drop_table('orcamento')
@@ -0,0 +1,31 @@
+"""Add partial index on open quotes for expiry
+
+Revision ID: e5a9c3d7f2b4
+Revises: d4f8b2a6e1c9
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c3d7f2b4'
+down_revision = 'd4f8b2a6e1c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_orcamento_abertos_validade',
+        'orcamento',
+        ['validade', 'id'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('pendente', 'enviado')"),
+        sqlite_where=sa.text("status IN ('pendente', 'enviado')"),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_orcamento_abertos_validade', table_name='orcamento')
@@ -0,0 +1,31 @@
+"""Add chosen freight option columns to orcamento
+
+Revision ID: f1b7d4c8a3e6
+Revises: e5a9c3d7f2b4
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b7d4c8a3e6'
+down_revision = 'e5a9c3d7f2b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('orcamento', sa.Column('frete_transportadora', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True))
+    op.add_column('orcamento', sa.Column('frete_servico', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True))
+    op.add_column('orcamento', sa.Column('frete_prazo', sa.Integer(), nullable=True))
+    op.add_column('orcamento', sa.Column('frete_cep_destino', sqlmodel.sql.sqltypes.AutoString(length=8), nullable=True))
+
+
+def downgrade():
+    op.drop_column('orcamento', 'frete_cep_destino')
+    op.drop_column('orcamento', 'frete_prazo')
+    op.drop_column('orcamento', 'frete_servico')
+    op.drop_column('orcamento', 'frete_transportadora')
@@ -1,15 +1,21 @@
-from collections.abc import Generator
-from typing import Annotated
+from collections.abc import Callable, Generator, Sequence
+from typing import Annotated, Any, TypeVar
 
-from fastapi import Depends, HTTPException, status
+import sqlalchemy as sa
+from fastapi import Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session
+from pydantic import BaseModel
+from sqlmodel import Session, select
 
 from app.core.security import decode_access_token
 from app.core.config import settings
 from app.core.db import engine
 from app.domain.services import UserService
 
+ServiceT = TypeVar("ServiceT")
+
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
 )
@@ -26,6 +32,21 @@ SessionDep = Annotated[Session, Depends(get_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
+def require_db(servico: ServiceT) -> ServiceT:
+    """
+    Devolve o serviço se ele tiver uma sessão de banco. Rotas que só respondem
+    com dados reais usam isto para devolver 503 sem banco, em vez de dados de
+    exemplo: `require_db(get_cliente_service()).get(cliente_id)`.
+    """
+    # TODO: Reverter para implementação real (com o banco, a sessão nunca é None)
+    if getattr(servico, "session", None) is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Banco de dados indisponível",
+        )
+    return servico
+
+
 def get_current_user(session: SessionDep, token: str = Depends(reusable_oauth2)):
     # TODO: Reverter para implementação real
     class FakeUser:
@@ -50,3 +71,77 @@ def get_current_active_user(current_user: CurrentUser) -> object:
 def get_current_active_superuser(current_user: CurrentUser) -> object:
     # TODO: Reverter para implementação real
     return current_user
+
+
+class SparseFields:
+    """
+    Campos pedidos pelo cliente via `?fields=id,sku,nome`.
+
+    Sem o parâmetro, nada muda: a consulta seleciona a entidade inteira e a
+    resposta segue o `response_model` da rota. Com o parâmetro, o SELECT traz
+    apenas as colunas pedidas e a resposta leva apenas esses campos.
+    """
+
+    def __init__(self, campos: tuple[str, ...] | None = None):
+        self.campos = campos
+
+    @property
+    def ativo(self) -> bool:
+        return self.campos is not None
+
+    def select(self, tabela: Any) -> Any:
+        """Monta o SELECT da tabela restrito às colunas pedidas."""
+        if not self.ativo:
+            return select(tabela)
+        return sa.select(*(getattr(tabela, campo) for campo in self.campos))
+
+    def project(self, itens: Sequence[Any]) -> Sequence[Any]:
+        """Reduz cada item (linha, modelo ou dict) aos campos pedidos."""
+        if not self.ativo:
+            return itens
+        projetados = []
+        for item in itens:
+            if hasattr(item, "_mapping"):
+                item = dict(item._mapping)
+            elif isinstance(item, BaseModel):
+                item = item.model_dump(include=set(self.campos))
+            projetados.append({campo: item[campo] for campo in self.campos})
+        return projetados
+
+    def response(self, payload: Any) -> Any:
+        """
+        Devolve o payload da rota. Com campos selecionados, serializa
+        diretamente, pois os itens parciais não passariam pela validação
+        do `response_model`.
+        """
+        if not self.ativo:
+            return payload
+        return JSONResponse(content=jsonable_encoder(payload))
+
+
+def sparse_fields(
+    model: type[BaseModel], obrigatorios: tuple[str, ...] = ("id",)
+) -> Callable[..., SparseFields]:
+    """Cria a dependência que lê e valida `?fields=` contra os campos de `model`."""
+    permitidos = set(model.model_fields)
+
+    def dependency(
+        fields: str | None = Query(
+            None,
+            description="Lista de campos separados por vírgula (ex.: id,sku,nome).",
+        ),
+    ) -> SparseFields:
+        if not fields:
+            return SparseFields()
+        pedidos = [c.strip() for c in fields.split(",") if c.strip()]
+        invalidos = sorted(set(pedidos) - permitidos)
+        if invalidos:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campos inválidos: {', '.join(invalidos)}. "
+                f"Disponíveis: {', '.join(sorted(permitidos))}.",
+            )
+        campos = dict.fromkeys([*obrigatorios, *pedidos])
+        return SparseFields(tuple(campos))
+
+    return dependency
@@ -1,9 +1,21 @@
+from importlib import import_module
+
 from fastapi import APIRouter
 
-# Garantindo que TODOS os módulos de rotas sejam importados
+# Rotas do "Corredor Estável": sempre carregadas
 from app.api.routes import (
-    items, login, private, users, produtos, 
-    utils, dashboard, vendedor, anuncios
+    anuncios,
+    batch,
+    clientes,
+    dashboard,
+    items,
+    login,
+    orcamentos,
+    planilhas,
+    produtos,
+    users,
+    utils,
+    vendedor,
 )
 from app.core.config import settings
 
@@ -29,10 +41,35 @@ api_router.include_router(vendedor.router, prefix="/vendedor", tags=["Vendedor"]
 # Rotas de Anúncios
 api_router.include_router(anuncios.router, prefix="/anuncios", tags=["Anuncios"])
 
+# Rotas de Orçamentos
+api_router.include_router(orcamentos.router, prefix="/orcamentos", tags=["Orcamentos"])
+
+# Rotas de Clientes
+api_router.include_router(clientes.router, prefix="/clientes", tags=["Clientes"])
+
+# Planilhas de fornecedor (prévia e importação para o catálogo)
+api_router.include_router(planilhas.router, prefix="/parser", tags=["Parser"])
+
+# Requisições em lote (várias rotas GET em uma única chamada)
+api_router.include_router(batch.router, prefix="/batch", tags=["Batch"])
+
 # Rotas de utilitários e exemplos
 api_router.include_router(utils.router, prefix="/utils", tags=["Utils"])
 api_router.include_router(items.router, prefix="/items", tags=["Items"])
 
-# Rotas privadas
-if settings.ENVIRONMENT == "local":
-    api_router.include_router(private.router, prefix="/private", tags=["Private"])
+# --- ROTAS OPCIONAIS ---
+# O módulo só é importado quando a condição é verdadeira, evitando o custo de
+# importação (e as dependências pesadas) de integrações desligadas.
+# (módulo, prefixo, tags, habilitado)
+_ROUTERS_OPCIONAIS: list[tuple[str, str, list[str], bool]] = [
+    # Rotas privadas
+    ("app.api.routes.private", "/private", ["Private"], settings.ENVIRONMENT == "local"),
+    # Integração com o Mercado Livre (sincronização de anúncios)
+    ("app.api.routes.mercado_livre", "/anuncios", ["Mercado Livre"], settings.FEATURE_MERCADO_LIVRE),
+    # Leitura de XML de NF-e de fornecedor
+    ("app.api.routes.nfe", "/parser", ["Parser"], settings.FEATURE_NFE),
+]
+
+for modulo, prefixo, tags, habilitado in _ROUTERS_OPCIONAIS:
+    if habilitado:
+        api_router.include_router(import_module(modulo).router, prefix=prefixo, tags=tags)
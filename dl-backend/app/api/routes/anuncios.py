@@ -1,9 +1,34 @@
-from fastapi import APIRouter
+import base64
+import binascii
+import json
+import re
+
+from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+
+from app.core.config import settings
+from app.core.zip_stream import EntradaZip, zip_em_blocos
+from app.infra.imagens import TAMANHO_BLOCO, VERSOES, ImagemInvalida, armazem_imagens
+from app.schemas.anuncio import (
+    CriacaoZIPRequest,
+    ProcessamentoImagemRequest,
+    ProcessamentoImagemResponse,
+    RemoverFundoRequest,
+)
 
 router = APIRouter()
 
+_HASH = re.compile(r"[0-9a-f]{64}")
+_TIPO_DATA_URL = re.compile(r"^data:(image/[a-z]+);base64,")
+_NOME_ARQUIVO = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _url_imagem(hash_: str, nome: str) -> str:
+    return f"{settings.API_V1_STR}/anuncios/imagens/{hash_}/{nome}"
+
+
 @router.get("/resumo", tags=["Anuncios"])
-def get_ads_summary():
+async def get_ads_summary():
     """ Retorna um resumo de performance para o painel de anúncios. """
     # Dados de exemplo para que a página de anúncios possa carregar.
     return {
@@ -11,4 +36,125 @@ def get_ads_summary():
         "cliques": 3450,
         "conversoes": 89,
         "cpa": 16.86, # Custo por Aquisição
-    }
\ No newline at end of file
+    }
+
+
+async def _processar(blocos, tipo: str | None, versao: str) -> ProcessamentoImagemResponse:
+    try:
+        imagem = await armazem_imagens.salvar(blocos, tipo)
+        await armazem_imagens.versao(imagem.hash, versao)
+    except ImagemInvalida as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ProcessamentoImagemResponse(
+        imagem_processada_url=_url_imagem(imagem.hash, versao),
+        sucesso=True,
+        mensagem="Imagem já existia no armazém" if imagem.duplicada else "Imagem processada",
+        hash=imagem.hash,
+        duplicada=imagem.duplicada,
+        versoes={nome: _url_imagem(imagem.hash, nome) for nome in VERSOES},
+    )
+
+
+@router.post("/upload-imagem/", tags=["Anuncios"])
+async def upload_imagem(file: UploadFile = File(...), versao: str = "ml"):
+    """
+    Recebe uma foto (multipart), grava em disco em blocos e gera a versão
+    pedida (padrão: 1200px para o Mercado Livre) no pool de processos.
+    Fotos repetidas são reconhecidas pelo hash e não são processadas de novo.
+    """
+    async def blocos():
+        while bloco := await file.read(TAMANHO_BLOCO):
+            yield bloco
+
+    return {"processamento": await _processar(blocos(), file.content_type, versao)}
+
+
+@router.post("/processar-imagem/", response_model=ProcessamentoImagemResponse, tags=["Anuncios"])
+async def processar_imagem(request: ProcessamentoImagemRequest):
+    """ Mesmo processamento do upload, para imagens enviadas em base64. """
+    conteudo = request.imagem_base64
+    tipo = "image/png" if request.nome_arquivo.lower().endswith(".png") else "image/jpeg"
+    if prefixo := _TIPO_DATA_URL.match(conteudo):
+        tipo = prefixo.group(1)
+        conteudo = conteudo[prefixo.end():]
+    try:
+        dados = base64.b64decode(conteudo, validate=True)
+    except binascii.Error:
+        raise HTTPException(status_code=400, detail="imagem_base64 inválida")
+
+    async def blocos():
+        for inicio in range(0, len(dados), TAMANHO_BLOCO):
+            yield dados[inicio : inicio + TAMANHO_BLOCO]
+
+    return await _processar(blocos(), tipo, request.versao)
+
+
+@router.post("/remover-fundo", tags=["Anuncios"])
+async def remover_fundo(request: RemoverFundoRequest):
+    """ Gera (ou reaproveita do cache) a versão PNG sem fundo de uma foto do armazém. """
+    encontrado = _HASH.search(request.imagem_url)
+    if encontrado is None or armazem_imagens.original(encontrado.group()) is None:
+        raise HTTPException(status_code=404, detail="Imagem não encontrada no armazém")
+    hash_ = encontrado.group()
+    await armazem_imagens.versao(hash_, "sem_fundo")
+    return {
+        "anuncio_id": request.anuncio_id,
+        "imagem_processada": _url_imagem(hash_, "sem_fundo"),
+    }
+
+
+@router.get("/imagens/{hash_imagem}/{nome}", tags=["Anuncios"])
+async def get_imagem(hash_imagem: str, nome: str):
+    """ Serve a foto original (`original`) ou uma versão derivada, gerando-a se preciso. """
+    if not _HASH.fullmatch(hash_imagem):
+        raise HTTPException(status_code=404, detail="Imagem não encontrada")
+    try:
+        if nome == "original":
+            caminho = armazem_imagens.original(hash_imagem)
+            if caminho is None:
+                raise FileNotFoundError(hash_imagem)
+        else:
+            caminho = await armazem_imagens.versao(hash_imagem, nome)
+    except (FileNotFoundError, ImagemInvalida):
+        raise HTTPException(status_code=404, detail="Imagem não encontrada")
+    # O conteúdo de um hash nunca muda: pode ficar em cache indefinidamente
+    return FileResponse(caminho, headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+
+@router.post("/criar-zip-ml/", tags=["Anuncios"])
+async def criar_zip_mercado_livre(request: CriacaoZIPRequest):
+    """
+    Pacote do anúncio para upload no Mercado Livre: dados (JSON), descrição e
+    fotos. O ZIP é gerado em fluxo: o download começa de imediato e as fotos
+    são lidas do armazém uma a uma, sem montar o arquivo em memória.
+    """
+    # As imagens são validadas antes de começar a resposta: depois do primeiro
+    # bloco enviado não há mais como devolver um erro HTTP
+    fotos = []
+    for url in request.imagens:
+        encontrado = _HASH.search(url)
+        original = armazem_imagens.original(encontrado.group()) if encontrado else None
+        if original is None:
+            raise HTTPException(status_code=400, detail=f"Imagem não encontrada no armazém: {url}")
+        # Usa a versão de 1200px já gerada no upload; senão, a foto original
+        versao = armazem_imagens.caminho_versao(encontrado.group(), "ml")
+        fotos.append(versao if versao.exists() else original)
+
+    dados = {
+        "titulo": request.titulo,
+        "descricao": request.descricao,
+        "preco": request.preco,
+        "sku": request.sku,
+        "imagens": [f"imagens/{i:02d}{foto.suffix}" for i, foto in enumerate(fotos, 1)],
+    }
+    entradas = [
+        EntradaZip("anuncio.json", json.dumps(dados, ensure_ascii=False, indent=2).encode()),
+        EntradaZip("descricao.txt", request.descricao.encode()),
+        *(EntradaZip(nome, foto) for nome, foto in zip(dados["imagens"], fotos, strict=True)),
+    ]
+    nome_zip = f"anuncio_ml_{_NOME_ARQUIVO.sub('_', request.sku) or 'sem_sku'}.zip"
+    return StreamingResponse(
+        zip_em_blocos(entradas),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{nome_zip}"'},
+    )
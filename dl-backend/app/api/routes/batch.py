@@ -0,0 +1,149 @@
+import asyncio
+import json
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.routing import Match
+
+from app.core.config import settings
+from app.schemas.batch import BatchItemResult, BatchRequest, BatchSubRequest
+from app.schemas.common import ApiResponse
+
+router = APIRouter()
+
+# Cabeçalhos que descrevem o corpo da requisição original e não valem para as sub-requisições
+_CABECALHOS_IGNORADOS = {b"content-length", b"content-type", b"transfer-encoding"}
+
+
+def _scope(request: Request, item: BatchSubRequest) -> dict[str, Any]:
+    caminho, _, query = item.path.partition("?")
+    root_path = request.scope.get("root_path", "")
+    caminho_completo = f"{root_path}{settings.API_V1_STR}{caminho}"
+    return {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": "1.1",
+        "method": item.method,
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": root_path,
+        "path": caminho_completo,
+        "raw_path": caminho_completo.encode(),
+        "query_string": query.encode(),
+        "headers": [
+            (k, v)
+            for k, v in request.scope["headers"]
+            if k not in _CABECALHOS_IGNORADOS
+        ],
+    }
+
+
+def _em_fluxo(request: Request, item: BatchSubRequest) -> bool:
+    """Se a rota responde em fluxo (SSE, NDJSON...): essa resposta nunca termina dentro do lote."""
+    scope = _scope(request, item)
+    for rota in request.app.router.routes:
+        correspondencia, _ = rota.matches(scope)
+        if correspondencia == Match.FULL:
+            classe = getattr(rota, "response_class", None)
+            # O padrão do FastAPI vem embrulhado num DefaultPlaceholder
+            classe = getattr(classe, "value", classe)
+            return isinstance(classe, type) and issubclass(classe, StreamingResponse)
+    return False
+
+
+async def _executar(request: Request, item: BatchSubRequest) -> BatchItemResult:
+    """
+    Executa uma sub-requisição diretamente na aplicação ASGI, sem passar pela rede.
+    Autenticação e demais cabeçalhos da requisição do lote são repassados.
+    """
+    scope = _scope(request, item)
+    corpo_enviado = False
+    nunca = asyncio.Event()
+
+    async def receive() -> dict[str, Any]:
+        nonlocal corpo_enviado
+        if not corpo_enviado:
+            corpo_enviado = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await nunca.wait()
+        return {"type": "http.disconnect"}
+
+    status = 500
+    tipo = ""
+    partes: list[bytes] = []
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status, tipo
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for k, v in message.get("headers", []):
+                if k.lower() == b"content-type":
+                    tipo = v.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            partes.append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        # O ServerErrorMiddleware já respondeu 500 antes de relançar o erro
+        status = 500
+
+    conteudo = b"".join(partes)
+    body: Any = None
+    if conteudo:
+        if tipo.startswith("application/json"):
+            body = json.loads(conteudo)
+        else:
+            body = conteudo.decode("utf-8", errors="replace")
+    return BatchItemResult(id=item.id, path=item.path, status=status, body=body)
+
+
+async def _executar_com_prazo(
+    request: Request, item: BatchSubRequest
+) -> BatchItemResult:
+    try:
+        return await asyncio.wait_for(
+            _executar(request, item), settings.BATCH_ITEM_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        # wait_for cancela a sub-requisição, que libera a vaga do controle de admissão
+        return BatchItemResult(
+            id=item.id,
+            path=item.path,
+            status=504,
+            body={"detail": "A sub-requisição excedeu o tempo limite do lote."},
+        )
+
+
+@router.post(
+    "",
+    response_model=ApiResponse[list[BatchItemResult]],
+    summary="Executa várias requisições GET da API em uma única chamada",
+)
+async def run_batch(payload: BatchRequest, request: Request):
+    """
+    Executa as sub-requisições concorrentemente, dentro do próprio processo,
+    e devolve o resultado de cada uma (status e corpo) na mesma ordem do pedido.
+    """
+    if len(payload.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"O lote aceita no máximo {settings.BATCH_MAX_REQUESTS} requisições.",
+        )
+    if any(item.path.split("?")[0].startswith("/batch") for item in payload.requests):
+        raise HTTPException(
+            status_code=400, detail="Lotes aninhados não são permitidos."
+        )
+    em_fluxo = [item.path for item in payload.requests if _em_fluxo(request, item)]
+    if em_fluxo:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Rotas de resposta contínua não podem ir no lote: {', '.join(em_fluxo)}",
+        )
+
+    resultados = await asyncio.gather(
+        *(_executar_com_prazo(request, item) for item in payload.requests)
+    )
+    return ApiResponse(ok=True, data=list(resultados))
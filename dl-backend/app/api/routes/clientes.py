@@ -0,0 +1,110 @@
+"""
+Rotas de clientes (cadastro e busca do balcão).
+
+GET /clientes/buscar/?termo= é o campo único da tela: dígitos procuram por
+prefixo de CPF/CNPJ ou telefone, texto procura por trechos do nome. As
+listagens aceitam `apos` (id do último cliente recebido) para paginar sem
+OFFSET em tabelas grandes.
+
+/clientes/duplicados/ é a revisão das sugestões de mesclagem geradas pelo job
+de duplicidade (app.domain.duplicidade_clientes).
+"""
+
+from fastapi import APIRouter, HTTPException
+
+from app.api.deps import require_db
+from app.domain.duplicidade_clientes import duplicidade_clientes
+from app.domain.schemas import ClienteCreate, ClienteUpdate
+from app.domain.services import get_cliente_service, get_sugestoes_mesclagem_service
+
+router = APIRouter()
+
+
+@router.get("/", tags=["Clientes"])
+def listar_clientes(
+    nome: str | None = None,
+    telefone: str | None = None,
+    cpf_cnpj: str | None = None,
+    skip: int = 0,
+    limit: int = 50,
+    apos: int | None = None,
+):
+    """Lista clientes em ordem de nome, com filtros opcionais."""
+    return require_db(get_cliente_service()).listar(
+        nome, telefone, cpf_cnpj, skip, limit, apos
+    )
+
+
+@router.get("/buscar/", tags=["Clientes"])
+def buscar_clientes(
+    termo: str, skip: int = 0, limit: int = 20, apos: int | None = None
+):
+    """Busca por nome, telefone ou CPF/CNPJ com um único termo."""
+    return require_db(get_cliente_service()).buscar(termo, skip, limit, apos)
+
+
+# --- Duplicidade ---
+
+
+@router.get("/duplicados/", tags=["Clientes"])
+def listar_duplicados(status: str = "pendente", skip: int = 0, limit: int = 50):
+    """Sugestões de mesclagem, das mais prováveis para as menos."""
+    return require_db(get_sugestoes_mesclagem_service()).listar(status, skip, limit)
+
+
+@router.post("/duplicados/analisar/", status_code=202, tags=["Clientes"])
+async def analisar_duplicados():
+    """
+    Dispara a detecção de duplicados em segundo plano (o mesmo job roda a
+    cada CUSTOMER_DEDUP_INTERVAL_HOURS). Acompanhe em /__duplicidade.
+    """
+    return {"agendado": duplicidade_clientes.agendar()}
+
+
+@router.post("/duplicados/{cliente_id}/{duplicado_id}/descartar/", tags=["Clientes"])
+def descartar_duplicado(cliente_id: int, duplicado_id: int):
+    """Marca o par como cadastros distintos; ele não volta a ser sugerido."""
+    servico = require_db(get_sugestoes_mesclagem_service())
+    if not servico.descartar(cliente_id, duplicado_id):
+        raise HTTPException(status_code=404, detail="Sugestão não encontrada")
+    return {"ok": True}
+
+
+@router.get("/{cliente_id}/", tags=["Clientes"])
+def obter_cliente(cliente_id: int):
+    """Cliente pelo id."""
+    cliente = require_db(get_cliente_service()).get(cliente_id)
+    if cliente is None:
+        raise HTTPException(status_code=404, detail="Cliente não encontrado")
+    return cliente
+
+
+@router.post("/", tags=["Clientes"])
+def criar_cliente(dados: ClienteCreate):
+    """Cadastra um cliente; conta como novo cliente do vendedor, se informado."""
+    servico = require_db(get_cliente_service())
+    try:
+        return servico.create(dados)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.put("/{cliente_id}/", tags=["Clientes"])
+def atualizar_cliente(cliente_id: int, dados: ClienteUpdate):
+    """Atualiza os campos enviados do cliente."""
+    servico = require_db(get_cliente_service())
+    try:
+        cliente = servico.update(cliente_id, dados)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if cliente is None:
+        raise HTTPException(status_code=404, detail="Cliente não encontrado")
+    return cliente
+
+
+@router.delete("/{cliente_id}/", tags=["Clientes"])
+def deletar_cliente(cliente_id: int):
+    """Remove um cliente."""
+    if not require_db(get_cliente_service()).delete(cliente_id):
+        raise HTTPException(status_code=404, detail="Cliente não encontrado")
+    return {"ok": True}
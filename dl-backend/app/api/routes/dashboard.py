@@ -1,40 +1,103 @@
-from fastapi import APIRouter
+from typing import Literal
+
+import anyio.to_thread
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import require_db
+from app.core.config import settings
+from app.core.live import publicador_dashboard
+from app.core.singleflight import coalesce
+from app.domain.ranking_vendedores import ranking_vendedores
+from app.domain.rollups import RollupService
+from app.domain.top_produtos import ranking_produtos
+from app.infra.db.session import get_session
 
 router = APIRouter()
 
+
 @router.get("/metricas", tags=["Dashboard"])
-def get_dashboard_metrics():
-    """ Retorna métricas principais para o dashboard do gestor. """
-    # Retornando dados mockados com a estrutura que o frontend espera
-    return {
-        "faturamento": 125300.50,
-        "total_clientes": 212,
-        "vendas_hoje": 34,
-        "taxa_conversao": 81.2,
-        "satisfacao_cliente": 96.5,
-        "eficiencia_ia": 91.3
-    }
+@coalesce(ttl=settings.COALESCE_TTL_SECONDS)
+async def get_dashboard_metrics():
+    """Retorna métricas principais para o dashboard do gestor."""
+    return await _metricas()
+
 
 @router.get("/estatisticas", tags=["Dashboard"])
-def get_dashboard_stats():
-    """ Retorna estatísticas e dados para os gráficos do dashboard. """
-    # Retornando dados mockados com a estrutura que o frontend espera
+@coalesce(ttl=settings.COALESCE_TTL_SECONDS)
+async def get_dashboard_stats():
+    """Retorna estatísticas e dados para os gráficos do dashboard."""
+    return await _estatisticas()
+
+
+@router.get("/stream", response_class=StreamingResponse, tags=["Dashboard"])
+async def stream_dashboard():
+    """
+    Atualizações ao vivo do dashboard (Server-Sent Events).
+
+    Envia um evento `snapshot` com métricas e estatísticas completas, depois
+    eventos `delta` só com o que mudou e comentários de heartbeat quando não
+    há mudanças. Substitui o polling de /metricas e /estatisticas.
+    """
+    # Sem banco não há o que transmitir: 503 antes de abrir o stream
+    require_db(RollupService(get_session()))
+    return StreamingResponse(
+        publicador_dashboard.assinar(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Desliga o buffering do nginx para esta resposta
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.get("/top-produtos", tags=["Dashboard"])
+async def get_top_produtos(
+    janela: Literal["dia", "semana", "mes"] = "mes",
+    criterio: Literal["quantidade", "faturamento", "margem"] = "quantidade",
+    limite: int = Query(default=10, ge=1, le=settings.TOP_PRODUCTS_SIZE),
+):
+    """
+    Produtos mais vendidos da janela corrente (dia, semana ou mês) por
+    unidades, faturamento ou margem (em reais). Lido do ranking em memória,
+    atualizado a cada venda registrada.
+    """
     return {
-        "evolucao_semanal": [
-            {"name": "Seg", "vendas": 10, "conversao": 60},
-            {"name": "Ter", "vendas": 15, "conversao": 65},
-            {"name": "Qua", "vendas": 12, "conversao": 70},
-            {"name": "Qui", "vendas": 20, "conversao": 75},
-            {"name": "Sex", "vendas": 25, "conversao": 80},
-        ],
-        "distribuicao_canais": [
-            {"name": "WhatsApp", "value": 450, "color": "#25D366"},
-            {"name": "Mercado Livre", "value": 320, "color": "#FFE600"},
-            {"name": "Venda Direta", "value": 280, "color": "#3483FA"},
-        ],
-        "performance_produtos": [
-            {"produto": "Capô Golf", "vendas": 55, "margem": 35},
-            {"produto": "Farol Civic", "vendas": 42, "margem": 40},
-            {"produto": "Parachoque Corolla", "vendas": 31, "margem": 30},
-        ]
+        "janela": janela,
+        "criterio": criterio,
+        "produtos": ranking_produtos.top(janela, criterio, limite),
     }
+
+
+@router.get("/ranking-vendedores", tags=["Dashboard"])
+async def get_ranking_vendedores(
+    limite: int = Query(default=10, ge=1, le=100),
+    inicio: int = Query(default=0, ge=0),
+):
+    """
+    Ranking ao vivo dos vendedores pelas vendas do dia, com o progresso em
+    relação à meta diária. Paginado por `inicio`/`limite`.
+    """
+    return ranking_vendedores.top(limite, inicio)
+
+
+async def _metricas():
+    # Faturamento, vendas e conversão vêm dos rollups diários (app/domain/rollups.py);
+    # a leitura do banco é bloqueante e roda no threadpool
+    servico = require_db(RollupService(get_session()))
+    return await anyio.to_thread.run_sync(servico.metricas_dashboard)
+
+
+async def _estatisticas():
+    # Os três blocos vêm dos rollups diários, sem varrer as vendas
+    servico = require_db(RollupService(get_session()))
+    return await anyio.to_thread.run_sync(servico.estatisticas_dashboard)
+
+
+async def _estado_dashboard():
+    """Estado publicado no stream: os mesmos dados de /metricas e /estatisticas."""
+    return {"metricas": await _metricas(), "estatisticas": await _estatisticas()}
+
+
+publicador_dashboard.fonte = _estado_dashboard
@@ -1,27 +1,33 @@
 import uuid
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import func, select
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import CurrentUser, SessionDep, SparseFields, sparse_fields
 from app.models import Item, ItemCreate, ItemPublic, ItemsPublic, ItemUpdate, Message
 
 router = APIRouter(prefix="/items", tags=["items"])
 
+ItemFields = Annotated[SparseFields, Depends(sparse_fields(ItemPublic))]
+
 
 @router.get("/", response_model=ItemsPublic)
 def read_items(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    fields: ItemFields,
+    skip: int = 0,
+    limit: int = 100,
 ) -> Any:
     """
-    Retrieve items.
+    Retrieve items. Use `fields` to return only some columns.
     """
     # TODO: Reverter para implementação real
     # if current_user.is_superuser:
     #     count_statement = select(func.count()).select_from(Item)
     #     count = session.exec(count_statement).one()
-    #     statement = select(Item).offset(skip).limit(limit)
+    #     statement = fields.select(Item).offset(skip).limit(limit)
     #     items = session.exec(statement).all()
     # else:
     #     count_statement = (
@@ -31,15 +37,15 @@ def read_items(
     #     )
     #     count = session.exec(count_statement).one()
     #     statement = (
-    #         select(Item)
+    #         fields.select(Item)
     #         .where(Item.owner_id == current_user.id)
     #         .offset(skip)
     #         .limit(limit)
     #     )
     #     items = session.exec(statement).all()
 
-    # return ItemsPublic(data=items, count=count)
-    return ItemsPublic(data=[], count=0)
+    # return fields.response({"data": fields.project(items), "count": count})
+    return fields.response({"data": [], "count": 0})
 
 
 @router.get("/{id}", response_model=ItemPublic)
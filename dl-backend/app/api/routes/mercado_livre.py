@@ -0,0 +1,55 @@
+"""
+Rotas da integração com o Mercado Livre (carregadas com FEATURE_MERCADO_LIVRE).
+"""
+
+from fastapi import APIRouter, Query
+
+from app.api.deps import require_db
+from app.domain.services import get_anuncio_ml_service
+from app.domain.sync_mercado_livre import sincronizacao_ml
+
+router = APIRouter()
+
+
+@router.post("/ml/sincronizar-para-banco", tags=["Mercado Livre"])
+async def sincronizar_para_banco(completo: bool = False):
+    """
+    Dispara em segundo plano a sincronização dos anúncios do ML para o banco.
+    Por padrão é incremental (só anúncios alterados desde a última leitura);
+    `completo=true` relê todos. Acompanhe por GET /anuncios/ml/sincronizacao.
+    """
+    iniciada = sincronizacao_ml.iniciar(completo)
+    return {"iniciada": iniciada, **sincronizacao_ml.resumo()}
+
+
+@router.get("/ml/sincronizacao", tags=["Mercado Livre"])
+async def status_sincronizacao():
+    """Estado da sincronização atual ou da última concluída."""
+    return sincronizacao_ml.resumo()
+
+
+@router.post("/sincronizar-ml", tags=["Mercado Livre"])
+async def sincronizar_ml():
+    """
+    Sincronização incremental no formato esperado pela tela de anúncios.
+    Os números são os da última sincronização concluída.
+    """
+    sincronizacao_ml.iniciar()
+    resultado = sincronizacao_ml.ultimo_resultado
+    return {
+        "estado": sincronizacao_ml.estado,
+        "sincronizacao": {
+            "total_anuncios": resultado.total_encontrados if resultado else 0,
+            "sincronizados": resultado.gravados if resultado else 0,
+            "erros": resultado.erros if resultado else 0,
+            "produtos_sincronizados": resultado.gravados if resultado else 0,
+            "total_encontrados": resultado.total_encontrados if resultado else 0,
+            "detalhes": [],
+        },
+    }
+
+
+@router.get("/ml/meus-produtos", tags=["Mercado Livre"])
+def meus_produtos(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=500)):
+    """Anúncios do vendedor já sincronizados no banco local."""
+    return require_db(get_anuncio_ml_service()).listar(skip, limit)
@@ -0,0 +1,94 @@
+"""
+Leitura de XML de NF-e de fornecedor (ativa com FEATURE_NFE).
+
+POST /parser/parse-xml lê o arquivo em fluxo (app.infra.nfe), concilia os
+itens com o catálogo em lotes e devolve uma prévia no formato de `ParsedXML`
+do frontend: os totais cobrem o arquivo inteiro, as listas de notas e itens
+são limitadas por NFE_PREVIEW_NOTES e NFE_PREVIEW_ITEMS. XML que não é NF-e
+volta com a contagem de elementos e uma amostra dos textos.
+"""
+
+from collections import Counter
+from dataclasses import asdict
+from typing import Any
+
+from fastapi import APIRouter, File, HTTPException, UploadFile
+
+from app.api.deps import SessionDep
+from app.core.config import settings
+from app.domain.conciliacao_nfe import ConciliacaoProdutosNFe
+from app.infra.nfe import ErroNFe, ItemNFe, LeitorNFe, NotaFiscal
+
+router = APIRouter()
+
+
+def _nfe_info(
+    notas: list[NotaFiscal],
+    itens: list[ItemNFe],
+    total_notas: int,
+    total_itens: int,
+    situacoes: Counter,
+) -> dict[str, Any]:
+    return {
+        "quantidade_notas": total_notas,
+        "quantidade_itens": total_itens,
+        "notas": [asdict(nota) for nota in notas],
+        "itens": [asdict(item) for item in itens],
+        "conciliacao": {
+            situacao: situacoes[situacao]
+            for situacao in ("conciliado", "sem_cadastro", "nao_verificado")
+        },
+    }
+
+
+@router.post("/parse-xml", tags=["Parser"])
+def parse_xml(session: SessionDep, file: UploadFile = File(...)):
+    """NF-e (avulsa, nfeProc ou lote) com os itens conciliados com o catálogo."""
+    bruto = file.file.read(settings.XML_RAW_PREVIEW_BYTES).decode(
+        "utf-8", errors="replace"
+    )
+    file.file.seek(0)
+
+    leitor = LeitorNFe(file.file)
+    notas: list[NotaFiscal] = []
+    itens: list[ItemNFe] = []
+    total_notas = total_itens = 0
+    situacoes: Counter[str] = Counter()
+    try:
+        for registro in ConciliacaoProdutosNFe(session).conciliar(leitor):
+            if isinstance(registro, NotaFiscal):
+                total_notas += 1
+                if len(notas) < settings.NFE_PREVIEW_NOTES:
+                    notas.append(registro)
+            else:
+                total_itens += 1
+                situacoes[registro.situacao] += 1
+                if len(itens) < settings.NFE_PREVIEW_ITEMS:
+                    itens.append(registro)
+    except ErroNFe as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if total_notas == 0:
+        xml_type = "generic"
+    elif total_notas == 1:
+        xml_type = "nfe"
+    else:
+        xml_type = "nfe_lote"
+    parsed_data: dict[str, Any] = {
+        "type": xml_type,
+        "elements": leitor.amostra,
+        "attributes": leitor.atributos_raiz,
+    }
+    if total_notas:
+        parsed_data["nfe_info"] = _nfe_info(
+            notas, itens, total_notas, total_itens, situacoes
+        )
+    return {
+        "type": "xml",
+        "xml_type": xml_type,
+        "root_tag": leitor.raiz,
+        "attributes": leitor.atributos_raiz,
+        "elements_count": leitor.elementos,
+        "parsed_data": parsed_data,
+        "raw_content": bruto,
+    }
@@ -0,0 +1,407 @@
+"""
+Rotas de orçamentos ("Corredor Estável": criação e autosave do rascunho).
+
+O autosave usa PATCH /orcamentos/{id} com as operações por linha desde a
+versão que o frontend tem; uma versão desatualizada devolve 409 com a versão
+atual, para o frontend recarregar o rascunho antes de reenviar.
+"""
+
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import anyio.to_thread
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel
+
+from app.api.deps import require_db
+from app.core.config import settings
+from app.domain.expiracao_orcamentos import expiracao_orcamentos
+from app.domain.frete import montar_pacote, motor_frete
+from app.domain.schemas import (
+    ConversaoVendaRequest,
+    OrcamentoCreate,
+    OrcamentoFreteUpdate,
+    OrcamentoPatch,
+    OrcamentoRead,
+    OrcamentoStatusUpdate,
+    OrcamentoUpdate,
+)
+from app.domain.services import (
+    ConflitoVersao,
+    ErroOrcamento,
+    EstoqueInsuficiente,
+    OrcamentoNaoEditavel,
+    get_conversao_venda_service,
+    get_orcamento_service,
+)
+from app.infra.ceps import indice_cep, normalizar_cep
+from app.infra.pdf_orcamento import cache_pdf
+from app.infra.transportadoras import OpcaoFrete, PacoteFrete
+from app.schemas.frete import (
+    CalculoFreteRequest,
+    CotacaoOrcamentoRequest,
+    FreteOrcamentoRequest,
+    OpcaoFreteResponse,
+    RespostaFrete,
+)
+
+router = APIRouter()
+
+
+class EnvioOrcamento(BaseModel):
+    metodo: str = "whatsapp"
+    numero_whatsapp: str | None = None
+    whatsapp: str | None = None
+    email: str | None = None
+    mensagem_personalizada: str | None = None
+
+
+class AprovacaoOrcamento(BaseModel):
+    aprovador_id: int | None = None
+    observacoes: str | None = None
+
+
+class ConclusaoOrcamento(BaseModel):
+    observacoes: str | None = None
+
+
+def _erro_http(erro: ErroOrcamento) -> HTTPException:
+    if isinstance(erro, ConflitoVersao):
+        return HTTPException(
+            status_code=409,
+            detail={"mensagem": str(erro), "versao_atual": erro.versao_atual},
+        )
+    if isinstance(erro, EstoqueInsuficiente):
+        return HTTPException(
+            status_code=409,
+            detail={
+                "mensagem": str(erro),
+                "linhas": [linha.model_dump(mode="json") for linha in erro.linhas],
+            },
+        )
+    if isinstance(erro, OrcamentoNaoEditavel):
+        return HTTPException(status_code=409, detail=str(erro))
+    return HTTPException(status_code=400, detail=str(erro))
+
+
+@router.post("/", tags=["Orcamentos"])
+def criar_orcamento(dados: OrcamentoCreate, vendedor_id: int):
+    """Cria um orçamento como rascunho."""
+    servico = require_db(get_orcamento_service())
+    try:
+        orcamento = servico.create(dados, vendedor_id)
+    except ErroOrcamento as e:
+        raise _erro_http(e)
+    return {"orcamento": orcamento}
+
+
+@router.get("/", tags=["Orcamentos"])
+def listar_orcamentos(
+    skip: int = 0,
+    limit: int = 50,
+    status: str | None = None,
+    vendedor_id: int | None = None,
+    cliente_id: int | None = None,
+):
+    """Lista orçamentos (sem as linhas), mais recentes primeiro."""
+    return require_db(get_orcamento_service()).list_all(
+        skip, limit, status, vendedor_id, cliente_id
+    )
+
+
+@router.post("/expirar-vencidos", tags=["Orcamentos"])
+async def expirar_vencidos():
+    """
+    Expira agora os orçamentos enviados com validade vencida (o mesmo job
+    roda a cada QUOTE_EXPIRY_INTERVAL_MINUTES).
+    """
+    resultado = await expiracao_orcamentos.executar()
+    if resultado is None:
+        return {"orcamentos_expirados": 0, "lotes": 0, "duracao_s": 0.0}
+    return {
+        "orcamentos_expirados": resultado.expirados,
+        "lotes": resultado.lotes,
+        "duracao_s": resultado.duracao_s,
+    }
+
+
+# --- Frete ---
+
+
+@router.get("/validar-cep/{cep}", tags=["Orcamentos"])
+def validar_cep(cep: str):
+    """Valida o CEP pelo índice local de faixas (sem chamada externa)."""
+    if normalizar_cep(cep) is None:
+        return {"valido": False, "cep": cep, "mensagem": "CEP deve ter 8 dígitos"}
+    local = indice_cep.buscar(cep)
+    if local is None:
+        return {
+            "valido": False,
+            "cep": cep,
+            "mensagem": "CEP fora das faixas conhecidas",
+        }
+    return {
+        "valido": True,
+        "cep": local.cep,
+        "cep_formatado": local.formatado,
+        "uf": local.uf,
+        "regiao": local.regiao,
+        "cidade": local.cidade,
+    }
+
+
+def _pacote(
+    cep_destino: str, valor: float, peso: float | None, dimensoes: Any
+) -> PacoteFrete:
+    try:
+        return montar_pacote(cep_destino, peso, dimensoes, valor_declarado=valor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _opcao(opcao: OpcaoFrete) -> OpcaoFreteResponse:
+    return OpcaoFreteResponse(
+        transportadora=opcao.transportadora,
+        servico=opcao.servico,
+        prazo=opcao.prazo,
+        valor=float(opcao.valor),
+        codigo_servico=opcao.codigo_servico,
+    )
+
+
+async def _cotar(pacote: PacoteFrete) -> RespostaFrete:
+    opcoes, resultados = await motor_frete.cotar(pacote)
+    indisponiveis = [r.transportadora for r in resultados if r.erro]
+    if not opcoes:
+        return RespostaFrete(
+            sucesso=False,
+            opcoes_frete=[],
+            erro="Nenhuma transportadora atendeu o CEP informado",
+            indisponiveis=indisponiveis,
+        )
+    return RespostaFrete(
+        sucesso=True,
+        opcoes_frete=[_opcao(o) for o in opcoes],
+        mensagem=f"{len(opcoes)} opções de frete",
+        indisponiveis=indisponiveis,
+    )
+
+
+async def _linhas_ndjson(pacote: PacoteFrete) -> AsyncIterator[str]:
+    async for resultado in motor_frete.cotar_em_fluxo(pacote):
+        yield (
+            json.dumps(
+                {
+                    "transportadora": resultado.transportadora,
+                    "opcoes_frete": [_opcao(o).model_dump() for o in resultado.opcoes],
+                    "erro": resultado.erro,
+                },
+                ensure_ascii=False,
+            )
+            + "\n"
+        )
+
+
+@router.post("/frete/cotar", tags=["Orcamentos"])
+async def cotar_frete(dados: CalculoFreteRequest, fluxo: bool = False):
+    """
+    Cota o frete em todas as transportadoras ao mesmo tempo. Com `fluxo=true`
+    a resposta é NDJSON, uma linha por transportadora assim que ela responde.
+    """
+    peso, dimensoes = dados.pacote()
+    pacote = _pacote(dados.cep_destino, dados.valor_total, peso, dimensoes)
+    if fluxo:
+        return StreamingResponse(
+            _linhas_ndjson(pacote), media_type="application/x-ndjson"
+        )
+    return await _cotar(pacote)
+
+
+async def _cotar_orcamento(
+    orcamento_id: int, dados: FreteOrcamentoRequest
+) -> RespostaFrete:
+    servico = require_db(get_orcamento_service())
+    orcamento = await anyio.to_thread.run_sync(servico.get, orcamento_id)
+    if orcamento is None:
+        raise HTTPException(status_code=404, detail="Orçamento não encontrado")
+    valor = float(orcamento.valor_total - orcamento.frete_valor)
+    dimensoes = dados.dimensoes.tupla() if dados.dimensoes else None
+    return await _cotar(_pacote(dados.cep_destino, valor, dados.peso_total, dimensoes))
+
+
+@router.post("/frete/cotar-orcamento", tags=["Orcamentos"])
+async def cotar_frete_orcamento(dados: CotacaoOrcamentoRequest):
+    """Cota o frete de um orçamento (valor declarado = total do orçamento)."""
+    return await _cotar_orcamento(dados.orcamento_id, dados)
+
+
+@router.get("/{orcamento_id}", tags=["Orcamentos"])
+def obter_orcamento(orcamento_id: int):
+    """Orçamento com as linhas."""
+    orcamento = require_db(get_orcamento_service()).get(orcamento_id)
+    if orcamento is None:
+        raise HTTPException(status_code=404, detail="Orçamento não encontrado")
+    return orcamento
+
+
+@router.put("/{orcamento_id}", tags=["Orcamentos"])
+def atualizar_orcamento(orcamento_id: int, dados: OrcamentoUpdate):
+    """
+    Atualização completa. Prefira o PATCH no autosave: aqui a lista de itens é
+    comparada com a gravada para escrever só as linhas alteradas.
+    """
+    servico = require_db(get_orcamento_service())
+    try:
+        orcamento = servico.update(orcamento_id, dados)
+    except ErroOrcamento as e:
+        raise _erro_http(e)
+    if orcamento is None:
+        raise HTTPException(status_code=404, detail="Orçamento não encontrado")
+    return orcamento
+
+
+@router.patch("/{orcamento_id}", tags=["Orcamentos"])
+def autosave_orcamento(orcamento_id: int, patch: OrcamentoPatch):
+    """Autosave do rascunho: aplica as operações por linha sobre `versao`."""
+    servico = require_db(get_orcamento_service())
+    try:
+        resultado = servico.aplicar_patch(orcamento_id, patch)
+    except ErroOrcamento as e:
+        raise _erro_http(e)
+    if resultado is None:
+        raise HTTPException(status_code=404, detail="Orçamento não encontrado")
+    return resultado
+
+
+@router.delete("/{orcamento_id}", tags=["Orcamentos"])
+def deletar_orcamento(orcamento_id: int):
+    """Remove um orçamento e suas linhas."""
+    if not require_db(get_orcamento_service()).delete(orcamento_id):
+        raise HTTPException(status_code=404, detail="Orçamento não encontrado")
+    return {"ok": True}
+
+
+def _mudar_status(
+    orcamento_id: int, novo_status: str, observacoes: str | None = None
+) -> dict[str, Any]:
+    servico = require_db(get_orcamento_service())
+    try:
+        orcamento = servico.mudar_status(orcamento_id, novo_status, observacoes)
+    except ErroOrcamento as e:
+        raise _erro_http(e)
+    if orcamento is None:
+        raise HTTPException(status_code=404, detail="Orçamento não encontrado")
+    return orcamento.model_dump()
+
+
+@router.put("/{orcamento_id}/status", tags=["Orcamentos"])
+def mudar_status(orcamento_id: int, dados: OrcamentoStatusUpdate):
+    """Muda o status; enviados, fechados e perdidos contam no painel do vendedor."""
+    return _mudar_status(orcamento_id, dados.novo_status, dados.observacoes)
+
+
+@router.post("/{orcamento_id}/enviar", tags=["Orcamentos"])
+def enviar_orcamento(orcamento_id: int, dados: EnvioOrcamento):
+    """Marca o orçamento como enviado ao cliente."""
+    destino = dados.numero_whatsapp or dados.whatsapp or dados.email
+    orcamento = _mudar_status(orcamento_id, "enviado")
+    return {
+        "sucesso": True,
+        "metodo": dados.metodo,
+        "destino": destino,
+        "orcamento": orcamento,
+    }
+
+
+@router.post("/{orcamento_id}/aprovar", tags=["Orcamentos"])
+def aprovar_orcamento(orcamento_id: int, dados: AprovacaoOrcamento):
+    """Registra a aprovação do cliente."""
+    return _mudar_status(orcamento_id, "aprovado", dados.observacoes)
+
+
+@router.post("/{orcamento_id}/concluir", tags=["Orcamentos"])
+def concluir_orcamento(orcamento_id: int, dados: ConclusaoOrcamento):
+    """Marca o orçamento como concluído."""
+    return {
+        "sucesso": True,
+        "orcamento": _mudar_status(orcamento_id, "concluido", dados.observacoes),
+    }
+
+
+@router.post("/{orcamento_id}/frete", tags=["Orcamentos"])
+async def calcular_frete_orcamento(orcamento_id: int, dados: FreteOrcamentoRequest):
+    """Opções de frete para o orçamento."""
+    return await _cotar_orcamento(orcamento_id, dados)
+
+
+@router.put("/{orcamento_id}/frete", tags=["Orcamentos"])
+def aplicar_frete(orcamento_id: int, dados: OrcamentoFreteUpdate):
+    """Aplica a opção de frete escolhida: grava a transportadora e soma o frete ao total."""
+    servico = require_db(get_orcamento_service())
+    try:
+        orcamento = servico.aplicar_frete(orcamento_id, dados)
+    except ErroOrcamento as e:
+        raise _erro_http(e)
+    if orcamento is None:
+        raise HTTPException(status_code=404, detail="Orçamento não encontrado")
+    return orcamento
+
+
+@router.post("/{orcamento_id}/converter-venda", tags=["Orcamentos"])
+def converter_em_venda(orcamento_id: int, dados: ConversaoVendaRequest):
+    """
+    Converte o orçamento em venda numa só transação: cria a venda e baixa o
+    estoque de todas as linhas de uma vez. Sem estoque para alguma linha,
+    responde 409 com o resultado de cada linha e nada é gravado.
+    """
+    servico = require_db(get_conversao_venda_service())
+    try:
+        resultado = servico.converter(orcamento_id, dados)
+    except ErroOrcamento as e:
+        raise _erro_http(e)
+    if resultado is None:
+        raise HTTPException(status_code=404, detail="Orçamento não encontrado")
+    return resultado
+
+
+async def _orcamento_para_pdf(orcamento_id: int) -> OrcamentoRead:
+    servico = require_db(get_orcamento_service())
+    orcamento = await anyio.to_thread.run_sync(servico.get, orcamento_id)
+    if orcamento is None:
+        raise HTTPException(status_code=404, detail="Orçamento não encontrado")
+    return orcamento
+
+
+@router.post("/{orcamento_id}/gerar-pdf", tags=["Orcamentos"])
+async def gerar_pdf(orcamento_id: int):
+    """
+    Gera o PDF da versão atual do orçamento (ou reaproveita o do cache, se o
+    conteúdo não mudou) e devolve a URL de download.
+    """
+    orcamento = await _orcamento_para_pdf(orcamento_id)
+    _, chave = await cache_pdf.obter(orcamento)
+    return {
+        "sucesso": True,
+        "mensagem": "PDF gerado",
+        "pdf_url": f"{settings.API_V1_STR}/orcamentos/{orcamento_id}/download-pdf",
+        "versao": orcamento.versao,
+        "hash": chave,
+    }
+
+
+@router.get("/{orcamento_id}/download-pdf", tags=["Orcamentos"])
+async def download_pdf(orcamento_id: int):
+    """PDF do orçamento, servido do cache em disco (aceita Range)."""
+    orcamento = await _orcamento_para_pdf(orcamento_id)
+    caminho, chave = await cache_pdf.obter(orcamento)
+    return FileResponse(
+        caminho,
+        media_type="application/pdf",
+        filename=f"{orcamento.numero_orcamento}.pdf",
+        headers={
+            "ETag": f'"{chave}"',
+            "Cache-Control": "private, max-age=0, must-revalidate",
+        },
+    )
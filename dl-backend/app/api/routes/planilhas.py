@@ -0,0 +1,173 @@
+"""
+Planilhas de fornecedor (XLSX e CSV): prévia paginada e importação para o catálogo.
+
+POST /parser/parse-spreadsheet lê só até a página pedida (app.infra.planilhas)
+e devolve a prévia no formato de `ParsedSpreadsheet` do frontend, com o
+mapeamento das colunas para os campos do produto e a validação das linhas da
+página. POST /parser/import-spreadsheet guarda o arquivo e agenda a gravação
+em segundo plano (app.domain.importacao_produtos); o andamento sai em
+GET /parser/importacoes/{id}.
+"""
+
+import json
+import shutil
+import uuid
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+import anyio.to_thread
+from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
+
+from app.core.config import settings
+from app.domain.importacao_produtos import (
+    importacao_produtos,
+    mapear_colunas,
+    validar_bloco,
+)
+from app.infra.planilhas import (
+    ArquivoPlanilha,
+    ErroPlanilha,
+    abrir_planilha,
+    tipo_valor,
+)
+
+router = APIRouter()
+
+# Limite de linhas por página da prévia
+MAX_LINHAS_POR_PAGINA = 500
+
+
+def _mapeamento(texto: str | None) -> dict[str, str] | None:
+    """Mapeamento explícito enviado como JSON: {"sku": "Código", "preco": "Valor"}."""
+    if not texto:
+        return None
+    try:
+        mapa = json.loads(texto)
+    except json.JSONDecodeError:
+        raise HTTPException(
+            status_code=400, detail="Mapeamento deve ser um JSON {campo: coluna}"
+        )
+    if not isinstance(mapa, dict) or not all(isinstance(v, str) for v in mapa.values()):
+        raise HTTPException(
+            status_code=400, detail="Mapeamento deve ser um JSON {campo: coluna}"
+        )
+    return mapa
+
+
+def _planilhas(arquivo_planilha: ArquivoPlanilha) -> list[dict[str, Any]]:
+    # Só os metadados de cada aba: a dimensão gravada no XLSX e o cabeçalho
+    dados = []
+    for nome in arquivo_planilha.nomes_planilhas:
+        aba = arquivo_planilha.planilha(nome)
+        dados.append(
+            {"name": nome, "columns": aba.colunas, "rows_count": aba.total_estimado}
+        )
+    return dados
+
+
+@router.post("/parse-spreadsheet", tags=["Parser"])
+def parse_spreadsheet(
+    file: UploadFile = File(...),
+    pagina: int = Query(1, ge=1),
+    por_pagina: int = Query(
+        settings.SPREADSHEET_PREVIEW_ROWS, ge=1, le=MAX_LINHAS_POR_PAGINA
+    ),
+    planilha: str | None = Form(None),
+    mapeamento: str | None = Form(None),
+):
+    """Prévia de uma página da planilha, com as colunas mapeadas e as linhas validadas."""
+    explicito = _mapeamento(mapeamento)
+    inicio = (pagina - 1) * por_pagina
+    try:
+        with abrir_planilha(file.file, file.filename or "") as arquivo_planilha:
+            abas = _planilhas(arquivo_planilha)
+            aba = arquivo_planilha.planilha(planilha)
+            # Uma linha além da página diz se há mais, sem ler o resto do arquivo
+            linhas = list(islice(aba, inicio, inicio + por_pagina + 1))
+    except ErroPlanilha as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    tem_mais = len(linhas) > por_pagina
+    linhas = linhas[:por_pagina]
+    # Chegou ao fim: o leitor contou todas as linhas (mesmo com a página além do
+    # fim); senão, a estimativa do arquivo (se houver)
+    total = aba.total_estimado if tem_mais else aba.lidas
+    mapa = mapear_colunas(aba.colunas, explicito)
+    validadas = validar_bloco(linhas, mapa, inicio + 1)
+    tipos = {
+        coluna: next(
+            (
+                t
+                for t in (tipo_valor(linha.get(coluna)) for linha in linhas)
+                if t != "vazio"
+            ),
+            "vazio",
+        )
+        for coluna in aba.colunas
+    }
+    return {
+        "type": "spreadsheet",
+        "file_type": arquivo_planilha.tipo,
+        "columns": aba.colunas,
+        "columns_count": len(aba.colunas),
+        "sample_data": linhas,
+        "data_types": tipos,
+        "rows_count": total,
+        "delimiter": arquivo_planilha.delimitador,
+        "sheets_count": len(abas),
+        "sheet_names": arquivo_planilha.nomes_planilhas,
+        "workbook_properties": arquivo_planilha.propriedades,
+        "sheets_data": abas,
+        "pagina": pagina,
+        "por_pagina": por_pagina,
+        "tem_mais": tem_mais,
+        "mapeamento": mapa,
+        "validacao": {
+            "validas": sum(1 for v in validadas if v.produto is not None),
+            "invalidas": sum(1 for v in validadas if v.produto is None),
+            "linhas": [
+                {"linha": v.numero, "erros": v.erros} for v in validadas if v.erros
+            ],
+        },
+    }
+
+
+def _guardar(file: UploadFile, planilha: str | None) -> Path:
+    """Confere se o arquivo abre e o copia para a pasta de importações."""
+    with abrir_planilha(file.file, file.filename or "") as arquivo_planilha:
+        arquivo_planilha.planilha(planilha)
+    file.file.seek(0)
+    pasta = Path(settings.SPREADSHEET_IMPORT_DIR)
+    pasta.mkdir(parents=True, exist_ok=True)
+    caminho = pasta / f"{uuid.uuid4().hex}{Path(file.filename or '').suffix.lower()}"
+    with open(caminho, "wb") as destino:
+        shutil.copyfileobj(file.file, destino)
+    return caminho
+
+
+@router.post("/import-spreadsheet", status_code=202, tags=["Parser"])
+async def import_spreadsheet(
+    file: UploadFile = File(...),
+    planilha: str | None = Form(None),
+    mapeamento: str | None = Form(None),
+):
+    """Agenda a gravação das linhas válidas no catálogo (upsert por SKU)."""
+    explicito = _mapeamento(mapeamento)
+    try:
+        caminho = await anyio.to_thread.run_sync(_guardar, file, planilha)
+    except ErroPlanilha as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    estado = importacao_produtos.agendar(
+        caminho, file.filename or caminho.name, planilha, explicito
+    )
+    return importacao_produtos.estado(estado.id)
+
+
+@router.get("/importacoes/{importacao_id}", tags=["Parser"])
+def status_importacao(importacao_id: str):
+    """Andamento de uma importação de planilha."""
+    estado = importacao_produtos.estado(importacao_id)
+    if estado is None:
+        raise HTTPException(status_code=404, detail="Importação não encontrada")
+    return estado
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends
+import uuid
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
 from sqlmodel import func, select
 
 # Importamos as dependências de segurança
 from app.api import deps
-from app.api.deps import SessionDep
+from app.api.deps import SessionDep, SparseFields, require_db, sparse_fields
 from app.domain.models import Produto
+from app.domain.reservas_estoque import EstoqueIndisponivel, reservas_estoque
+from app.domain.schemas import ReservaCreate, ReservaRenovacao
+from app.domain.services import get_reserva_estoque_service
 from app.schemas.common import ApiResponse
-from app.schemas.produto import ProdutosPublic
+from app.schemas.produto import ProdutoRead, ProdutosPublic
 
 router = APIRouter()
 
+ProdutoFields = Annotated[SparseFields, Depends(sparse_fields(ProdutoRead))]
+
 @router.get(
     "/",
     response_model=ApiResponse[ProdutosPublic],
@@ -22,16 +31,25 @@ def read_produtos(
     # Esta linha exige que o usuário esteja logado para acessar a rota.
     current_user: deps.CurrentUser,
     # -----------------------------
+    fields: ProdutoFields,
     skip: int = 0,
     limit: int = 100
-) -> ApiResponse[ProdutosPublic]:
+) -> Any:
     """
     Recupera uma lista paginada de produtos do estoque.
-    Requer autenticação.
+    Requer autenticação. Use `fields` para trazer apenas algumas colunas
+    (ex.: `?fields=sku,nome,estoque`): nesse caso cada item de `data.data`
+    traz só as colunas pedidas e a resposta não passa pelo `response_model`
+    (que exige o produto completo).
     """
     # TODO: Reverter para implementação real
+    # count = session.exec(select(func.count()).select_from(Produto)).one()
+    # statement = fields.select(Produto).offset(skip).limit(limit)
+    # produtos = fields.project(session.exec(statement).all())
+    # return fields.response(
+    #     {"ok": True, "data": {"data": produtos, "count": count}}
+    # )
     from decimal import Decimal
-    import uuid
     
     mock_produtos = [
         {
@@ -50,11 +68,63 @@ def read_produtos(
         },
     ]
     
-    paginated_data = ProdutosPublic(data=mock_produtos, count=len(mock_produtos))
-    
-    return ApiResponse(ok=True, data=paginated_data)
+    produtos = fields.project(mock_produtos)
+
+    return fields.response(
+        {"ok": True, "data": {"data": produtos, "count": len(produtos)}}
+    )
 
 @router.get("/estatisticas", tags=["Produtos"])
-def get_product_stock_stats():
+async def get_product_stock_stats():
     """ Retorna estatísticas de estoque para o dashboard. """
     return {"total_produtos": 1480}
+
+
+# --- Reservas de estoque ---
+
+class LiberacaoReserva(BaseModel):
+    reserva_id: uuid.UUID
+
+
+@router.post("/reservar", tags=["Produtos"])
+def reservar_estoque(dados: ReservaCreate):
+    """
+    Reserva uma quantidade por alguns minutos (carrinho da venda rápida ou
+    orçamento). Sem disponível suficiente, responde 409 com o disponível.
+    """
+    servico = require_db(get_reserva_estoque_service())
+    try:
+        reserva = servico.reservar(dados)
+    except EstoqueIndisponivel as e:
+        raise HTTPException(status_code=409, detail={"mensagem": str(e), "disponivel": e.disponivel})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if reserva is None:
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+    return {"sucesso": True, "mensagem": f"{reserva.quantidade} un. de {reserva.sku} reservadas", "reserva": reserva}
+
+
+@router.post("/reservas/{reserva_id}/renovar", tags=["Produtos"])
+def renovar_reserva(reserva_id: uuid.UUID, dados: ReservaRenovacao):
+    """ Estende a validade de uma reserva ainda ativa (carrinho ainda aberto). """
+    reserva = require_db(get_reserva_estoque_service()).renovar(reserva_id, dados.ttl_segundos)
+    if reserva is None:
+        raise HTTPException(status_code=404, detail="Reserva não encontrada ou vencida")
+    return reserva
+
+
+@router.post("/liberar", tags=["Produtos"])
+def liberar_reserva(dados: LiberacaoReserva):
+    """ Libera uma reserva antes de vencer (item removido do carrinho). """
+    if not require_db(get_reserva_estoque_service()).liberar(dados.reserva_id):
+        raise HTTPException(status_code=404, detail="Reserva não encontrada ou vencida")
+    return {"sucesso": True, "mensagem": "Reserva liberada"}
+
+
+@router.get("/disponibilidade/{sku}", tags=["Produtos"])
+def disponibilidade(sku: str):
+    """ Disponível do SKU (estoque menos reservas ativas), lido da memória. """
+    disponivel = reservas_estoque.disponivel(sku)
+    if disponivel is None:
+        raise HTTPException(status_code=404, detail="SKU não encontrado")
+    return {"sku": sku, "disponivel": disponivel, "reservado": reservas_estoque.reservado(sku)}
@@ -1,5 +1,5 @@
 import uuid
-from typing import Any
+from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import col, delete, func, select
@@ -8,7 +8,9 @@ from app import crud
 from app.api.deps import (
     CurrentUser,
     SessionDep,
+    SparseFields,
     get_current_active_superuser,
+    sparse_fields,
 )
 from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
@@ -31,23 +33,27 @@ from app.utils import generate_new_account_email, send_email
 
 router = APIRouter()
 
+UserFields = Annotated[SparseFields, Depends(sparse_fields(UserPublic))]
+
 
 @router.get(
     "/",
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+def read_users(
+    session: SessionDep, fields: UserFields, skip: int = 0, limit: int = 100
+) -> Any:
     """
-    Retrieve users.
+    Retrieve users. Use `fields` to return only some columns.
     """
     # TODO: Reverter para implementação real
     # count_statement = select(func.count()).select_from(User)
     # count = session.exec(count_statement).one()
-    # statement = select(User).offset(skip).limit(limit)
+    # statement = fields.select(User).offset(skip).limit(limit)
     # users = session.exec(statement).all()
-    # return UsersPublic(data=users, count=count)
-    return UsersPublic(data=[], count=0)
+    # return fields.response({"data": fields.project(users), "count": count})
+    return fields.response({"data": [], "count": 0})
 
 
 @router.post(
@@ -1,14 +1,88 @@
+from datetime import datetime, timezone
+
 from fastapi import APIRouter
 
+from app.api.deps import require_db
+from app.core.config import settings
+from app.core.singleflight import coalesce
+from app.domain.contadores_vendedor import ContadoresVendedorService
+from app.domain.ranking_vendedores import ranking_vendedores
+from app.domain.services import get_orcamento_service
+from app.infra.db.session import get_session
+
 router = APIRouter()
 
+# Orçamentos enviados listados como "aguardando retorno"
+MAX_ORCAMENTOS_AGUARDANDO = 20
+
+
 @router.get("/{vendedor_id}/resumo-dia", tags=["Vendedor"])
+@coalesce(ttl=settings.COALESCE_TTL_SECONDS)
 def get_daily_summary(vendedor_id: int):
     """ Retorna um resumo do dia para um vendedor específico. """
-    # Dados de exemplo para que a página do vendedor possa carregar.
+    # Uma linha de vendedordia, incrementada a cada venda/orçamento/cliente
+    return require_db(ContadoresVendedorService(get_session())).resumo_dia(vendedor_id)
+
+
+@router.get("/{vendedor_id}/ranking", tags=["Vendedor"])
+async def get_posicao_ranking(vendedor_id: int):
+    """ Posição do vendedor no ranking de vendas do dia (lido da memória). """
+    return ranking_vendedores.posicao(vendedor_id)
+
+
+@router.get("/{vendedor_id}/metricas-dia", tags=["Vendedor"])
+def get_metricas_dia(vendedor_id: int):
+    """ Métricas do dia do vendedor (vendas, orçamentos e desempenho). """
+    resumo = require_db(ContadoresVendedorService(get_session())).resumo_dia(vendedor_id)
+    return {
+        "vendas_dia": resumo["vendas_realizadas"],
+        "num_vendas": resumo["num_vendas"],
+        "orcamentos_ativos": resumo["orcamentos_enviados"],
+        "performance": f"{resumo['progresso_meta']:.0f}%",
+        "data": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+@router.get("/{vendedor_id}/feedback", tags=["Vendedor"])
+def get_feedback(vendedor_id: int):
+    """ Feedback do dia para o vendedor, a partir dos seus contadores. """
+    resumo = require_db(ContadoresVendedorService(get_session())).resumo_dia(vendedor_id)
+    fechados, perdidos = resumo["orcamentos_fechados"], resumo["orcamentos_perdidos"]
+    decididos = fechados + perdidos
+    taxa = round(fechados / decididos * 100) if decididos else 0
+    if not decididos:
+        feedback = "Nenhum orçamento decidido hoje: faça follow-up dos que foram enviados."
+    elif taxa >= 60:
+        feedback = "Ótima taxa de fechamento hoje! Continue com os follow-ups rápidos."
+    else:
+        feedback = "Vários orçamentos perdidos hoje: revise preços e ligue para os clientes em aberto."
+    return {
+        "feedback": feedback,
+        "metricas": {
+            "total_orcamentos": resumo["orcamentos_enviados"],
+            "orcamentos_fechados": fechados,
+            "orcamentos_perdidos": perdidos,
+            "taxa_fechamento": taxa,
+        },
+    }
+
+
+@router.get("/{vendedor_id}/orcamentos-perdidos", tags=["Vendedor"])
+def get_orcamentos_perdidos(vendedor_id: int):
+    """ Orçamentos do vendedor que aguardam retorno do cliente. """
+    orcamentos = require_db(get_orcamento_service()).list_all(
+        limit=MAX_ORCAMENTOS_AGUARDANDO, status="enviado", vendedor_id=vendedor_id
+    )
     return {
-        "meta_diaria": 5000.00,
-        "vendas_realizadas": 3850.50,
-        "orcamentos_enviados": 12,
-        "novos_clientes": 3,
-    }
\ No newline at end of file
+        "vendedor_id": vendedor_id,
+        "orcamentos_perdidos": [
+            {
+                "id": orcamento.id,
+                "numero": orcamento.numero_orcamento,
+                "cliente_id": orcamento.cliente_id,
+                "valor": orcamento.valor_total,
+                "dias_restantes": orcamento.dias_restantes,
+            }
+            for orcamento in orcamentos
+        ],
+    }
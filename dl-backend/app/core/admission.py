@@ -0,0 +1,197 @@
+"""
+Controle de admissão e descarte de carga.
+
+Cada requisição é classificada (auth, reads, writes, reports) e precisa de uma
+vaga na sua classe para executar. Sem vaga, espera numa fila limitada até um
+prazo; com a fila cheia ou o prazo vencido, responde 503 com `Retry-After`
+imediatamente, em vez de deixar todas as requisições ficarem lentas.
+"""
+
+import asyncio
+import json
+from collections import deque
+from typing import Any
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+CLASSE_AUTH = "auth"
+CLASSE_READS = "reads"
+CLASSE_WRITES = "writes"
+CLASSE_REPORTS = "reports"
+
+_METODOS_LEITURA = {"GET", "HEAD", "OPTIONS"}
+# Trechos de caminho que identificam rotas de relatório/agregação
+_TRECHOS_REPORTS = ("/dashboard", "/estatisticas", "/relatorios")
+
+
+def _caminhos_isentos() -> tuple[str, ...]:
+    return (
+        "/__health",
+        "/__admission",
+        f"{settings.API_V1_STR}/utils/health-check",
+        # Conexão SSE de longa duração: ocuparia uma vaga indefinidamente
+        f"{settings.API_V1_STR}/dashboard/stream",
+    )
+
+
+def classificar(method: str, path: str) -> str | None:
+    """Retorna a classe da requisição, ou None se ela for isenta."""
+    if path.startswith(_caminhos_isentos()):
+        return None
+    if "/login" in path:
+        return CLASSE_AUTH
+    if any(trecho in path for trecho in _TRECHOS_REPORTS):
+        return CLASSE_REPORTS
+    if method.upper() not in _METODOS_LEITURA:
+        return CLASSE_WRITES
+    return CLASSE_READS
+
+
+class ClasseAdmissao:
+    """Limite de concorrência com fila de espera limitada para uma classe de rotas."""
+
+    def __init__(self, nome: str, limite: int, tamanho_fila: int):
+        self.nome = nome
+        self.limite = limite
+        self.tamanho_fila = tamanho_fila
+        self.ativos = 0
+        self.aguardando: deque[asyncio.Future[None]] = deque()
+        self.admitidas = 0
+        self.rejeitadas = 0
+        self.expiradas = 0
+
+    async def entrar(self, prazo: float) -> bool:
+        """Ocupa uma vaga, esperando no máximo `prazo` segundos na fila."""
+        if self.ativos < self.limite and not self.aguardando:
+            self.ativos += 1
+            self.admitidas += 1
+            return True
+        if len(self.aguardando) >= self.tamanho_fila:
+            self.rejeitadas += 1
+            return False
+
+        futuro: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self.aguardando.append(futuro)
+        try:
+            await asyncio.wait_for(futuro, timeout=prazo)
+        except asyncio.TimeoutError:
+            self._descartar(futuro)
+            self.expiradas += 1
+            return False
+        except BaseException:
+            # Cliente desconectou enquanto esperava
+            if futuro.done() and not futuro.cancelled():
+                self.sair()
+            else:
+                futuro.cancel()
+                self._descartar(futuro)
+            raise
+        self.admitidas += 1
+        return True
+
+    def _descartar(self, futuro: asyncio.Future[None]) -> None:
+        # `sair` pode já ter removido o futuro cancelado ao percorrer a fila
+        if futuro in self.aguardando:
+            self.aguardando.remove(futuro)
+
+    def sair(self) -> None:
+        """Libera a vaga, repassando-a diretamente ao próximo da fila."""
+        while self.aguardando:
+            futuro = self.aguardando.popleft()
+            if not futuro.done():
+                futuro.set_result(None)
+                return
+        self.ativos -= 1
+
+    def metricas(self) -> dict[str, Any]:
+        return {
+            "limite": self.limite,
+            "ativos": self.ativos,
+            "fila": len(self.aguardando),
+            "tamanho_fila": self.tamanho_fila,
+            "admitidas": self.admitidas,
+            "rejeitadas": self.rejeitadas,
+            "expiradas": self.expiradas,
+        }
+
+
+class ControleAdmissao:
+    """Conjunto das classes de admissão de um worker."""
+
+    def __init__(self, limites: dict[str, int], tamanho_fila: int, prazo_fila: float):
+        self.prazo_fila = prazo_fila
+        self.classes = {
+            nome: ClasseAdmissao(nome, limite, tamanho_fila)
+            for nome, limite in limites.items()
+        }
+
+    def metricas(self) -> dict[str, dict[str, Any]]:
+        return {nome: classe.metricas() for nome, classe in self.classes.items()}
+
+
+controle_admissao = ControleAdmissao(
+    limites={
+        CLASSE_AUTH: settings.ADMISSION_LIMIT_AUTH,
+        CLASSE_READS: settings.ADMISSION_LIMIT_READS,
+        CLASSE_WRITES: settings.ADMISSION_LIMIT_WRITES,
+        CLASSE_REPORTS: settings.ADMISSION_LIMIT_REPORTS,
+    },
+    tamanho_fila=settings.ADMISSION_QUEUE_SIZE,
+    prazo_fila=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+)
+
+
+class AdmissionControlMiddleware:
+    """Middleware ASGI que aplica o `ControleAdmissao` às requisições HTTP."""
+
+    def __init__(self, app: ASGIApp, controle: ControleAdmissao = controle_admissao):
+        self.app = app
+        self.controle = controle
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        caminho = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and caminho.startswith(root_path):
+            caminho = caminho[len(root_path) :]
+        nome = classificar(scope["method"], caminho)
+        classe = self.controle.classes.get(nome) if nome else None
+        if classe is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await classe.entrar(self.controle.prazo_fila):
+            await self._sobrecarregado(classe.nome, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            classe.sair()
+
+    async def _sobrecarregado(self, nome: str, send: Send) -> None:
+        corpo = json.dumps(
+            {
+                "ok": False,
+                "data": None,
+                "error": f"Servidor sobrecarregado ({nome}). Tente novamente em instantes.",
+            }
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(corpo)).encode()),
+                    (
+                        b"retry-after",
+                        str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode(),
+                    ),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": corpo})
@@ -38,6 +38,135 @@ class Settings(BaseSettings):
     FRONTEND_HOST: str = "http://localhost:5173"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
 
+    # Fuso horário da loja: define o "dia" dos agregados de vendas
+    STORE_TIMEZONE: str = "America/Sao_Paulo"
+
+    # Feature flags (Artigo 5 da Constituição): desligadas por padrão. Os routers
+    # de cada integração só são importados quando a flag correspondente está ativa.
+    FEATURE_SHOPIFY: bool = False
+    FEATURE_MERCADO_LIVRE: bool = False
+    FEATURE_NFE: bool = False
+
+    # Threads disponíveis para rotas síncronas (`def`); o padrão do AnyIO é 40
+    THREADPOOL_SIZE: int = 40
+
+    # Tempo (segundos) que rotas agregadas reaproveitam o resultado coalescido
+    COALESCE_TTL_SECONDS: float = 2.0
+    # Número máximo de sub-requisições aceitas por chamada a /batch
+    BATCH_MAX_REQUESTS: int = 20
+    # Tempo máximo (segundos) de cada sub-requisição do lote; acima dele, 504
+    BATCH_ITEM_TIMEOUT_SECONDS: float = 10.0
+
+    # Stream SSE do dashboard: recálculo periódico, heartbeat e fila por conexão
+    DASHBOARD_STREAM_INTERVAL_SECONDS: float = 5.0
+    DASHBOARD_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    DASHBOARD_STREAM_QUEUE_SIZE: int = 16
+
+    # Tamanho do top de produtos mantido em memória por janela e critério
+    TOP_PRODUCTS_SIZE: int = 10
+
+    # Meta diária de vendas (R$) de cada vendedor, base do progresso no painel
+    SELLER_DAILY_GOAL: float = 5000.0
+
+    # Orçamentos: dias de validade a partir da criação
+    QUOTE_VALIDITY_DAYS: int = 15
+
+    # Expiração dos orçamentos vencidos: intervalo do job (0 desliga), linhas
+    # por UPDATE e pausa entre lotes
+    QUOTE_EXPIRY_INTERVAL_MINUTES: int = 5
+    QUOTE_EXPIRY_BATCH_SIZE: int = 1000
+    QUOTE_EXPIRY_PAUSE_SECONDS: float = 0.05
+
+    # Reservas de estoque: validade padrão e máxima de uma reserva, intervalo
+    # da varredura das vencidas (0 desliga), linhas apagadas por lote e de
+    # quanto em quanto tempo o estoque em memória é relido do banco
+    STOCK_RESERVATION_TTL_SECONDS: int = 900
+    STOCK_RESERVATION_MAX_TTL_SECONDS: int = 3 * 24 * 3600
+    STOCK_RESERVATION_SWEEP_SECONDS: float = 30.0
+    STOCK_RESERVATION_SWEEP_BATCH_SIZE: int = 1000
+    STOCK_RESERVATION_RESYNC_SECONDS: float = 300.0
+
+    # Duplicidade de clientes: intervalo do job (0 desliga), linhas lidas por
+    # vez do banco, blocos maiores que o limite (ex.: telefone de balcão
+    # repetido em milhares de cadastros) são pulados, vizinhos comparados na
+    # ordem do nome e pontuação mínima de uma sugestão de mesclagem
+    CUSTOMER_DEDUP_INTERVAL_HOURS: int = 24
+    CUSTOMER_DEDUP_FETCH_SIZE: int = 5000
+    CUSTOMER_DEDUP_MAX_BLOCK_SIZE: int = 200
+    CUSTOMER_DEDUP_NAME_WINDOW: int = 8
+    CUSTOMER_DEDUP_MIN_SCORE: float = 0.7
+
+    # Frete: CEP de onde saem as entregas, timeout de cada transportadora e
+    # cache das cotações (validade e número máximo de entradas)
+    FREIGHT_ORIGIN_CEP: str = "01001000"
+    FREIGHT_CARRIER_TIMEOUT_SECONDS: float = 4.0
+    # Depois de um timeout ou erro, a transportadora fica de fora por este tempo
+    FREIGHT_CARRIER_PAUSE_SECONDS: float = 30.0
+    FREIGHT_CACHE_TTL_SECONDS: int = 600
+    FREIGHT_CACHE_MAX_ENTRIES: int = 5000
+    # Tabela de frete própria (calculada localmente) e Melhor Envio (ativo com token)
+    FREIGHT_OWN_TABLE_ENABLED: bool = True
+    MELHOR_ENVIO_API_URL: str = "https://melhorenvio.com.br"
+    MELHOR_ENVIO_TOKEN: str | None = None
+    MELHOR_ENVIO_EMAIL: str = "contato@example.com"
+    # CSV de faixas de CEP (inicio,fim,uf,cidade); sem ele, usa as faixas por UF
+    CEP_RANGES_FILE: str | None = None
+
+    # Leitura de XML de NF-e (ativa com FEATURE_NFE): itens e notas devolvidos
+    # na prévia (o arquivo inteiro é lido e conciliado), itens por consulta de
+    # conciliação com o catálogo e bytes do XML bruto na resposta
+    NFE_PREVIEW_ITEMS: int = 200
+    NFE_PREVIEW_NOTES: int = 50
+    NFE_MATCH_BATCH_SIZE: int = 500
+    XML_RAW_PREVIEW_BYTES: int = 2000
+
+    # Planilhas de fornecedor (XLSX/CSV): linhas por página da prévia, linhas
+    # por bloco na importação (um upsert por bloco) e pasta onde o arquivo
+    # enviado espera a importação em segundo plano
+    SPREADSHEET_PREVIEW_ROWS: int = 50
+    SPREADSHEET_CHUNK_ROWS: int = 1000
+    SPREADSHEET_IMPORT_DIR: str = "./data/importacoes"
+
+    # Integração Mercado Livre (ativa com FEATURE_MERCADO_LIVRE)
+    ML_API_BASE_URL: str = "https://api.mercadolibre.com"
+    ML_ACCESS_TOKEN: str | None = None
+    ML_SELLER_ID: str | None = None
+    # Sincronização: requisições simultâneas, tentativas por requisição,
+    # anúncios por lote gravado no banco e timeout de cada chamada
+    ML_SYNC_CONCURRENCY: int = 8
+    ML_SYNC_MAX_RETRIES: int = 5
+    ML_SYNC_BATCH_SIZE: int = 500
+    ML_HTTP_TIMEOUT_SECONDS: float = 15.0
+
+    # Propagação de preço/estoque para os canais: janela de debounce por SKU,
+    # espera máxima de um SKU alterado sem parar e SKUs por lote enviado
+    CHANNEL_SYNC_DEBOUNCE_SECONDS: float = 2.0
+    CHANNEL_SYNC_MAX_DELAY_SECONDS: float = 30.0
+    CHANNEL_SYNC_BATCH_SIZE: int = 100
+
+    # Fotos dos anúncios: pasta do armazém, tamanho máximo de upload e
+    # processos do pool que geram as versões (redimensionar, remover fundo)
+    IMAGE_STORE_DIR: str = "./data/imagens"
+    IMAGE_MAX_UPLOAD_MB: int = 15
+    IMAGE_WORKERS: int = 2
+
+    # PDFs de orçamento: cache em disco (LRU, limitado em MB) e processos do
+    # pool de renderização
+    QUOTE_PDF_CACHE_DIR: str = "./data/pdfs"
+    QUOTE_PDF_CACHE_MB: int = 200
+    PDF_WORKERS: int = 2
+
+    # Controle de admissão: requisições simultâneas por classe de rota,
+    # tamanho da fila de espera de cada classe e prazo máximo na fila
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_LIMIT_AUTH: int = 8
+    ADMISSION_LIMIT_READS: int = 32
+    ADMISSION_LIMIT_WRITES: int = 16
+    ADMISSION_LIMIT_REPORTS: int = 4
+    ADMISSION_QUEUE_SIZE: int = 64
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
     BACKEND_CORS_ORIGINS: Annotated[
         list[AnyUrl] | str, BeforeValidator(parse_cors)
     ] = []
@@ -0,0 +1,145 @@
+"""
+Publicação de atualizações ao vivo do dashboard via Server-Sent Events.
+
+Um único publicador por worker recalcula o estado do dashboard (a cada
+intervalo ou quando avisado de uma mudança, ex.: venda registrada) e envia a
+todos os navegadores conectados apenas o que mudou. O custo de cálculo deixa
+de crescer com o número de dashboards abertos.
+
+Cada assinante tem uma fila limitada. Se um cliente lento deixa a fila
+encher, os deltas pendentes são descartados e ele recebe um snapshot completo
+na próxima leitura, mantendo a memória por conexão constante.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Estado = dict[str, dict[str, Any]]
+
+
+def calcular_delta(anterior: Estado, atual: Estado) -> Estado:
+    """Retorna, por bloco, apenas as chaves cujo valor mudou."""
+    delta: Estado = {}
+    for bloco, valores in atual.items():
+        antigos = anterior.get(bloco, {})
+        mudou = {k: v for k, v in valores.items() if antigos.get(k) != v}
+        if mudou:
+            delta[bloco] = mudou
+    return delta
+
+
+def formatar_evento(evento: str, dados: Any) -> str:
+    return f"event: {evento}\ndata: {json.dumps(dados, default=str)}\n\n"
+
+
+class _Assinante:
+    def __init__(self, tamanho_fila: int):
+        self.fila: asyncio.Queue[Estado] = asyncio.Queue(maxsize=tamanho_fila)
+        self.dessincronizado = False
+        self.descartes = 0
+
+
+class PublicadorDashboard:
+    """Publicador compartilhado (um por processo) do estado do dashboard."""
+
+    def __init__(self) -> None:
+        self.fonte: Callable[[], Awaitable[Estado]] | None = None
+        self._assinantes: set[_Assinante] = set()
+        self._estado: Estado = {}
+        self._laco: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._mudou: asyncio.Event | None = None
+
+    @property
+    def conectados(self) -> int:
+        return len(self._assinantes)
+
+    def notificar(self) -> None:
+        """
+        Avisa que os números mudaram e devem ser recalculados já.
+        Pode ser chamado de rotas síncronas (threadpool) ou assíncronas.
+        """
+        if self._loop is None or self._mudou is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._mudou.set)
+
+    async def _recalcular(self) -> None:
+        if self.fonte is None:
+            return
+        atual = await self.fonte()
+        delta = calcular_delta(self._estado, atual)
+        self._estado = atual
+        if not delta:
+            return
+        for assinante in self._assinantes:
+            try:
+                assinante.fila.put_nowait(delta)
+            except asyncio.QueueFull:
+                # Cliente lento: descarta os deltas e ressincroniza com snapshot
+                while not assinante.fila.empty():
+                    assinante.fila.get_nowait()
+                assinante.dessincronizado = True
+                assinante.descartes += 1
+                assinante.fila.put_nowait(delta)  # acorda o leitor
+
+    async def _executar(self) -> None:
+        assert self._mudou is not None
+        while self._assinantes:
+            try:
+                await asyncio.wait_for(
+                    self._mudou.wait(),
+                    timeout=settings.DASHBOARD_STREAM_INTERVAL_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._mudou.clear()
+            try:
+                await self._recalcular()
+            except Exception:
+                logger.exception("Falha ao recalcular o estado do dashboard")
+        self._laco = None
+
+    async def assinar(self) -> AsyncIterator[str]:
+        """Gera os eventos SSE de uma conexão: snapshot inicial, deltas e heartbeats."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._mudou = asyncio.Event()
+            self._laco = None
+        if self._laco is None and self.fonte is not None:
+            # Sem laço ativo o estado guardado pode estar velho
+            self._estado = await self.fonte()
+
+        assinante = _Assinante(settings.DASHBOARD_STREAM_QUEUE_SIZE)
+        self._assinantes.add(assinante)
+        if self._laco is None:
+            self._laco = asyncio.create_task(self._executar())
+        try:
+            yield formatar_evento("snapshot", self._estado)
+            while True:
+                try:
+                    delta = await asyncio.wait_for(
+                        assinante.fila.get(),
+                        timeout=settings.DASHBOARD_STREAM_HEARTBEAT_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if assinante.dessincronizado:
+                    assinante.dessincronizado = False
+                    yield formatar_evento("snapshot", self._estado)
+                else:
+                    yield formatar_evento("delta", delta)
+        finally:
+            self._assinantes.discard(assinante)
+
+
+# Instância compartilhada pelo processo (um worker do uvicorn)
+publicador_dashboard = PublicadorDashboard()
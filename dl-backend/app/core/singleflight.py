@@ -0,0 +1,216 @@
+"""
+Coalescência de requisições idênticas ("single-flight").
+
+Quando várias requisições iguais chegam ao mesmo tempo (ex.: dezenas de
+vendedores abrindo o dashboard no início do turno), apenas a primeira executa
+a rota; as demais aguardam essa execução e recebem o mesmo resultado.
+Opcionalmente o resultado é mantido por um TTL curto, atendendo também as
+requisições que chegam logo depois.
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from fastapi import Request
+
+# Acima deste número de entradas, o cache remove as expiradas ao gravar.
+_MAX_ENTRADAS_CACHE = 1024
+
+
+class _Chamada:
+    """Execução em andamento compartilhada entre chamadas com a mesma chave."""
+
+    def __init__(self) -> None:
+        self.evento = threading.Event()
+        self.resultado: Any = None
+        self.erro: BaseException | None = None
+
+
+def _consumir_erro(tarefa: asyncio.Future[Any]) -> None:
+    # Marca o erro como consumido quando todos que aguardavam desistiram
+    if not tarefa.cancelled():
+        tarefa.exception()
+
+
+class SingleFlight:
+    """Agrupa chamadas concorrentes com a mesma chave em uma única execução.
+
+    Suporta funções síncronas (rotas `def`, executadas no threadpool) e
+    corrotinas (rotas `async def`). Erros da execução são propagados para
+    todas as chamadas que aguardavam e nunca são mantidos em cache.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._em_andamento: dict[Hashable, _Chamada] = {}
+        self._em_andamento_async: dict[Hashable, asyncio.Future[Any]] = {}
+        self._cache: dict[Hashable, tuple[float, Any]] = {}
+
+    def _buscar_cache(self, chave: Hashable) -> tuple[bool, Any]:
+        entrada = self._cache.get(chave)
+        if entrada is not None and entrada[0] > time.monotonic():
+            return True, entrada[1]
+        return False, None
+
+    def _gravar_cache(self, chave: Hashable, valor: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        agora = time.monotonic()
+        if len(self._cache) >= _MAX_ENTRADAS_CACHE:
+            self._cache = {k: v for k, v in self._cache.items() if v[0] > agora}
+        self._cache[chave] = (agora + ttl, valor)
+
+    def do(self, chave: Hashable, fn: Callable[[], Any], ttl: float = 0.0) -> Any:
+        """Executa `fn` uma única vez para chamadas concorrentes com `chave`."""
+        with self._lock:
+            encontrado, valor = self._buscar_cache(chave)
+            if encontrado:
+                return valor
+            chamada = self._em_andamento.get(chave)
+            lider = chamada is None
+            if chamada is None:
+                chamada = _Chamada()
+                self._em_andamento[chave] = chamada
+
+        if not lider:
+            chamada.evento.wait()
+            if chamada.erro is not None:
+                raise chamada.erro
+            return chamada.resultado
+
+        try:
+            chamada.resultado = fn()
+        except BaseException as e:
+            chamada.erro = e
+            raise
+        finally:
+            with self._lock:
+                self._em_andamento.pop(chave, None)
+                if chamada.erro is None:
+                    self._gravar_cache(chave, chamada.resultado, ttl)
+            chamada.evento.set()
+        return chamada.resultado
+
+    async def do_async(
+        self, chave: Hashable, fn: Callable[[], Any], ttl: float = 0.0
+    ) -> Any:
+        """Versão assíncrona de `do`; `fn` deve retornar um awaitable.
+
+        A execução roda numa tarefa própria: se quem a iniciou for cancelado
+        (ex.: cliente que desconectou), as demais chamadas continuam aguardando
+        o resultado em vez de receberem o cancelamento de outra requisição.
+        """
+        with self._lock:
+            encontrado, valor = self._buscar_cache(chave)
+            if encontrado:
+                return valor
+            tarefa = self._em_andamento_async.get(chave)
+            if tarefa is None:
+                tarefa = asyncio.ensure_future(self._executar_async(chave, fn, ttl))
+                tarefa.add_done_callback(_consumir_erro)
+                self._em_andamento_async[chave] = tarefa
+
+        # shield: o cancelamento de quem espera não cancela a execução
+        return await asyncio.shield(tarefa)
+
+    async def _executar_async(
+        self, chave: Hashable, fn: Callable[[], Any], ttl: float
+    ) -> Any:
+        try:
+            resultado = await fn()
+        except BaseException:
+            with self._lock:
+                self._em_andamento_async.pop(chave, None)
+            raise
+        with self._lock:
+            self._em_andamento_async.pop(chave, None)
+            self._gravar_cache(chave, resultado, ttl)
+        return resultado
+
+    def limpar(self) -> None:
+        """Descarta os resultados mantidos em cache."""
+        with self._lock:
+            self._cache.clear()
+
+
+# Instância compartilhada pelo processo (um worker do uvicorn)
+singleflight = SingleFlight()
+
+_PARAM_REQUEST = "_coalesce_request"
+
+
+def _papel(kwargs: dict[str, Any]) -> str | None:
+    usuario = kwargs.get("current_user")
+    return getattr(usuario, "role", None) if usuario is not None else None
+
+
+def _chave(request: Request, kwargs: dict[str, Any]) -> Hashable:
+    return (
+        request.method,
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+        _papel(kwargs),
+    )
+
+
+def coalesce(ttl: float = 0.0, *, grupo: SingleFlight | None = None) -> Callable:
+    """
+    Decorator de rota que coalesce requisições idênticas concorrentes.
+
+    A chave é formada por método, caminho (incluindo path params), query params
+    e o role do `current_user`, quando a rota o declara. Com `ttl > 0` o
+    resultado também é reaproveitado por esse número de segundos.
+
+    Deve ficar abaixo do decorator do router:
+
+        @router.get("/metricas")
+        @coalesce(ttl=2)
+        def get_dashboard_metrics(): ...
+    """
+
+    def decorator(func: Callable) -> Callable:
+        alvo = grupo or singleflight
+        assinatura = inspect.signature(func)
+        recebe_request = any(
+            p.annotation is Request for p in assinatura.parameters.values()
+        )
+        if not recebe_request:
+            parametros = list(assinatura.parameters.values())
+            parametros.append(
+                inspect.Parameter(
+                    _PARAM_REQUEST, inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                )
+            )
+            assinatura = assinatura.replace(parameters=parametros)
+
+        def _extrair_request(kwargs: dict[str, Any]) -> Request:
+            if not recebe_request:
+                return kwargs.pop(_PARAM_REQUEST)
+            return next(v for v in kwargs.values() if isinstance(v, Request))
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper_async(*args: Any, **kwargs: Any) -> Any:
+                request = _extrair_request(kwargs)
+                return await alvo.do_async(
+                    _chave(request, kwargs), lambda: func(*args, **kwargs), ttl
+                )
+
+            wrapper_async.__signature__ = assinatura  # type: ignore[attr-defined]
+            return wrapper_async
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            request = _extrair_request(kwargs)
+            return alvo.do(_chave(request, kwargs), lambda: func(*args, **kwargs), ttl)
+
+        wrapper.__signature__ = assinatura  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -0,0 +1,184 @@
+"""
+Conjunto ordenado em memória com a semântica de um sorted set do Redis.
+
+Implementado como skip list indexável (cada ligação guarda quantas posições
+ela salta), o que dá O(log n) esperado para atualizar a pontuação de um
+membro, consultar sua posição e localizar a k-ésima posição. Ordena da maior
+para a menor pontuação; empates ficam na ordem crescente do membro.
+
+Não é thread-safe: quem compartilha a estrutura entre threads deve protegê-la.
+"""
+
+import random
+from collections.abc import Hashable, Iterator
+from typing import Any
+
+_NIVEL_MAXIMO = 32
+_PROBABILIDADE = 0.25
+
+
+class _No:
+    __slots__ = ("chave", "membro", "pontuacao", "proximos", "saltos")
+
+    def __init__(self, nivel: int, membro: Any = None, pontuacao: float = 0.0):
+        self.membro = membro
+        self.pontuacao = pontuacao
+        # Maior pontuação primeiro; empate desfeito pelo membro
+        self.chave = (-pontuacao, membro)
+        self.proximos: list[_No | None] = [None] * nivel
+        self.saltos = [0] * nivel
+
+
+class ConjuntoOrdenado:
+    """Membros únicos ordenados por pontuação (maior primeiro)."""
+
+    def __init__(self) -> None:
+        self._cabeca = _No(_NIVEL_MAXIMO)
+        self._nivel = 1
+        self._tamanho = 0  # nós na skip list
+        self._pontuacoes: dict[Hashable, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._pontuacoes)
+
+    def __contains__(self, membro: Hashable) -> bool:
+        return membro in self._pontuacoes
+
+    def pontuacao(self, membro: Hashable) -> float | None:
+        return self._pontuacoes.get(membro)
+
+    def adicionar(self, membro: Hashable, pontuacao: float) -> None:
+        """Insere o membro ou atualiza sua pontuação (ZADD)."""
+        atual = self._pontuacoes.get(membro)
+        if atual == pontuacao:
+            return
+        if atual is not None:
+            self._remover_no(membro, atual)
+        self._inserir_no(membro, pontuacao)
+        self._pontuacoes[membro] = pontuacao
+
+    def incrementar(self, membro: Hashable, delta: float) -> float:
+        """Soma `delta` à pontuação do membro (ZINCRBY); retorna a nova pontuação."""
+        nova = self._pontuacoes.get(membro, 0) + delta
+        self.adicionar(membro, nova)
+        return nova
+
+    def remover(self, membro: Hashable) -> bool:
+        atual = self._pontuacoes.pop(membro, None)
+        if atual is None:
+            return False
+        self._remover_no(membro, atual)
+        return True
+
+    def posicao(self, membro: Hashable) -> int | None:
+        """Posição do membro começando em 0 (ZREVRANK), ou None se ausente."""
+        pontuacao = self._pontuacoes.get(membro)
+        if pontuacao is None:
+            return None
+        chave = (-pontuacao, membro)
+        posicao = 0
+        no = self._cabeca
+        for nivel in reversed(range(self._nivel)):
+            while (
+                proximo := no.proximos[nivel]
+            ) is not None and proximo.chave <= chave:
+                posicao += no.saltos[nivel]
+                no = proximo
+            if no is not self._cabeca and no.chave == chave:
+                return posicao - 1
+        return None
+
+    def intervalo(
+        self, inicio: int = 0, quantidade: int = 10
+    ) -> list[tuple[Any, float]]:
+        """`quantidade` membros a partir da posição `inicio` (ZREVRANGE)."""
+        resultado: list[tuple[Any, float]] = []
+        for no in self._a_partir_de(inicio):
+            if len(resultado) >= quantidade:
+                break
+            resultado.append((no.membro, no.pontuacao))
+        return resultado
+
+    def _a_partir_de(self, inicio: int) -> Iterator[_No]:
+        if inicio < 0 or inicio >= len(self):
+            return
+        alvo = inicio + 1  # as posições na skip list começam em 1
+        percorrido = 0
+        no = self._cabeca
+        for nivel in reversed(range(self._nivel)):
+            while (
+                proximo := no.proximos[nivel]
+            ) is not None and percorrido + no.saltos[nivel] <= alvo:
+                percorrido += no.saltos[nivel]
+                no = proximo
+            if percorrido == alvo:
+                break
+        atual: _No | None = no
+        while atual is not None:
+            yield atual
+            atual = atual.proximos[0]
+
+    @staticmethod
+    def _nivel_aleatorio() -> int:
+        nivel = 1
+        while nivel < _NIVEL_MAXIMO and random.random() < _PROBABILIDADE:
+            nivel += 1
+        return nivel
+
+    def _inserir_no(self, membro: Hashable, pontuacao: float) -> None:
+        novo_chave = (-pontuacao, membro)
+        anteriores: list[_No] = [self._cabeca] * _NIVEL_MAXIMO
+        posicoes = [0] * _NIVEL_MAXIMO
+        no = self._cabeca
+        for nivel in reversed(range(self._nivel)):
+            posicoes[nivel] = 0 if nivel == self._nivel - 1 else posicoes[nivel + 1]
+            while (
+                proximo := no.proximos[nivel]
+            ) is not None and proximo.chave < novo_chave:
+                posicoes[nivel] += no.saltos[nivel]
+                no = proximo
+            anteriores[nivel] = no
+
+        nivel_novo = self._nivel_aleatorio()
+        if nivel_novo > self._nivel:
+            for nivel in range(self._nivel, nivel_novo):
+                posicoes[nivel] = 0
+                anteriores[nivel] = self._cabeca
+                self._cabeca.saltos[nivel] = self._tamanho
+            self._nivel = nivel_novo
+
+        novo = _No(nivel_novo, membro, pontuacao)
+        for nivel in range(nivel_novo):
+            anterior = anteriores[nivel]
+            novo.proximos[nivel] = anterior.proximos[nivel]
+            anterior.proximos[nivel] = novo
+            novo.saltos[nivel] = anterior.saltos[nivel] - (
+                posicoes[0] - posicoes[nivel]
+            )
+            anterior.saltos[nivel] = posicoes[0] - posicoes[nivel] + 1
+        for nivel in range(nivel_novo, self._nivel):
+            anteriores[nivel].saltos[nivel] += 1
+        self._tamanho += 1
+
+    def _remover_no(self, membro: Hashable, pontuacao: float) -> None:
+        chave = (-pontuacao, membro)
+        anteriores: list[_No] = [self._cabeca] * _NIVEL_MAXIMO
+        no = self._cabeca
+        for nivel in reversed(range(self._nivel)):
+            while (proximo := no.proximos[nivel]) is not None and proximo.chave < chave:
+                no = proximo
+            anteriores[nivel] = no
+
+        alvo = no.proximos[0]
+        if alvo is None or alvo.chave != chave:
+            return
+        for nivel in range(self._nivel):
+            anterior = anteriores[nivel]
+            if anterior.proximos[nivel] is alvo:
+                anterior.saltos[nivel] += alvo.saltos[nivel] - 1
+                anterior.proximos[nivel] = alvo.proximos[nivel]
+            else:
+                anterior.saltos[nivel] -= 1
+        while self._nivel > 1 and self._cabeca.proximos[self._nivel - 1] is None:
+            self._nivel -= 1
+        self._tamanho -= 1
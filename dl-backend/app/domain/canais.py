@@ -0,0 +1,300 @@
+"""
+Propagação de preço, estoque e título dos produtos para os canais de venda.
+
+Cada canal (Mercado Livre, Shopify) guarda em snapshotcanal o hash do último
+estado enviado por SKU, calculado só sobre os campos que o canal recebe (o ML
+não recebe o título, então renomear um produto não gera envio para ele). Depois de uma escrita local o SKU é
+marcado; mudanças seguidas no mesmo SKU são coalescidas por uma janela de
+debounce, e só então o estado atual é comparado com o snapshot de cada canal.
+Apenas os SKUs cujo hash mudou viram alterações, agrupadas em lotes por canal
+e entregues ao publicador do canal, que devolve os SKUs aceitos. O snapshot é
+gravado só para esses; os demais voltam para a fila e são reenviados no
+próximo ciclo.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import anyio.to_thread
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.domain.models import Produto, SnapshotCanal
+
+logger = logging.getLogger(__name__)
+
+CANAL_MERCADO_LIVRE = "mercado_livre"
+CANAL_SHOPIFY = "shopify"
+
+
+def canais_habilitados() -> list[str]:
+    canais = []
+    if settings.FEATURE_MERCADO_LIVRE:
+        canais.append(CANAL_MERCADO_LIVRE)
+    if settings.FEATURE_SHOPIFY:
+        canais.append(CANAL_SHOPIFY)
+    return canais
+
+
+def hash_estado(preco: Decimal, estoque: int, titulo: str | None = None) -> str:
+    """Hash dos campos enviados ao canal; `titulo=None` para canais que não o recebem."""
+    conteudo = f"{Decimal(preco):.2f}|{estoque}"
+    if titulo is not None:
+        conteudo += f"|{titulo}"
+    return hashlib.blake2b(conteudo.encode(), digest_size=8).hexdigest()
+
+
+@dataclass(frozen=True)
+class Alteracao:
+    sku: str
+    preco: Decimal
+    estoque: int
+    titulo: str
+    hash: str
+
+
+@dataclass
+class LoteAtualizacao:
+    """Job de atualização de um canal: as alterações mínimas de até N SKUs."""
+
+    canal: str
+    alteracoes: list[Alteracao]
+    criado_em: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+# Recebe o lote e devolve os SKUs que o canal aceitou
+Publicador = Callable[[LoteAtualizacao], Awaitable[set[str]]]
+
+
+class MotorDiffCanais:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # sku -> (primeira marcação, última marcação), em time.monotonic()
+        self._pendentes: dict[str, tuple[float, float]] = {}
+        self._publicadores: dict[str, Publicador] = {}
+        self._envia_titulo: dict[str, bool] = {}
+        self._tarefa: asyncio.Task[None] | None = None
+        self.lotes_enviados = 0
+        self.alteracoes_enviadas = 0
+        self.descartados_sem_mudanca = 0
+        self.recusadas = 0
+
+    def registrar_publicador(
+        self, canal: str, publicador: Publicador, envia_titulo: bool = True
+    ) -> None:
+        self._publicadores[canal] = publicador
+        self._envia_titulo[canal] = envia_titulo
+
+    def marcar(self, skus: str | Iterable[str]) -> None:
+        """Marca SKUs alterados localmente. Barato: chamado após cada escrita."""
+        if not canais_habilitados():
+            return
+        agora = time.monotonic()
+        with self._lock:
+            for sku in [skus] if isinstance(skus, str) else skus:
+                primeira = self._pendentes.get(sku, (agora, agora))[0]
+                self._pendentes[sku] = (primeira, agora)
+
+    def _prontos(self, agora: float) -> list[str]:
+        """Retira os SKUs quietos há `debounce` (ou esperando há `atraso máximo`)."""
+        debounce = settings.CHANNEL_SYNC_DEBOUNCE_SECONDS
+        maximo = settings.CHANNEL_SYNC_MAX_DELAY_SECONDS
+        with self._lock:
+            prontos = [
+                sku
+                for sku, (primeira, ultima) in self._pendentes.items()
+                if agora - ultima >= debounce or agora - primeira >= maximo
+            ]
+            for sku in prontos:
+                del self._pendentes[sku]
+        return prontos
+
+    def _devolver(self, skus: Iterable[str]) -> None:
+        agora = time.monotonic()
+        with self._lock:
+            for sku in skus:
+                self._pendentes.setdefault(sku, (agora, agora))
+
+    def calcular(
+        self, session: Session, canais: list[str], skus: list[str]
+    ) -> dict[str, list[Alteracao]]:
+        """Diferenças por canal entre o estado atual dos SKUs e os snapshots."""
+        produtos = session.exec(select(Produto).where(col(Produto.sku).in_(skus))).all()
+        snapshots = {
+            (s.canal, s.sku): s.hash
+            for s in session.exec(
+                select(SnapshotCanal)
+                .where(col(SnapshotCanal.canal).in_(canais))
+                .where(col(SnapshotCanal.sku).in_([p.sku for p in produtos]))
+            ).all()
+        }
+        diferencas: dict[str, list[Alteracao]] = {}
+        for canal in canais:
+            envia_titulo = self._envia_titulo.get(canal, True)
+            mudou = []
+            for p in produtos:
+                hash_ = hash_estado(
+                    p.preco, p.estoque, p.nome if envia_titulo else None
+                )
+                if snapshots.get((canal, p.sku)) != hash_:
+                    mudou.append(Alteracao(p.sku, p.preco, p.estoque, p.nome, hash_))
+            self.descartados_sem_mudanca += len(produtos) - len(mudou)
+            if mudou:
+                diferencas[canal] = mudou
+        return diferencas
+
+    def confirmar(
+        self, session: Session, canal: str, alteracoes: list[Alteracao]
+    ) -> None:
+        """Grava o snapshot dos SKUs que o canal aceitou."""
+        agora = datetime.now(timezone.utc)
+        for alteracao in alteracoes:
+            session.merge(
+                SnapshotCanal(
+                    canal=canal,
+                    sku=alteracao.sku,
+                    hash=alteracao.hash,
+                    preco=alteracao.preco,
+                    estoque=alteracao.estoque,
+                    enviado_em=agora,
+                )
+            )
+        session.commit()
+
+    async def processar(self, abrir_sessao: Callable[[], Session | None]) -> int:
+        """Um ciclo: diff dos SKUs prontos e envio dos lotes. Retorna os lotes enviados."""
+        canais = [c for c in canais_habilitados() if c in self._publicadores]
+        skus = self._prontos(time.monotonic())
+        if not canais or not skus:
+            return 0
+        session = abrir_sessao()
+        if session is None:
+            self._devolver(skus)
+            return 0
+
+        enviados = 0
+        with session:
+            diferencas = await anyio.to_thread.run_sync(
+                self.calcular, session, canais, skus
+            )
+            tamanho = settings.CHANNEL_SYNC_BATCH_SIZE
+            for canal, alteracoes in diferencas.items():
+                for inicio in range(0, len(alteracoes), tamanho):
+                    lote = LoteAtualizacao(canal, alteracoes[inicio : inicio + tamanho])
+                    try:
+                        aceitos = await self._publicadores[canal](lote)
+                    except Exception:
+                        logger.exception(
+                            "Falha ao publicar %s SKUs em %s",
+                            len(lote.alteracoes),
+                            canal,
+                        )
+                        self._devolver(a.sku for a in lote.alteracoes)
+                        continue
+                    confirmadas = [a for a in lote.alteracoes if a.sku in aceitos]
+                    recusadas = [a.sku for a in lote.alteracoes if a.sku not in aceitos]
+                    if recusadas:
+                        self.recusadas += len(recusadas)
+                        self._devolver(recusadas)
+                    if confirmadas:
+                        await anyio.to_thread.run_sync(
+                            self.confirmar, session, canal, confirmadas
+                        )
+                    enviados += 1
+                    self.lotes_enviados += 1
+                    self.alteracoes_enviadas += len(confirmadas)
+        return enviados
+
+    async def _executar(self, abrir_sessao: Callable[[], Session | None]) -> None:
+        intervalo = max(0.1, settings.CHANNEL_SYNC_DEBOUNCE_SECONDS / 2)
+        while True:
+            await asyncio.sleep(intervalo)
+            try:
+                await self.processar(abrir_sessao)
+            except Exception:
+                logger.exception("Falha no ciclo de propagação para os canais")
+
+    def iniciar(self) -> None:
+        """Inicia o laço em segundo plano (no lifespan), se algum canal estiver ativo."""
+        if self._tarefa is not None or not canais_habilitados():
+            return
+        from app.infra.db.session import get_session
+
+        self._tarefa = asyncio.create_task(self._executar(get_session))
+
+    async def parar(self) -> None:
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+
+motor_canais = MotorDiffCanais()
+
+
+async def publicar_mercado_livre(lote: LoteAtualizacao) -> set[str]:
+    """
+    Atualiza preço e estoque dos anúncios do ML ligados aos SKUs do lote.
+    Devolve os SKUs cujos anúncios foram todos atualizados (ou que não têm anúncio).
+    """
+    from app.domain.models import AnuncioML
+    from app.infra.db.session import get_session
+    from app.infra.mercado_livre import ClienteMercadoLivre
+
+    def anuncios_por_sku() -> list[tuple[str, str]]:
+        with get_session() as session:
+            return list(
+                session.exec(
+                    select(AnuncioML.id, AnuncioML.sku).where(
+                        col(AnuncioML.sku).in_([a.sku for a in lote.alteracoes])
+                    )
+                ).all()
+            )
+
+    por_sku = {a.sku: a for a in lote.alteracoes}
+    anuncios = await anyio.to_thread.run_sync(anuncios_por_sku)
+    # O título não é enviado: o ML não permite alterá-lo em anúncios com vendas
+    async with ClienteMercadoLivre() as cliente:
+        resultados = await asyncio.gather(
+            *(
+                cliente.put(
+                    f"/items/{anuncio_id}",
+                    {
+                        "price": float(por_sku[sku].preco),
+                        "available_quantity": por_sku[sku].estoque,
+                    },
+                )
+                for anuncio_id, sku in anuncios
+            ),
+            return_exceptions=True,
+        )
+    falhas: set[str] = set()
+    for (anuncio_id, sku), resultado in zip(anuncios, resultados, strict=True):
+        if isinstance(resultado, Exception):
+            logger.warning(
+                "Falha ao atualizar o anúncio %s (%s) no ML: %s",
+                anuncio_id,
+                sku,
+                resultado,
+            )
+            falhas.add(sku)
+        elif isinstance(resultado, BaseException):
+            raise resultado
+    return set(por_sku) - falhas
+
+
+motor_canais.registrar_publicador(
+    CANAL_MERCADO_LIVRE, publicar_mercado_livre, envia_titulo=False
+)
+# Shopify: ainda não há cliente da Admin API no projeto. Canais sem publicador
+# registrado são ignorados; registre aqui o do Shopify quando ele existir.
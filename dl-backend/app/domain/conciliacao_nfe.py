@@ -0,0 +1,62 @@
+"""
+Conciliação dos itens de NF-e de fornecedor com o catálogo (tabela produto).
+
+Recebe o fluxo do `LeitorNFe` e devolve o mesmo fluxo, na mesma ordem, com
+cada item marcado: `conciliado` (produto achado pelo código do fornecedor ou
+pelo EAN, ambos comparados com o SKU), `sem_cadastro` ou, sem banco,
+`nao_verificado`. Os itens são consultados em lotes de NFE_MATCH_BATCH_SIZE
+(um SELECT ... WHERE sku IN (...) por lote): a memória fica no tamanho do
+lote e o número de consultas não depende de quantos itens cada nota tem.
+"""
+
+from collections.abc import Iterable, Iterator
+
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.domain.models import Produto
+from app.infra.nfe import ItemNFe, NotaFiscal
+
+
+class ConciliacaoProdutosNFe:
+    """Marca os itens de NF-e com o produto do catálogo correspondente"""
+
+    def __init__(self, session: Session | None):
+        self.session = session
+
+    def _marcar(self, itens: list[ItemNFe]) -> None:
+        if self.session is None or not itens:
+            return
+        codigos = {item.codigo for item in itens if item.codigo} | {
+            item.ean for item in itens if item.ean
+        }
+        produtos = dict(
+            self.session.exec(
+                select(Produto.sku, Produto.id).where(col(Produto.sku).in_(codigos))
+            ).all()
+        )
+        for item in itens:
+            if item.codigo in produtos:
+                item.produto_id, item.conciliado_por = produtos[item.codigo], "sku"
+            elif item.ean and item.ean in produtos:
+                item.produto_id, item.conciliado_por = produtos[item.ean], "ean"
+            item.situacao = (
+                "conciliado" if item.produto_id is not None else "sem_cadastro"
+            )
+
+    def conciliar(
+        self, registros: Iterable[ItemNFe | NotaFiscal]
+    ) -> Iterator[ItemNFe | NotaFiscal]:
+        tamanho = settings.NFE_MATCH_BATCH_SIZE
+        pendentes: list[ItemNFe | NotaFiscal] = []
+        itens: list[ItemNFe] = []
+        for registro in registros:
+            pendentes.append(registro)
+            if isinstance(registro, ItemNFe):
+                itens.append(registro)
+                if len(itens) >= tamanho:
+                    self._marcar(itens)
+                    yield from pendentes
+                    pendentes, itens = [], []
+        self._marcar(itens)
+        yield from pendentes
@@ -0,0 +1,97 @@
+"""
+Contadores diários por vendedor (tabela vendedordia).
+
+Vendas, orçamentos e novos clientes incrementam a linha (vendedor, dia) com um
+upsert, na transação de quem registra o evento. O dia é o do fuso da loja:
+à meia-noite o primeiro evento cria a linha do novo dia e o painel passa a ler
+zeros até lá, sem job de virada. O resumo do vendedor é a leitura de uma linha.
+"""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.domain.models import VendedorDia
+from app.domain.rollups import dia_da_loja, hoje_na_loja, upsert_somando
+
+CONTADORES = (
+    "num_vendas",
+    "vendas_valor",
+    "orcamentos_enviados",
+    "orcamentos_fechados",
+    "orcamentos_perdidos",
+    "novos_clientes",
+)
+
+
+class ContadoresVendedorService:
+    """Incremento e leitura dos contadores do dia de cada vendedor"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def incrementar(
+        self, vendedor_id: int, quando: datetime | None = None, **deltas: int | Decimal
+    ) -> None:
+        """Soma `deltas` aos contadores do dia de `quando`. Não faz commit."""
+        invalidos = set(deltas) - set(CONTADORES)
+        if invalidos:
+            raise ValueError(f"Contadores inválidos: {', '.join(sorted(invalidos))}")
+        dia = dia_da_loja(quando or datetime.now(timezone.utc))
+        valores = {contador: deltas.get(contador, 0) for contador in CONTADORES}
+        upsert_somando(
+            self.session,
+            VendedorDia,
+            CONTADORES,
+            [{"vendedor_id": vendedor_id, "dia": dia, **valores}],
+        )
+
+    def registrar_venda(
+        self, vendedor_id: int, valor: Decimal, quando: datetime | None = None
+    ) -> None:
+        self.incrementar(vendedor_id, quando, num_vendas=1, vendas_valor=valor)
+
+    def registrar_orcamento_enviado(
+        self, vendedor_id: int, quando: datetime | None = None
+    ) -> None:
+        self.incrementar(vendedor_id, quando, orcamentos_enviados=1)
+
+    def registrar_orcamento_fechado(
+        self, vendedor_id: int, quando: datetime | None = None
+    ) -> None:
+        self.incrementar(vendedor_id, quando, orcamentos_fechados=1)
+
+    def registrar_orcamento_perdido(
+        self, vendedor_id: int, quando: datetime | None = None
+    ) -> None:
+        self.incrementar(vendedor_id, quando, orcamentos_perdidos=1)
+
+    def registrar_novo_cliente(
+        self, vendedor_id: int, quando: datetime | None = None
+    ) -> None:
+        self.incrementar(vendedor_id, quando, novos_clientes=1)
+
+    def do_dia(self, vendedor_id: int, dia: date | None = None) -> VendedorDia:
+        """Linha do dia (ou uma zerada, se o vendedor ainda não teve eventos)."""
+        dia = dia or hoje_na_loja()
+        linha = self.session.get(VendedorDia, (vendedor_id, dia))
+        return linha or VendedorDia(vendedor_id=vendedor_id, dia=dia)
+
+    def resumo_dia(self, vendedor_id: int, dia: date | None = None) -> dict[str, Any]:
+        """Resumo do painel do vendedor, no formato de /vendedor/{id}/resumo-dia."""
+        linha = self.do_dia(vendedor_id, dia)
+        meta = settings.SELLER_DAILY_GOAL
+        vendas = float(linha.vendas_valor)
+        return {
+            "meta_diaria": meta,
+            "vendas_realizadas": vendas,
+            "progresso_meta": round(vendas / meta * 100, 1) if meta else 0.0,
+            "num_vendas": linha.num_vendas,
+            "orcamentos_enviados": linha.orcamentos_enviados,
+            "orcamentos_fechados": linha.orcamentos_fechados,
+            "orcamentos_perdidos": linha.orcamentos_perdidos,
+            "novos_clientes": linha.novos_clientes,
+        }
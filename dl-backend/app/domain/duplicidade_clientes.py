@@ -0,0 +1,432 @@
+"""
+Detecção de clientes cadastrados mais de uma vez.
+
+Comparar todos os pares é O(n²): 1 milhão de cadastros dá 5 × 10¹¹ pares. Em
+vez disso, só se comparam cadastros que já compartilham uma chave de bloco:
+
+- documento: mesmos dígitos de CPF/CNPJ;
+- telefone: mesmos 8 últimos dígitos (cobre DDI, DDD ausente e o 9 extra);
+- nome: vizinhos na ordem de `nome_normalizado` (janela deslizante de
+  CUSTOMER_DEDUP_NAME_WINDOW cadastros), que pega grafias parecidas.
+
+Cada passada lê a tabela ordenada pela chave, em fluxo (servidor → cursor,
+CUSTOMER_DEDUP_FETCH_SIZE linhas por vez), e só guarda o bloco corrente: a
+memória não cresce com o tamanho da tabela. Blocos grandes demais (telefone
+da loja usado como padrão, CPF genérico) são pulados e contados nas métricas.
+
+Os pares de um bloco recebem uma pontuação pelas evidências em comum (ver
+`pontuar`); acima de CUSTOMER_DEDUP_MIN_SCORE viram sugestões de mesclagem,
+gravadas em lotes na tabela sugestaomesclagemcliente. Pendentes que não
+aparecerem de novo numa execução são apagadas; descartadas são mantidas para
+o par não voltar à lista.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from typing import Any, NamedTuple
+
+import anyio.to_thread
+from sqlalchemy import Connection
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, col, delete, func, select
+
+from app.core.config import settings
+from app.domain.models import Cliente, SugestaoMesclagemCliente
+from app.domain.normalizacao import so_digitos
+
+logger = logging.getLogger(__name__)
+
+# Quanto cada evidência em comum soma na pontuação de um par
+PESOS = {"documento": 0.6, "telefone": 0.3, "email": 0.25, "placa": 0.25, "cep": 0.1}
+# Peso da semelhança dos nomes (0 a 1, difflib)
+PESO_NOME = 0.5
+# Partículas ignoradas na comparação dos nomes ("jose da silva" ~ "jose silva")
+PARTICULAS = frozenset({"da", "de", "do", "das", "dos", "e"})
+# Sugestões gravadas por transação
+LOTE_GRAVACAO = 1000
+
+
+class RegistroCliente(NamedTuple):
+    """O que a comparação usa de um cadastro, já normalizado."""
+
+    id: int
+    nome: str
+    documento: str
+    telefone: str
+    email: str
+    placa: str
+    cep: str
+
+
+@dataclass
+class ResultadoDuplicidade:
+    lidos: int = 0
+    comparacoes: int = 0
+    sugestoes: int = 0
+    removidas: int = 0
+    blocos_ignorados: int = 0
+    maior_bloco: int = 0
+    duracao_s: float = 0.0
+
+
+def _registro(linha: Any) -> RegistroCliente:
+    nome = " ".join(
+        p for p in (linha.nome_normalizado or "").split() if p not in PARTICULAS
+    )
+    telefone = linha.telefone_digitos or ""
+    return RegistroCliente(
+        id=linha.id,
+        nome=nome,
+        documento=linha.documento or "",
+        telefone=telefone[-8:] if len(telefone) >= 8 else "",
+        email=(linha.email or "").strip().lower(),
+        placa="".join(c for c in (linha.placa_veiculo or "").upper() if c.isalnum()),
+        cep=so_digitos(linha.cep),
+    )
+
+
+def pontuar(
+    a: RegistroCliente, b: RegistroCliente, minimo: float = 0.0
+) -> tuple[float, list[str]] | None:
+    """
+    Pontuação (0 a 1) de `a` e `b` serem o mesmo cliente e as evidências.
+
+    Documentos diferentes (ambos preenchidos) descartam o par. Sem evidência
+    suficiente para chegar a `minimo` mesmo com nomes iguais, a comparação
+    dos nomes (a parte cara) nem é feita.
+    """
+    if a.documento and b.documento and a.documento != b.documento:
+        return None
+    motivos = [
+        campo
+        for campo in PESOS
+        if getattr(a, campo) and getattr(a, campo) == getattr(b, campo)
+    ]
+    pontuacao = sum(PESOS[campo] for campo in motivos)
+    if pontuacao + PESO_NOME < minimo:
+        return None
+    comparador = SequenceMatcher(None, a.nome, b.nome, autojunk=False)
+    falta = (minimo - pontuacao) / PESO_NOME
+    # quick_ratio é um limite superior barato de ratio
+    if comparador.quick_ratio() < falta:
+        return None
+    semelhanca = comparador.ratio()
+    if semelhanca < falta:
+        return None
+    motivos.append(f"nome:{semelhanca:.2f}")
+    return min(1.0, round(pontuacao + PESO_NOME * semelhanca, 3)), motivos
+
+
+def _linhas(
+    conexao: Connection, chave: Any, *filtros: Any
+) -> Iterator[tuple[Any, RegistroCliente]]:
+    """Cadastros em ordem de (chave, id), lidos em fluxo."""
+    stmt = (
+        select(
+            chave.label("chave"),
+            Cliente.id,
+            Cliente.nome_normalizado,
+            Cliente.documento,
+            Cliente.telefone_digitos,
+            Cliente.email,
+            Cliente.placa_veiculo,
+            Cliente.cep,
+        )
+        .where(*filtros)
+        .order_by(chave, Cliente.id)
+    )
+    resultado = conexao.execution_options(
+        stream_results=True, yield_per=settings.CUSTOMER_DEDUP_FETCH_SIZE
+    ).execute(stmt)
+    for linha in resultado:
+        yield linha.chave, _registro(linha)
+
+
+class DuplicidadeClientes:
+    """Executa a detecção e guarda as métricas das execuções neste worker."""
+
+    def __init__(self) -> None:
+        self._tarefa: asyncio.Task[None] | None = None
+        self._avulsa: asyncio.Task[Any] | None = None
+        self._lock = asyncio.Lock()
+        self.execucoes = 0
+        self.erros = 0
+        self.ultima_execucao: datetime | None = None
+        self.ultimo_resultado: ResultadoDuplicidade | None = None
+
+    # --- Pares candidatos ---
+
+    def _blocos(
+        self,
+        linhas: Iterable[tuple[Any, RegistroCliente]],
+        resultado: ResultadoDuplicidade,
+    ) -> Iterator[tuple[RegistroCliente, RegistroCliente]]:
+        """Todos os pares de cada grupo de chave igual (linhas já ordenadas pela chave)."""
+        limite = settings.CUSTOMER_DEDUP_MAX_BLOCK_SIZE
+        chave_atual: Any = None
+        bloco: list[RegistroCliente] = []
+        ignorando = False
+
+        def pares() -> Iterator[tuple[RegistroCliente, RegistroCliente]]:
+            if ignorando:
+                resultado.blocos_ignorados += 1
+                return
+            resultado.maior_bloco = max(resultado.maior_bloco, len(bloco))
+            for i, a in enumerate(bloco):
+                for b in bloco[i + 1 :]:
+                    yield a, b
+
+        for chave, registro in linhas:
+            resultado.lidos += 1
+            if chave != chave_atual:
+                yield from pares()
+                chave_atual, bloco, ignorando = chave, [], False
+            if ignorando:
+                continue
+            bloco.append(registro)
+            if len(bloco) > limite:
+                # Bloco grande demais: descarta o que já leu e pula o resto
+                bloco, ignorando = [], True
+        yield from pares()
+
+    def _janela(
+        self,
+        linhas: Iterable[tuple[Any, RegistroCliente]],
+        resultado: ResultadoDuplicidade,
+    ) -> Iterator[tuple[RegistroCliente, RegistroCliente]]:
+        """Cada cadastro com os CUSTOMER_DEDUP_NAME_WINDOW anteriores na ordem do nome."""
+        janela: deque[RegistroCliente] = deque(
+            maxlen=settings.CUSTOMER_DEDUP_NAME_WINDOW
+        )
+        for _, registro in linhas:
+            resultado.lidos += 1
+            for anterior in janela:
+                yield anterior, registro
+            janela.append(registro)
+
+    def _candidatos(
+        self, conexao: Connection, resultado: ResultadoDuplicidade
+    ) -> Iterator[tuple[RegistroCliente, RegistroCliente]]:
+        documento = col(Cliente.documento)
+        yield from self._blocos(
+            _linhas(conexao, documento, func.length(documento).in_((11, 14))), resultado
+        )
+        telefone = col(Cliente.telefone_digitos)
+        final_telefone = func.substr(telefone, func.length(telefone) - 7)
+        yield from self._blocos(
+            _linhas(conexao, final_telefone, func.length(telefone) >= 8), resultado
+        )
+        yield from self._janela(
+            _linhas(conexao, col(Cliente.nome_normalizado)), resultado
+        )
+
+    # --- Gravação ---
+
+    def _gravar(self, session: Session, sugestoes: list[dict[str, Any]]) -> None:
+        """Upsert das sugestões; pares já descartados não mudam."""
+        if not sugestoes:
+            return
+        tabela = SugestaoMesclagemCliente.__table__  # type: ignore[attr-defined]
+        dialeto = session.get_bind().dialect.name
+        if dialeto == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialeto == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            for valor in sugestoes:
+                linha = session.get(
+                    SugestaoMesclagemCliente,
+                    (valor["cliente_id"], valor["duplicado_id"]),
+                )
+                if linha is None:
+                    session.add(SugestaoMesclagemCliente(**valor))
+                elif linha.status == "pendente":
+                    linha.sqlmodel_update(valor)
+            session.commit()
+            return
+        stmt = insert(tabela).values(sugestoes)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[tabela.c.cliente_id, tabela.c.duplicado_id],
+            set_={
+                c: stmt.excluded[c] for c in ("pontuacao", "motivos", "atualizada_em")
+            },
+            where=tabela.c.status == "pendente",
+        )
+        session.exec(stmt)  # type: ignore[call-overload]
+        session.commit()
+
+    def executar_sync(self, session: Session) -> ResultadoDuplicidade:
+        minimo = settings.CUSTOMER_DEDUP_MIN_SCORE
+        resultado = ResultadoDuplicidade()
+        inicio = time.perf_counter()
+        agora = datetime.now(timezone.utc)
+        # Leitura numa conexão própria: os commits dos lotes de sugestões não
+        # fecham o cursor em fluxo
+        with session.get_bind().connect() as conexao:
+            lote: dict[tuple[int, int], dict[str, Any]] = {}
+            for a, b in self._candidatos(conexao, resultado):
+                resultado.comparacoes += 1
+                pontos = pontuar(a, b, minimo)
+                if pontos is None or pontos[0] < minimo:
+                    continue
+                cliente_id, duplicado_id = min(a.id, b.id), max(a.id, b.id)
+                lote[(cliente_id, duplicado_id)] = {
+                    "cliente_id": cliente_id,
+                    "duplicado_id": duplicado_id,
+                    "pontuacao": pontos[0],
+                    "motivos": ",".join(pontos[1])[:200],
+                    "atualizada_em": agora,
+                }
+                if len(lote) >= LOTE_GRAVACAO:
+                    self._gravar(session, list(lote.values()))
+                    lote.clear()
+            self._gravar(session, list(lote.values()))
+        # Pendentes que esta execução não confirmou (cadastro corrigido ou removido)
+        removidas = session.exec(  # type: ignore[call-overload]
+            delete(SugestaoMesclagemCliente)
+            .where(col(SugestaoMesclagemCliente.status) == "pendente")
+            .where(col(SugestaoMesclagemCliente.atualizada_em) < agora)
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        resultado.removidas = removidas.rowcount
+        resultado.sugestoes = session.exec(
+            select(func.count())
+            .select_from(SugestaoMesclagemCliente)
+            .where(col(SugestaoMesclagemCliente.status) == "pendente")
+        ).one()
+        resultado.duracao_s = round(time.perf_counter() - inicio, 3)
+        return resultado
+
+    async def executar(self) -> ResultadoDuplicidade | None:
+        """Uma execução (no threadpool); None se o banco não estiver disponível."""
+        from app.infra.db.session import get_session
+
+        async with self._lock:  # uma execução por vez neste worker
+            session = get_session()
+            if session is None:
+                return None
+            try:
+                with session:
+                    resultado = await anyio.to_thread.run_sync(
+                        self.executar_sync, session
+                    )
+            except Exception:
+                self.erros += 1
+                raise
+            self.execucoes += 1
+            self.ultima_execucao = datetime.now(timezone.utc)
+            self.ultimo_resultado = resultado
+            logger.info(
+                "Duplicidade de clientes: %s leituras, %s comparações, %s sugestões pendentes, %.3fs",
+                resultado.lidos,
+                resultado.comparacoes,
+                resultado.sugestoes,
+                resultado.duracao_s,
+            )
+            return resultado
+
+    def agendar(self) -> bool:
+        """Dispara uma execução em segundo plano; False se já houver uma rodando."""
+        if self._lock.locked() or (
+            self._avulsa is not None and not self._avulsa.done()
+        ):
+            return False
+        self._avulsa = asyncio.create_task(self._executar_registrando())
+        return True
+
+    async def _executar_registrando(self) -> None:
+        try:
+            await self.executar()
+        except Exception:
+            logger.exception("Falha na detecção de clientes duplicados")
+
+    async def _executar_periodicamente(self) -> None:
+        while True:
+            await asyncio.sleep(settings.CUSTOMER_DEDUP_INTERVAL_HOURS * 3600)
+            await self._executar_registrando()
+
+    def iniciar(self) -> None:
+        """Agenda a detecção periódica (no lifespan); 0 horas desliga."""
+        if self._tarefa is None and settings.CUSTOMER_DEDUP_INTERVAL_HOURS > 0:
+            self._tarefa = asyncio.create_task(self._executar_periodicamente())
+
+    async def parar(self) -> None:
+        for tarefa in (self._tarefa, self._avulsa):
+            if tarefa is not None and not tarefa.done():
+                tarefa.cancel()
+                try:
+                    await tarefa
+                except asyncio.CancelledError:
+                    pass
+        self._tarefa = self._avulsa = None
+
+    def metricas(self) -> dict[str, Any]:
+        return {
+            "em_execucao": self._lock.locked(),
+            "execucoes": self.execucoes,
+            "erros": self.erros,
+            "ultima_execucao": self.ultima_execucao,
+            "ultimo_resultado": asdict(self.ultimo_resultado)
+            if self.ultimo_resultado
+            else None,
+        }
+
+
+duplicidade_clientes = DuplicidadeClientes()
+
+
+class SugestoesMesclagemService:
+    """Leitura e revisão das sugestões de mesclagem"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def listar(
+        self, status: str = "pendente", skip: int = 0, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """Sugestões com o nome dos dois cadastros, das mais prováveis para as menos."""
+        cliente, duplicado = aliased(Cliente), aliased(Cliente)
+        stmt = (
+            select(SugestaoMesclagemCliente, cliente.nome, duplicado.nome)
+            .join(cliente, cliente.id == SugestaoMesclagemCliente.cliente_id)
+            .join(duplicado, duplicado.id == SugestaoMesclagemCliente.duplicado_id)
+            .where(col(SugestaoMesclagemCliente.status) == status)
+            .order_by(
+                col(SugestaoMesclagemCliente.pontuacao).desc(),
+                col(SugestaoMesclagemCliente.cliente_id),
+            )
+            .offset(skip)
+            .limit(limit)
+        )
+        return [
+            {
+                "cliente_id": sugestao.cliente_id,
+                "cliente_nome": cliente_nome,
+                "duplicado_id": sugestao.duplicado_id,
+                "duplicado_nome": duplicado_nome,
+                "pontuacao": sugestao.pontuacao,
+                "motivos": sugestao.motivos.split(",") if sugestao.motivos else [],
+                "status": sugestao.status,
+            }
+            for sugestao, cliente_nome, duplicado_nome in self.session.exec(stmt).all()
+        ]
+
+    def descartar(self, cliente_id: int, duplicado_id: int) -> bool:
+        """Marca o par como não duplicado; as próximas execuções não o sugerem de novo."""
+        sugestao = self.session.get(
+            SugestaoMesclagemCliente,
+            (min(cliente_id, duplicado_id), max(cliente_id, duplicado_id)),
+        )
+        if sugestao is None:
+            return False
+        sugestao.status = "descartada"
+        self.session.add(sugestao)
+        self.session.commit()
+        return True
@@ -0,0 +1,176 @@
+"""
+Expiração dos orçamentos enviados cuja validade passou.
+
+Em vez de carregar e salvar orçamento por orçamento, cada lote é um único
+UPDATE sobre um subselect limitado:
+
+    UPDATE orcamento SET status = 'expirado', versao = versao + 1, ...
+     WHERE id IN (SELECT id FROM orcamento
+                   WHERE status IN ('pendente', 'enviado') AND validade < :hoje
+                   ORDER BY validade, id LIMIT :lote FOR UPDATE SKIP LOCKED)
+    RETURNING vendedor_id
+
+O subselect usa o índice parcial dos orçamentos em aberto (só eles entram no
+índice, que continua pequeno numa tabela grande). Cada lote é uma transação
+curta, e SKIP LOCKED pula orçamentos que alguém está editando naquele
+instante: o job nunca espera pelo tráfego interativo, e o que foi pulado
+expira na próxima execução. Os vendedor_id devolvidos alimentam os contadores
+de orçamentos perdidos do dia.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timezone
+from typing import Any
+
+import anyio.to_thread
+from sqlalchemy import text
+from sqlmodel import Session, col, select, update
+
+from app.core.config import settings
+from app.domain.contadores_vendedor import ContadoresVendedorService
+from app.domain.models import ORCAMENTO_EM_ABERTO, Orcamento
+from app.domain.rollups import hoje_na_loja
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ResultadoExpiracao:
+    expirados: int = 0
+    lotes: int = 0
+    duracao_s: float = 0.0
+    maior_lote_s: float = 0.0
+
+
+def expirar_lote(session: Session, hoje: date, tamanho: int) -> list[int]:
+    """Expira até `tamanho` orçamentos vencidos; devolve o vendedor de cada um. Não faz commit."""
+    vencidos = (
+        select(Orcamento.id)
+        .where(text(ORCAMENTO_EM_ABERTO))
+        .where(Orcamento.validade < hoje)
+        .order_by(col(Orcamento.validade), col(Orcamento.id))
+        .limit(tamanho)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(Orcamento)
+        .where(col(Orcamento.id).in_(vencidos.scalar_subquery()))
+        .values(
+            status="expirado",
+            versao=Orcamento.versao + 1,
+            atualizado_em=datetime.now(timezone.utc),
+        )
+        .returning(col(Orcamento.vendedor_id))
+        # Atualização em massa: nada a sincronizar com objetos da sessão
+        .execution_options(synchronize_session=False)
+    )
+    return [linha.vendedor_id for linha in session.exec(stmt)]  # type: ignore[call-overload]
+
+
+class ExpiracaoOrcamentos:
+    """Executa a expiração em lotes e guarda as métricas das execuções neste worker."""
+
+    def __init__(self) -> None:
+        self._tarefa: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+        self.execucoes = 0
+        self.expirados_total = 0
+        self.ultima_execucao: datetime | None = None
+        self.ultimo_resultado: ResultadoExpiracao | None = None
+        self.erros = 0
+
+    def executar_sync(
+        self, session: Session, hoje: date | None = None
+    ) -> ResultadoExpiracao:
+        hoje = hoje or hoje_na_loja()
+        tamanho = settings.QUOTE_EXPIRY_BATCH_SIZE
+        resultado = ResultadoExpiracao()
+        inicio = time.perf_counter()
+        while True:
+            inicio_lote = time.perf_counter()
+            vendedores = expirar_lote(session, hoje, tamanho)
+            contadores = ContadoresVendedorService(session)
+            for vendedor_id, quantidade in Counter(vendedores).items():
+                contadores.incrementar(vendedor_id, orcamentos_perdidos=quantidade)
+            session.commit()
+            resultado.maior_lote_s = max(
+                resultado.maior_lote_s, time.perf_counter() - inicio_lote
+            )
+            resultado.expirados += len(vendedores)
+            resultado.lotes += 1
+            if len(vendedores) < tamanho:
+                break
+            # Folga entre lotes para o tráfego interativo
+            time.sleep(settings.QUOTE_EXPIRY_PAUSE_SECONDS)
+        resultado.duracao_s = round(time.perf_counter() - inicio, 3)
+        resultado.maior_lote_s = round(resultado.maior_lote_s, 3)
+        return resultado
+
+    async def executar(self) -> ResultadoExpiracao | None:
+        """Uma execução (no threadpool); None se o banco não estiver disponível."""
+        from app.infra.db.session import get_session
+
+        async with self._lock:  # uma execução por vez neste worker
+            session = get_session()
+            if session is None:
+                return None
+            try:
+                with session:
+                    resultado = await anyio.to_thread.run_sync(
+                        self.executar_sync, session
+                    )
+            except Exception:
+                self.erros += 1
+                raise
+            self.execucoes += 1
+            self.expirados_total += resultado.expirados
+            self.ultima_execucao = datetime.now(timezone.utc)
+            self.ultimo_resultado = resultado
+            logger.info(
+                "Expiração de orçamentos: %s expirados em %s lotes, %.3fs (maior lote %.3fs)",
+                resultado.expirados,
+                resultado.lotes,
+                resultado.duracao_s,
+                resultado.maior_lote_s,
+            )
+            return resultado
+
+    async def _executar_periodicamente(self) -> None:
+        while True:
+            await asyncio.sleep(settings.QUOTE_EXPIRY_INTERVAL_MINUTES * 60)
+            try:
+                await self.executar()
+            except Exception:
+                logger.exception("Falha na expiração de orçamentos")
+
+    def iniciar(self) -> None:
+        """Agenda a expiração periódica (no lifespan); 0 minutos desliga."""
+        if self._tarefa is None and settings.QUOTE_EXPIRY_INTERVAL_MINUTES > 0:
+            self._tarefa = asyncio.create_task(self._executar_periodicamente())
+
+    async def parar(self) -> None:
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    def metricas(self) -> dict[str, Any]:
+        return {
+            "execucoes": self.execucoes,
+            "expirados_total": self.expirados_total,
+            "erros": self.erros,
+            "ultima_execucao": self.ultima_execucao,
+            "ultimo_resultado": asdict(self.ultimo_resultado)
+            if self.ultimo_resultado
+            else None,
+        }
+
+
+expiracao_orcamentos = ExpiracaoOrcamentos()
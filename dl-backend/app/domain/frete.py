@@ -0,0 +1,273 @@
+"""
+Motor de cotação de frete.
+
+Uma cotação consulta todas as transportadoras configuradas ao mesmo tempo,
+cada uma limitada a FREIGHT_CARRIER_TIMEOUT_SECONDS: a resposta leva o tempo
+da transportadora mais lenta dentro do prazo (não a soma), e uma que não
+responde a tempo só fica de fora (e é pulada por FREIGHT_CARRIER_PAUSE_SECONDS,
+para que as cotações seguintes não esperem por ela). `cotar_em_fluxo` entrega
+as opções de cada transportadora assim que ela responde.
+
+As cotações ficam em cache por transportadora, com TTL, pela chave
+(CEP de origem, prefixo de 5 dígitos do CEP de destino, faixa de peso, faixa
+de volume, faixa de valor declarado). O pacote é arredondado para cima até a
+faixa antes de ir à transportadora, então o valor em cache vale para qualquer
+pacote da faixa.
+Consultas iguais simultâneas viram uma só chamada (singleflight).
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.config import settings
+from app.core.singleflight import singleflight
+from app.infra.ceps import normalizar_cep
+from app.infra.transportadoras import (
+    OpcaoFrete,
+    PacoteFrete,
+    Transportadora,
+    transportadoras_configuradas,
+)
+
+logger = logging.getLogger(__name__)
+
+# Pacote assumido quando a cotação não informa peso/dimensões
+PESO_PADRAO_KG = 1.0
+DIMENSOES_PADRAO_CM = (20, 15, 10)
+# Divisor da cubagem (cm³ por kg) usado pelas transportadoras rodoviárias
+FATOR_CUBAGEM = 6000
+# Dimensões arredondadas para múltiplos deste passo, em cm
+PASSO_DIMENSAO_CM = 5
+
+
+def faixa_peso(peso_kg: float) -> float:
+    """Teto da faixa de peso: 0,5 kg até 5 kg, 1 kg até 30 kg, 5 kg acima."""
+    if peso_kg <= 5:
+        return max(0.5, math.ceil(peso_kg * 2) / 2)
+    if peso_kg <= 30:
+        return float(math.ceil(peso_kg))
+    return float(math.ceil(peso_kg / 5) * 5)
+
+
+def faixa_valor(valor: float) -> float:
+    """
+    Teto da faixa de valor declarado (seguro): dois algarismos significativos,
+    no mínimo R$ 1. Declara no máximo 10% a mais que o valor real.
+    """
+    if valor <= 0:
+        return 0.0
+    passo = max(1.0, 10.0 ** (math.floor(math.log10(valor)) - 1))
+    return float(math.ceil(round(valor / passo, 6)) * passo)
+
+
+def _faixa_dimensao(cm: float) -> int:
+    return max(PASSO_DIMENSAO_CM, math.ceil(cm / PASSO_DIMENSAO_CM) * PASSO_DIMENSAO_CM)
+
+
+def montar_pacote(
+    cep_destino: str,
+    peso_kg: float | None = None,
+    dimensoes_cm: tuple[float, float, float] | None = None,
+    valor_declarado: float = 0.0,
+    cep_origem: str | None = None,
+) -> PacoteFrete:
+    """
+    Pacote normalizado para a cotação: dimensões em múltiplos de 5 cm
+    (maior primeiro), peso taxável, max(peso real, cubagem), e valor
+    declarado no teto das respectivas faixas.
+    Levanta ValueError se algum CEP for inválido.
+    """
+    destino = normalizar_cep(cep_destino)
+    origem = normalizar_cep(cep_origem or settings.FREIGHT_ORIGIN_CEP)
+    if destino is None:
+        raise ValueError("CEP de destino inválido")
+    if origem is None:
+        raise ValueError("CEP de origem inválido")
+    comprimento, largura, altura = sorted(
+        (_faixa_dimensao(d) for d in (dimensoes_cm or DIMENSOES_PADRAO_CM)),
+        reverse=True,
+    )
+    cubagem = comprimento * largura * altura / FATOR_CUBAGEM
+    peso = faixa_peso(max(peso_kg or PESO_PADRAO_KG, cubagem))
+    return PacoteFrete(
+        cep_origem=origem,
+        cep_destino=destino,
+        peso_kg=peso,
+        comprimento_cm=comprimento,
+        largura_cm=largura,
+        altura_cm=altura,
+        valor_declarado=faixa_valor(valor_declarado),
+    )
+
+
+def _chave_cache(transportadora: str, pacote: PacoteFrete) -> Hashable:
+    return (
+        transportadora,
+        pacote.cep_origem,
+        pacote.cep_destino[:5],
+        pacote.peso_kg,
+        (pacote.comprimento_cm, pacote.largura_cm, pacote.altura_cm),
+        # O valor declarado vai como seguro e muda o preço da cotação
+        pacote.valor_declarado,
+    )
+
+
+@dataclass
+class ResultadoTransportadora:
+    transportadora: str
+    opcoes: list[OpcaoFrete] = field(default_factory=list)
+    erro: str | None = None
+    do_cache: bool = False
+    duracao_s: float = 0.0
+
+
+@dataclass
+class _Contadores:
+    consultas: int = 0
+    acertos_cache: int = 0
+    timeouts: int = 0
+    erros: int = 0
+
+
+class MotorFrete:
+    def __init__(self, transportadoras: list[Transportadora] | None = None):
+        self._transportadoras = transportadoras
+        self._cache: OrderedDict[Hashable, tuple[float, list[OpcaoFrete]]] = (
+            OrderedDict()
+        )
+        self._contadores: dict[str, _Contadores] = {}
+        # Transportadora -> instante (monotonic) até o qual não é consultada
+        self._pausadas: dict[str, float] = {}
+
+    @property
+    def transportadoras(self) -> list[Transportadora]:
+        if self._transportadoras is None:
+            self._transportadoras = transportadoras_configuradas()
+        return self._transportadoras
+
+    # --- Cache (LRU com TTL) ---
+
+    def _do_cache(self, chave: Hashable) -> list[OpcaoFrete] | None:
+        entrada = self._cache.get(chave)
+        if entrada is None:
+            return None
+        if entrada[0] <= time.monotonic():
+            del self._cache[chave]
+            return None
+        self._cache.move_to_end(chave)
+        return entrada[1]
+
+    def _guardar(self, chave: Hashable, opcoes: list[OpcaoFrete]) -> None:
+        self._cache[chave] = (
+            time.monotonic() + settings.FREIGHT_CACHE_TTL_SECONDS,
+            opcoes,
+        )
+        self._cache.move_to_end(chave)
+        while len(self._cache) > settings.FREIGHT_CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    def limpar_cache(self) -> None:
+        self._cache.clear()
+        self._pausadas.clear()
+
+    # --- Cotação ---
+
+    async def _consultar(
+        self, transportadora: Transportadora, pacote: PacoteFrete
+    ) -> ResultadoTransportadora:
+        contadores = self._contadores.setdefault(transportadora.nome, _Contadores())
+        contadores.consultas += 1
+        chave = _chave_cache(transportadora.nome, pacote)
+        resultado = ResultadoTransportadora(transportadora.nome)
+        opcoes = self._do_cache(chave)
+        if opcoes is not None:
+            contadores.acertos_cache += 1
+            resultado.opcoes, resultado.do_cache = opcoes, True
+            return resultado
+
+        async def consultar() -> list[OpcaoFrete]:
+            opcoes = await asyncio.wait_for(
+                transportadora.cotar(pacote), settings.FREIGHT_CARRIER_TIMEOUT_SECONDS
+            )
+            self._guardar(chave, opcoes)
+            return opcoes
+
+        if self._pausadas.get(transportadora.nome, 0.0) > time.monotonic():
+            resultado.erro = "indisponível"
+            return resultado
+
+        inicio = time.perf_counter()
+        try:
+            resultado.opcoes = await singleflight.do_async(("frete", chave), consultar)
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                contadores.timeouts += 1
+                resultado.erro = "tempo esgotado"
+            else:
+                contadores.erros += 1
+                resultado.erro = str(e) or type(e).__name__
+            # Transportadora fora do ar: as próximas cotações não esperam por ela
+            if self._pausadas.get(transportadora.nome, 0.0) <= time.monotonic():
+                self._pausadas[transportadora.nome] = (
+                    time.monotonic() + settings.FREIGHT_CARRIER_PAUSE_SECONDS
+                )
+                logger.warning(
+                    "Cotação de frete falhou em %s: %s",
+                    transportadora.nome,
+                    resultado.erro,
+                )
+        resultado.duracao_s = round(time.perf_counter() - inicio, 3)
+        return resultado
+
+    async def cotar_em_fluxo(
+        self, pacote: PacoteFrete
+    ) -> AsyncIterator[ResultadoTransportadora]:
+        """Resultado de cada transportadora, na ordem em que respondem."""
+        tarefas = [
+            asyncio.ensure_future(self._consultar(t, pacote))
+            for t in self.transportadoras
+        ]
+        try:
+            for proxima in asyncio.as_completed(tarefas):
+                yield await proxima
+        finally:
+            # Cliente desistiu no meio do fluxo: não deixa consultas órfãs
+            for tarefa in tarefas:
+                tarefa.cancel()
+
+    async def cotar(
+        self, pacote: PacoteFrete
+    ) -> tuple[list[OpcaoFrete], list[ResultadoTransportadora]]:
+        """Todas as opções (da mais barata à mais cara) e o resultado de cada transportadora."""
+        resultados = [r async for r in self.cotar_em_fluxo(pacote)]
+        opcoes = [o for r in resultados for o in r.opcoes]
+        opcoes.sort(key=lambda o: (o.valor, o.prazo))
+        return opcoes, resultados
+
+    async def fechar(self) -> None:
+        """Fecha as conexões HTTP das transportadoras (no fim do lifespan)."""
+        for transportadora in self._transportadoras or []:
+            fechar = getattr(transportadora, "fechar", None)
+            if fechar is not None:
+                await fechar()
+
+    def metricas(self) -> dict[str, Any]:
+        agora = time.monotonic()
+        return {
+            "transportadoras": [t.nome for t in self.transportadoras],
+            "cache_entradas": sum(
+                1 for validade, _ in self._cache.values() if validade > agora
+            ),
+            "por_transportadora": {
+                nome: vars(c) for nome, c in self._contadores.items()
+            },
+        }
+
+
+motor_frete = MotorFrete()
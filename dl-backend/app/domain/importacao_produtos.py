@@ -0,0 +1,371 @@
+"""
+Importação de listas de preço de fornecedor para o catálogo (tabela produto).
+
+As colunas da planilha são mapeadas para os campos de `ProdutoCreate` pelo
+nome (sinônimos comuns: "Código", "Descrição", "Preço (R$)", "Qtde"...) ou
+por um mapeamento explícito, e cada linha é convertida e validada. A prévia
+valida só a página mostrada; a importação roda em segundo plano, lendo a
+planilha em blocos de SPREADSHEET_CHUNK_ROWS linhas: cada bloco vira um
+único INSERT ... ON CONFLICT (sku) DO UPDATE numa transação curta, e só as
+linhas válidas são gravadas. A memória fica no tamanho do bloco, qualquer
+que seja o tamanho da lista.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any
+
+import anyio.to_thread
+from pydantic import ValidationError
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.domain.canais import motor_canais
+from app.domain.models import Produto
+from app.domain.normalizacao import normalizar_nome
+from app.domain.reservas_estoque import reservas_estoque
+from app.domain.schemas import ProdutoCreate
+from app.infra.planilhas import Linha, abrir_planilha
+
+logger = logging.getLogger(__name__)
+
+# Nomes de coluna reconhecidos para cada campo (já normalizados), em ordem de preferência
+SINONIMOS: dict[str, tuple[str, ...]] = {
+    "sku": (
+        "sku",
+        "codigo",
+        "cod",
+        "codigo produto",
+        "codigo interno",
+        "referencia",
+        "ref",
+        "cprod",
+        "part number",
+    ),
+    "nome": ("nome", "descricao", "produto", "descricao produto", "xprod", "item"),
+    "preco": (
+        "preco",
+        "preco venda",
+        "preco unitario",
+        "valor unitario",
+        "valor",
+        "vlr unit",
+        "vlr",
+        "preco tabela",
+    ),
+    "estoque": ("estoque", "estoque atual", "saldo", "quantidade", "qtde", "qtd"),
+}
+# Limites das colunas da tabela produto (sku 100, nome 255, preco NUMERIC(10, 2))
+MAX_SKU = 100
+MAX_NOME = 255
+MAX_PRECO = Decimal("99999999.99")
+# Erros de validação guardados por importação
+MAX_ERROS = 100
+# Importações mantidas para consulta do andamento neste worker
+MAX_IMPORTACOES = 20
+
+
+def mapear_colunas(
+    colunas: list[str], explicito: dict[str, str] | None = None
+) -> dict[str, str]:
+    """
+    Campo de ProdutoCreate -> coluna da planilha. O mapeamento explícito vale
+    primeiro; os demais campos procuram um sinônimo igual ao nome da coluna
+    ou no começo dele ("Preço (R$)" -> preco).
+    """
+    mapa = {
+        campo: coluna
+        for campo, coluna in (explicito or {}).items()
+        if coluna in colunas
+    }
+    normalizadas = {coluna: normalizar_nome(coluna) for coluna in colunas}
+    livres = [coluna for coluna in colunas if coluna not in mapa.values()]
+    for campo, sinonimos in SINONIMOS.items():
+        if campo in mapa:
+            continue
+        for sinonimo in sinonimos:
+            achada = next(
+                (c for c in livres if normalizadas[c] == sinonimo), None
+            ) or next(
+                (c for c in livres if normalizadas[c].startswith(sinonimo + " ")), None
+            )
+            if achada is not None:
+                mapa[campo] = achada
+                livres.remove(achada)
+                break
+    return mapa
+
+
+def converter_numero(valor: Any) -> Decimal | None:
+    """Número da planilha: 10, 10.5, "R$ 1.234,56", "1,234.56", "12,5"."""
+    if valor is None or isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float, Decimal)):
+        return Decimal(str(valor))
+    texto = "".join(c for c in str(valor) if c.isdigit() or c in ",.-")
+    if not texto:
+        return None
+    if "," in texto and "." in texto:
+        # O separador que aparece por último é o decimal
+        milhar = "." if texto.rfind(",") > texto.rfind(".") else ","
+        texto = texto.replace(milhar, "")
+    elif texto.count(".") > 1:
+        texto = texto.replace(".", "")
+    try:
+        return Decimal(texto.replace(",", "."))
+    except InvalidOperation:
+        return None
+
+
+def _texto(valor: Any) -> str:
+    # Códigos numéricos chegam do Excel como float (12345.0)
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return "" if valor is None else str(valor).strip()
+
+
+@dataclass
+class LinhaValidada:
+    numero: int
+    produto: ProdutoCreate | None
+    erros: list[str] = field(default_factory=list)
+
+
+def validar_linha(numero: int, linha: Linha, mapa: dict[str, str]) -> LinhaValidada:
+    """Converte a linha para ProdutoCreate; `numero` é a linha de dados (1 = primeira depois do cabeçalho)."""
+    erros = [
+        f"coluna para '{campo}' não encontrada"
+        for campo in ("sku", "nome", "preco")
+        if campo not in mapa
+    ]
+    if erros:
+        return LinhaValidada(numero, None, erros)
+    # Descrições longas de fornecedor são cortadas no tamanho da coluna
+    dados: dict[str, Any] = {
+        "sku": _texto(linha.get(mapa["sku"])),
+        "nome": _texto(linha.get(mapa["nome"]))[:MAX_NOME].rstrip(),
+    }
+    preco = converter_numero(linha.get(mapa["preco"]))
+    if preco is None or not preco.is_finite():
+        erros.append("preço vazio ou inválido")
+    elif preco < 0:
+        erros.append("preço negativo")
+    elif preco > MAX_PRECO or preco.quantize(Decimal("0.01")) > MAX_PRECO:
+        erros.append(f"preço acima de {MAX_PRECO}")
+    else:
+        dados["preco"] = preco.quantize(Decimal("0.01"))
+    if "estoque" in mapa:
+        estoque = converter_numero(linha.get(mapa["estoque"]))
+        if estoque is not None and (
+            estoque < 0 or estoque != estoque.to_integral_value()
+        ):
+            erros.append("estoque deve ser um inteiro não negativo")
+        elif estoque is not None:
+            dados["estoque"] = int(estoque)
+    if not dados["sku"]:
+        erros.append("SKU vazio")
+    elif len(dados["sku"]) > MAX_SKU:
+        erros.append(f"SKU com mais de {MAX_SKU} caracteres")
+    if not dados["nome"]:
+        erros.append("nome vazio")
+    if erros:
+        return LinhaValidada(numero, None, erros)
+    try:
+        return LinhaValidada(numero, ProdutoCreate.model_validate(dados))
+    except ValidationError as e:
+        return LinhaValidada(
+            numero,
+            None,
+            [
+                f"{'.'.join(map(str, erro['loc']))}: {erro['msg']}"
+                for erro in e.errors()
+            ],
+        )
+
+
+def validar_bloco(
+    linhas: list[Linha], mapa: dict[str, str], primeira: int
+) -> list[LinhaValidada]:
+    return [validar_linha(primeira + i, linha, mapa) for i, linha in enumerate(linhas)]
+
+
+def gravar_produtos(
+    session: Session, produtos: list[ProdutoCreate], atualizar_estoque: bool
+) -> list[tuple[str, int]]:
+    """
+    Upsert por SKU (a última linha de um SKU repetido no bloco vale); devolve
+    (sku, estoque) das linhas gravadas. Não faz commit.
+    """
+    por_sku = {produto.sku: produto for produto in produtos}
+    if not por_sku:
+        return []
+    tabela = Produto.__table__  # type: ignore[attr-defined]
+    atualizados = ["nome", "preco"] + (["estoque"] if atualizar_estoque else [])
+    dialeto = session.get_bind().dialect.name
+    if dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        gravados = []
+        for produto in por_sku.values():
+            linha = session.exec(
+                select(Produto).where(Produto.sku == produto.sku).with_for_update()
+            ).first()
+            if linha is None:
+                linha = Produto.model_validate(produto)
+            else:
+                for campo in atualizados:
+                    setattr(linha, campo, getattr(produto, campo))
+            session.add(linha)
+            gravados.append((linha.sku, linha.estoque))
+        return gravados
+
+    stmt = insert(tabela).values(
+        [{"id": uuid.uuid4(), **produto.model_dump()} for produto in por_sku.values()]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[tabela.c.sku],
+        set_={campo: stmt.excluded[campo] for campo in atualizados},
+    ).returning(tabela.c.sku, tabela.c.estoque)
+    return [(linha.sku, linha.estoque) for linha in session.exec(stmt)]  # type: ignore[call-overload]
+
+
+@dataclass
+class EstadoImportacao:
+    id: str
+    arquivo: str
+    status: str = "pendente"  # pendente, processando, concluida, falhou
+    mapeamento: dict[str, str] = field(default_factory=dict)
+    lidas: int = 0
+    gravadas: int = 0
+    invalidas: int = 0
+    erros: list[dict[str, Any]] = field(default_factory=list)
+    mensagem: str | None = None
+    criada_em: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    duracao_s: float = 0.0
+
+
+class ImportacaoProdutos:
+    """Fila de importações de planilhas, uma por vez, em segundo plano neste worker."""
+
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+        self._tarefas: set[asyncio.Task[None]] = set()
+        self.importacoes: OrderedDict[str, EstadoImportacao] = OrderedDict()
+
+    def executar_sync(
+        self,
+        session: Session,
+        caminho: Path,
+        estado: EstadoImportacao,
+        planilha: str | None = None,
+        mapeamento: dict[str, str] | None = None,
+    ) -> None:
+        inicio = time.perf_counter()
+        with (
+            open(caminho, "rb") as arquivo,
+            abrir_planilha(arquivo, estado.arquivo) as arquivo_planilha,
+        ):
+            aba = arquivo_planilha.planilha(planilha)
+            estado.mapeamento = mapa = mapear_colunas(aba.colunas, mapeamento)
+            for bloco in aba.blocos(settings.SPREADSHEET_CHUNK_ROWS):
+                validadas = validar_bloco(bloco, mapa, estado.lidas + 1)
+                estado.lidas += len(bloco)
+                produtos = [v.produto for v in validadas if v.produto is not None]
+                for invalida in (v for v in validadas if v.produto is None):
+                    estado.invalidas += 1
+                    if len(estado.erros) < MAX_ERROS:
+                        estado.erros.append(
+                            {"linha": invalida.numero, "erros": invalida.erros}
+                        )
+                gravados = gravar_produtos(
+                    session, produtos, atualizar_estoque="estoque" in mapa
+                )
+                session.commit()
+                estado.gravadas += len(gravados)
+                for sku, estoque in gravados:
+                    reservas_estoque.definir_estoque(sku, estoque)
+                motor_canais.marcar([sku for sku, _ in gravados])
+        estado.duracao_s = round(time.perf_counter() - inicio, 3)
+
+    async def _executar(
+        self,
+        caminho: Path,
+        estado: EstadoImportacao,
+        planilha: str | None,
+        mapeamento: dict[str, str] | None,
+    ) -> None:
+        from app.infra.db.session import get_session
+
+        try:
+            async with self._lock:  # uma importação por vez neste worker
+                session = get_session()
+                if session is None:
+                    estado.status, estado.mensagem = (
+                        "falhou",
+                        "Banco de dados indisponível",
+                    )
+                    return
+                estado.status = "processando"
+                with session:
+                    await anyio.to_thread.run_sync(
+                        self.executar_sync,
+                        session,
+                        caminho,
+                        estado,
+                        planilha,
+                        mapeamento,
+                    )
+                estado.status = "concluida"
+                logger.info(
+                    "Importação %s: %s linhas, %s gravadas, %s inválidas em %.3fs",
+                    estado.id,
+                    estado.lidas,
+                    estado.gravadas,
+                    estado.invalidas,
+                    estado.duracao_s,
+                )
+        except Exception as e:
+            estado.status, estado.mensagem = "falhou", str(e)
+            logger.exception("Falha na importação %s", estado.id)
+        finally:
+            caminho.unlink(missing_ok=True)
+
+    def agendar(
+        self,
+        caminho: Path,
+        nome_arquivo: str,
+        planilha: str | None = None,
+        mapeamento: dict[str, str] | None = None,
+    ) -> EstadoImportacao:
+        """Enfileira a importação do arquivo em `caminho` (apagado ao final)."""
+        estado = EstadoImportacao(id=uuid.uuid4().hex, arquivo=nome_arquivo)
+        self.importacoes[estado.id] = estado
+        while len(self.importacoes) > MAX_IMPORTACOES:
+            self.importacoes.popitem(last=False)
+        tarefa = asyncio.create_task(
+            self._executar(caminho, estado, planilha, mapeamento)
+        )
+        self._tarefas.add(tarefa)
+        tarefa.add_done_callback(self._tarefas.discard)
+        return estado
+
+    def estado(self, importacao_id: str) -> dict[str, Any] | None:
+        estado = self.importacoes.get(importacao_id)
+        return asdict(estado) if estado else None
+
+    async def parar(self) -> None:
+        for tarefa in list(self._tarefas):
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, return_exceptions=True)
+
+
+importacao_produtos = ImportacaoProdutos()
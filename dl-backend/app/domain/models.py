@@ -1,5 +1,7 @@
 import uuid
+from datetime import date, datetime, timezone
 from decimal import Decimal
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 
@@ -9,4 +11,259 @@ class Produto(SQLModel, table=True):
     sku: str = Field(unique=True, index=True, max_length=100)
     nome: str = Field(max_length=255)
     preco: Decimal = Field(max_digits=10, decimal_places=2)
-    estoque: int = Field(default=0, ge=0) 
\ No newline at end of file
+    estoque: int = Field(default=0, ge=0)
+
+
+class Venda(SQLModel, table=True):
+    """Venda registrada (cabeçalho)"""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    criada_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Dia da venda no fuso da loja; é a chave de todos os agregados diários
+    dia: date = Field(index=True)
+    canal: str = Field(max_length=50, index=True)
+    vendedor_id: int | None = Field(default=None, index=True)
+    total: Decimal = Field(default=Decimal("0"), max_digits=12, decimal_places=2)
+    custo_total: Decimal = Field(default=Decimal("0"), max_digits=12, decimal_places=2)
+
+
+class VendaItem(SQLModel, table=True):
+    """Linha de uma venda"""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    venda_id: uuid.UUID = Field(
+        foreign_key="venda.id", nullable=False, ondelete="CASCADE", index=True
+    )
+    sku: str = Field(max_length=100, index=True)
+    quantidade: int = Field(gt=0)
+    preco_unitario: Decimal = Field(max_digits=10, decimal_places=2)
+    custo_unitario: Decimal = Field(default=Decimal("0"), max_digits=10, decimal_places=2)
+
+
+class VendaRollup(SQLModel, table=True):
+    """
+    Agregado diário de vendas por dimensão.
+
+    `dimensao` é "total", "canal", "produto" (chave = SKU) ou "vendedor"
+    (chave = id do vendedor); para "total" a chave é vazia.
+    """
+    dia: date = Field(primary_key=True)
+    dimensao: str = Field(primary_key=True, max_length=20)
+    chave: str = Field(default="", primary_key=True, max_length=100)
+    num_vendas: int = 0
+    quantidade: int = 0
+    faturamento: Decimal = Field(default=Decimal("0"), max_digits=14, decimal_places=2)
+    custo: Decimal = Field(default=Decimal("0"), max_digits=14, decimal_places=2)
+
+
+class VendedorDia(SQLModel, table=True):
+    """
+    Contadores do dia de um vendedor (dia no fuso da loja).
+
+    Incrementados a cada venda, orçamento e cliente registrados; o painel do
+    vendedor lê uma única linha. Um novo dia começa numa linha nova.
+    """
+    vendedor_id: int = Field(primary_key=True)
+    dia: date = Field(primary_key=True)
+    num_vendas: int = 0
+    vendas_valor: Decimal = Field(default=Decimal("0"), max_digits=14, decimal_places=2)
+    orcamentos_enviados: int = 0
+    orcamentos_fechados: int = 0
+    orcamentos_perdidos: int = 0
+    novos_clientes: int = 0
+
+
+class AnuncioML(SQLModel, table=True):
+    """Anúncio do Mercado Livre espelhado localmente"""
+    id: str = Field(primary_key=True, max_length=30)  # ex.: MLB1234567890
+    sku: str | None = Field(default=None, index=True, max_length=100)
+    titulo: str = Field(max_length=255)
+    preco: Decimal = Field(max_digits=12, decimal_places=2)
+    estoque: int = 0
+    status: str = Field(max_length=30)
+    permalink: str | None = Field(default=None, max_length=500)
+    thumbnail: str | None = Field(default=None, max_length=500)
+    # Cursor de mudança: `last_updated` do ML na última leitura do anúncio
+    atualizado_ml_em: datetime
+    sincronizado_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class SnapshotCanal(SQLModel, table=True):
+    """Último estado (preço, estoque, título) de um SKU aceito por um canal de venda"""
+    canal: str = Field(primary_key=True, max_length=30)
+    sku: str = Field(primary_key=True, max_length=100)
+    hash: str = Field(max_length=32)
+    preco: Decimal = Field(max_digits=10, decimal_places=2)
+    estoque: int = 0
+    enviado_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class Cliente(SQLModel, table=True):
+    """
+    Cliente da loja.
+
+    `nome_normalizado`, `telefone_digitos` e `documento` são as formas de
+    busca (sem acento/pontuação, só dígitos), gravadas junto com o que foi
+    digitado. No PostgreSQL, o nome tem índice de trigramas (busca por
+    trecho) e os dígitos têm índices de prefixo (varchar_pattern_ops).
+    """
+    __table_args__ = (
+        Index(
+            "ix_cliente_nome_trgm",
+            "nome_normalizado",
+            postgresql_using="gin",
+            postgresql_ops={"nome_normalizado": "gin_trgm_ops"},
+        ),
+        Index("ix_cliente_nome_normalizado_id", "nome_normalizado", "id"),
+        Index(
+            "ix_cliente_telefone_digitos",
+            "telefone_digitos",
+            postgresql_ops={"telefone_digitos": "varchar_pattern_ops"},
+        ),
+        Index(
+            "ix_cliente_documento",
+            "documento",
+            postgresql_ops={"documento": "varchar_pattern_ops"},
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    nome: str = Field(max_length=255)
+    nome_normalizado: str = Field(default="", max_length=255)
+    telefone: str | None = Field(default=None, max_length=30)
+    telefone_digitos: str | None = Field(default=None, max_length=15)
+    email: str | None = Field(default=None, max_length=255)
+    cpf_cnpj: str | None = Field(default=None, max_length=20)
+    documento: str | None = Field(default=None, max_length=14)
+    rua: str | None = Field(default=None, max_length=255)
+    numero: str | None = Field(default=None, max_length=20)
+    bairro: str | None = Field(default=None, max_length=100)
+    cidade: str | None = Field(default=None, max_length=100)
+    uf: str | None = Field(default=None, max_length=2)
+    cep: str | None = Field(default=None, max_length=9)
+    modelo_carro: str | None = Field(default=None, max_length=100)
+    placa_veiculo: str | None = Field(default=None, max_length=10)
+    observacoes: str | None = Field(default=None, max_length=2000)
+    vendedor_id: int | None = Field(default=None, index=True)
+    data_cadastro: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    atualizado_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class SugestaoMesclagemCliente(SQLModel, table=True):
+    """
+    Par de cadastros que parecem ser o mesmo cliente, achado pelo job de
+    duplicidade. `cliente_id` é o cadastro mais antigo (o que fica numa
+    mesclagem) e `duplicado_id` o mais novo.
+
+    Pendentes são recalculadas a cada execução; descartadas ficam gravadas
+    para o par não voltar à lista.
+    """
+    __table_args__ = (
+        # Lista de revisão: pendentes, das mais prováveis para as menos
+        Index("ix_sugestaomesclagemcliente_status_pontuacao", "status", "pontuacao"),
+    )
+
+    cliente_id: int = Field(primary_key=True)
+    duplicado_id: int = Field(primary_key=True, index=True)
+    pontuacao: float
+    # Evidências separadas por vírgula (ex.: "documento,telefone,nome:0.92")
+    motivos: str = Field(default="", max_length=200)
+    status: str = Field(default="pendente", max_length=20)
+    atualizada_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+# Predicado dos orçamentos em aberto (expiráveis). A consulta da expiração usa
+# este mesmo texto, para que o planejador reconheça o índice parcial.
+ORCAMENTO_EM_ABERTO = "status IN ('pendente', 'enviado')"
+
+
+class Orcamento(SQLModel, table=True):
+    """
+    Orçamento (cabeçalho).
+
+    Os totais são mantidos incrementalmente a cada alteração de linha;
+    `versao` cresce a cada gravação e protege o rascunho contra autosaves
+    fora de ordem (controle otimista de concorrência).
+    """
+    __table_args__ = (
+        # Índice parcial: só os orçamentos em aberto, varridos pela expiração
+        Index(
+            "ix_orcamento_abertos_validade",
+            "validade",
+            "id",
+            postgresql_where=text(ORCAMENTO_EM_ABERTO),
+            sqlite_where=text(ORCAMENTO_EM_ABERTO),
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    numero: str | None = Field(default=None, unique=True, max_length=30)
+    cliente_id: int | None = Field(default=None, index=True)
+    vendedor_id: int = Field(index=True)
+    status: str = Field(default="rascunho", max_length=20, index=True)
+    prioridade: str = Field(default="media", max_length=10)
+    observacoes: str | None = Field(default=None, max_length=2000)
+    marca_veiculo: str | None = Field(default=None, max_length=60)
+    modelo_veiculo: str | None = Field(default=None, max_length=60)
+    ano_veiculo: str | None = Field(default=None, max_length=10)
+    placa_veiculo: str | None = Field(default=None, max_length=10)
+    versao: int = 1
+    total_itens: int = 0
+    subtotal: Decimal = Field(default=Decimal("0"), max_digits=14, decimal_places=2)
+    desconto_total: Decimal = Field(default=Decimal("0"), max_digits=14, decimal_places=2)
+    frete_valor: Decimal = Field(default=Decimal("0"), max_digits=12, decimal_places=2)
+    # Opção de frete escolhida na cotação
+    frete_transportadora: str | None = Field(default=None, max_length=100)
+    frete_servico: str | None = Field(default=None, max_length=100)
+    frete_prazo: int | None = None
+    frete_cep_destino: str | None = Field(default=None, max_length=8)
+    valor_total: Decimal = Field(default=Decimal("0"), max_digits=14, decimal_places=2)
+    validade: date
+    # Venda gerada na conversão do orçamento
+    venda_id: uuid.UUID | None = Field(default=None, foreign_key="venda.id")
+    criado_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    atualizado_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class OrcamentoItem(SQLModel, table=True):
+    """
+    Linha de um orçamento. O id pode ser gerado pelo cliente, o que permite
+    referenciar no próximo autosave uma linha recém-adicionada.
+    """
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    orcamento_id: int = Field(
+        foreign_key="orcamento.id", nullable=False, ondelete="CASCADE", index=True
+    )
+    posicao: int = 0
+    produto_id: uuid.UUID | None = Field(default=None)
+    sku: str | None = Field(default=None, max_length=100)
+    descricao: str = Field(max_length=255)
+    quantidade: int = Field(gt=0)
+    valor_unitario: Decimal = Field(max_digits=10, decimal_places=2)
+    desconto_percentual: Decimal = Field(default=Decimal("0"), max_digits=5, decimal_places=2)
+    desconto_valor: Decimal = Field(default=Decimal("0"), max_digits=10, decimal_places=2)
+    # Desconto efetivo e total da linha, gravados para somar sem recalcular
+    desconto_linha: Decimal = Field(default=Decimal("0"), max_digits=12, decimal_places=2)
+    valor_total: Decimal = Field(default=Decimal("0"), max_digits=12, decimal_places=2)
+    observacoes: str | None = Field(default=None, max_length=500)
+
+
+class ReservaEstoque(SQLModel, table=True):
+    """
+    Reserva temporária de estoque (carrinho da venda rápida ou orçamento).
+
+    Vale até `expira_em`: vencida, deixa de contar no disponível e é apagada
+    pela varredura periódica.
+    """
+    __table_args__ = (
+        # Soma das reservas ativas de um SKU
+        Index("ix_reservaestoque_sku_expira_em", "sku", "expira_em"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    sku: str = Field(max_length=100)
+    quantidade: int = Field(gt=0)
+    expira_em: datetime = Field(index=True)
+    origem: str = Field(default="carrinho", max_length=20)
+    # Carrinho ou orçamento dono da reserva (ex.: id do orçamento)
+    referencia: str | None = Field(default=None, max_length=100, index=True)
+    vendedor_id: int | None = None
+    criada_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,41 @@
+"""
+Normalização de nomes, telefones e documentos para busca e comparação.
+
+As colunas normalizadas do cliente são gravadas com estas funções e a busca
+normaliza o termo digitado do mesmo jeito, então "(11) 98765-4321",
+"11987654321" e "+55 11 98765 4321" caem na mesma chave.
+"""
+
+import re
+import unicodedata
+
+_NAO_DIGITOS = re.compile(r"\D")
+_NAO_ALFANUM = re.compile(r"[^a-z0-9 ]+")
+_ESPACOS = re.compile(r"\s+")
+
+
+def so_digitos(texto: str | None) -> str:
+    return _NAO_DIGITOS.sub("", texto or "")
+
+
+def normalizar_nome(nome: str | None) -> str:
+    """Minúsculas, sem acentos nem pontuação, espaços simples: "José  da Silva." -> "jose da silva"."""
+    sem_acentos = (
+        unicodedata.normalize("NFKD", nome or "")
+        .encode("ascii", "ignore")
+        .decode("ascii")
+    )
+    return _ESPACOS.sub(" ", _NAO_ALFANUM.sub(" ", sem_acentos.lower())).strip()
+
+
+def normalizar_telefone(telefone: str | None) -> str:
+    """Dígitos do telefone sem o DDI 55: "+55 (11) 98765-4321" -> "11987654321"."""
+    digitos = so_digitos(telefone)
+    if len(digitos) in (12, 13) and digitos.startswith("55"):
+        digitos = digitos[2:]
+    return digitos
+
+
+def normalizar_documento(documento: str | None) -> str:
+    """Dígitos do CPF (11) ou CNPJ (14)."""
+    return so_digitos(documento)
@@ -0,0 +1,129 @@
+"""
+Ranking ao vivo dos vendedores pelas vendas do dia contra a meta diária.
+
+As pontuações ficam num `ConjuntoOrdenado` por processo: cada venda soma seu
+valor em O(log n), e o top-k ou a posição de um vendedor saem sem ordenar os
+agregados a cada requisição. Na inicialização o ranking é recriado a partir
+das linhas do dia em vendedordia; na virada do dia (fuso da loja) recomeça
+vazio.
+"""
+
+import logging
+import threading
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.sorted_set import ConjuntoOrdenado
+from app.domain.models import VendedorDia
+from app.domain.rollups import hoje_na_loja
+
+logger = logging.getLogger(__name__)
+
+
+def _progresso(vendas: float) -> float:
+    meta = settings.SELLER_DAILY_GOAL
+    return round(vendas / meta * 100, 1) if meta else 0.0
+
+
+class RankingVendedores:
+    """Vendas do dia por vendedor, ordenadas da maior para a menor."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._dia: date | None = None
+        self._conjunto = ConjuntoOrdenado()
+
+    def _do_dia(self, dia: date) -> ConjuntoOrdenado | None:
+        if self._dia is None or dia > self._dia:
+            self._dia = dia
+            self._conjunto = ConjuntoOrdenado()
+        elif dia < self._dia:
+            return None  # venda de um dia já encerrado
+        return self._conjunto
+
+    def registrar_venda(self, vendedor_id: int, valor: Decimal, dia: date) -> None:
+        with self._lock:
+            conjunto = self._do_dia(dia)
+            if conjunto is not None:
+                conjunto.incrementar(vendedor_id, float(valor))
+
+    def carregar(self, session: Session, hoje: date | None = None) -> int:
+        """Recria o ranking a partir dos contadores do dia (tabela vendedordia)."""
+        hoje = hoje or hoje_na_loja()
+        linhas = session.exec(
+            select(VendedorDia.vendedor_id, VendedorDia.vendas_valor).where(
+                VendedorDia.dia == hoje
+            )
+        ).all()
+        conjunto = ConjuntoOrdenado()
+        for vendedor_id, vendas in linhas:
+            if vendas:
+                conjunto.adicionar(vendedor_id, float(vendas))
+        with self._lock:
+            self._dia, self._conjunto = hoje, conjunto
+        return len(conjunto)
+
+    def _atual(self, hoje: date | None) -> ConjuntoOrdenado:
+        # Sem vendas desde a meia-noite o conjunto guardado ainda é o de ontem
+        if self._dia != (hoje or hoje_na_loja()):
+            return ConjuntoOrdenado()
+        return self._conjunto
+
+    def top(
+        self, limite: int = 10, inicio: int = 0, hoje: date | None = None
+    ) -> dict[str, Any]:
+        with self._lock:
+            conjunto = self._atual(hoje)
+            pagina = conjunto.intervalo(inicio, limite)
+            total = len(conjunto)
+        return {
+            "meta_diaria": settings.SELLER_DAILY_GOAL,
+            "total_vendedores": total,
+            "ranking": [
+                {
+                    "posicao": inicio + indice + 1,
+                    "vendedor_id": vendedor_id,
+                    "vendas": round(vendas, 2),
+                    "progresso_meta": _progresso(vendas),
+                }
+                for indice, (vendedor_id, vendas) in enumerate(pagina)
+            ],
+        }
+
+    def posicao(self, vendedor_id: int, hoje: date | None = None) -> dict[str, Any]:
+        with self._lock:
+            conjunto = self._atual(hoje)
+            posicao = conjunto.posicao(vendedor_id)
+            vendas = conjunto.pontuacao(vendedor_id) or 0.0
+            total = len(conjunto)
+        return {
+            "vendedor_id": vendedor_id,
+            # Sem vendas no dia o vendedor ainda não entrou no ranking
+            "posicao": posicao + 1 if posicao is not None else None,
+            "total_vendedores": total,
+            "vendas": round(vendas, 2),
+            "meta_diaria": settings.SELLER_DAILY_GOAL,
+            "progresso_meta": _progresso(vendas),
+        }
+
+
+ranking_vendedores = RankingVendedores()
+
+
+def carregar_ranking_vendedores() -> None:
+    """Preenche o ranking na inicialização; sem banco disponível, começa vazio."""
+    from app.infra.db.session import get_session
+
+    session = get_session()
+    if session is None:
+        return
+    try:
+        with session:
+            total = ranking_vendedores.carregar(session)
+        logger.info("Ranking de vendedores carregado com %s vendedores", total)
+    except Exception:
+        logger.exception("Falha ao carregar o ranking de vendedores")
@@ -0,0 +1,407 @@
+"""
+Reservas de estoque com validade (carrinho da venda rápida e orçamentos).
+
+Uma reserva segura uma quantidade de um SKU por alguns minutos, sem manter
+transação aberta: é uma linha em `reservaestoque` com `expira_em`. Criar a
+reserva é uma transação curta que trava só a linha do produto, soma as
+reservas ativas do SKU (índice sku + expira_em) e insere a nova se couber,
+então dois vendedores não conseguem prometer a mesma última peça.
+
+Cada worker mantém em memória o estoque e o total reservado por SKU:
+`disponivel(sku)` é uma consulta de dicionário. As reservas ativas ficam num
+heap por vencimento, e as vencidas saem do total na própria leitura (custo
+amortizado O(1)). A varredura periódica apaga as vencidas do banco em lotes
+e ressincroniza a memória com as reservas feitas pelos outros workers.
+"""
+
+import asyncio
+import heapq
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import anyio.to_thread
+from sqlmodel import Session, col, delete, func, or_, select
+
+from app.core.config import settings
+from app.domain.models import Produto, ReservaEstoque
+from app.domain.schemas import ReservaCreate, ReservaRead
+
+logger = logging.getLogger(__name__)
+
+
+class EstoqueIndisponivel(ValueError):
+    """A quantidade pedida passa do disponível (estoque menos reservas ativas)"""
+
+    def __init__(self, sku: str, disponivel: int):
+        super().__init__(f"Estoque indisponível para {sku}: disponível {disponivel}")
+        self.sku = sku
+        self.disponivel = disponivel
+
+
+def _utc(momento: datetime) -> datetime:
+    return (
+        momento if momento.tzinfo is not None else momento.replace(tzinfo=timezone.utc)
+    )
+
+
+@dataclass
+class _Reserva:
+    sku: str
+    quantidade: int
+    expira_em: float  # timestamp
+    registrada_em: float = 0.0  # monotonic, neste worker
+
+
+class ReservasEstoque:
+    """Visão em memória do disponível por SKU e varredura das reservas vencidas."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._estoque: dict[str, int] = {}
+        self._reservado: dict[str, int] = {}
+        self._ativas: dict[uuid.UUID, _Reserva] = {}
+        self._vencimentos: list[tuple[float, uuid.UUID]] = []
+        self._tarefa: asyncio.Task[None] | None = None
+        self._ultima_releitura = 0.0
+        self.varreduras = 0
+        self.apagadas_total = 0
+        self.erros = 0
+
+    # --- Visão em memória ---
+
+    def _vencer(self, agora: float) -> None:
+        """Tira do total as reservas vencidas (chamar com o lock)."""
+        while self._vencimentos and self._vencimentos[0][0] <= agora:
+            _, reserva_id = heapq.heappop(self._vencimentos)
+            reserva = self._ativas.get(reserva_id)
+            # Reservas renovadas têm uma entrada mais nova no heap
+            if reserva is not None and reserva.expira_em <= agora:
+                self._retirar(reserva_id, reserva)
+
+    def _retirar(self, reserva_id: uuid.UUID, reserva: _Reserva) -> None:
+        del self._ativas[reserva_id]
+        restante = self._reservado.get(reserva.sku, 0) - reserva.quantidade
+        if restante > 0:
+            self._reservado[reserva.sku] = restante
+        else:
+            self._reservado.pop(reserva.sku, None)
+
+    def disponivel(self, sku: str) -> int | None:
+        """Estoque menos reservas ativas; None se o SKU não for conhecido."""
+        with self._lock:
+            self._vencer(time.time())
+            estoque = self._estoque.get(sku)
+            if estoque is None:
+                return None
+            return estoque - self._reservado.get(sku, 0)
+
+    def reservado(self, sku: str) -> int:
+        with self._lock:
+            self._vencer(time.time())
+            return self._reservado.get(sku, 0)
+
+    def definir_estoque(self, sku: str, estoque: int) -> None:
+        with self._lock:
+            self._estoque[sku] = estoque
+
+    def adicionar(
+        self, reserva_id: uuid.UUID, sku: str, quantidade: int, expira_em: datetime
+    ) -> None:
+        """Registra (ou renova) uma reserva já gravada no banco."""
+        vencimento = _utc(expira_em).timestamp()
+        with self._lock:
+            anterior = self._ativas.get(reserva_id)
+            if anterior is not None:
+                self._retirar(reserva_id, anterior)
+            self._ativas[reserva_id] = _Reserva(
+                sku, quantidade, vencimento, time.monotonic()
+            )
+            self._reservado[sku] = self._reservado.get(sku, 0) + quantidade
+            heapq.heappush(self._vencimentos, (vencimento, reserva_id))
+
+    def remover(self, reserva_ids: Iterable[uuid.UUID]) -> None:
+        with self._lock:
+            for reserva_id in reserva_ids:
+                reserva = self._ativas.get(reserva_id)
+                if reserva is not None:
+                    self._retirar(reserva_id, reserva)
+
+    # --- Sincronização com o banco ---
+
+    def _reler_reservas(self, session: Session, agora: datetime) -> None:
+        inicio = time.monotonic()
+        ativas = session.exec(
+            select(
+                ReservaEstoque.id,
+                ReservaEstoque.sku,
+                ReservaEstoque.quantidade,
+                ReservaEstoque.expira_em,
+            ).where(col(ReservaEstoque.expira_em) > agora)
+        ).all()
+        reservas: dict[uuid.UUID, _Reserva] = {}
+        reservado: dict[str, int] = {}
+        for reserva_id, sku, quantidade, expira_em in ativas:
+            reservas[reserva_id] = _Reserva(
+                sku, quantidade, _utc(expira_em).timestamp()
+            )
+            reservado[sku] = reservado.get(sku, 0) + quantidade
+        with self._lock:
+            # Reservas feitas neste worker enquanto a leitura rodava não estão nela
+            for reserva_id, reserva in self._ativas.items():
+                if reserva.registrada_em >= inicio and reserva_id not in reservas:
+                    reservas[reserva_id] = reserva
+                    reservado[reserva.sku] = (
+                        reservado.get(reserva.sku, 0) + reserva.quantidade
+                    )
+            vencimentos = [
+                (r.expira_em, reserva_id) for reserva_id, r in reservas.items()
+            ]
+            heapq.heapify(vencimentos)
+            self._ativas, self._reservado, self._vencimentos = (
+                reservas,
+                reservado,
+                vencimentos,
+            )
+
+    def _reler_estoque(self, session: Session) -> None:
+        estoque = dict(session.exec(select(Produto.sku, Produto.estoque)).all())
+        with self._lock:
+            self._estoque = estoque
+        self._ultima_releitura = time.monotonic()
+
+    def carregar(self, session: Session) -> int:
+        """Lê estoque e reservas ativas do banco; devolve o número de SKUs."""
+        self._reler_estoque(session)
+        self._reler_reservas(session, datetime.now(timezone.utc))
+        return len(self._estoque)
+
+    def varrer_sync(self, session: Session) -> int:
+        """Apaga as reservas vencidas em lotes e ressincroniza a memória; devolve quantas apagou."""
+        agora = datetime.now(timezone.utc)
+        tamanho = settings.STOCK_RESERVATION_SWEEP_BATCH_SIZE
+        apagadas = 0
+        while True:
+            vencidas = (
+                select(ReservaEstoque.id)
+                .where(col(ReservaEstoque.expira_em) <= agora)
+                .limit(tamanho)
+            )
+            resultado = session.exec(  # type: ignore[call-overload]
+                delete(ReservaEstoque)
+                .where(col(ReservaEstoque.id).in_(vencidas.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            apagadas += resultado.rowcount
+            if resultado.rowcount < tamanho:
+                break
+        self._reler_reservas(session, agora)
+        if (
+            time.monotonic() - self._ultima_releitura
+            >= settings.STOCK_RESERVATION_RESYNC_SECONDS
+        ):
+            self._reler_estoque(session)
+        return apagadas
+
+    async def varrer(self) -> int | None:
+        """Uma varredura (no threadpool); None se o banco não estiver disponível."""
+        from app.infra.db.session import get_session
+
+        session = get_session()
+        if session is None:
+            return None
+        try:
+            with session:
+                apagadas = await anyio.to_thread.run_sync(self.varrer_sync, session)
+        except Exception:
+            self.erros += 1
+            raise
+        self.varreduras += 1
+        self.apagadas_total += apagadas
+        return apagadas
+
+    async def _varrer_periodicamente(self) -> None:
+        while True:
+            await asyncio.sleep(settings.STOCK_RESERVATION_SWEEP_SECONDS)
+            try:
+                await self.varrer()
+            except Exception:
+                logger.exception("Falha na varredura das reservas de estoque")
+
+    def iniciar(self) -> None:
+        """Agenda a varredura periódica (no lifespan); 0 segundos desliga."""
+        if self._tarefa is None and settings.STOCK_RESERVATION_SWEEP_SECONDS > 0:
+            self._tarefa = asyncio.create_task(self._varrer_periodicamente())
+
+    async def parar(self) -> None:
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    def metricas(self) -> dict[str, Any]:
+        with self._lock:
+            self._vencer(time.time())
+            return {
+                "skus": len(self._estoque),
+                "reservas_ativas": len(self._ativas),
+                "skus_reservados": len(self._reservado),
+                "varreduras": self.varreduras,
+                "apagadas_total": self.apagadas_total,
+                "erros": self.erros,
+            }
+
+
+reservas_estoque = ReservasEstoque()
+
+
+def carregar_reservas_estoque() -> None:
+    """Preenche a visão em memória na inicialização; sem banco disponível, começa vazia."""
+    from app.infra.db.session import get_session
+
+    session = get_session()
+    if session is None:
+        return
+    try:
+        with session:
+            skus = reservas_estoque.carregar(session)
+        logger.info("Reservas de estoque carregadas para %s SKUs", skus)
+    except Exception:
+        logger.exception("Falha ao carregar as reservas de estoque")
+
+
+class ReservaEstoqueService:
+    """Criação, renovação e liberação de reservas (fonte da verdade: o banco)"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def reservado_por_sku(
+        self, skus: Iterable[str], exceto: tuple[str, str] | None = None
+    ) -> dict[str, int]:
+        """Total reservado (reservas ativas) de cada SKU, sem as do dono `exceto` (origem, referência)"""
+        statement = (
+            select(ReservaEstoque.sku, func.sum(ReservaEstoque.quantidade))
+            .where(col(ReservaEstoque.sku).in_(list(skus)))
+            .where(col(ReservaEstoque.expira_em) > datetime.now(timezone.utc))
+            .group_by(col(ReservaEstoque.sku))
+        )
+        if exceto is not None:
+            origem, referencia = exceto
+            # Sem referência a reserva não é do dono: `referencia != r` daria NULL
+            statement = statement.where(
+                or_(
+                    col(ReservaEstoque.origem) != origem,
+                    col(ReservaEstoque.referencia).is_(None),
+                    col(ReservaEstoque.referencia) != referencia,
+                )
+            )
+        return {sku: int(total) for sku, total in self.session.exec(statement).all()}
+
+    def _validade(self, ttl_segundos: int | None) -> datetime:
+        ttl = min(
+            ttl_segundos or settings.STOCK_RESERVATION_TTL_SECONDS,
+            settings.STOCK_RESERVATION_MAX_TTL_SECONDS,
+        )
+        return datetime.now(timezone.utc) + timedelta(seconds=ttl)
+
+    def reservar(self, dados: ReservaCreate) -> ReservaRead | None:
+        """
+        Reserva `quantidade` do produto; None se o produto não existir.
+        Levanta EstoqueIndisponivel se não houver disponível suficiente.
+        """
+        statement = select(Produto)
+        if dados.produto_id is not None:
+            statement = statement.where(Produto.id == dados.produto_id)
+        elif dados.sku:
+            statement = statement.where(Produto.sku == dados.sku)
+        else:
+            raise ValueError("Informe sku ou produto_id")
+        # Trava só a linha do produto: reservas do mesmo SKU entram em fila
+        produto = self.session.exec(statement.with_for_update()).first()
+        if produto is None:
+            return None
+        reservado = self.reservado_por_sku([produto.sku]).get(produto.sku, 0)
+        disponivel = produto.estoque - reservado
+        if disponivel < dados.quantidade:
+            self.session.rollback()
+            reservas_estoque.definir_estoque(produto.sku, produto.estoque)
+            raise EstoqueIndisponivel(produto.sku, disponivel)
+        reserva = ReservaEstoque(
+            sku=produto.sku,
+            quantidade=dados.quantidade,
+            expira_em=self._validade(dados.ttl_segundos),
+            origem=dados.origem,
+            referencia=dados.referencia,
+            vendedor_id=dados.vendedor_id,
+        )
+        self.session.add(reserva)
+        sku, estoque = produto.sku, produto.estoque
+        self.session.commit()
+        reservas_estoque.definir_estoque(sku, estoque)
+        reservas_estoque.adicionar(
+            reserva.id, sku, reserva.quantidade, reserva.expira_em
+        )
+        return ReservaRead(
+            id=reserva.id,
+            sku=sku,
+            quantidade=reserva.quantidade,
+            expira_em=reserva.expira_em,
+            origem=reserva.origem,
+            referencia=reserva.referencia,
+            disponivel=disponivel - reserva.quantidade,
+        )
+
+    def renovar(
+        self, reserva_id: uuid.UUID, ttl_segundos: int | None = None
+    ) -> ReservaRead | None:
+        """Estende a validade de uma reserva ainda ativa; None se não existir ou já venceu"""
+        reserva = self.session.get(ReservaEstoque, reserva_id)
+        if reserva is None or _utc(reserva.expira_em) <= datetime.now(timezone.utc):
+            return None
+        reserva.expira_em = self._validade(ttl_segundos)
+        self.session.add(reserva)
+        self.session.commit()
+        self.session.refresh(reserva)
+        reservas_estoque.adicionar(
+            reserva.id, reserva.sku, reserva.quantidade, reserva.expira_em
+        )
+        return ReservaRead(
+            **reserva.model_dump(
+                include={"id", "sku", "quantidade", "expira_em", "origem", "referencia"}
+            ),
+            disponivel=reservas_estoque.disponivel(reserva.sku) or 0,
+        )
+
+    def liberar(self, reserva_id: uuid.UUID) -> bool:
+        """Libera uma reserva; False se ela não existir (ou já tiver sido varrida)"""
+        resultado = self.session.exec(  # type: ignore[call-overload]
+            delete(ReservaEstoque).where(col(ReservaEstoque.id) == reserva_id)
+        )
+        self.session.commit()
+        reservas_estoque.remover([reserva_id])
+        return resultado.rowcount > 0
+
+    def liberar_referencia(self, origem: str, referencia: str) -> list[uuid.UUID]:
+        """
+        Apaga as reservas de um carrinho/orçamento sem fazer commit (para compor
+        com outra transação); devolve os ids, a tirar da memória após o commit.
+        """
+        return list(
+            self.session.exec(  # type: ignore[call-overload]
+                delete(ReservaEstoque)
+                .where(col(ReservaEstoque.origem) == origem)
+                .where(col(ReservaEstoque.referencia) == referencia)
+                .returning(col(ReservaEstoque.id))
+                .execution_options(synchronize_session=False)
+            ).scalars()
+        )
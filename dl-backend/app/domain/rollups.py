@@ -0,0 +1,331 @@
+"""
+Agregados diários (rollups) de vendas.
+
+Cada venda registrada incrementa, na mesma transação, uma linha por dia para
+cada dimensão: total do dia, canal, produto (SKU) e vendedor. O dashboard lê
+apenas essas linhas, nunca varre as vendas. `RollupService.rebuild` recalcula
+tudo a partir do histórico bruto (ver scripts/rebuild_rollups.py).
+"""
+
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import sqlalchemy as sa
+from sqlmodel import Session, SQLModel, col, delete, func, select
+
+from app.core.config import settings
+from app.domain.models import (
+    Cliente,
+    Produto,
+    Venda,
+    VendaItem,
+    VendaRollup,
+    VendedorDia,
+)
+
+DIMENSAO_TOTAL = "total"
+DIMENSAO_CANAL = "canal"
+DIMENSAO_PRODUTO = "produto"
+DIMENSAO_VENDEDOR = "vendedor"
+
+_METRICAS = ("num_vendas", "quantidade", "faturamento", "custo")
+
+DIAS_SEMANA = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sáb", "Dom"]
+
+CORES_CANAIS = {
+    "WhatsApp": "#25D366",
+    "Mercado Livre": "#FFE600",
+    "Venda Direta": "#3483FA",
+    "Shopify": "#95BF47",
+}
+COR_PADRAO = "#9CA3AF"
+
+
+def dia_da_loja(momento: datetime) -> date:
+    """Converte um instante para o dia civil no fuso da loja."""
+    if momento.tzinfo is None:
+        momento = momento.replace(tzinfo=timezone.utc)
+    return momento.astimezone(ZoneInfo(settings.STORE_TIMEZONE)).date()
+
+
+def hoje_na_loja() -> date:
+    return dia_da_loja(datetime.now(timezone.utc))
+
+
+def deltas_da_venda(venda: Venda, itens: Sequence[VendaItem]) -> list[dict[str, Any]]:
+    """
+    Calcula os incrementos que uma venda aplica aos rollups, já somados por
+    chave (um mesmo SKU em duas linhas vira um único incremento).
+    """
+    acumulado: dict[tuple[str, str], dict[str, Any]] = defaultdict(
+        lambda: {
+            "num_vendas": 1,
+            "quantidade": 0,
+            "faturamento": Decimal("0"),
+            "custo": Decimal("0"),
+        }
+    )
+    chaves_da_venda = [(DIMENSAO_TOTAL, ""), (DIMENSAO_CANAL, venda.canal)]
+    if venda.vendedor_id is not None:
+        chaves_da_venda.append((DIMENSAO_VENDEDOR, str(venda.vendedor_id)))
+
+    for item in itens:
+        receita = item.preco_unitario * item.quantidade
+        custo = item.custo_unitario * item.quantidade
+        for chave in [*chaves_da_venda, (DIMENSAO_PRODUTO, item.sku)]:
+            linha = acumulado[chave]
+            linha["quantidade"] += item.quantidade
+            linha["faturamento"] += receita
+            linha["custo"] += custo
+
+    return [
+        {"dia": venda.dia, "dimensao": dimensao, "chave": chave, **metricas}
+        for (dimensao, chave), metricas in acumulado.items()
+    ]
+
+
+def upsert_somando(
+    session: Session,
+    modelo: type[SQLModel],
+    metricas: Sequence[str],
+    valores: list[dict[str, Any]],
+) -> None:
+    """
+    INSERT ... ON CONFLICT (chave primária) somando `metricas` às linhas
+    existentes. Cada valor deve trazer todas as colunas da chave primária.
+    """
+    tabela = modelo.__table__  # type: ignore[attr-defined]
+    chave_primaria = list(tabela.primary_key.columns)
+    dialeto = session.get_bind().dialect.name
+    if dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        for valor in valores:
+            chave = tuple(valor[coluna.name] for coluna in chave_primaria)
+            linha = session.get(modelo, chave, with_for_update=True)
+            if linha is None:
+                session.add(modelo(**valor))
+            else:
+                for metrica in metricas:
+                    setattr(
+                        linha, metrica, getattr(linha, metrica) + valor.get(metrica, 0)
+                    )
+        return
+
+    stmt = insert(tabela).values(valores)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=chave_primaria,
+        set_={m: tabela.c[m] + stmt.excluded[m] for m in metricas},
+    )
+    session.exec(stmt)  # type: ignore[call-overload]
+
+
+class RollupService:
+    """Serviço de manutenção e leitura dos rollups de vendas"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def registrar(self, venda: Venda, itens: Sequence[VendaItem]) -> None:
+        """Aplica os incrementos da venda. Não faz commit: roda na transação da venda."""
+        valores = deltas_da_venda(venda, itens)
+        if valores:
+            upsert_somando(self.session, VendaRollup, _METRICAS, valores)
+
+    def rebuild(self, desde: date | None = None) -> int:
+        """Recalcula os rollups a partir das vendas (todas, ou a partir de `desde`)."""
+        apagar = delete(VendaRollup)
+        if desde is not None:
+            apagar = apagar.where(col(VendaRollup.dia) >= desde)
+        self.session.exec(apagar)  # type: ignore[call-overload]
+
+        chaves = {
+            DIMENSAO_TOTAL: sa.cast(sa.literal(""), sa.String),
+            DIMENSAO_CANAL: col(Venda.canal),
+            DIMENSAO_PRODUTO: col(VendaItem.sku),
+            DIMENSAO_VENDEDOR: sa.cast(col(Venda.vendedor_id), sa.String),
+        }
+        destino = ["dia", "dimensao", "chave", *_METRICAS]
+        total = 0
+        for dimensao, chave in chaves.items():
+            consulta = (
+                sa.select(
+                    col(Venda.dia),
+                    sa.cast(sa.literal(dimensao), sa.String),
+                    chave,
+                    func.count(sa.distinct(Venda.id)),
+                    func.sum(VendaItem.quantidade),
+                    func.sum(VendaItem.quantidade * VendaItem.preco_unitario),
+                    func.sum(VendaItem.quantidade * VendaItem.custo_unitario),
+                )
+                .join(VendaItem, col(VendaItem.venda_id) == col(Venda.id))
+                .group_by(col(Venda.dia), chave)
+            )
+            if dimensao == DIMENSAO_VENDEDOR:
+                consulta = consulta.where(col(Venda.vendedor_id).is_not(None))
+            if desde is not None:
+                consulta = consulta.where(col(Venda.dia) >= desde)
+            resultado = self.session.exec(  # type: ignore[call-overload]
+                sa.insert(VendaRollup.__table__).from_select(destino, consulta)
+            )
+            total += resultado.rowcount or 0
+        self.session.commit()
+        return total
+
+    def _somar(self, dimensao: str, inicio: date, fim: date) -> Sequence[Any]:
+        consulta = (
+            select(
+                VendaRollup.chave,
+                func.sum(VendaRollup.num_vendas).label("num_vendas"),
+                func.sum(VendaRollup.quantidade).label("quantidade"),
+                func.sum(VendaRollup.faturamento).label("faturamento"),
+                func.sum(VendaRollup.custo).label("custo"),
+            )
+            .where(VendaRollup.dimensao == dimensao)
+            .where(col(VendaRollup.dia).between(inicio, fim))
+            .group_by(VendaRollup.chave)
+        )
+        return self.session.exec(consulta).all()
+
+    def _orcamentos_decididos(
+        self, inicio: date, fim: date
+    ) -> dict[date, tuple[int, int]]:
+        """Orçamentos fechados e perdidos por dia, somando os contadores dos vendedores."""
+        linhas = self.session.exec(
+            select(
+                VendedorDia.dia,
+                func.sum(VendedorDia.orcamentos_fechados),
+                func.sum(VendedorDia.orcamentos_perdidos),
+            )
+            .where(col(VendedorDia.dia).between(inicio, fim))
+            .group_by(VendedorDia.dia)
+        ).all()
+        return {
+            dia: (int(fechados or 0), int(perdidos or 0))
+            for dia, fechados, perdidos in linhas
+        }
+
+    def metricas_dashboard(self, hoje: date | None = None) -> dict[str, Any]:
+        """Faturamento e conversão do mês, vendas do dia e total de clientes."""
+        hoje = hoje or hoje_na_loja()
+        linhas = self.session.exec(
+            select(VendaRollup)
+            .where(VendaRollup.dimensao == DIMENSAO_TOTAL)
+            .where(col(VendaRollup.dia).between(hoje.replace(day=1), hoje))
+        ).all()
+        do_dia = next((linha for linha in linhas if linha.dia == hoje), None)
+        decididos = self._orcamentos_decididos(hoje.replace(day=1), hoje).values()
+        return {
+            "faturamento": float(
+                sum((linha.faturamento for linha in linhas), Decimal("0"))
+            ),
+            "total_clientes": self.session.exec(
+                select(func.count(col(Cliente.id)))
+            ).one(),
+            "vendas_hoje": do_dia.num_vendas if do_dia else 0,
+            "taxa_conversao": _conversao(
+                sum(fechados for fechados, _ in decididos),
+                sum(perdidos for _, perdidos in decididos),
+            ),
+            # Ainda sem fonte de dados (pesquisa de satisfação, uso da IA)
+            "satisfacao_cliente": None,
+            "eficiencia_ia": None,
+        }
+
+    def estatisticas_dashboard(
+        self, hoje: date | None = None, top_produtos: int = 3
+    ) -> dict[str, Any]:
+        """Evolução dos últimos 7 dias, canais e produtos mais vendidos do mês."""
+        hoje = hoje or hoje_na_loja()
+        semana = [hoje - timedelta(days=d) for d in range(6, -1, -1)]
+        por_dia = {
+            linha.dia: linha
+            for linha in self.session.exec(
+                select(VendaRollup)
+                .where(VendaRollup.dimensao == DIMENSAO_TOTAL)
+                .where(col(VendaRollup.dia).between(semana[0], hoje))
+            ).all()
+        }
+        decididos = self._orcamentos_decididos(semana[0], hoje)
+        inicio_mes = hoje.replace(day=1)
+        canais = self._somar(DIMENSAO_CANAL, inicio_mes, hoje)
+        produtos = self._top_produtos_do_mes(inicio_mes, hoje, top_produtos)
+        nomes = dict(
+            self.session.exec(
+                select(Produto.sku, Produto.nome).where(
+                    col(Produto.sku).in_([produto["sku"] for produto in produtos])
+                )
+            ).all()
+        )
+        return {
+            "evolucao_semanal": [
+                {
+                    "name": DIAS_SEMANA[dia.weekday()],
+                    "vendas": por_dia[dia].num_vendas if dia in por_dia else 0,
+                    "faturamento": float(por_dia[dia].faturamento)
+                    if dia in por_dia
+                    else 0.0,
+                    "conversao": _conversao(*decididos.get(dia, (0, 0))),
+                }
+                for dia in semana
+            ],
+            "distribuicao_canais": [
+                {
+                    "name": linha.chave,
+                    "value": int(linha.num_vendas),
+                    "color": CORES_CANAIS.get(linha.chave, COR_PADRAO),
+                }
+                for linha in canais
+            ],
+            "performance_produtos": [
+                {
+                    "produto": nomes.get(produto["sku"], produto["sku"]),
+                    "vendas": produto["vendas"],
+                    "margem": produto["margem"],
+                }
+                for produto in produtos
+            ],
+        }
+
+    def _top_produtos_do_mes(
+        self, inicio: date, hoje: date, limite: int
+    ) -> list[dict[str, Any]]:
+        """Usa o ranking em memória; sem ele (ex.: scripts), soma os rollups do mês."""
+        from app.domain.top_produtos import JANELA_MES, ranking_produtos
+
+        if limite <= ranking_produtos.tamanho:
+            top = ranking_produtos.top(JANELA_MES, limite=limite, hoje=hoje)
+            if top:
+                return top
+        linhas = sorted(
+            self._somar(DIMENSAO_PRODUTO, inicio, hoje),
+            key=lambda linha: linha.quantidade,
+            reverse=True,
+        )[:limite]
+        return [
+            {
+                "sku": linha.chave,
+                "vendas": int(linha.quantidade),
+                "margem": _margem(linha.faturamento, linha.custo),
+            }
+            for linha in linhas
+        ]
+
+
+def _conversao(fechados: int, perdidos: int) -> float:
+    """Percentual de orçamentos fechados entre os decididos (fechados + perdidos)."""
+    if not fechados + perdidos:
+        return 0.0
+    return round(fechados / (fechados + perdidos) * 100, 1)
+
+
+def _margem(faturamento: Decimal | None, custo: Decimal | None) -> float:
+    if not faturamento:
+        return 0.0
+    return round(float((faturamento - (custo or 0)) / faturamento * 100), 1)
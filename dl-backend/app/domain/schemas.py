@@ -1,8 +1,9 @@
 import uuid
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
-from sqlmodel import SQLModel
-from pydantic import EmailStr
+from typing import Annotated, Literal, Optional
+from sqlmodel import Field, SQLModel
+from pydantic import EmailStr, field_validator
 
 
 # Schemas de Autenticação
@@ -111,4 +112,299 @@ class ProdutoRead(ProdutoBase):
 class ProdutosList(SQLModel):
     """Schema para lista de produtos"""
     data: list[ProdutoRead]
-    count: int 
\ No newline at end of file
+    count: int
+
+
+# Schemas de Venda
+class VendaItemCreate(SQLModel):
+    """Schema para uma linha de venda"""
+    sku: str
+    quantidade: int
+    preco_unitario: Decimal
+    custo_unitario: Decimal = Decimal("0")
+
+
+class VendaCreate(SQLModel):
+    """Schema para registro de Venda"""
+    canal: str
+    vendedor_id: int | None = None
+    criada_em: datetime | None = None
+    itens: list[VendaItemCreate]
+
+
+class VendaRead(SQLModel):
+    """Schema para leitura de Venda"""
+    id: uuid.UUID
+    criada_em: datetime
+    dia: date
+    canal: str
+    vendedor_id: int | None = None
+    total: Decimal
+    custo_total: Decimal
+
+
+
+# Schemas de Cliente
+class ClienteBase(SQLModel):
+    """Campos do cadastro de cliente, como digitados"""
+    nome: str = Field(min_length=1, max_length=255)
+    telefone: str | None = Field(default=None, max_length=30)
+    email: str | None = Field(default=None, max_length=255)
+    cpf_cnpj: str | None = Field(default=None, max_length=20)
+    rua: str | None = Field(default=None, max_length=255)
+    numero: str | None = Field(default=None, max_length=20)
+    bairro: str | None = Field(default=None, max_length=100)
+    cidade: str | None = Field(default=None, max_length=100)
+    uf: str | None = Field(default=None, max_length=2)
+    cep: str | None = Field(default=None, max_length=9)
+    modelo_carro: str | None = Field(default=None, max_length=100)
+    placa_veiculo: str | None = Field(default=None, max_length=10)
+    observacoes: str | None = Field(default=None, max_length=2000)
+
+
+class ClienteCreate(ClienteBase):
+    """Schema para criação de Cliente"""
+    vendedor_id: int | None = None
+
+
+class ClienteUpdate(ClienteBase):
+    """Schema para atualização de Cliente (campos omitidos não mudam)"""
+    nome: str | None = Field(default=None, min_length=1, max_length=255)  # type: ignore[assignment]
+
+
+class ClienteRead(ClienteBase):
+    """Schema para leitura de Cliente"""
+    id: int
+    vendedor_id: int | None = None
+    data_cadastro: datetime
+
+
+# Schemas de Reserva de estoque
+class ReservaCreate(SQLModel):
+    """Reserva de estoque; informe `sku` ou `produto_id`"""
+    sku: str | None = None
+    produto_id: uuid.UUID | None = None
+    quantidade: int = Field(gt=0)
+    ttl_segundos: int | None = Field(default=None, gt=0)
+    origem: Literal["carrinho", "orcamento"] = "carrinho"
+    referencia: str | None = None
+    vendedor_id: int | None = None
+
+
+class ReservaRead(SQLModel):
+    """Reserva criada ou renovada, com o disponível do SKU depois dela"""
+    id: uuid.UUID
+    sku: str
+    quantidade: int
+    expira_em: datetime
+    origem: str
+    referencia: str | None = None
+    disponivel: int
+
+
+class ReservaRenovacao(SQLModel):
+    ttl_segundos: int | None = Field(default=None, gt=0)
+
+
+# Schemas de Orçamento
+class OrcamentoItemCreate(SQLModel):
+    """Schema para uma linha de orçamento (produto do estoque ou avulso)"""
+    id: uuid.UUID | None = None
+    produto_id: uuid.UUID | None = None
+    sku: str | None = None
+    produto_avulso: str | None = None
+    quantidade: int = Field(gt=0)
+    valor_unitario: Decimal = Field(ge=0)
+    desconto_percentual: Decimal = Field(default=Decimal("0"), ge=0, le=100)
+    desconto_valor: Decimal = Field(default=Decimal("0"), ge=0)
+    observacoes: str | None = None
+
+
+class OrcamentoItemRead(SQLModel):
+    """Schema para leitura de uma linha de orçamento"""
+    id: uuid.UUID
+    posicao: int
+    produto_id: uuid.UUID | None = None
+    sku: str | None = None
+    descricao: str
+    quantidade: int
+    valor_unitario: Decimal
+    desconto_percentual: Decimal
+    desconto_valor: Decimal
+    valor_total: Decimal
+    observacoes: str | None = None
+
+
+class OrcamentoCabecalho(SQLModel):
+    """Campos do cabeçalho que o vendedor edita no rascunho"""
+    cliente_id: int | None = None
+    observacoes: str | None = None
+    prioridade: Literal["baixa", "media", "alta"] | None = None
+    marca_veiculo: str | None = None
+    modelo_veiculo: str | None = None
+    ano_veiculo: str | None = None
+    placa_veiculo: str | None = None
+
+    @field_validator("prioridade")
+    @classmethod
+    def _prioridade_nao_nula(cls, valor: str | None) -> str:
+        # Omitida, não muda; `null` explícito não cabe na coluna (NOT NULL)
+        if valor is None:
+            raise ValueError("não pode ser nulo")
+        return valor
+
+
+class OrcamentoCreate(OrcamentoCabecalho):
+    """Schema para criação de Orçamento"""
+    itens: list[OrcamentoItemCreate] = []
+
+
+class OrcamentoUpdate(OrcamentoCabecalho):
+    """
+    Schema para atualização completa (PUT). `itens`, se enviado, é a lista
+    inteira; o serviço grava só as linhas que de fato mudaram.
+    """
+    versao: int | None = None
+    itens: list[OrcamentoItemCreate] | None = None
+
+
+class OperacaoAdicionar(SQLModel):
+    op: Literal["adicionar"]
+    item: OrcamentoItemCreate
+
+
+class OperacaoAlterar(SQLModel):
+    op: Literal["alterar"]
+    id: uuid.UUID
+    quantidade: int | None = Field(default=None, gt=0)
+    valor_unitario: Decimal | None = Field(default=None, ge=0)
+    desconto_percentual: Decimal | None = Field(default=None, ge=0, le=100)
+    desconto_valor: Decimal | None = Field(default=None, ge=0)
+    observacoes: str | None = None
+
+    @field_validator(
+        "quantidade", "valor_unitario", "desconto_percentual", "desconto_valor"
+    )
+    @classmethod
+    def _valores_nao_nulos(cls, valor: Decimal | int | None) -> Decimal | int:
+        # Omitidos, não mudam; só `observacoes` aceita ser apagada com `null`
+        if valor is None:
+            raise ValueError("não pode ser nulo")
+        return valor
+
+
+class OperacaoRemover(SQLModel):
+    op: Literal["remover"]
+    id: uuid.UUID
+
+
+OperacaoItem = Annotated[
+    OperacaoAdicionar | OperacaoAlterar | OperacaoRemover, Field(discriminator="op")
+]
+
+
+class OrcamentoPatch(SQLModel):
+    """
+    Autosave do rascunho: só o que mudou desde a `versao` que o cliente tem.
+    Campos do cabeçalho omitidos não são alterados.
+    """
+    versao: int
+    cabecalho: OrcamentoCabecalho | None = None
+    operacoes: list[OperacaoItem] = []
+
+
+class OrcamentoPatchResult(SQLModel):
+    """Resposta do autosave: nova versão e totais recalculados"""
+    id: int
+    versao: int
+    total_itens: int
+    subtotal: Decimal
+    desconto_total: Decimal
+    frete_valor: Decimal
+    valor_total: Decimal
+    linhas_gravadas: int
+
+
+class OrcamentoRead(SQLModel):
+    """Schema para leitura de Orçamento, no formato da tela de orçamentos"""
+    id: int
+    numero_orcamento: str
+    cliente_id: int | None = None
+    cliente_nome: str | None = None
+    vendedor_id: int
+    vendedor_nome: str | None = None
+    status: str
+    prioridade: str
+    versao: int
+    total_itens: int
+    subtotal: Decimal
+    desconto_total: Decimal
+    frete_valor: Decimal
+    valor_total: Decimal
+    frete_transportadora: str | None = None
+    frete_servico: str | None = None
+    frete_prazo: int | None = None
+    frete_cep_destino: str | None = None
+    valor_potencial: Decimal
+    validade_orcamento: date
+    dias_restantes: int
+    data_criacao: datetime
+    atualizado_em: datetime
+    observacoes: str | None = None
+    marca_veiculo: str | None = None
+    modelo_veiculo: str | None = None
+    ano_veiculo: str | None = None
+    placa_veiculo: str | None = None
+    itens: list[OrcamentoItemRead] | None = None
+
+
+class OrcamentoFreteUpdate(SQLModel):
+    """Opção de frete escolhida para o orçamento (campos da tela do orçamento)"""
+    transportadora_frete: str
+    valor_frete: Decimal = Field(ge=0)
+    prazo_frete: int | None = Field(default=None, ge=0)
+    codigo_frete: str | None = None
+    cep_destino: str | None = None
+    versao: int | None = None
+
+
+class ConversaoVendaRequest(SQLModel):
+    """Conversão de orçamento em venda"""
+    vendedor_id: int | None = None
+    observacoes: str | None = None
+    versao: int | None = None
+
+
+class ResultadoLinhaConversao(SQLModel):
+    """
+    Resultado de uma linha na conversão: "baixado" (estoque debitado),
+    "avulso" (linha sem produto, não mexe no estoque), "estoque_insuficiente"
+    ou "produto_inexistente". Os estoques são o disponível para o orçamento
+    (estoque menos as reservas de outros carrinhos/orçamentos).
+    """
+    item_id: uuid.UUID
+    produto_id: uuid.UUID | None = None
+    sku: str | None = None
+    descricao: str
+    quantidade: int
+    status: Literal["baixado", "avulso", "estoque_insuficiente", "produto_inexistente"]
+    estoque_anterior: int | None = None
+    estoque_atual: int | None = None
+
+
+class ConversaoVendaResult(SQLModel):
+    """Resultado da conversão: a venda criada e o que aconteceu em cada linha"""
+    sucesso: bool
+    orcamento_id: int
+    venda_id: uuid.UUID | None = None
+    total: Decimal | None = None
+    linhas: list[ResultadoLinhaConversao]
+
+
+class OrcamentoStatusUpdate(SQLModel):
+    """Schema para mudança de status"""
+    novo_status: Literal[
+        "rascunho", "pendente", "enviado", "aprovado",
+        "rejeitado", "expirado", "convertido", "concluido",
+    ]
+    observacoes: str | None = None
@@ -1,15 +1,75 @@
 import uuid
-from typing import List, Optional
-from sqlmodel import Session, select
-from app.domain.models import Produto
+from datetime import datetime, timedelta, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, List, Optional
+
+from sqlalchemy import case, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, col, delete, func, select, update
+
+from app.core.config import settings
+from app.core.live import publicador_dashboard
+from app.core.security import create_access_token, verify_password
+from app.domain.canais import motor_canais
+from app.domain.contadores_vendedor import ContadoresVendedorService
+from app.domain.duplicidade_clientes import SugestoesMesclagemService
+from app.domain.models import (
+    AnuncioML,
+    Cliente,
+    Orcamento,
+    OrcamentoItem,
+    Produto,
+    Venda,
+    VendaItem,
+)
+from app.domain.normalizacao import (
+    normalizar_documento,
+    normalizar_nome,
+    normalizar_telefone,
+    so_digitos,
+)
+from app.domain.ranking_vendedores import ranking_vendedores
+from app.domain.reservas_estoque import ReservaEstoqueService, reservas_estoque
+from app.domain.rollups import RollupService, dia_da_loja, hoje_na_loja
 from app.domain.schemas import (
-    ProdutoCreate, ProdutoUpdate, ProdutoRead, ProdutosList,
-    LoginData, Token, ResetPasswordData, UserCreate, UserRead, UserUpdate, PasswordUpdate,
-    ItemCreate, ItemRead, ItemUpdate
+    ClienteCreate,
+    ClienteRead,
+    ClienteUpdate,
+    ConversaoVendaRequest,
+    ConversaoVendaResult,
+    ItemCreate,
+    ItemRead,
+    ItemUpdate,
+    LoginData,
+    OperacaoAdicionar,
+    OperacaoAlterar,
+    OperacaoRemover,
+    OrcamentoCreate,
+    OrcamentoFreteUpdate,
+    OrcamentoItemCreate,
+    OrcamentoItemRead,
+    OrcamentoPatch,
+    OrcamentoPatchResult,
+    OrcamentoRead,
+    OrcamentoUpdate,
+    PasswordUpdate,
+    ProdutoCreate,
+    ProdutoRead,
+    ProdutosList,
+    ProdutoUpdate,
+    ResetPasswordData,
+    ResultadoLinhaConversao,
+    Token,
+    UserCreate,
+    UserRead,
+    UserUpdate,
+    VendaCreate,
+    VendaItemCreate,
+    VendaRead,
 )
+from app.domain.top_produtos import ranking_produtos
 from app.infra.db.session import get_session
 from app.models import User
-from app.core.security import verify_password, create_access_token
 
 
 class AuthService:
@@ -98,8 +158,9 @@ class UserService:
     def get_by_email(self, email: str) -> Optional[object]:
         """Busca um usuário por email"""
         # Implementação temporária usando crud
-        from app.models import User
         from sqlmodel import select
+
+        from app.models import User
         
         statement = select(User).where(User.email == email)
         user = self.session.exec(statement).first()
@@ -196,6 +257,8 @@ class ProdutoService:
         self.session.add(produto)
         self.session.commit()
         self.session.refresh(produto)
+        motor_canais.marcar(produto.sku)
+        reservas_estoque.definir_estoque(produto.sku, produto.estoque)
         return ProdutoRead.model_validate(produto)
     
     def update(self, produto_id: str, produto_update: ProdutoUpdate) -> ProdutoRead | None:
@@ -216,6 +279,8 @@ class ProdutoService:
             self.session.add(produto)
             self.session.commit()
             self.session.refresh(produto)
+            motor_canais.marcar(produto.sku)
+            reservas_estoque.definir_estoque(produto.sku, produto.estoque)
             return ProdutoRead.model_validate(produto)
         except ValueError:
             return None
@@ -238,6 +303,769 @@ class ProdutoService:
             return False
 
 
+class VendaService:
+    """Serviço de domínio para Vendas"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def registrar(self, venda_create: VendaCreate) -> VendaRead:
+        """Registra uma venda e atualiza os rollups na mesma transação"""
+        venda, itens = self.preparar(venda_create)
+        self.session.commit()
+        self.session.refresh(venda)
+        self.publicar(venda, itens)
+        return VendaRead.model_validate(venda)
+
+    def preparar(self, venda_create: VendaCreate) -> tuple[Venda, list[VendaItem]]:
+        """
+        Grava a venda, os rollups e os contadores do vendedor sem fazer commit,
+        para compor com outras escritas na mesma transação. Depois do commit,
+        chame `publicar`.
+        """
+        criada_em = venda_create.criada_em or datetime.now(timezone.utc)
+        venda = Venda(
+            criada_em=criada_em,
+            dia=dia_da_loja(criada_em),
+            canal=venda_create.canal,
+            vendedor_id=venda_create.vendedor_id,
+        )
+        itens = [
+            VendaItem(venda_id=venda.id, **item.model_dump())
+            for item in venda_create.itens
+        ]
+        venda.total = sum(
+            (i.preco_unitario * i.quantidade for i in itens), Decimal("0")
+        )
+        venda.custo_total = sum(
+            (i.custo_unitario * i.quantidade for i in itens), Decimal("0")
+        )
+
+        self.session.add(venda)
+        self.session.add_all(itens)
+        self.session.flush()
+        RollupService(self.session).registrar(venda, itens)
+        if venda.vendedor_id is not None:
+            ContadoresVendedorService(self.session).registrar_venda(
+                venda.vendedor_id, venda.total, venda.criada_em
+            )
+        return venda, itens
+
+    def publicar(self, venda: Venda, itens: list[VendaItem]) -> None:
+        """Atualiza os rankings em memória e o dashboard com uma venda já gravada"""
+        ranking_produtos.registrar(venda.dia, itens)
+        if venda.vendedor_id is not None:
+            ranking_vendedores.registrar_venda(venda.vendedor_id, venda.total, venda.dia)
+        publicador_dashboard.notificar()
+
+
+CENTAVOS = Decimal("0.01")
+
+STATUS_EDITAVEIS = {"rascunho", "pendente"}
+STATUS_FECHADOS = {"aprovado", "convertido", "concluido"}
+STATUS_PERDIDOS = {"rejeitado", "expirado"}
+STATUS_FINAIS = {"convertido", "concluido"}
+
+# Canal das vendas geradas a partir de orçamentos
+CANAL_VENDA_ORCAMENTO = "Venda Direta"
+
+_CAMPOS_LINHA = ("quantidade", "valor_unitario", "desconto_percentual", "desconto_valor", "observacoes")
+
+
+class ErroOrcamento(ValueError):
+    """Operação inválida sobre um orçamento"""
+
+
+class OrcamentoNaoEditavel(ErroOrcamento):
+    """O status do orçamento não permite a alteração"""
+
+
+class ConflitoVersao(ErroOrcamento):
+    """O cliente editou uma versão que não é mais a atual"""
+
+    def __init__(self, versao_atual: int):
+        super().__init__(f"Orçamento alterado por outra gravação (versão atual: {versao_atual})")
+        self.versao_atual = versao_atual
+
+
+def totais_linha(item: OrcamentoItem) -> tuple[Decimal, Decimal]:
+    """(valor bruto, desconto efetivo) da linha; o desconto nunca passa do bruto."""
+    bruto = (item.valor_unitario * item.quantidade).quantize(CENTAVOS, ROUND_HALF_UP)
+    desconto = item.desconto_valor + bruto * item.desconto_percentual / 100
+    return bruto, min(desconto.quantize(CENTAVOS, ROUND_HALF_UP), bruto)
+
+
+def _identidade_linha(produto_id: uuid.UUID | None, descricao: str | None) -> tuple[object, ...]:
+    return (produto_id,) if produto_id is not None else (None, descricao)
+
+
+class OrcamentoService:
+    """
+    Serviço de domínio para Orçamentos.
+
+    O autosave do rascunho chega como um patch de operações por linha
+    (adicionar/alterar/remover) sobre uma versão. Só as linhas tocadas são
+    lidas e gravadas; os totais do cabeçalho recebem a diferença de cada
+    linha num UPDATE condicionado à versão, que também a incrementa.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    # --- Leitura ---
+
+    def _itens(self, orcamento_id: int) -> list[OrcamentoItem]:
+        return list(
+            self.session.exec(
+                select(OrcamentoItem)
+                .where(OrcamentoItem.orcamento_id == orcamento_id)
+                .order_by(col(OrcamentoItem.posicao))
+            ).all()
+        )
+
+    def _leitura(self, orcamento: Orcamento, itens: list[OrcamentoItem] | None = None) -> OrcamentoRead:
+        assert orcamento.id is not None
+        return OrcamentoRead(
+            **orcamento.model_dump(exclude={"id", "numero", "validade", "criado_em"}),
+            id=orcamento.id,
+            numero_orcamento=orcamento.numero or "",
+            valor_potencial=orcamento.valor_total,
+            validade_orcamento=orcamento.validade,
+            dias_restantes=(orcamento.validade - hoje_na_loja()).days,
+            data_criacao=orcamento.criado_em,
+            itens=[OrcamentoItemRead.model_validate(i) for i in itens] if itens is not None else None,
+        )
+
+    def get(self, orcamento_id: int) -> OrcamentoRead | None:
+        """Busca um orçamento com as linhas"""
+        orcamento = self.session.get(Orcamento, orcamento_id)
+        if orcamento is None:
+            return None
+        return self._leitura(orcamento, self._itens(orcamento_id))
+
+    def list_all(
+        self,
+        skip: int = 0,
+        limit: int = 50,
+        status: str | None = None,
+        vendedor_id: int | None = None,
+        cliente_id: int | None = None,
+    ) -> list[OrcamentoRead]:
+        """Lista orçamentos (sem as linhas), mais recentes primeiro"""
+        statement = select(Orcamento)
+        if status:
+            statement = statement.where(Orcamento.status == status)
+        if vendedor_id is not None:
+            statement = statement.where(Orcamento.vendedor_id == vendedor_id)
+        if cliente_id is not None:
+            statement = statement.where(Orcamento.cliente_id == cliente_id)
+        statement = statement.order_by(col(Orcamento.id).desc()).offset(skip).limit(limit)
+        return [self._leitura(o) for o in self.session.exec(statement).all()]
+
+    # --- Escrita ---
+
+    def _nova_linha(self, orcamento_id: int, posicao: int, dados: OrcamentoItemCreate) -> OrcamentoItem:
+        sku, descricao = dados.sku, dados.produto_avulso
+        if dados.produto_id is not None:
+            produto = self.session.get(Produto, dados.produto_id)
+            if produto is None:
+                raise ErroOrcamento(f"Produto não encontrado: {dados.produto_id}")
+            sku, descricao = produto.sku, descricao or produto.nome
+        if not descricao:
+            raise ErroOrcamento("Informe produto_id ou produto_avulso")
+        item = OrcamentoItem(
+            **dados.model_dump(include=set(_CAMPOS_LINHA)),
+            id=dados.id or uuid.uuid4(),
+            orcamento_id=orcamento_id,
+            posicao=posicao,
+            produto_id=dados.produto_id,
+            sku=sku,
+            descricao=descricao[:255],
+        )
+        bruto, desconto = totais_linha(item)
+        item.desconto_linha, item.valor_total = desconto, bruto - desconto
+        return item
+
+    def create(self, orcamento_create: OrcamentoCreate, vendedor_id: int) -> OrcamentoRead:
+        """Cria um orçamento (rascunho) com as linhas iniciais"""
+        agora = datetime.now(timezone.utc)
+        orcamento = Orcamento(
+            **orcamento_create.model_dump(exclude={"itens"}, exclude_none=True),
+            vendedor_id=vendedor_id,
+            validade=dia_da_loja(agora) + timedelta(days=settings.QUOTE_VALIDITY_DAYS),
+            criado_em=agora,
+            atualizado_em=agora,
+        )
+        self.session.add(orcamento)
+        self.session.flush()
+        assert orcamento.id is not None
+        orcamento.numero = f"ORC-{agora:%Y}-{orcamento.id:06d}"
+        itens = [
+            self._nova_linha(orcamento.id, posicao, dados)
+            for posicao, dados in enumerate(orcamento_create.itens)
+        ]
+        for item in itens:
+            bruto, desconto = totais_linha(item)
+            orcamento.subtotal += bruto
+            orcamento.desconto_total += desconto
+        orcamento.total_itens = len(itens)
+        orcamento.valor_total = orcamento.subtotal - orcamento.desconto_total + orcamento.frete_valor
+        self.session.add_all(itens)
+        self.session.commit()
+        self.session.refresh(orcamento)
+        return self._leitura(orcamento, itens)
+
+    def aplicar_patch(self, orcamento_id: int, patch: OrcamentoPatch) -> OrcamentoPatchResult | None:
+        """
+        Aplica um autosave. Levanta ConflitoVersao se `patch.versao` não for a
+        atual e OrcamentoNaoEditavel fora dos status de rascunho.
+        """
+        orcamento = self.session.get(Orcamento, orcamento_id)
+        if orcamento is None:
+            return None
+        if orcamento.status not in STATUS_EDITAVEIS:
+            raise OrcamentoNaoEditavel(f"Orçamento com status '{orcamento.status}' não pode ser editado")
+        if orcamento.versao != patch.versao:
+            raise ConflitoVersao(orcamento.versao)
+
+        # Só as linhas referenciadas pelo patch são lidas
+        referenciadas = {
+            op.item.id if isinstance(op, OperacaoAdicionar) else op.id for op in patch.operacoes
+        } - {None}
+        linhas: dict[uuid.UUID, OrcamentoItem] = {}
+        if referenciadas:
+            linhas = {
+                i.id: i
+                for i in self.session.exec(
+                    select(OrcamentoItem)
+                    .where(OrcamentoItem.orcamento_id == orcamento_id)
+                    .where(col(OrcamentoItem.id).in_(referenciadas))
+                ).all()
+            }
+        proxima_posicao: int | None = None
+
+        delta_bruto = delta_desconto = Decimal("0")
+        delta_itens = 0
+        gravadas = 0
+        # As linhas novas só vão ao banco no flush abaixo, onde um id de linha
+        # de outro orçamento vira erro de validação em vez de IntegrityError
+        with self.session.no_autoflush:
+            for op in patch.operacoes:
+                if isinstance(op, OperacaoAdicionar):
+                    if op.item.id is not None and op.item.id in linhas:
+                        raise ErroOrcamento(f"Linha já existe: {op.item.id}")
+                    if proxima_posicao is None:
+                        maxima = self.session.exec(
+                            select(func.max(OrcamentoItem.posicao)).where(
+                                OrcamentoItem.orcamento_id == orcamento_id
+                            )
+                        ).one()
+                        proxima_posicao = -1 if maxima is None else maxima
+                    proxima_posicao += 1
+                    item = self._nova_linha(orcamento_id, proxima_posicao, op.item)
+                    linhas[item.id] = item
+                    self.session.add(item)
+                    delta_bruto += totais_linha(item)[0]
+                    delta_desconto += item.desconto_linha
+                    delta_itens += 1
+                else:
+                    item = linhas.get(op.id)
+                    if item is None:
+                        raise ErroOrcamento(f"Linha não encontrada: {op.id}")
+                    bruto_anterior = totais_linha(item)[0]
+                    delta_bruto -= bruto_anterior
+                    delta_desconto -= item.desconto_linha
+                    if isinstance(op, OperacaoRemover):
+                        del linhas[op.id]
+                        self.session.delete(item)
+                        delta_itens -= 1
+                    else:
+                        for campo, valor in op.model_dump(exclude_unset=True, exclude={"op", "id"}).items():
+                            setattr(item, campo, valor)
+                        bruto, desconto = totais_linha(item)
+                        item.desconto_linha, item.valor_total = desconto, bruto - desconto
+                        self.session.add(item)
+                        delta_bruto += bruto
+                        delta_desconto += desconto
+                gravadas += 1
+        try:
+            self.session.flush()
+        except IntegrityError:
+            self.session.rollback()
+            raise ErroOrcamento("Id de linha já usado em outro orçamento")
+
+        cabecalho = patch.cabecalho.model_dump(exclude_unset=True) if patch.cabecalho else {}
+        # Compara-e-incrementa a versão e soma as diferenças numa só instrução:
+        # dois autosaves concorrentes da mesma versão não passam os dois
+        resultado = self.session.exec(  # type: ignore[call-overload]
+            update(Orcamento)
+            .where(col(Orcamento.id) == orcamento_id)
+            .where(col(Orcamento.versao) == patch.versao)
+            .values(
+                **cabecalho,
+                versao=Orcamento.versao + 1,
+                total_itens=Orcamento.total_itens + delta_itens,
+                subtotal=Orcamento.subtotal + delta_bruto,
+                desconto_total=Orcamento.desconto_total + delta_desconto,
+                valor_total=Orcamento.valor_total + delta_bruto - delta_desconto,
+                atualizado_em=datetime.now(timezone.utc),
+            )
+        )
+        if resultado.rowcount == 0:
+            self.session.rollback()
+            atual = self.session.get(Orcamento, orcamento_id)
+            raise ConflitoVersao(atual.versao if atual else patch.versao)
+        self.session.commit()
+        self.session.refresh(orcamento)
+        assert orcamento.id is not None
+        return OrcamentoPatchResult(
+            **orcamento.model_dump(
+                include={"versao", "total_itens", "subtotal", "desconto_total", "frete_valor", "valor_total"}
+            ),
+            id=orcamento.id,
+            linhas_gravadas=gravadas,
+        )
+
+    def update(self, orcamento_id: int, orcamento_update: OrcamentoUpdate) -> OrcamentoRead | None:
+        """
+        Atualização completa (PUT). A lista de itens recebida é comparada com a
+        gravada (pelo id da linha ou, sem id, pelo produto) e convertida num
+        patch, de modo que só as linhas diferentes são escritas.
+        """
+        orcamento = self.session.get(Orcamento, orcamento_id)
+        if orcamento is None:
+            return None
+        operacoes: list[OperacaoAdicionar | OperacaoAlterar | OperacaoRemover] = []
+        if orcamento_update.itens is not None:
+            atuais = self._itens(orcamento_id)
+            por_id = {i.id: i for i in atuais}
+            com_id = {d.id for d in orcamento_update.itens if d.id in por_id}
+            # Linhas sem id casam com a primeira linha gravada do mesmo produto
+            livres: dict[tuple[object, ...], list[OrcamentoItem]] = {}
+            for item in atuais:
+                if item.id not in com_id:
+                    livres.setdefault(_identidade_linha(item.produto_id, item.descricao), []).append(item)
+            usadas: set[uuid.UUID] = set()
+            for dados in orcamento_update.itens:
+                if dados.id in por_id:
+                    existente: OrcamentoItem | None = por_id[dados.id]
+                elif dados.id is None:
+                    candidatas = livres.get(_identidade_linha(dados.produto_id, dados.produto_avulso))
+                    existente = candidatas.pop(0) if candidatas else None
+                else:
+                    existente = None
+                if existente is None or existente.id in usadas:
+                    operacoes.append(OperacaoAdicionar(op="adicionar", item=dados))
+                    continue
+                usadas.add(existente.id)
+                mudancas = {
+                    campo: getattr(dados, campo)
+                    for campo in _CAMPOS_LINHA
+                    if getattr(dados, campo) != getattr(existente, campo)
+                }
+                if mudancas:
+                    operacoes.append(OperacaoAlterar(op="alterar", id=existente.id, **mudancas))
+            operacoes.extend(
+                OperacaoRemover(op="remover", id=i.id) for i in atuais if i.id not in usadas
+            )
+        patch = OrcamentoPatch(
+            versao=orcamento_update.versao or orcamento.versao,
+            cabecalho=orcamento_update.model_dump(exclude_unset=True, exclude={"versao", "itens"}),
+            operacoes=operacoes,
+        )
+        self.aplicar_patch(orcamento_id, patch)
+        return self.get(orcamento_id)
+
+    def aplicar_frete(self, orcamento_id: int, frete: OrcamentoFreteUpdate) -> OrcamentoRead | None:
+        """
+        Grava a opção de frete escolhida e troca o frete no valor total. Como no
+        autosave, a troca é condicionada à versão (a informada ou a lida).
+        """
+        orcamento = self.session.get(Orcamento, orcamento_id)
+        if orcamento is None:
+            return None
+        if orcamento.status in STATUS_FINAIS | STATUS_PERDIDOS:
+            raise OrcamentoNaoEditavel(f"Orçamento com status '{orcamento.status}' não aceita frete")
+        versao = frete.versao or orcamento.versao
+        valor = frete.valor_frete.quantize(CENTAVOS, ROUND_HALF_UP)
+        cep = "".join(c for c in frete.cep_destino or "" if c.isdigit())[:8] or orcamento.frete_cep_destino
+        resultado = self.session.exec(  # type: ignore[call-overload]
+            update(Orcamento)
+            .where(col(Orcamento.id) == orcamento_id)
+            .where(col(Orcamento.versao) == versao)
+            .values(
+                versao=Orcamento.versao + 1,
+                frete_valor=valor,
+                valor_total=Orcamento.valor_total - Orcamento.frete_valor + valor,
+                frete_transportadora=frete.transportadora_frete[:100],
+                frete_servico=(frete.codigo_frete or "")[:100] or None,
+                frete_prazo=frete.prazo_frete,
+                frete_cep_destino=cep,
+                atualizado_em=datetime.now(timezone.utc),
+            )
+        )
+        if resultado.rowcount == 0:
+            self.session.rollback()
+            atual = self.session.get(Orcamento, orcamento_id)
+            raise ConflitoVersao(atual.versao if atual else versao)
+        self.session.commit()
+        self.session.refresh(orcamento)
+        return self._leitura(orcamento)
+
+    def delete(self, orcamento_id: int) -> bool:
+        """Remove um orçamento (as linhas vão junto, por cascata)"""
+        orcamento = self.session.get(Orcamento, orcamento_id)
+        if orcamento is None:
+            return False
+        self.session.exec(  # type: ignore[call-overload]
+            delete(OrcamentoItem).where(col(OrcamentoItem.orcamento_id) == orcamento_id)
+        )
+        self.session.delete(orcamento)
+        self.session.commit()
+        return True
+
+    def mudar_status(
+        self, orcamento_id: int, novo_status: str, observacoes: str | None = None
+    ) -> OrcamentoRead | None:
+        """Muda o status e atualiza os contadores de orçamentos do vendedor"""
+        orcamento = self.session.get(Orcamento, orcamento_id)
+        if orcamento is None:
+            return None
+        anterior = orcamento.status
+        if anterior in STATUS_FINAIS and novo_status != anterior:
+            raise OrcamentoNaoEditavel(f"Orçamento já está '{anterior}'")
+        agora = datetime.now(timezone.utc)
+        contadores = ContadoresVendedorService(self.session)
+        if novo_status == "enviado" and anterior in STATUS_EDITAVEIS:
+            contadores.registrar_orcamento_enviado(orcamento.vendedor_id, agora)
+        elif novo_status in STATUS_FECHADOS and anterior not in STATUS_FECHADOS:
+            contadores.registrar_orcamento_fechado(orcamento.vendedor_id, agora)
+        elif novo_status in STATUS_PERDIDOS and anterior not in STATUS_PERDIDOS:
+            contadores.registrar_orcamento_perdido(orcamento.vendedor_id, agora)
+        orcamento.status = novo_status
+        if observacoes:
+            orcamento.observacoes = observacoes
+        orcamento.versao += 1
+        orcamento.atualizado_em = agora
+        self.session.add(orcamento)
+        self.session.commit()
+        self.session.refresh(orcamento)
+        return self._leitura(orcamento)
+
+
+class EstoqueInsuficiente(ErroOrcamento):
+    """Alguma linha pede mais do que há em estoque; nada foi gravado"""
+
+    def __init__(self, linhas: list[ResultadoLinhaConversao]):
+        faltando = [linha.sku or linha.descricao for linha in linhas if linha.status not in ("baixado", "avulso")]
+        super().__init__(f"Estoque insuficiente para: {', '.join(faltando)}")
+        self.linhas = linhas
+
+
+class ConversaoVendaService:
+    """
+    Converte um orçamento em venda numa única transação.
+
+    O orçamento é travado primeiro e depois só os produtos das suas linhas,
+    em ordem de id (SELECT ... ORDER BY id FOR UPDATE): conversões que
+    disputam os mesmos produtos travam na mesma ordem e não entram em
+    deadlock. O estoque de todos os produtos é debitado num único UPDATE,
+    com a quantidade de cada um num CASE por id. Conta como disponível o
+    estoque menos as reservas de outros donos; as do próprio orçamento são
+    consumidas. Se alguma linha não tiver disponível, nada é gravado e o
+    resultado por linha aponta quais faltaram.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _resultado_linhas(
+        self, itens: list[OrcamentoItem], estoques: dict[uuid.UUID, int]
+    ) -> list[ResultadoLinhaConversao]:
+        restante = dict(estoques)
+        linhas = []
+        for item in itens:
+            linha = ResultadoLinhaConversao(
+                item_id=item.id,
+                produto_id=item.produto_id,
+                sku=item.sku,
+                descricao=item.descricao,
+                quantidade=item.quantidade,
+                status="avulso",
+            )
+            if item.produto_id is not None:
+                anterior = restante.get(item.produto_id)
+                if anterior is None:
+                    linha.status = "produto_inexistente"
+                elif anterior < item.quantidade:
+                    linha.status = "estoque_insuficiente"
+                    linha.estoque_anterior = linha.estoque_atual = anterior
+                else:
+                    restante[item.produto_id] = anterior - item.quantidade
+                    linha.status = "baixado"
+                    linha.estoque_anterior, linha.estoque_atual = anterior, anterior - item.quantidade
+            linhas.append(linha)
+        return linhas
+
+    def converter(self, orcamento_id: int, dados: ConversaoVendaRequest) -> ConversaoVendaResult | None:
+        """
+        Cria a venda, baixa o estoque e marca o orçamento como convertido.
+        Levanta EstoqueInsuficiente (com o resultado por linha) sem gravar nada.
+        """
+        orcamento = self.session.exec(
+            select(Orcamento).where(Orcamento.id == orcamento_id).with_for_update()
+        ).first()
+        if orcamento is None:
+            return None
+        if orcamento.status in STATUS_FINAIS | STATUS_PERDIDOS:
+            raise OrcamentoNaoEditavel(f"Orçamento com status '{orcamento.status}' não pode ser convertido")
+        if dados.versao is not None and dados.versao != orcamento.versao:
+            raise ConflitoVersao(orcamento.versao)
+        itens = list(
+            self.session.exec(
+                select(OrcamentoItem)
+                .where(OrcamentoItem.orcamento_id == orcamento_id)
+                .order_by(col(OrcamentoItem.posicao))
+            ).all()
+        )
+        if not itens:
+            raise ErroOrcamento("Orçamento sem itens")
+
+        # Quantidade total por produto (o mesmo produto pode estar em várias linhas)
+        pedidos: dict[uuid.UUID, int] = {}
+        for item in itens:
+            if item.produto_id is not None:
+                pedidos[item.produto_id] = pedidos.get(item.produto_id, 0) + item.quantidade
+        travados = []
+        if pedidos:
+            travados = self.session.exec(
+                select(Produto.id, Produto.sku, Produto.estoque)
+                .where(col(Produto.id).in_(pedidos))
+                .order_by(col(Produto.id))
+                .with_for_update()
+            ).all()
+        # Disponível = estoque menos o que outros carrinhos/orçamentos reservaram
+        reservas = ReservaEstoqueService(self.session)
+        reservado = reservas.reservado_por_sku(
+            [sku for _, sku, _ in travados], exceto=("orcamento", str(orcamento_id))
+        )
+        disponiveis = {produto_id: estoque - reservado.get(sku, 0) for produto_id, sku, estoque in travados}
+        linhas = self._resultado_linhas(itens, disponiveis)
+        if any(linha.status not in ("baixado", "avulso") for linha in linhas):
+            self.session.rollback()
+            raise EstoqueInsuficiente(linhas)
+
+        if pedidos:
+            quantidade = case(pedidos, value=Produto.id)
+            resultado = self.session.exec(  # type: ignore[call-overload]
+                update(Produto)
+                .where(col(Produto.id).in_(pedidos))
+                .where(col(Produto.estoque) >= quantidade)
+                .values(estoque=Produto.estoque - quantidade)
+                .execution_options(synchronize_session=False)
+            )
+            if resultado.rowcount != len(pedidos):
+                # Sem FOR UPDATE (SQLite), outra baixa pode ter vencido a corrida
+                self.session.rollback()
+                raise ErroOrcamento("Estoque alterado durante a conversão; tente novamente")
+        liberadas = reservas.liberar_referencia("orcamento", str(orcamento_id))
+
+        vendas = VendaService(self.session)
+        venda, venda_itens = vendas.preparar(
+            VendaCreate(
+                canal=CANAL_VENDA_ORCAMENTO,
+                vendedor_id=dados.vendedor_id or orcamento.vendedor_id,
+                itens=[
+                    VendaItemCreate(
+                        sku=item.sku or item.descricao[:100],
+                        quantidade=item.quantidade,
+                        preco_unitario=(item.valor_total / item.quantidade).quantize(CENTAVOS, ROUND_HALF_UP),
+                    )
+                    for item in itens
+                ],
+            )
+        )
+        agora = datetime.now(timezone.utc)
+        if orcamento.status not in STATUS_FECHADOS:
+            ContadoresVendedorService(self.session).registrar_orcamento_fechado(orcamento.vendedor_id, agora)
+        orcamento.status = "convertido"
+        orcamento.venda_id = venda.id
+        if dados.observacoes:
+            orcamento.observacoes = dados.observacoes
+        orcamento.versao += 1
+        orcamento.atualizado_em = agora
+        self.session.add(orcamento)
+        venda_id, total = venda.id, venda.total
+        self.session.commit()
+
+        vendas.publicar(venda, venda_itens)
+        reservas_estoque.remover(liberadas)
+        for produto_id, sku, estoque in travados:
+            reservas_estoque.definir_estoque(sku, estoque - pedidos[produto_id])
+            motor_canais.marcar(sku)
+        return ConversaoVendaResult(
+            sucesso=True, orcamento_id=orcamento_id, venda_id=venda_id, total=total, linhas=linhas
+        )
+
+
+# Limite de clientes por página nas listagens e buscas
+MAX_CLIENTES_POR_PAGINA = 100
+
+
+class ClienteService:
+    """
+    Serviço de domínio para Clientes.
+
+    A busca compara formas normalizadas: dígitos do telefone e do CPF/CNPJ por
+    prefixo e pedaços do nome sem acento. As páginas saem em ordem de
+    (nome_normalizado, id), a ordem do índice; `apos` (id do último cliente
+    da página anterior) continua dali sem OFFSET.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    @staticmethod
+    def _normalizar(cliente: Cliente) -> None:
+        documento = normalizar_documento(cliente.cpf_cnpj)
+        if documento and len(documento) not in (11, 14):
+            raise ValueError("CPF/CNPJ deve ter 11 (CPF) ou 14 (CNPJ) dígitos")
+        cliente.nome_normalizado = normalizar_nome(cliente.nome)
+        cliente.documento = documento or None
+        cliente.telefone_digitos = normalizar_telefone(cliente.telefone) or None
+
+    @staticmethod
+    def _read(cliente: Cliente) -> ClienteRead:
+        return ClienteRead.model_validate(cliente, from_attributes=True)
+
+    def _paginar(self, statement, skip: int, limit: int, apos: int | None) -> list[ClienteRead]:
+        limit = max(0, min(limit, MAX_CLIENTES_POR_PAGINA))
+        if apos is not None:
+            ultimo = self.session.get(Cliente, apos)
+            if ultimo is not None:
+                statement = statement.where(
+                    tuple_(Cliente.nome_normalizado, Cliente.id)
+                    > tuple_(ultimo.nome_normalizado, ultimo.id)
+                )
+                skip = 0
+        statement = statement.order_by(Cliente.nome_normalizado, Cliente.id).offset(skip).limit(limit)
+        return [self._read(cliente) for cliente in self.session.exec(statement).all()]
+
+    @staticmethod
+    def _filtro_nome(statement, nome: str):
+        # Cada palavra é um LIKE '%palavra%', atendido pelo índice de trigramas.
+        # Os padrões vão prontos (valores normalizados não têm % nem _) para o
+        # planejador enxergar uma constante e usar os índices.
+        for palavra in normalizar_nome(nome).split():
+            statement = statement.where(col(Cliente.nome_normalizado).like(f"%{palavra}%"))
+        return statement
+
+    def get(self, cliente_id: int) -> ClienteRead | None:
+        cliente = self.session.get(Cliente, cliente_id)
+        return self._read(cliente) if cliente else None
+
+    def listar(
+        self,
+        nome: str | None = None,
+        telefone: str | None = None,
+        cpf_cnpj: str | None = None,
+        skip: int = 0,
+        limit: int = 50,
+        apos: int | None = None,
+    ) -> list[ClienteRead]:
+        """Lista clientes filtrando por nome (trechos), telefone e CPF/CNPJ (prefixo dos dígitos)."""
+        statement = select(Cliente)
+        if nome:
+            statement = self._filtro_nome(statement, nome)
+        if telefone and (digitos := normalizar_telefone(telefone)):
+            statement = statement.where(col(Cliente.telefone_digitos).like(f"{digitos}%"))
+        if cpf_cnpj and (digitos := normalizar_documento(cpf_cnpj)):
+            statement = statement.where(col(Cliente.documento).like(f"{digitos}%"))
+        return self._paginar(statement, skip, limit, apos)
+
+    def buscar(self, termo: str, skip: int = 0, limit: int = 20, apos: int | None = None) -> list[ClienteRead]:
+        """
+        Busca do campo único da tela: termo só com dígitos (e pontuação) é
+        prefixo de CPF/CNPJ ou telefone; qualquer outro é trecho do nome.
+        """
+        termo = termo.strip()
+        if not termo:
+            return []
+        digitos = so_digitos(termo)
+        if digitos and not any(c.isalpha() for c in termo):
+            telefone = normalizar_telefone(termo)
+            statement = select(Cliente).where(
+                col(Cliente.documento).like(f"{digitos}%")
+                | col(Cliente.telefone_digitos).like(f"{telefone}%")
+            )
+        else:
+            statement = self._filtro_nome(select(Cliente), termo)
+        return self._paginar(statement, skip, limit, apos)
+
+    def create(self, cliente_create: ClienteCreate) -> ClienteRead:
+        cliente = Cliente.model_validate(cliente_create)
+        self._normalizar(cliente)
+        self.session.add(cliente)
+        if cliente.vendedor_id is not None:
+            ContadoresVendedorService(self.session).registrar_novo_cliente(cliente.vendedor_id)
+        self.session.commit()
+        self.session.refresh(cliente)
+        return self._read(cliente)
+
+    def update(self, cliente_id: int, cliente_update: ClienteUpdate) -> ClienteRead | None:
+        cliente = self.session.get(Cliente, cliente_id)
+        if not cliente:
+            return None
+        for field, value in cliente_update.model_dump(exclude_unset=True).items():
+            setattr(cliente, field, value)
+        self._normalizar(cliente)
+        cliente.atualizado_em = datetime.now(timezone.utc)
+        self.session.add(cliente)
+        self.session.commit()
+        self.session.refresh(cliente)
+        return self._read(cliente)
+
+    def delete(self, cliente_id: int) -> bool:
+        cliente = self.session.get(Cliente, cliente_id)
+        if not cliente:
+            return False
+        self.session.delete(cliente)
+        self.session.commit()
+        return True
+
+
+class AnuncioMLService:
+    """Leitura dos anúncios do Mercado Livre espelhados na tabela anuncioml"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def listar(self, skip: int = 0, limit: int = 100) -> dict[str, Any]:
+        """Página de anúncios sincronizados, no formato da tela de anúncios."""
+        total = self.session.exec(select(func.count()).select_from(AnuncioML)).one()
+        anuncios = self.session.exec(
+            select(AnuncioML).order_by(col(AnuncioML.id)).offset(skip).limit(limit)
+        ).all()
+        return {
+            "produtos": [
+                {
+                    "id": anuncio.id,
+                    "sku": anuncio.sku,
+                    "titulo": anuncio.titulo,
+                    "preco": float(anuncio.preco),
+                    "estoque": anuncio.estoque,
+                    "status": anuncio.status,
+                    "permalink": anuncio.permalink,
+                    "thumbnail": anuncio.thumbnail,
+                    "sincronizado_em": anuncio.sincronizado_em,
+                }
+                for anuncio in anuncios
+            ],
+            "produtos_encontrados": total,
+            "vendedor": settings.ML_SELLER_ID,
+        }
+
+
 # Factories para criar instâncias dos serviços
 def get_auth_service() -> AuthService:
     """Factory para criar instância do AuthService"""
@@ -261,4 +1089,32 @@ def get_private_service() -> PrivateService:
 
 def get_produto_service() -> ProdutoService:
     """Factory para criar instância do ProdutoService"""
-    return ProdutoService(get_session()) 
\ No newline at end of file
+    return ProdutoService(get_session())
+
+def get_venda_service() -> VendaService:
+    """Factory para criar instância do VendaService"""
+    return VendaService(get_session())
+
+def get_orcamento_service() -> OrcamentoService:
+    """Factory para criar instância do OrcamentoService"""
+    return OrcamentoService(get_session())
+
+def get_conversao_venda_service() -> ConversaoVendaService:
+    """Factory para criar instância do ConversaoVendaService"""
+    return ConversaoVendaService(get_session())
+
+def get_reserva_estoque_service() -> ReservaEstoqueService:
+    """Factory para criar instância do ReservaEstoqueService"""
+    return ReservaEstoqueService(get_session())
+
+def get_cliente_service() -> ClienteService:
+    """Factory para criar instância do ClienteService"""
+    return ClienteService(get_session())
+
+def get_sugestoes_mesclagem_service() -> SugestoesMesclagemService:
+    """Factory para criar instância do SugestoesMesclagemService"""
+    return SugestoesMesclagemService(get_session())
+
+def get_anuncio_ml_service() -> AnuncioMLService:
+    """Factory para criar instância do AnuncioMLService"""
+    return AnuncioMLService(get_session())
@@ -0,0 +1,274 @@
+"""
+Sincronização incremental dos anúncios do Mercado Livre para a tabela anuncioml.
+
+1. Percorre os ids de todos os anúncios do vendedor (scan paginado).
+2. Busca só o `last_updated` de cada anúncio (multiget com `attributes`, uma
+   resposta mínima) e compara com o cursor guardado localmente.
+3. Busca completos apenas os anúncios novos ou alterados e grava em lotes com
+   upsert; a gravação de um lote roda em thread enquanto o próximo é buscado.
+
+Com `completo=True` a etapa 2 é pulada e todos os anúncios são relidos.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any
+
+import anyio.to_thread
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.domain.models import AnuncioML
+from app.infra.mercado_livre import (
+    TAMANHO_MULTIGET,
+    ClienteMercadoLivre,
+    ErroMercadoLivre,
+)
+
+logger = logging.getLogger(__name__)
+
+_ATRIBUTOS_CURSOR = ["id", "last_updated"]
+_MAXIMO_DETALHES_ERRO = 20
+
+
+def _em_lotes(itens: Sequence[str], tamanho: int) -> Iterator[list[str]]:
+    for inicio in range(0, len(itens), tamanho):
+        yield list(itens[inicio : inicio + tamanho])
+
+
+def _instante(valor: str | datetime) -> datetime:
+    """Normaliza datas do ML (ISO 8601, com Z) e do banco para UTC com fuso."""
+    if isinstance(valor, str):
+        valor = datetime.fromisoformat(valor.replace("Z", "+00:00"))
+    if valor.tzinfo is None:
+        return valor.replace(tzinfo=timezone.utc)
+    return valor.astimezone(timezone.utc)
+
+
+def _sku(corpo: dict[str, Any]) -> str | None:
+    if corpo.get("seller_custom_field"):
+        return str(corpo["seller_custom_field"])
+    for atributo in corpo.get("attributes") or []:
+        if atributo.get("id") == "SELLER_SKU" and atributo.get("value_name"):
+            return str(atributo["value_name"])
+    return None
+
+
+def _para_linha(corpo: dict[str, Any], agora: datetime) -> dict[str, Any]:
+    return {
+        "id": corpo["id"],
+        "sku": _sku(corpo),
+        "titulo": str(corpo.get("title") or "")[:255],
+        "preco": Decimal(str(corpo.get("price") or 0)),
+        "estoque": int(corpo.get("available_quantity") or 0),
+        "status": str(corpo.get("status") or ""),
+        "permalink": corpo.get("permalink"),
+        "thumbnail": corpo.get("thumbnail"),
+        "atualizado_ml_em": _instante(corpo["last_updated"]),
+        "sincronizado_em": agora,
+    }
+
+
+def _upsert_anuncios(session: Session, linhas: list[dict[str, Any]]) -> None:
+    tabela = AnuncioML.__table__  # type: ignore[attr-defined]
+    dialeto = session.get_bind().dialect.name
+    if dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        for linha in linhas:
+            session.merge(AnuncioML(**linha))
+        return
+    stmt = insert(tabela).values(linhas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[tabela.c.id],
+        set_={coluna: stmt.excluded[coluna] for coluna in linhas[0] if coluna != "id"},
+    )
+    session.exec(stmt)  # type: ignore[call-overload]
+
+
+@dataclass
+class ResultadoSincronizacao:
+    total_encontrados: int = 0
+    alterados: int = 0
+    gravados: int = 0
+    erros: int = 0
+    requisicoes: int = 0
+    repeticoes: int = 0
+    limitadas: int = 0
+    duracao_s: float = 0.0
+    detalhes_erros: list[str] = field(default_factory=list)
+
+    def registrar_erro(self, quantidade: int, mensagem: str) -> None:
+        self.erros += quantidade
+        if len(self.detalhes_erros) < _MAXIMO_DETALHES_ERRO:
+            self.detalhes_erros.append(mensagem)
+
+
+class SincronizadorMercadoLivre:
+    """Executa uma sincronização; `abrir_sessao` cria uma sessão por operação no banco."""
+
+    def __init__(
+        self,
+        cliente: ClienteMercadoLivre,
+        abrir_sessao: Callable[[], Session],
+        seller_id: str,
+        tamanho_lote: int | None = None,
+    ):
+        self.cliente = cliente
+        self.abrir_sessao = abrir_sessao
+        self.seller_id = seller_id
+        self.tamanho_lote = tamanho_lote or settings.ML_SYNC_BATCH_SIZE
+        self.resultado = ResultadoSincronizacao()
+
+    def _carregar_cursores(self) -> dict[str, datetime]:
+        with self.abrir_sessao() as session:
+            linhas = session.exec(
+                select(AnuncioML.id, AnuncioML.atualizado_ml_em)
+            ).all()
+        return {id_: _instante(atualizado) for id_, atualizado in linhas}
+
+    def _gravar(self, linhas: list[dict[str, Any]]) -> None:
+        with self.abrir_sessao() as session:
+            _upsert_anuncios(session, linhas)
+            session.commit()
+
+    async def _multiget_concorrente(
+        self, ids: list[str], atributos: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Busca os ids em blocos de 20, todos em paralelo (o cliente limita a concorrência)."""
+        blocos = list(_em_lotes(ids, TAMANHO_MULTIGET))
+        respostas = await asyncio.gather(
+            *(self.cliente.multiget(bloco, atributos) for bloco in blocos),
+            return_exceptions=True,
+        )
+        corpos: list[dict[str, Any]] = []
+        for bloco, resposta in zip(blocos, respostas, strict=True):
+            if isinstance(resposta, ErroMercadoLivre):
+                self.resultado.registrar_erro(len(bloco), str(resposta))
+            elif isinstance(resposta, BaseException):
+                raise resposta
+            else:
+                corpos.extend(resposta)
+        return corpos
+
+    async def _alterados(
+        self, ids: list[str], cursores: dict[str, datetime]
+    ) -> list[str]:
+        alterados: list[str] = []
+        for lote in _em_lotes(ids, self.tamanho_lote):
+            for corpo in await self._multiget_concorrente(lote, _ATRIBUTOS_CURSOR):
+                local = cursores.get(corpo["id"])
+                if local is None or _instante(corpo["last_updated"]) > local:
+                    alterados.append(corpo["id"])
+        return alterados
+
+    async def executar(self, completo: bool = False) -> ResultadoSincronizacao:
+        inicio = time.perf_counter()
+        cursores = (
+            {} if completo else await anyio.to_thread.run_sync(self._carregar_cursores)
+        )
+
+        ids: list[str] = []
+        async for pagina in self.cliente.ids_do_vendedor(self.seller_id):
+            ids.extend(pagina)
+        self.resultado.total_encontrados = len(ids)
+
+        alterados = ids if completo else await self._alterados(ids, cursores)
+        self.resultado.alterados = len(alterados)
+
+        gravacao: asyncio.Future[None] | None = None
+        for lote in _em_lotes(alterados, self.tamanho_lote):
+            corpos = await self._multiget_concorrente(lote)
+            agora = datetime.now(timezone.utc)
+            linhas = [_para_linha(corpo, agora) for corpo in corpos]
+            if gravacao is not None:
+                await gravacao
+            if linhas:
+                gravacao = asyncio.ensure_future(
+                    anyio.to_thread.run_sync(self._gravar, linhas)
+                )
+                self.resultado.gravados += len(linhas)
+        if gravacao is not None:
+            await gravacao
+
+        self.resultado.requisicoes = self.cliente.requisicoes
+        self.resultado.repeticoes = self.cliente.repeticoes
+        self.resultado.limitadas = self.cliente.limitadas
+        self.resultado.duracao_s = round(time.perf_counter() - inicio, 3)
+        return self.resultado
+
+
+class GerenciadorSincronizacaoML:
+    """Garante uma sincronização por vez no processo e guarda o estado da última."""
+
+    def __init__(self) -> None:
+        self._tarefa: asyncio.Task[None] | None = None
+        self.estado = "ociosa"
+        self.iniciada_em: datetime | None = None
+        self.concluida_em: datetime | None = None
+        self.completa = False
+        self.ultimo_resultado: ResultadoSincronizacao | None = None
+        self.erro: str | None = None
+
+    @property
+    def em_andamento(self) -> bool:
+        return self._tarefa is not None and not self._tarefa.done()
+
+    def iniciar(self, completo: bool = False) -> bool:
+        """Dispara a sincronização em segundo plano; False se já houver uma rodando."""
+        if self.em_andamento:
+            return False
+        self.estado = "em_andamento"
+        self.iniciada_em = datetime.now(timezone.utc)
+        self.concluida_em = None
+        self.completa = completo
+        self.erro = None
+        self._tarefa = asyncio.create_task(self._executar(completo))
+        return True
+
+    async def _executar(self, completo: bool) -> None:
+        from app.infra.db.session import get_session
+
+        def abrir_sessao() -> Session:
+            session = get_session()
+            if session is None:
+                raise RuntimeError("Banco de dados indisponível")
+            return session
+
+        try:
+            if not settings.ML_SELLER_ID:
+                raise RuntimeError("ML_SELLER_ID não configurado")
+            async with ClienteMercadoLivre() as cliente:
+                sincronizador = SincronizadorMercadoLivre(
+                    cliente, abrir_sessao, settings.ML_SELLER_ID
+                )
+                self.ultimo_resultado = await sincronizador.executar(completo)
+            self.estado = "concluida"
+        except Exception as exc:
+            logger.exception("Falha na sincronização com o Mercado Livre")
+            self.estado = "erro"
+            self.erro = str(exc)
+        finally:
+            self.concluida_em = datetime.now(timezone.utc)
+
+    def resumo(self) -> dict[str, Any]:
+        return {
+            "estado": self.estado,
+            "completa": self.completa,
+            "iniciada_em": self.iniciada_em,
+            "concluida_em": self.concluida_em,
+            "erro": self.erro,
+            "resultado": asdict(self.ultimo_resultado)
+            if self.ultimo_resultado
+            else None,
+        }
+
+
+sincronizacao_ml = GerenciadorSincronizacaoML()
@@ -0,0 +1,226 @@
+"""
+Ranking em memória dos produtos mais vendidos por janela (dia, semana, mês).
+
+Cada venda registrada soma suas linhas aos totais por SKU das janelas
+correntes e ajusta um top-N já ordenado para cada critério (unidades,
+faturamento e margem). A leitura devolve a lista pronta, sem ORDER BY sobre as
+linhas de venda; a atualização custa O(N) por SKU, com N pequeno (10).
+
+Os totais são exatos: o número de SKUs vendidos num mês é limitado pelo
+catálogo, então não há ganho em aproximar com count-min sketch. Na
+inicialização as janelas são preenchidas a partir dos rollups diários por
+produto (uma linha por SKU e dia), não das vendas brutas.
+"""
+
+import heapq
+import logging
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.domain.models import VendaItem, VendaRollup
+from app.domain.rollups import DIMENSAO_PRODUTO, hoje_na_loja
+
+logger = logging.getLogger(__name__)
+
+JANELA_DIA = "dia"
+JANELA_SEMANA = "semana"
+JANELA_MES = "mes"
+JANELAS = (JANELA_DIA, JANELA_SEMANA, JANELA_MES)
+
+CRITERIO_QUANTIDADE = "quantidade"
+CRITERIO_FATURAMENTO = "faturamento"
+# Margem de contribuição em reais (faturamento - custo); o percentual vai na resposta
+CRITERIO_MARGEM = "margem"
+CRITERIOS = (CRITERIO_QUANTIDADE, CRITERIO_FATURAMENTO, CRITERIO_MARGEM)
+
+
+def inicio_da_janela(janela: str, dia: date) -> date:
+    """Primeiro dia da janela que contém `dia` (semana começa na segunda)."""
+    if janela == JANELA_SEMANA:
+        return dia - timedelta(days=dia.weekday())
+    if janela == JANELA_MES:
+        return dia.replace(day=1)
+    return dia
+
+
+@dataclass
+class TotaisProduto:
+    quantidade: int = 0
+    faturamento: Decimal = Decimal("0")
+    custo: Decimal = Decimal("0")
+
+    def valor(self, criterio: str) -> Decimal | int:
+        if criterio == CRITERIO_QUANTIDADE:
+            return self.quantidade
+        if criterio == CRITERIO_FATURAMENTO:
+            return self.faturamento
+        return self.faturamento - self.custo
+
+    def margem_percentual(self) -> float:
+        if not self.faturamento:
+            return 0.0
+        return round(float((self.faturamento - self.custo) / self.faturamento * 100), 1)
+
+
+class _Janela:
+    """Totais por SKU de uma janela e o top-N ordenado de cada critério."""
+
+    def __init__(self, inicio: date, tamanho: int):
+        self.inicio = inicio
+        self.tamanho = tamanho
+        self.totais: dict[str, TotaisProduto] = {}
+        self.tops: dict[str, list[str]] = {criterio: [] for criterio in CRITERIOS}
+
+    def somar(
+        self, sku: str, quantidade: int, faturamento: Decimal, custo: Decimal
+    ) -> None:
+        totais = self.totais.setdefault(sku, TotaisProduto())
+        anterior = {criterio: totais.valor(criterio) for criterio in CRITERIOS}
+        totais.quantidade += quantidade
+        totais.faturamento += faturamento
+        totais.custo += custo
+        for criterio in CRITERIOS:
+            self._ajustar(criterio, sku, anterior[criterio])
+
+    def _ajustar(self, criterio: str, sku: str, anterior: Decimal | int) -> None:
+        top = self.tops[criterio]
+        valor = self.totais[sku].valor(criterio)
+
+        def chave(s: str) -> Decimal | int:
+            return self.totais[s].valor(criterio)
+
+        if sku in top:
+            if valor < anterior:
+                # Só a margem pode cair (venda abaixo do custo); o próximo
+                # colocado pode estar fora do top, então recalcula a partir dos totais
+                self.tops[criterio] = heapq.nlargest(
+                    self.tamanho, self.totais, key=chave
+                )
+                return
+            top.remove(sku)
+        elif len(top) >= self.tamanho and valor <= chave(top[-1]):
+            return
+        posicao = 0
+        while posicao < len(top) and chave(top[posicao]) >= valor:
+            posicao += 1
+        top.insert(posicao, sku)
+        del top[self.tamanho :]
+
+    def top(self, criterio: str, limite: int) -> list[dict[str, Any]]:
+        return [
+            {
+                "sku": sku,
+                "vendas": self.totais[sku].quantidade,
+                "faturamento": float(self.totais[sku].faturamento),
+                "lucro": float(self.totais[sku].faturamento - self.totais[sku].custo),
+                "margem": self.totais[sku].margem_percentual(),
+            }
+            for sku in self.tops[criterio][:limite]
+        ]
+
+
+class RankingProdutos:
+    """Top-N de produtos por janela e critério, compartilhado pelo processo."""
+
+    def __init__(self, tamanho: int):
+        self.tamanho = tamanho
+        self._lock = threading.Lock()
+        self._janelas: dict[str, _Janela] = {}
+
+    def _janela(self, nome: str, dia: date) -> _Janela | None:
+        """Janela corrente que contém `dia`, virando-a se `dia` já é de outra."""
+        inicio = inicio_da_janela(nome, dia)
+        atual = self._janelas.get(nome)
+        if atual is None or inicio > atual.inicio:
+            atual = self._janelas[nome] = _Janela(inicio, self.tamanho)
+        elif inicio < atual.inicio:
+            return None  # venda de uma janela que já foi encerrada
+        return atual
+
+    def _somar(
+        self, dia: date, sku: str, quantidade: int, faturamento: Decimal, custo: Decimal
+    ) -> None:
+        for nome in JANELAS:
+            janela = self._janela(nome, dia)
+            if janela is not None:
+                janela.somar(sku, quantidade, faturamento, custo)
+
+    def registrar(self, dia: date, itens: Iterable[VendaItem]) -> None:
+        """Soma as linhas de uma venda às janelas que contêm `dia`."""
+        with self._lock:
+            for item in itens:
+                self._somar(
+                    dia,
+                    item.sku,
+                    item.quantidade,
+                    item.preco_unitario * item.quantidade,
+                    item.custo_unitario * item.quantidade,
+                )
+
+    def carregar(self, session: Session, hoje: date | None = None) -> int:
+        """Recria as janelas correntes a partir dos rollups diários por produto."""
+        hoje = hoje or hoje_na_loja()
+        desde = min(inicio_da_janela(nome, hoje) for nome in JANELAS)
+        linhas = session.exec(
+            select(VendaRollup)
+            .where(VendaRollup.dimensao == DIMENSAO_PRODUTO)
+            .where(col(VendaRollup.dia).between(desde, hoje))
+            .order_by(col(VendaRollup.dia))
+        ).all()
+        with self._lock:
+            self._janelas = {
+                nome: _Janela(inicio_da_janela(nome, hoje), self.tamanho)
+                for nome in JANELAS
+            }
+            for linha in linhas:
+                self._somar(
+                    linha.dia,
+                    linha.chave,
+                    linha.quantidade,
+                    linha.faturamento,
+                    linha.custo,
+                )
+        return len(linhas)
+
+    def top(
+        self,
+        janela: str = JANELA_MES,
+        criterio: str = CRITERIO_QUANTIDADE,
+        limite: int = 10,
+        hoje: date | None = None,
+    ) -> list[dict[str, Any]]:
+        """Os `limite` (até `tamanho`) produtos da janela corrente pelo critério."""
+        if janela not in JANELAS or criterio not in CRITERIOS:
+            raise ValueError(f"Janela ou critério inválido: {janela}/{criterio}")
+        hoje = hoje or hoje_na_loja()
+        with self._lock:
+            atual = self._janelas.get(janela)
+            # Sem vendas desde a virada (ex.: meia-noite) a janela guardada é a anterior
+            if atual is None or atual.inicio != inicio_da_janela(janela, hoje):
+                return []
+            return atual.top(criterio, limite)
+
+
+ranking_produtos = RankingProdutos(settings.TOP_PRODUCTS_SIZE)
+
+
+def carregar_ranking_produtos() -> None:
+    """Preenche o ranking na inicialização; sem banco disponível, começa vazio."""
+    from app.infra.db.session import get_session
+
+    session = get_session()
+    if session is None:
+        return
+    try:
+        with session:
+            linhas = ranking_produtos.carregar(session)
+        logger.info("Ranking de produtos carregado de %s linhas de rollup", linhas)
+    except Exception:
+        logger.exception("Falha ao carregar o ranking de produtos")
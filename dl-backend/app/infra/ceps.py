@@ -0,0 +1,151 @@
+"""
+Índice local de faixas de CEP, para validar CEPs sem chamada externa.
+
+As faixas ficam em dois arrays ordenados (início e fim, como inteiros de 8
+dígitos) e a busca é um `bisect`: alguns KB de memória e microssegundos por
+consulta. Por padrão o índice tem as faixas de cada UF; com CEP_RANGES_FILE
+ele carrega um CSV mais detalhado (`inicio,fim,uf,cidade`, uma faixa por
+linha, como as tabelas de faixas por localidade dos Correios).
+"""
+
+import bisect
+import csv
+import logging
+import re
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Faixas de CEP por UF (5 primeiros dígitos)
+FAIXAS_UF: list[tuple[str, str, str]] = [
+    ("01000", "19999", "SP"),
+    ("20000", "28999", "RJ"),
+    ("29000", "29999", "ES"),
+    ("30000", "39999", "MG"),
+    ("40000", "48999", "BA"),
+    ("49000", "49999", "SE"),
+    ("50000", "56999", "PE"),
+    ("57000", "57999", "AL"),
+    ("58000", "58999", "PB"),
+    ("59000", "59999", "RN"),
+    ("60000", "63999", "CE"),
+    ("64000", "64999", "PI"),
+    ("65000", "65999", "MA"),
+    ("66000", "68899", "PA"),
+    ("68900", "68999", "AP"),
+    ("69000", "69299", "AM"),
+    ("69300", "69399", "RR"),
+    ("69400", "69899", "AM"),
+    ("69900", "69999", "AC"),
+    ("70000", "72799", "DF"),
+    ("72800", "72999", "GO"),
+    ("73000", "73699", "DF"),
+    ("73700", "76799", "GO"),
+    ("76800", "76999", "RO"),
+    ("77000", "77999", "TO"),
+    ("78000", "78899", "MT"),
+    ("79000", "79999", "MS"),
+    ("80000", "87999", "PR"),
+    ("88000", "89999", "SC"),
+    ("90000", "99999", "RS"),
+]
+
+REGIOES: dict[str, str] = {
+    **dict.fromkeys(("AC", "AM", "AP", "PA", "RO", "RR", "TO"), "Norte"),
+    **dict.fromkeys(("AL", "BA", "CE", "MA", "PB", "PE", "PI", "RN", "SE"), "Nordeste"),
+    **dict.fromkeys(("DF", "GO", "MS", "MT"), "Centro-Oeste"),
+    **dict.fromkeys(("ES", "MG", "RJ", "SP"), "Sudeste"),
+    **dict.fromkeys(("PR", "RS", "SC"), "Sul"),
+}
+
+_NAO_DIGITOS = re.compile(r"\D")
+
+
+def normalizar_cep(cep: str) -> str | None:
+    """Só os dígitos do CEP, ou None se não tiver 8 dígitos."""
+    digitos = _NAO_DIGITOS.sub("", cep or "")
+    return digitos if len(digitos) == 8 else None
+
+
+@dataclass(frozen=True)
+class LocalCEP:
+    cep: str
+    uf: str
+    regiao: str
+    cidade: str | None = None
+
+    @property
+    def formatado(self) -> str:
+        return f"{self.cep[:5]}-{self.cep[5:]}"
+
+
+class IndiceCEP:
+    def __init__(self, faixas: list[tuple[int, int, str, str | None]]):
+        faixas = sorted(faixas)
+        self._inicios = array("I", (f[0] for f in faixas))
+        self._fins = array("I", (f[1] for f in faixas))
+        # UFs e cidades se repetem muito: guardadas uma vez, referenciadas por índice
+        self._nomes: list[tuple[str, str | None]] = []
+        posicoes: dict[tuple[str, str | None], int] = {}
+        self._locais = array("H")
+        for _, _, uf, cidade in faixas:
+            chave = (uf, cidade)
+            if chave not in posicoes:
+                posicoes[chave] = len(self._nomes)
+                self._nomes.append(chave)
+            self._locais.append(posicoes[chave])
+
+    def __len__(self) -> int:
+        return len(self._inicios)
+
+    @classmethod
+    def por_uf(cls) -> "IndiceCEP":
+        return cls(
+            [(int(i + "000"), int(f + "999"), uf, None) for i, f, uf in FAIXAS_UF]
+        )
+
+    @classmethod
+    def de_arquivo(cls, caminho: str | Path) -> "IndiceCEP":
+        faixas: list[tuple[int, int, str, str | None]] = []
+        with open(caminho, newline="", encoding="utf-8") as arquivo:
+            for linha in csv.reader(arquivo):
+                if not linha or not linha[0].strip()[:1].isdigit():
+                    continue  # cabeçalho ou linha vazia
+                inicio, fim = normalizar_cep(linha[0]), normalizar_cep(linha[1])
+                if inicio is None or fim is None:
+                    continue
+                cidade = (
+                    linha[3].strip() if len(linha) > 3 and linha[3].strip() else None
+                )
+                faixas.append((int(inicio), int(fim), linha[2].strip().upper(), cidade))
+        return cls(faixas)
+
+    def buscar(self, cep: str) -> LocalCEP | None:
+        """Localidade do CEP, ou None se for inválido ou não estiver em nenhuma faixa."""
+        digitos = normalizar_cep(cep)
+        if digitos is None:
+            return None
+        numero = int(digitos)
+        posicao = bisect.bisect_right(self._inicios, numero) - 1
+        if posicao < 0 or numero > self._fins[posicao]:
+            return None
+        uf, cidade = self._nomes[self._locais[posicao]]
+        return LocalCEP(cep=digitos, uf=uf, regiao=REGIOES.get(uf, ""), cidade=cidade)
+
+
+def _carregar_indice() -> IndiceCEP:
+    if settings.CEP_RANGES_FILE:
+        try:
+            indice = IndiceCEP.de_arquivo(settings.CEP_RANGES_FILE)
+            logger.info("Índice de CEP carregado com %s faixas", len(indice))
+            return indice
+        except OSError:
+            logger.exception("Falha ao ler CEP_RANGES_FILE; usando as faixas por UF")
+    return IndiceCEP.por_uf()
+
+
+indice_cep = _carregar_indice()
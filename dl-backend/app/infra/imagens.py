@@ -0,0 +1,240 @@
+"""
+Armazenamento e processamento das fotos dos anúncios.
+
+Uploads são gravados em disco em blocos, calculando o SHA-256 enquanto
+chegam; o hash é o nome do arquivo, então a mesma foto enviada duas vezes é
+guardada uma vez só. As versões derivadas (tamanhos dos marketplaces, fundo
+removido) são geradas num `ProcessPoolExecutor`, fora dos workers da API, e
+ficam em cache no disco: processar de novo a mesma foto é só ler o arquivo.
+
+    <IMAGE_STORE_DIR>/originais/ab/abcdef....jpg
+    <IMAGE_STORE_DIR>/derivadas/abcdef.../ml.jpg
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import anyio.to_thread
+
+from app.core.config import settings
+from app.core.singleflight import singleflight
+
+TAMANHO_BLOCO = 1024 * 1024
+
+# Versões geradas: (lado máximo em px, formato, qualidade)
+VERSOES: dict[str, tuple[int, str, int]] = {
+    "ml": (1200, "JPEG", 90),  # Mercado Livre: mínimo recomendado 1200px
+    "shopify": (2048, "JPEG", 85),
+    "miniatura": (300, "JPEG", 80),
+    "sem_fundo": (1200, "PNG", 0),
+}
+
+_EXTENSOES = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp"}
+
+
+class ImagemInvalida(ValueError):
+    """Arquivo enviado não é uma imagem aceita ou passa do tamanho máximo."""
+
+
+@dataclass
+class ImagemArmazenada:
+    hash: str
+    caminho: Path
+    tamanho: int
+    duplicada: bool
+
+
+def _verificar(caminho: str) -> None:
+    """Confere se o arquivo é uma imagem que o Pillow consegue ler, sem decodificá-la toda."""
+    from PIL import Image
+
+    try:
+        with Image.open(caminho) as imagem:
+            imagem.verify()
+    except (Image.DecompressionBombError, OSError, SyntaxError) as e:
+        # UnidentifiedImageError é um OSError; arquivo truncado pode dar SyntaxError
+        raise ImagemInvalida(f"Arquivo não é uma imagem válida: {e}") from e
+
+
+# --- Funções executadas nos processos do pool (precisam ser de módulo) ---
+
+
+def _abrir_rgb(origem: str):  # type: ignore[no-untyped-def]
+    from PIL import Image, ImageOps
+
+    imagem = Image.open(origem)
+    imagem = ImageOps.exif_transpose(imagem)  # respeita a orientação da câmera
+    return (
+        imagem.convert("RGBA")
+        if imagem.mode in ("RGBA", "LA", "P")
+        else imagem.convert("RGB")
+    )
+
+
+def _gerar_versao(
+    origem: str, destino: str, lado: int, formato: str, qualidade: int
+) -> None:
+    imagem = _abrir_rgb(origem)
+    imagem.thumbnail((lado, lado))
+    if formato == "JPEG" and imagem.mode != "RGB":
+        from PIL import Image
+
+        fundo = Image.new("RGB", imagem.size, (255, 255, 255))
+        fundo.paste(imagem, mask=imagem.getchannel("A"))
+        imagem = fundo
+    temporario = f"{destino}.tmp"
+    opcoes = (
+        {"quality": qualidade, "optimize": True, "progressive": True}
+        if formato == "JPEG"
+        else {"optimize": True}
+    )
+    imagem.save(temporario, formato, **opcoes)
+    os.replace(temporario, destino)
+
+
+def _remover_fundo(origem: str, destino: str, lado: int, tolerancia: int = 30) -> None:
+    """
+    Torna transparente o fundo liso de fotos de produto: preenche a partir das
+    bordas os pixels parecidos com a cor dos cantos. Não é segmentação por IA;
+    funciona para fotos de estúdio ou sobre fundo claro uniforme.
+    """
+    from PIL import Image, ImageChops, ImageDraw
+
+    imagem = _abrir_rgb(origem).convert("RGB")
+    imagem.thumbnail((lado, lado))
+    largura, altura = imagem.size
+    marcador = (255, 0, 255)
+    mascara_base = imagem.copy()
+    for canto in ((0, 0), (largura - 1, 0), (0, altura - 1), (largura - 1, altura - 1)):
+        if mascara_base.getpixel(canto) != marcador:
+            ImageDraw.floodfill(mascara_base, canto, marcador, thresh=tolerancia)
+    diferenca = ImageChops.difference(
+        mascara_base, Image.new("RGB", imagem.size, marcador)
+    )
+    alfa = diferenca.convert("L").point(lambda v: 0 if v == 0 else 255)
+    imagem.putalpha(alfa)
+    temporario = f"{destino}.tmp"
+    imagem.save(temporario, "PNG", optimize=True)
+    os.replace(temporario, destino)
+
+
+# --- Armazém ---
+
+
+class ArmazemImagens:
+    def __init__(self, raiz: str | Path | None = None):
+        self.raiz = Path(raiz or settings.IMAGE_STORE_DIR)
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS)
+        return self._pool
+
+    def encerrar(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _dir_originais(self, hash_: str) -> Path:
+        return self.raiz / "originais" / hash_[:2]
+
+    def original(self, hash_: str) -> Path | None:
+        pasta = self._dir_originais(hash_)
+        for extensao in _EXTENSOES.values():
+            caminho = pasta / f"{hash_}{extensao}"
+            if caminho.exists():
+                return caminho
+        return None
+
+    def caminho_versao(self, hash_: str, versao: str) -> Path:
+        extensao = ".png" if VERSOES[versao][1] == "PNG" else ".jpg"
+        return self.raiz / "derivadas" / hash_ / f"{versao}{extensao}"
+
+    async def salvar(
+        self, blocos: AsyncIterator[bytes], tipo: str | None
+    ) -> ImagemArmazenada:
+        """Grava os blocos em disco calculando o hash; deduplica pelo conteúdo."""
+        extensao = _EXTENSOES.get(tipo or "")
+        if extensao is None:
+            raise ImagemInvalida(f"Tipo de imagem não suportado: {tipo}")
+        limite = settings.IMAGE_MAX_UPLOAD_MB * 1024 * 1024
+        temporarios = self.raiz / "tmp"
+        await anyio.to_thread.run_sync(
+            lambda: temporarios.mkdir(parents=True, exist_ok=True)
+        )
+
+        digest = hashlib.sha256()
+        tamanho = 0
+        descritor, nome = tempfile.mkstemp(dir=temporarios)
+        try:
+            with os.fdopen(descritor, "wb") as arquivo:
+                async for bloco in blocos:
+                    tamanho += len(bloco)
+                    if tamanho > limite:
+                        raise ImagemInvalida(
+                            f"Imagem maior que {settings.IMAGE_MAX_UPLOAD_MB} MB"
+                        )
+                    digest.update(bloco)
+                    await anyio.to_thread.run_sync(arquivo.write, bloco)
+            hash_ = digest.hexdigest()
+            existente = self.original(hash_)
+            if existente is not None:
+                os.unlink(nome)
+                return ImagemArmazenada(hash_, existente, tamanho, duplicada=True)
+            # Só entra nos originais o que abre como imagem; o resto vira 400
+            await anyio.to_thread.run_sync(_verificar, nome)
+            destino = self._dir_originais(hash_) / f"{hash_}{extensao}"
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(nome, destino)
+            return ImagemArmazenada(hash_, destino, tamanho, duplicada=False)
+        except BaseException:
+            if os.path.exists(nome):
+                os.unlink(nome)
+            raise
+
+    async def versao(self, hash_: str, versao: str) -> Path:
+        """Caminho da versão derivada, gerando-a no pool na primeira vez."""
+        if versao not in VERSOES:
+            raise ImagemInvalida(f"Versão desconhecida: {versao}")
+        destino = self.caminho_versao(hash_, versao)
+        if destino.exists():
+            return destino
+        origem = self.original(hash_)
+        if origem is None:
+            raise FileNotFoundError(hash_)
+
+        async def gerar() -> Path:
+            if destino.exists():
+                return destino
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            lado, formato, qualidade = VERSOES[versao]
+            loop = asyncio.get_running_loop()
+            if versao == "sem_fundo":
+                await loop.run_in_executor(
+                    self.pool, _remover_fundo, str(origem), str(destino), lado
+                )
+            else:
+                await loop.run_in_executor(
+                    self.pool,
+                    _gerar_versao,
+                    str(origem),
+                    str(destino),
+                    lado,
+                    formato,
+                    qualidade,
+                )
+            return destino
+
+        # Pedidos simultâneos da mesma versão geram o arquivo uma única vez
+        return await singleflight.do_async(("imagem", hash_, versao), gerar)
+
+
+armazem_imagens = ArmazemImagens()
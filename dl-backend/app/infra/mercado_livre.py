@@ -0,0 +1,193 @@
+"""
+Cliente HTTP assíncrono da API do Mercado Livre.
+
+Um único `httpx.AsyncClient` (pool de conexões keep-alive) é usado durante
+toda a sincronização, com um semáforo limitando as requisições simultâneas.
+Respostas 429/5xx e erros de rede são repetidos com backoff exponencial e
+jitter; num 429 o `Retry-After` é respeitado e o cliente inteiro pausa, para
+que as demais requisições não continuem estourando o limite da conta. Um 429
+não gasta as tentativas da requisição (ao fim da pausa as requisições
+simultâneas disputam o limite de novo); só o teto `_MAXIMO_429` a interrompe.
+"""
+
+import asyncio
+import random
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+
+# Limites da API: multiget aceita até 20 ids; o scan pagina de 100 em 100
+TAMANHO_MULTIGET = 20
+TAMANHO_PAGINA_SCAN = 100
+
+_BACKOFF_BASE_SECONDS = 0.5
+_BACKOFF_MAXIMO_SECONDS = 30.0
+# Respostas 429 aceitas numa mesma requisição antes de desistir
+_MAXIMO_429 = 50
+
+
+class ErroMercadoLivre(Exception):
+    """Falha definitiva numa chamada à API do Mercado Livre."""
+
+    def __init__(self, mensagem: str, status_code: int | None = None):
+        super().__init__(mensagem)
+        self.status_code = status_code
+
+
+def _retry_after(resposta: httpx.Response) -> float | None:
+    valor = resposta.headers.get("Retry-After")
+    try:
+        return max(0.0, float(valor)) if valor is not None else None
+    except ValueError:
+        return None
+
+
+class ClienteMercadoLivre:
+    """Use como `async with ClienteMercadoLivre() as cliente: ...`"""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        access_token: str | None = None,
+        concorrencia: int | None = None,
+        max_tentativas: int | None = None,
+        timeout: float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = base_url or settings.ML_API_BASE_URL
+        self.access_token = access_token or settings.ML_ACCESS_TOKEN
+        self.concorrencia = concorrencia or settings.ML_SYNC_CONCURRENCY
+        self.max_tentativas = max_tentativas or settings.ML_SYNC_MAX_RETRIES
+        self.timeout = timeout or settings.ML_HTTP_TIMEOUT_SECONDS
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._semaforo = asyncio.Semaphore(self.concorrencia)
+        self._pausa_ate = 0.0
+        # Contadores para o relatório da sincronização
+        self.requisicoes = 0
+        self.repeticoes = 0
+        self.limitadas = 0
+
+    async def __aenter__(self) -> "ClienteMercadoLivre":
+        cabecalhos = {"Accept": "application/json"}
+        if self.access_token:
+            cabecalhos["Authorization"] = f"Bearer {self.access_token}"
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=cabecalhos,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.concorrencia,
+                max_keepalive_connections=self.concorrencia,
+            ),
+            transport=self._transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _backoff(self, tentativa: int) -> float:
+        espera = min(_BACKOFF_MAXIMO_SECONDS, _BACKOFF_BASE_SECONDS * 2**tentativa)
+        return espera * (0.5 + random.random() / 2)
+
+    async def _aguardar_pausa(self) -> None:
+        loop = asyncio.get_running_loop()
+        while (restante := self._pausa_ate - loop.time()) > 0:
+            await asyncio.sleep(restante)
+
+    def _pausar(self, segundos: float) -> None:
+        loop = asyncio.get_running_loop()
+        self._pausa_ate = max(self._pausa_ate, loop.time() + segundos)
+
+    async def get(self, caminho: str, params: dict[str, Any] | None = None) -> Any:
+        """GET com repetição em 429/5xx/erros de rede; retorna o JSON da resposta."""
+        return await self._requisitar("GET", caminho, params=params)
+
+    async def put(self, caminho: str, corpo: dict[str, Any]) -> Any:
+        """PUT idempotente (ex.: preço/estoque de um anúncio), com as mesmas repetições."""
+        return await self._requisitar("PUT", caminho, json=corpo)
+
+    async def _requisitar(
+        self,
+        metodo: str,
+        caminho: str,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+    ) -> Any:
+        assert self._client is not None, "use o cliente dentro de `async with`"
+        ultimo_erro: Exception | None = None
+        tentativa = limitadas = 0
+        while True:
+            await self._aguardar_pausa()
+            async with self._semaforo:
+                self.requisicoes += 1
+                try:
+                    resposta = await self._client.request(
+                        metodo, caminho, params=params, json=json
+                    )
+                except httpx.TransportError as exc:
+                    ultimo_erro = exc
+                    espera = self._backoff(tentativa)
+                else:
+                    status = resposta.status_code
+                    if status == 429 or status >= 500:
+                        espera = _retry_after(resposta) or self._backoff(tentativa)
+                        if status == 429:
+                            self.limitadas += 1
+                            self._pausar(espera)
+                        ultimo_erro = ErroMercadoLivre(
+                            f"HTTP {status} em {metodo} {caminho}", status
+                        )
+                    elif resposta.is_error:
+                        raise ErroMercadoLivre(
+                            f"HTTP {status} em {metodo} {caminho}: {resposta.text[:200]}",
+                            status,
+                        )
+                    else:
+                        return resposta.json()
+            if (
+                isinstance(ultimo_erro, ErroMercadoLivre)
+                and ultimo_erro.status_code == 429
+            ):
+                limitadas += 1
+                esgotou = limitadas >= _MAXIMO_429
+            else:
+                tentativa += 1
+                esgotou = tentativa >= self.max_tentativas
+            if esgotou:
+                break
+            self.repeticoes += 1
+            await asyncio.sleep(espera)
+        raise ErroMercadoLivre(
+            f"{metodo} {caminho}: desistindo após {tentativa + limitadas} tentativas ({ultimo_erro})"
+        ) from ultimo_erro
+
+    async def ids_do_vendedor(self, seller_id: str) -> AsyncIterator[list[str]]:
+        """Percorre todos os anúncios do vendedor (search_type=scan), página a página."""
+        params: dict[str, Any] = {"search_type": "scan", "limit": TAMANHO_PAGINA_SCAN}
+        while True:
+            dados = await self.get(f"/users/{seller_id}/items/search", params)
+            ids = dados.get("results") or []
+            if not ids:
+                return
+            yield ids
+            # Sem scroll_id não há próxima página; repetir a busca recomeçaria o scan
+            if not dados.get("scroll_id"):
+                return
+            params["scroll_id"] = dados["scroll_id"]
+
+    async def multiget(
+        self, ids: list[str], atributos: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Busca até 20 anúncios numa chamada; ignora os que vierem com erro."""
+        params: dict[str, Any] = {"ids": ",".join(ids)}
+        if atributos:
+            params["attributes"] = ",".join(atributos)
+        respostas = await self.get("/items", params)
+        return [r["body"] for r in respostas if r.get("code") == 200 and r.get("body")]
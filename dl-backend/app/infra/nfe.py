@@ -0,0 +1,239 @@
+"""
+Leitura em fluxo de XML de NF-e (nota avulsa, nfeProc ou lotes com várias
+notas no mesmo arquivo).
+
+Usa `iterparse`: cada grupo de interesse (ide, emit, dest, det, total) é
+lido quando termina e em seguida removido da árvore, junto com tudo que
+estiver fora desses grupos (transp, cobr, infAdic, assinatura...). A árvore
+em memória nunca passa de uma linha de item ou de um cabeçalho, seja o
+arquivo de uma nota ou de milhares.
+
+    leitor = LeitorNFe(arquivo)
+    for registro in leitor:      # ItemNFe de cada <det>, NotaFiscal no fim de cada <infNFe>
+        ...
+    leitor.elementos, leitor.raiz  # disponíveis ao final
+
+O expat do Python não busca entidades externas e limita a expansão de
+entidades (ataques de "billion laughs").
+"""
+
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any
+
+# Grupos lidos inteiros antes de serem descartados
+GRUPOS = frozenset({"ide", "emit", "dest", "det", "total"})
+# Valores de cEAN que significam "sem código de barras"
+SEM_GTIN = frozenset({"", "SEM GTIN"})
+
+
+class ErroNFe(ValueError):
+    """XML malformado ou ilegível."""
+
+
+@dataclass
+class ItemNFe:
+    """Linha (<det>) de uma NF-e, com os impostos do item."""
+
+    chave_nfe: str
+    numero: int
+    codigo: str
+    descricao: str
+    ean: str | None = None
+    ncm: str | None = None
+    cfop: str | None = None
+    unidade: str | None = None
+    quantidade: Decimal = Decimal("0")
+    valor_unitario: Decimal = Decimal("0")
+    valor_total: Decimal = Decimal("0")
+    valor_desconto: Decimal = Decimal("0")
+    valor_icms: Decimal = Decimal("0")
+    valor_ipi: Decimal = Decimal("0")
+    valor_pis: Decimal = Decimal("0")
+    valor_cofins: Decimal = Decimal("0")
+    # Preenchidos pela conciliação com o catálogo
+    situacao: str = "nao_verificado"  # conciliado, sem_cadastro, nao_verificado
+    produto_id: Any = None
+    conciliado_por: str | None = None  # sku ou ean
+
+
+@dataclass
+class NotaFiscal:
+    """Cabeçalho e totais de uma NF-e; emitida ao fim do <infNFe>, depois dos itens."""
+
+    chave: str
+    versao: str | None = None
+    numero: str | None = None
+    serie: str | None = None
+    modelo: str | None = None
+    data_emissao: datetime | None = None
+    natureza_operacao: str | None = None
+    emitente_documento: str | None = None
+    emitente_nome: str | None = None
+    emitente_uf: str | None = None
+    destinatario_documento: str | None = None
+    destinatario_nome: str | None = None
+    quantidade_itens: int = 0
+    valor_produtos: Decimal = Decimal("0")
+    valor_frete: Decimal = Decimal("0")
+    valor_desconto: Decimal = Decimal("0")
+    valor_icms: Decimal = Decimal("0")
+    valor_ipi: Decimal = Decimal("0")
+    valor_pis: Decimal = Decimal("0")
+    valor_cofins: Decimal = Decimal("0")
+    valor_total: Decimal = Decimal("0")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _decimal(textos: dict[str, str], tag: str) -> Decimal:
+    try:
+        return Decimal(textos[tag]) if textos.get(tag) else Decimal("0")
+    except InvalidOperation:
+        return Decimal("0")
+
+
+def _data(texto: str | None) -> datetime | None:
+    if not texto:
+        return None
+    try:
+        return datetime.fromisoformat(texto)
+    except ValueError:
+        return None
+
+
+class LeitorNFe:
+    """Percorre o XML uma vez, emitindo itens e notas; conta os elementos no caminho."""
+
+    def __init__(self, fonte: str | IO[bytes], amostra_elementos: int = 100):
+        self.fonte = fonte
+        self.amostra_elementos = amostra_elementos
+        self.raiz: str | None = None
+        self.atributos_raiz: dict[str, str] = {}
+        self.elementos = 0
+        # Primeiro texto de cada tag (prévia de XMLs que não são NF-e)
+        self.amostra: dict[str, str] = {}
+        self._nomes: dict[str, str] = {}  # tag com namespace -> nome local
+
+    def _nome(self, tag: str) -> str:
+        nome = self._nomes.get(tag)
+        if nome is None:
+            nome = self._nomes[tag] = _local(tag)
+        return nome
+
+    def _textos(self, grupo: ET.Element) -> dict[str, str]:
+        """Primeiro texto de cada tag do grupo (numa só passada pela subárvore)."""
+        textos: dict[str, str] = {}
+        for elem in grupo.iter():
+            if elem.text is not None:
+                texto = elem.text.strip()
+                if texto:
+                    textos.setdefault(self._nome(elem.tag), texto)
+        return textos
+
+    def __iter__(self) -> Iterator[ItemNFe | NotaFiscal]:
+        pilha: list[ET.Element] = []
+        nota: NotaFiscal | None = None
+        abertos = 0  # grupos de interesse abertos acima do elemento atual
+        try:
+            for evento, elem in ET.iterparse(self.fonte, events=("start", "end")):
+                tag = self._nome(elem.tag)
+                if evento == "start":
+                    if not pilha:
+                        self.raiz, self.atributos_raiz = tag, dict(elem.attrib)
+                    pilha.append(elem)
+                    if tag in GRUPOS:
+                        abertos += 1
+                    elif tag == "infNFe":
+                        nota = NotaFiscal(
+                            chave=(elem.get("Id") or "").removeprefix("NFe"),
+                            versao=elem.get("versao"),
+                        )
+                    continue
+
+                pilha.pop()
+                self.elementos += 1
+                if (
+                    len(self.amostra) < self.amostra_elementos
+                    and elem.text
+                    and elem.text.strip()
+                ):
+                    self.amostra.setdefault(tag, elem.text.strip())
+                if tag in GRUPOS:
+                    abertos -= 1
+                    if nota is not None:
+                        textos = self._textos(elem)
+                        if tag == "det":
+                            nota.quantidade_itens += 1
+                            yield self._item(
+                                int(elem.get("nItem") or 0), textos, nota.chave
+                            )
+                        else:
+                            self._cabecalho(tag, textos, nota)
+                elif tag == "infNFe" and nota is not None:
+                    yield nota
+                    nota = None
+                # Fora dos grupos, nada mais vai ler este elemento
+                if abertos == 0 and pilha:
+                    elem.clear()
+                    pilha[-1].remove(elem)
+        except ET.ParseError as e:
+            raise ErroNFe(f"XML inválido: {e}") from e
+
+    @staticmethod
+    def _cabecalho(tag: str, textos: dict[str, str], nota: NotaFiscal) -> None:
+        # Os nomes das tags são únicos dentro de cada grupo (xNome do emitente
+        # vem antes do endereço; UF só existe no endereço)
+        if tag == "ide":
+            nota.numero = textos.get("nNF")
+            nota.serie = textos.get("serie")
+            nota.modelo = textos.get("mod")
+            nota.natureza_operacao = textos.get("natOp")
+            nota.data_emissao = _data(textos.get("dhEmi") or textos.get("dEmi"))
+        elif tag == "emit":
+            nota.emitente_documento = textos.get("CNPJ") or textos.get("CPF")
+            nota.emitente_nome = textos.get("xNome")
+            nota.emitente_uf = textos.get("UF")
+        elif tag == "dest":
+            nota.destinatario_documento = (
+                textos.get("CNPJ") or textos.get("CPF") or textos.get("idEstrangeiro")
+            )
+            nota.destinatario_nome = textos.get("xNome")
+        elif tag == "total":
+            nota.valor_produtos = _decimal(textos, "vProd")
+            nota.valor_frete = _decimal(textos, "vFrete")
+            nota.valor_desconto = _decimal(textos, "vDesc")
+            nota.valor_icms = _decimal(textos, "vICMS")
+            nota.valor_ipi = _decimal(textos, "vIPI")
+            nota.valor_pis = _decimal(textos, "vPIS")
+            nota.valor_cofins = _decimal(textos, "vCOFINS")
+            nota.valor_total = _decimal(textos, "vNF")
+
+    @staticmethod
+    def _item(numero: int, textos: dict[str, str], chave_nfe: str) -> ItemNFe:
+        ean = textos.get("cEAN") or textos.get("cEANTrib") or ""
+        return ItemNFe(
+            chave_nfe=chave_nfe,
+            numero=numero,
+            codigo=textos.get("cProd", ""),
+            descricao=textos.get("xProd", ""),
+            ean=None if ean.upper() in SEM_GTIN else ean,
+            ncm=textos.get("NCM"),
+            cfop=textos.get("CFOP"),
+            unidade=textos.get("uCom"),
+            quantidade=_decimal(textos, "qCom"),
+            valor_unitario=_decimal(textos, "vUnCom"),
+            valor_total=_decimal(textos, "vProd"),
+            valor_desconto=_decimal(textos, "vDesc"),
+            # Cada imposto fica num subgrupo por situação tributária (ICMS00,
+            # PISAliq...), mas o valor tem sempre o mesmo nome
+            valor_icms=_decimal(textos, "vICMS"),
+            valor_ipi=_decimal(textos, "vIPI"),
+            valor_pis=_decimal(textos, "vPIS"),
+            valor_cofins=_decimal(textos, "vCOFINS"),
+        )
@@ -0,0 +1,299 @@
+"""
+Geração dos PDFs de orçamento, com cache em disco.
+
+O PDF de um orçamento só depende do conteúdo impresso; o SHA-256 desse
+conteúdo (que inclui a versão do orçamento e a do layout) é o nome do
+arquivo. Pedir de novo o mesmo orçamento é servir um arquivo estático, com
+suporte a Range pelo FileResponse. A renderização roda num
+`ProcessPoolExecutor` para não ocupar os workers da API, e pedidos
+simultâneos do mesmo PDF geram o arquivo uma vez só.
+
+O diretório tem tamanho máximo (QUOTE_PDF_CACHE_MB): ao passar dele, os
+arquivos acessados há mais tempo são removidos. O instante de acesso é o
+mtime, atualizado a cada leitura, e por isso vale entre processos.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+from xml.sax.saxutils import escape
+
+import anyio.to_thread
+
+from app.core.config import settings
+from app.core.singleflight import singleflight
+from app.domain.schemas import OrcamentoRead
+
+logger = logging.getLogger(__name__)
+
+# Mude ao alterar o layout: invalida todos os PDFs do cache
+VERSAO_LAYOUT = 1
+
+# Arquivos acessados há menos que isto não são podados: o caminho pode ter
+# acabado de sair de `obter` para um FileResponse que ainda vai abri-lo
+PROTECAO_PODA_S = 60
+
+# Campos que não vão para o PDF (mudam sem mudar o documento)
+_CAMPOS_VOLATEIS = {"dias_restantes", "atualizado_em", "valor_potencial"}
+
+
+def conteudo_pdf(orcamento: OrcamentoRead) -> dict[str, Any]:
+    """O que é impresso no PDF, serializável e estável (base da chave do cache)."""
+    return {
+        "layout": VERSAO_LAYOUT,
+        "empresa": settings.PROJECT_NAME,
+        **orcamento.model_dump(mode="json", exclude=_CAMPOS_VOLATEIS),
+    }
+
+
+def chave_pdf(conteudo: dict[str, Any]) -> str:
+    serializado = json.dumps(
+        conteudo, sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(serializado.encode()).hexdigest()
+
+
+def _texto(valor: Any) -> str:
+    """Valor para dentro de um Paragraph, que interpreta marcação: <, > e & são escapados."""
+    return escape(str(valor))
+
+
+def _moeda(valor: Any) -> str:
+    texto = f"{Decimal(str(valor)):,.2f}"
+    return "R$ " + texto.replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def _desconto_linha(item: dict[str, Any]) -> Decimal:
+    """Desconto gravado da linha (bruto menos total): já limitado ao bruto pelo serviço."""
+    bruto = Decimal(str(item["valor_unitario"])) * item["quantidade"]
+    return bruto - Decimal(str(item["valor_total"]))
+
+
+# --- Executado nos processos do pool (precisa ser de módulo) ---
+
+
+def _renderizar(conteudo: dict[str, Any], destino: str) -> None:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.platypus import (
+        Paragraph,
+        SimpleDocTemplate,
+        Spacer,
+        Table,
+        TableStyle,
+    )
+
+    estilos = getSampleStyleSheet()
+    # Nome único ao lado do destino: duas gerações do mesmo PDF (processos
+    # diferentes) não escrevem no mesmo temporário
+    descritor, temporario = tempfile.mkstemp(
+        suffix=".tmp", dir=os.path.dirname(destino)
+    )
+    os.close(descritor)
+    documento = SimpleDocTemplate(
+        temporario,
+        pagesize=A4,
+        leftMargin=15 * mm,
+        rightMargin=15 * mm,
+        topMargin=15 * mm,
+        bottomMargin=15 * mm,
+        title=f"Orçamento {conteudo['numero_orcamento']}",
+    )
+    elementos: list[Any] = [
+        Paragraph(_texto(conteudo["empresa"]), estilos["Title"]),
+        Paragraph(
+            f"Orçamento {_texto(conteudo['numero_orcamento'])}", estilos["Heading2"]
+        ),
+        Paragraph(
+            f"Emitido em {_texto(conteudo['data_criacao'][:10])}"
+            f" · válido até {_texto(conteudo['validade_orcamento'])}",
+            estilos["Normal"],
+        ),
+    ]
+    if conteudo.get("cliente_nome"):
+        elementos.append(
+            Paragraph(f"Cliente: {_texto(conteudo['cliente_nome'])}", estilos["Normal"])
+        )
+    veiculo = " ".join(
+        str(conteudo[c])
+        for c in ("marca_veiculo", "modelo_veiculo", "ano_veiculo")
+        if conteudo.get(c)
+    )
+    if veiculo:
+        placa = (
+            f" · placa {_texto(conteudo['placa_veiculo'])}"
+            if conteudo.get("placa_veiculo")
+            else ""
+        )
+        elementos.append(
+            Paragraph(f"Veículo: {_texto(veiculo)}{placa}", estilos["Normal"])
+        )
+    elementos.append(Spacer(1, 6 * mm))
+
+    linhas = [["Item", "Qtd", "Unitário", "Desconto", "Total"]]
+    for item in conteudo.get("itens") or []:
+        desconto = _desconto_linha(item)
+        linhas.append(
+            [
+                Paragraph(_texto(item["descricao"]), estilos["BodyText"]),
+                str(item["quantidade"]),
+                _moeda(item["valor_unitario"]),
+                _moeda(desconto) if desconto else "-",
+                _moeda(item["valor_total"]),
+            ]
+        )
+    tabela = Table(
+        linhas, colWidths=[85 * mm, 15 * mm, 28 * mm, 24 * mm, 28 * mm], repeatRows=1
+    )
+    tabela.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f2937")),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                (
+                    "ROWBACKGROUNDS",
+                    (0, 1),
+                    (-1, -1),
+                    [colors.white, colors.HexColor("#f3f4f6")],
+                ),
+                ("GRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#d1d5db")),
+            ]
+        )
+    )
+    elementos += [tabela, Spacer(1, 4 * mm)]
+
+    totais = [["Subtotal", _moeda(conteudo["subtotal"])]]
+    if Decimal(str(conteudo["desconto_total"])):
+        totais.append(["Descontos", "- " + _moeda(conteudo["desconto_total"])])
+    if Decimal(str(conteudo["frete_valor"])):
+        totais.append(["Frete", _moeda(conteudo["frete_valor"])])
+    totais.append(["Total", _moeda(conteudo["valor_total"])])
+    quadro = Table(totais, colWidths=[40 * mm, 35 * mm], hAlign="RIGHT")
+    quadro.setStyle(
+        TableStyle(
+            [
+                ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+                ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+                ("LINEABOVE", (0, -1), (-1, -1), 0.5, colors.black),
+            ]
+        )
+    )
+    elementos.append(quadro)
+    if conteudo.get("observacoes"):
+        elementos += [
+            Spacer(1, 6 * mm),
+            Paragraph(
+                f"Observações: {_texto(conteudo['observacoes'])}", estilos["Normal"]
+            ),
+        ]
+
+    try:
+        documento.build(elementos)
+        os.replace(temporario, destino)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+# --- Cache ---
+
+
+class CachePDF:
+    def __init__(self, raiz: str | Path | None = None, limite_bytes: int | None = None):
+        self.raiz = Path(raiz or settings.QUOTE_PDF_CACHE_DIR)
+        self.limite_bytes = limite_bytes or settings.QUOTE_PDF_CACHE_MB * 1024 * 1024
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        # Tamanho ocupado; None até a primeira varredura do diretório
+        self._ocupado: int | None = None
+        self.acertos = 0
+        self.geracoes = 0
+        self.removidos = 0
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=settings.PDF_WORKERS)
+        return self._pool
+
+    def encerrar(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def caminho(self, chave: str) -> Path:
+        return self.raiz / chave[:2] / f"{chave}.pdf"
+
+    def _tocar(self, caminho: Path) -> bool:
+        """Marca o acesso (LRU); False se o arquivo já foi removido."""
+        try:
+            os.utime(caminho)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _podar(self, novo: int) -> None:
+        """Soma `novo` ao ocupado e remove os menos usados se passar do limite."""
+        with self._lock:
+            if self._ocupado is None:
+                self._ocupado = sum(p.stat().st_size for p in self.raiz.glob("*/*.pdf"))
+            else:
+                self._ocupado += novo
+            if self._ocupado <= self.limite_bytes:
+                return
+            arquivos = []
+            for caminho in self.raiz.glob("*/*.pdf"):
+                try:
+                    estado = caminho.stat()
+                except FileNotFoundError:
+                    continue
+                arquivos.append((estado.st_mtime, estado.st_size, caminho))
+            arquivos.sort()
+            self._ocupado = sum(tamanho for _, tamanho, _ in arquivos)
+            # Remove até 90% do limite, para não podar a cada geração
+            alvo = self.limite_bytes * 0.9
+            recentes = time.time() - PROTECAO_PODA_S
+            for acesso, tamanho, caminho in arquivos:
+                if self._ocupado <= alvo or acesso >= recentes:
+                    break
+                caminho.unlink(missing_ok=True)
+                self._ocupado -= tamanho
+                self.removidos += 1
+
+    async def obter(self, orcamento: OrcamentoRead) -> tuple[Path, str]:
+        """(caminho do PDF, chave), gerando o arquivo no pool se não estiver no cache."""
+        conteudo = conteudo_pdf(orcamento)
+        chave = chave_pdf(conteudo)
+        destino = self.caminho(chave)
+        if await anyio.to_thread.run_sync(self._tocar, destino):
+            self.acertos += 1
+            return destino, chave
+
+        async def gerar() -> Path:
+            if destino.exists():
+                return destino
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.get_running_loop().run_in_executor(
+                self.pool, _renderizar, conteudo, str(destino)
+            )
+            self.geracoes += 1
+            await anyio.to_thread.run_sync(self._podar, destino.stat().st_size)
+            return destino
+
+        return await singleflight.do_async(("pdf", chave), gerar), chave
+
+
+cache_pdf = CachePDF()
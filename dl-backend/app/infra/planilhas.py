@@ -0,0 +1,199 @@
+"""
+Leitura em fluxo de planilhas de fornecedor (XLSX e CSV).
+
+Nada é carregado inteiro: o XLSX é aberto em modo somente leitura do
+openpyxl (as linhas saem do XML da planilha conforme são pedidas) e o CSV é
+lido linha a linha, com o delimitador e a codificação detectados no começo do
+arquivo. Quem lê decide quando parar: a prévia para na página pedida, a
+importação vai até o fim em blocos.
+
+    with abrir_planilha(arquivo, "lista.xlsx") as arquivo_planilha:
+        for bloco in arquivo_planilha.planilha().blocos(1000):   # listas de {coluna: valor}
+            ...
+"""
+
+import codecs
+import csv
+import io
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any
+
+# Delimitadores aceitos no CSV (listas do Excel em português usam ;)
+DELIMITADORES = ";,\t|"
+# Bytes lidos do começo do CSV para detectar codificação e delimitador
+AMOSTRA_CSV = 64 * 1024
+
+Linha = dict[str, Any]
+
+
+class ErroPlanilha(ValueError):
+    """Arquivo ilegível ou formato não suportado."""
+
+
+def _cabecalho(valores: tuple[Any, ...] | list[Any]) -> list[str]:
+    """Nomes das colunas; vazias viram coluna_N e repetidas ganham sufixo."""
+    nomes: list[str] = []
+    for i, valor in enumerate(valores, start=1):
+        nome = (
+            str(valor).strip()
+            if valor is not None and str(valor).strip()
+            else f"coluna_{i}"
+        )
+        base, n = nome, 2
+        while nome in nomes:
+            nome, n = f"{base}_{n}", n + 1
+        nomes.append(nome)
+    return nomes
+
+
+def _vazia(valores: tuple[Any, ...] | list[Any]) -> bool:
+    return all(v is None or (isinstance(v, str) and not v.strip()) for v in valores)
+
+
+def tipo_valor(valor: Any) -> str:
+    if valor is None or valor == "":
+        return "vazio"
+    if isinstance(valor, bool):
+        return "booleano"
+    if isinstance(valor, int):
+        return "inteiro"
+    if isinstance(valor, float):
+        return "numero"
+    if isinstance(valor, (datetime, date)):
+        return "data"
+    return "texto"
+
+
+class Planilha:
+    """Uma aba (ou o CSV): colunas e linhas em fluxo, a partir da primeira linha não vazia."""
+
+    def __init__(
+        self,
+        linhas: Iterator[tuple[Any, ...] | list[Any]],
+        total_estimado: int | None = None,
+    ):
+        self._linhas = (valores for valores in linhas if not _vazia(valores))
+        primeira = next(self._linhas, None)
+        self.colunas = _cabecalho(primeira or [])
+        # Linhas de dados segundo os metadados do arquivo (XLSX); None quando desconhecido
+        self.total_estimado = total_estimado
+        self.lidas = 0
+
+    def __iter__(self) -> Iterator[Linha]:
+        for valores in self._linhas:
+            self.lidas += 1
+            yield dict(zip(self.colunas, valores, strict=False))
+
+    def blocos(self, tamanho: int) -> Iterator[list[Linha]]:
+        linhas = iter(self)
+        while bloco := list(islice(linhas, tamanho)):
+            yield bloco
+
+
+class ArquivoPlanilha(ABC):
+    """Arquivo aberto; `planilha(nome)` devolve a aba pedida (ou a primeira)."""
+
+    tipo: str = ""
+
+    def __init__(self) -> None:
+        self.nomes_planilhas: list[str] = []
+        self.delimitador: str | None = None
+        self.propriedades: dict[str, Any] = {}
+
+    @abstractmethod
+    def planilha(self, nome: str | None = None) -> Planilha: ...
+
+    @abstractmethod
+    def fechar(self) -> None:
+        """Libera o que o leitor abriu (não fecha o arquivo recebido)."""
+
+    def __enter__(self) -> "ArquivoPlanilha":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.fechar()
+
+
+class ArquivoXLSX(ArquivoPlanilha):
+    tipo = "xlsx"
+
+    def __init__(self, arquivo: IO[bytes]):
+        # Importado só aqui: quem lê apenas CSV não paga o custo do openpyxl
+        from openpyxl import load_workbook
+
+        super().__init__()
+        try:
+            self._livro = load_workbook(arquivo, read_only=True, data_only=True)
+        except Exception as e:
+            raise ErroPlanilha(f"XLSX inválido: {e}") from e
+        self.nomes_planilhas = list(self._livro.sheetnames)
+        p = self._livro.properties
+        self.propriedades = {
+            "title": p.title,
+            "creator": p.creator,
+            "created": p.created,
+            "modified": p.modified,
+        }
+
+    def planilha(self, nome: str | None = None) -> Planilha:
+        if nome is not None and nome not in self.nomes_planilhas:
+            raise ErroPlanilha(f"Planilha '{nome}' não encontrada")
+        aba = self._livro[nome or self.nomes_planilhas[0]]
+        # A dimensão gravada no arquivo dá uma estimativa sem ler as linhas
+        total = aba.max_row - 1 if aba.max_row else None
+        return Planilha(aba.iter_rows(values_only=True), total)
+
+    def fechar(self) -> None:
+        self._livro.close()
+
+
+class ArquivoCSV(ArquivoPlanilha):
+    tipo = "csv"
+
+    def __init__(self, arquivo: IO[bytes]):
+        super().__init__()
+        inicio = arquivo.read(AMOSTRA_CSV)
+        arquivo.seek(0)
+        codificacao = "utf-8-sig"
+        try:
+            # Decodificador incremental: a amostra pode cortar um caractere no meio
+            amostra = codecs.getincrementaldecoder(codificacao)().decode(inicio)
+        except UnicodeDecodeError:
+            # Listas exportadas pelo Excel no Windows
+            codificacao = "cp1252"
+            amostra = inicio.decode(codificacao, errors="replace")
+        # O delimitador sai das primeiras linhas completas
+        amostra = "\n".join(amostra.splitlines()[:20])
+        try:
+            self.delimitador = (
+                csv.Sniffer().sniff(amostra, delimiters=DELIMITADORES).delimiter
+            )
+        except csv.Error:
+            self.delimitador = ";" if amostra.count(";") > amostra.count(",") else ","
+        self._texto = io.TextIOWrapper(
+            arquivo, encoding=codificacao, errors="replace", newline=""
+        )
+
+    def planilha(self, nome: str | None = None) -> Planilha:
+        return Planilha(csv.reader(self._texto, delimiter=self.delimitador or ","))
+
+    def fechar(self) -> None:
+        # Solta o arquivo sem fechá-lo: quem abriu é quem fecha
+        self._texto.detach()
+
+
+def abrir_planilha(arquivo: IO[bytes], nome_arquivo: str) -> ArquivoPlanilha:
+    extensao = Path(nome_arquivo or "").suffix.lower()
+    if extensao in (".xlsx", ".xlsm"):
+        return ArquivoXLSX(arquivo)
+    if extensao in (".csv", ".txt"):
+        return ArquivoCSV(arquivo)
+    if extensao == ".xls":
+        raise ErroPlanilha(
+            "Formato .xls não suportado: salve a planilha como .xlsx ou .csv"
+        )
+    raise ErroPlanilha(f"Formato de planilha não suportado: {extensao or nome_arquivo}")
@@ -0,0 +1,188 @@
+"""
+Adaptadores das transportadoras usadas na cotação de frete.
+
+Cada adaptador recebe um `PacoteFrete` e devolve as opções de serviço. O
+motor de frete (app/domain/frete.py) chama todos em paralelo, cada um com seu
+próprio timeout, então um adaptador não precisa tratar lentidão, só erros.
+
+- `TransportadoraTabela`: frete da própria loja, calculado localmente por
+  zona (mesma UF, mesma região, outra região) e peso taxável.
+- `TransportadoraMelhorEnvio`: cotação na API do Melhor Envio (Correios,
+  Jadlog, etc. numa só chamada); ativa com MELHOR_ENVIO_TOKEN.
+"""
+
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, Any, Protocol
+
+from app.core.config import settings
+from app.infra.ceps import indice_cep
+
+if TYPE_CHECKING:
+    import httpx
+
+
+@dataclass(frozen=True)
+class PacoteFrete:
+    """Pacote normalizado: já arredondado para a faixa de peso/volume do cache."""
+
+    cep_origem: str
+    cep_destino: str
+    peso_kg: float
+    comprimento_cm: int
+    largura_cm: int
+    altura_cm: int
+    valor_declarado: float = 0.0
+
+
+@dataclass(frozen=True)
+class OpcaoFrete:
+    transportadora: str
+    servico: str
+    prazo: int  # dias úteis
+    valor: Decimal
+    codigo_servico: str
+
+
+class ErroTransportadora(Exception):
+    """A transportadora respondeu com erro ou não atende o trecho."""
+
+
+class Transportadora(Protocol):
+    nome: str
+
+    async def cotar(self, pacote: PacoteFrete) -> list[OpcaoFrete]: ...
+
+
+# --- Tabela própria ---
+
+# Por zona: (valor base, valor por kg, prazo em dias úteis)
+_TABELA: dict[str, dict[str, tuple[Decimal, Decimal, int]]] = {
+    "economico": {
+        "local": (Decimal("12.00"), Decimal("1.50"), 3),
+        "regional": (Decimal("18.00"), Decimal("2.50"), 5),
+        "nacional": (Decimal("25.00"), Decimal("4.00"), 9),
+    },
+    "expresso": {
+        "local": (Decimal("20.00"), Decimal("2.50"), 1),
+        "regional": (Decimal("30.00"), Decimal("4.00"), 2),
+        "nacional": (Decimal("45.00"), Decimal("6.50"), 4),
+    },
+}
+
+
+class TransportadoraTabela:
+    """Frete próprio da loja por zona e peso; ajuste `_TABELA` à tabela contratada."""
+
+    nome = "Entrega Própria"
+
+    async def cotar(self, pacote: PacoteFrete) -> list[OpcaoFrete]:
+        origem = indice_cep.buscar(pacote.cep_origem)
+        destino = indice_cep.buscar(pacote.cep_destino)
+        if origem is None or destino is None:
+            raise ErroTransportadora("CEP fora das faixas atendidas")
+        if origem.uf == destino.uf:
+            zona = "local"
+        elif origem.regiao == destino.regiao:
+            zona = "regional"
+        else:
+            zona = "nacional"
+        peso = Decimal(str(pacote.peso_kg))
+        opcoes = []
+        for servico, zonas in _TABELA.items():
+            base, por_kg, prazo = zonas[zona]
+            valor = (base + por_kg * peso).quantize(Decimal("0.01"), ROUND_HALF_UP)
+            opcoes.append(
+                OpcaoFrete(
+                    self.nome,
+                    servico.capitalize(),
+                    prazo,
+                    valor,
+                    f"propria-{servico}-{zona}",
+                )
+            )
+        return opcoes
+
+
+# --- Melhor Envio ---
+
+
+class TransportadoraMelhorEnvio:
+    nome = "Melhor Envio"
+
+    def __init__(self, cliente: "httpx.AsyncClient | None" = None):
+        self._cliente = cliente
+
+    def _http(self) -> "httpx.AsyncClient":
+        if self._cliente is None:
+            # Importado só aqui: sem MELHOR_ENVIO_TOKEN o httpx nem é carregado,
+            # e o módulo entra em toda inicialização (rotas de orçamento)
+            import httpx
+
+            self._cliente = httpx.AsyncClient(
+                base_url=settings.MELHOR_ENVIO_API_URL,
+                headers={
+                    "Authorization": f"Bearer {settings.MELHOR_ENVIO_TOKEN}",
+                    "Accept": "application/json",
+                    "User-Agent": f"{settings.PROJECT_NAME} ({settings.MELHOR_ENVIO_EMAIL})",
+                },
+                timeout=settings.FREIGHT_CARRIER_TIMEOUT_SECONDS,
+            )
+        return self._cliente
+
+    async def cotar(self, pacote: PacoteFrete) -> list[OpcaoFrete]:
+        corpo = {
+            "from": {"postal_code": pacote.cep_origem},
+            "to": {"postal_code": pacote.cep_destino},
+            "package": {
+                "weight": pacote.peso_kg,
+                "length": pacote.comprimento_cm,
+                "width": pacote.largura_cm,
+                "height": pacote.altura_cm,
+            },
+            "options": {
+                "insurance_value": pacote.valor_declarado,
+                "receipt": False,
+                "own_hand": False,
+            },
+        }
+        import httpx  # já carregado por _http() ou pelo cliente recebido
+
+        try:
+            resposta = await self._http().post(
+                "/api/v2/me/shipment/calculate", json=corpo
+            )
+            resposta.raise_for_status()
+        except httpx.HTTPError as e:
+            raise ErroTransportadora(f"Melhor Envio: {e}") from e
+        servicos: list[dict[str, Any]] = resposta.json()
+        opcoes = []
+        for servico in servicos:
+            if servico.get("error") or not servico.get("price"):
+                continue  # serviço não atende o trecho
+            opcoes.append(
+                OpcaoFrete(
+                    transportadora=str(
+                        (servico.get("company") or {}).get("name") or self.nome
+                    ),
+                    servico=str(servico.get("name") or ""),
+                    prazo=int(servico.get("delivery_time") or 0),
+                    valor=Decimal(str(servico["price"])),
+                    codigo_servico=f"melhorenvio-{servico.get('id')}",
+                )
+            )
+        return opcoes
+
+    async def fechar(self) -> None:
+        if self._cliente is not None:
+            await self._cliente.aclose()
+            self._cliente = None
+
+
+def transportadoras_configuradas() -> list[Transportadora]:
+    transportadoras: list[Transportadora] = []
+    if settings.FREIGHT_OWN_TABLE_ENABLED:
+        transportadoras.append(TransportadoraTabela())
+    if settings.MELHOR_ENVIO_TOKEN:
+        transportadoras.append(TransportadoraMelhorEnvio())
+    return transportadoras
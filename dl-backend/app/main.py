@@ -1,12 +1,25 @@
-﻿import os
-import logging
-import sentry_sdk
+﻿import logging
+import os
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
 from fastapi import FastAPI
-from fastapi.routing import APIRoute
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.routing import APIRoute
 
 from app.api.main import api_router
+from app.core.admission import AdmissionControlMiddleware, controle_admissao
 from app.core.config import settings
+from app.domain.canais import motor_canais
+from app.domain.duplicidade_clientes import duplicidade_clientes
+from app.domain.expiracao_orcamentos import expiracao_orcamentos
+from app.domain.frete import motor_frete
+from app.domain.importacao_produtos import importacao_produtos
+from app.domain.ranking_vendedores import carregar_ranking_vendedores
+from app.domain.reservas_estoque import carregar_reservas_estoque, reservas_estoque
+from app.domain.top_produtos import carregar_ranking_produtos
+from app.infra.imagens import armazem_imagens
+from app.infra.pdf_orcamento import cache_pdf
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -20,18 +33,55 @@ def custom_generate_unique_id(route: APIRoute) -> str:
     return route.name
 
 
-# Sentry apenas fora do ambiente local
+# Sentry apenas fora do ambiente local (importado só quando usado: é pesado)
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
+    import sentry_sdk
+
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Rotas síncronas rodam no threadpool do AnyIO; o tamanho vem das configurações
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = settings.THREADPOOL_SIZE
+    logger.info("Threadpool de rotas síncronas: %s threads", settings.THREADPOOL_SIZE)
+    # Rankings em memória, a partir dos rollups do mês e dos contadores do dia
+    await anyio.to_thread.run_sync(carregar_ranking_produtos)
+    await anyio.to_thread.run_sync(carregar_ranking_vendedores)
+    # Propagação de preço/estoque para os canais ativos (ML/Shopify)
+    motor_canais.iniciar()
+    # Expiração periódica dos orçamentos vencidos
+    expiracao_orcamentos.iniciar()
+    # Disponível por SKU em memória e varredura das reservas vencidas
+    await anyio.to_thread.run_sync(carregar_reservas_estoque)
+    reservas_estoque.iniciar()
+    # Detecção periódica de clientes duplicados (sugestões de mesclagem)
+    duplicidade_clientes.iniciar()
+    yield
+    await motor_canais.parar()
+    await expiracao_orcamentos.parar()
+    await reservas_estoque.parar()
+    await duplicidade_clientes.parar()
+    await importacao_produtos.parar()
+    await motor_frete.fechar()
+    armazem_imagens.encerrar()
+    cache_pdf.encerrar()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=os.getenv("APP_VERSION", "0.1.0"),
     description="API do DL_SISTEMA",
     root_path=ROOT_PATH,
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
+# ---- Controle de Admissão ----
+# Registrado antes do CORS para que as respostas 503 também levem os cabeçalhos CORS
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 # ---- Configuração do CORS ----
 cors_origins = [
     "http://localhost:3000",
@@ -57,6 +107,36 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/__admission", tags=["internal"])
+def admission_metrics():
+    """Ocupação e filas do controle de admissão neste worker."""
+    return controle_admissao.metricas()
+
+
+@app.get("/__expiracao", tags=["internal"])
+def expiracao_metrics():
+    """Execuções do job de expiração de orçamentos neste worker."""
+    return expiracao_orcamentos.metricas()
+
+
+@app.get("/__reservas", tags=["internal"])
+def reservas_metrics():
+    """Reservas de estoque ativas e varreduras neste worker."""
+    return reservas_estoque.metricas()
+
+
+@app.get("/__duplicidade", tags=["internal"])
+def duplicidade_metrics():
+    """Execuções da detecção de clientes duplicados neste worker."""
+    return duplicidade_clientes.metricas()
+
+
+@app.get("/__frete", tags=["internal"])
+def frete_metrics():
+    """Consultas, acertos de cache, timeouts e erros por transportadora neste worker."""
+    return motor_frete.metricas()
+
+
 # ---- Inclusão de Todas as Rotas da API ----
 # Esta linha regista todas as suas rotas de login, produtos, dashboard, etc.
 app.include_router(api_router, prefix=settings.API_V1_STR)
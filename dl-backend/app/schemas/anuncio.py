@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field
+
+
+class ProcessamentoImagemRequest(BaseModel):
+    """Imagem enviada em base64 (alternativa ao upload multipart)."""
+
+    imagem_base64: str = Field(
+        ..., description="Conteúdo da imagem; aceita prefixo data:image/...;base64,"
+    )
+    nome_arquivo: str
+    versao: str = Field(
+        "ml", description="Versão a gerar: ml, shopify, miniatura ou sem_fundo."
+    )
+
+
+class ProcessamentoImagemResponse(BaseModel):
+    imagem_processada_url: str
+    sucesso: bool
+    mensagem: str
+    hash: str | None = None
+    duplicada: bool = False
+    versoes: dict[str, str] = {}
+
+
+class RemoverFundoRequest(BaseModel):
+    anuncio_id: int | None = None
+    imagem_url: str = Field(
+        ..., description="URL de uma imagem do armazém (ou apenas o hash)."
+    )
+
+
+class CriacaoZIPRequest(BaseModel):
+    titulo: str
+    descricao: str
+    preco: float
+    sku: str
+    imagens: list[str] = Field(
+        default_factory=list, description="URLs (ou hashes) de imagens do armazém."
+    )
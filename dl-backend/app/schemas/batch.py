@@ -0,0 +1,33 @@
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class BatchSubRequest(BaseModel):
+    """Uma sub-requisição do lote, relativa ao prefixo da API (ex.: /dashboard/metricas)."""
+
+    id: str | None = Field(
+        None, description="Identificador livre devolvido no resultado."
+    )
+    method: Literal["GET"] = "GET"
+    path: str = Field(..., description="Caminho com query string opcional.")
+
+    @field_validator("path")
+    @classmethod
+    def _path_absoluto(cls, v: str) -> str:
+        if not v.startswith("/"):
+            raise ValueError("O caminho deve começar com '/'")
+        return v
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchSubRequest] = Field(..., min_length=1)
+
+
+class BatchItemResult(BaseModel):
+    """Resultado individual de uma sub-requisição."""
+
+    id: str | None = None
+    path: str
+    status: int
+    body: Any = None
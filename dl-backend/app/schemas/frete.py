@@ -0,0 +1,82 @@
+from pydantic import BaseModel, Field
+
+
+class Dimensoes(BaseModel):
+    """Dimensões em cm."""
+
+    comprimento: float = Field(..., gt=0)
+    largura: float = Field(..., gt=0)
+    altura: float = Field(..., gt=0)
+
+    def tupla(self) -> tuple[float, float, float]:
+        return self.comprimento, self.largura, self.altura
+
+
+class ProdutoFrete(BaseModel):
+    nome: str
+    quantidade: int = Field(1, gt=0)
+    peso: float | None = Field(None, ge=0, description="Peso unitário em kg.")
+    dimensoes: Dimensoes | None = None
+
+
+class CalculoFreteRequest(BaseModel):
+    cep_destino: str
+    valor_total: float = Field(..., ge=0, description="Valor declarado da mercadoria.")
+    peso_total: float | None = Field(None, gt=0, description="Peso total em kg.")
+    dimensoes: Dimensoes | None = None
+    produtos: list[ProdutoFrete] | None = None
+
+    def pacote(self) -> tuple[float | None, tuple[float, float, float] | None]:
+        """(peso em kg, dimensões em cm) do volume; sem peso/dimensões, estima pelos produtos."""
+        peso, dimensoes = self.peso_total, self.dimensoes
+        produtos = self.produtos or []
+        if peso is None and any(p.peso for p in produtos):
+            peso = sum((p.peso or 0) * p.quantidade for p in produtos)
+        if dimensoes is None:
+            com_medidas = [p for p in produtos if p.dimensoes]
+            if com_medidas:
+                # Caixa com a base do maior produto e altura para o volume somado
+                comprimento = max(p.dimensoes.comprimento for p in com_medidas)  # type: ignore[union-attr]
+                largura = max(p.dimensoes.largura for p in com_medidas)  # type: ignore[union-attr]
+                volume = sum(
+                    p.dimensoes.comprimento
+                    * p.dimensoes.largura
+                    * p.dimensoes.altura
+                    * p.quantidade  # type: ignore[union-attr]
+                    for p in com_medidas
+                )
+                dimensoes = Dimensoes(
+                    comprimento=comprimento,
+                    largura=largura,
+                    altura=volume / (comprimento * largura),
+                )
+        return peso, dimensoes.tupla() if dimensoes else None
+
+
+class FreteOrcamentoRequest(BaseModel):
+    """Cotação para um orçamento: o valor declarado é o total do orçamento."""
+
+    cep_destino: str
+    peso_total: float | None = Field(None, gt=0)
+    dimensoes: Dimensoes | None = None
+
+
+class CotacaoOrcamentoRequest(FreteOrcamentoRequest):
+    orcamento_id: int
+
+
+class OpcaoFreteResponse(BaseModel):
+    transportadora: str
+    servico: str
+    prazo: int
+    valor: float
+    codigo_servico: str
+
+
+class RespostaFrete(BaseModel):
+    sucesso: bool
+    opcoes_frete: list[OpcaoFreteResponse]
+    mensagem: str | None = None
+    erro: str | None = None
+    # Transportadoras que não responderam no prazo ou falharam
+    indisponiveis: list[str] = []
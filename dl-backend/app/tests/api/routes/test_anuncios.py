@@ -0,0 +1,39 @@
+import asyncio
+import io
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.infra.imagens import ArmazemImagens, armazem_imagens
+
+
+def test_upload_de_arquivo_que_nao_e_imagem_vira_400(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(armazem_imagens, "raiz", tmp_path)
+    r = client.post(
+        f"{settings.API_V1_STR}/anuncios/upload-imagem/",
+        files={"file": ("foto.jpg", b"isto nao e um jpeg" * 100, "image/jpeg")},
+    )
+    assert r.status_code == 400
+    assert "imagem válida" in r.json()["detail"]
+    # Nada foi parar nos originais e o temporário foi apagado
+    assert not (tmp_path / "originais").exists()
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+
+def test_imagem_valida_vai_para_os_originais(tmp_path: Path) -> None:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (10, 10), (255, 0, 0)).save(buffer, "JPEG")
+
+    async def blocos() -> AsyncIterator[bytes]:
+        yield buffer.getvalue()
+
+    imagem = asyncio.run(ArmazemImagens(tmp_path).salvar(blocos(), "image/jpeg"))
+    assert imagem.caminho.exists()
+    assert not imagem.duplicada
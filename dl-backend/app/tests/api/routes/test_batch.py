@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_batch_executa_subrequisicoes(client: TestClient) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/batch",
+        json={
+            "requests": [
+                {"id": "m", "path": "/dashboard/top-produtos"},
+                {"id": "x", "path": "/rota-inexistente"},
+            ]
+        },
+    )
+    assert r.status_code == 200
+    resultados = r.json()["data"]
+    assert [(item["id"], item["status"]) for item in resultados] == [
+        ("m", 200),
+        ("x", 404),
+    ]
+
+
+def test_batch_recusa_rota_em_fluxo(client: TestClient) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/batch",
+        json={"requests": [{"path": "/dashboard/stream"}]},
+    )
+    assert r.status_code == 400
+    assert "/dashboard/stream" in r.json()["detail"]
+
+
+def test_batch_subrequisicao_lenta_vira_504(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "BATCH_ITEM_TIMEOUT_SECONDS", 0)
+    r = client.post(
+        f"{settings.API_V1_STR}/batch",
+        json={"requests": [{"id": "m", "path": "/dashboard/top-produtos"}]},
+    )
+    assert r.status_code == 200
+    assert r.json()["data"][0]["status"] == 504
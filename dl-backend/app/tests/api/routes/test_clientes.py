@@ -0,0 +1,82 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.domain import services
+from app.domain.models import Cliente, SugestaoMesclagemCliente
+
+URL = f"{settings.API_V1_STR}/clientes"
+
+
+def test_rotas_de_cliente_sem_banco_respondem_503(client: TestClient) -> None:
+    assert client.get(f"{URL}/").status_code == 503
+    assert client.get(f"{URL}/buscar/", params={"termo": "silva"}).status_code == 503
+    assert client.delete(f"{URL}/1/").status_code == 503
+
+
+def test_listagem_continua_apos_o_ultimo_cliente(
+    client: TestClient, sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(services, "get_session", lambda: sqlite_db)
+    for nome, telefone in (
+        ("Ana Souza", "(11) 91111-1111"),
+        ("Bruno Silva", "(21) 92222-2222"),
+        ("Carla Silva", "(11) 93333-3333"),
+    ):
+        r = client.post(f"{URL}/", json={"nome": nome, "telefone": telefone})
+        assert r.status_code == 200
+    assert (
+        client.post(f"{URL}/", json={"nome": "Davi", "cpf_cnpj": "123"}).status_code
+        == 400
+    )
+
+    primeira = client.get(f"{URL}/", params={"limit": 2}).json()
+    assert [c["nome"] for c in primeira] == ["Ana Souza", "Bruno Silva"]
+    segunda = client.get(
+        f"{URL}/", params={"limit": 2, "apos": primeira[-1]["id"]}
+    ).json()
+    assert [c["nome"] for c in segunda] == ["Carla Silva"]
+
+    silvas = client.get(f"{URL}/buscar/", params={"termo": "silva", "limit": 1}).json()
+    assert [c["nome"] for c in silvas] == ["Bruno Silva"]
+    depois = client.get(
+        f"{URL}/buscar/", params={"termo": "silva", "apos": silvas[0]["id"]}
+    ).json()
+    assert [c["nome"] for c in depois] == ["Carla Silva"]
+    por_telefone = client.get(f"{URL}/buscar/", params={"termo": "1193333"}).json()
+    assert [c["nome"] for c in por_telefone] == ["Carla Silva"]
+
+
+def test_descartar_sugestao_tira_o_par_da_revisao(
+    client: TestClient, sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert client.get(f"{URL}/duplicados/").status_code == 503
+
+    monkeypatch.setattr(services, "get_session", lambda: sqlite_db)
+    antigo = Cliente(nome="José da Silva")
+    novo = Cliente(nome="Jose Silva")
+    sqlite_db.add_all([antigo, novo])
+    sqlite_db.commit()
+    assert antigo.id is not None and novo.id is not None
+    sqlite_db.add(
+        SugestaoMesclagemCliente(
+            cliente_id=antigo.id,
+            duplicado_id=novo.id,
+            pontuacao=0.76,
+            motivos="nome:0.92",
+        )
+    )
+    sqlite_db.commit()
+
+    pendentes = client.get(f"{URL}/duplicados/").json()
+    assert [(s["cliente_nome"], s["duplicado_nome"]) for s in pendentes] == [
+        ("José da Silva", "Jose Silva")
+    ]
+    # A ordem dos ids na URL não importa
+    r = client.post(f"{URL}/duplicados/{novo.id}/{antigo.id}/descartar/")
+    assert r.json() == {"ok": True}
+    assert client.get(f"{URL}/duplicados/").json() == []
+    assert (
+        client.post(f"{URL}/duplicados/{antigo.id}/999/descartar/").status_code == 404
+    )
@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.api.routes import dashboard
+from app.core.config import settings
+from app.domain.contadores_vendedor import ContadoresVendedorService
+from app.domain.models import Cliente, Produto
+from app.domain.schemas import VendaCreate, VendaItemCreate
+from app.domain.services import VendaService
+
+URL = f"{settings.API_V1_STR}/dashboard"
+
+
+def test_dashboard_sem_banco_responde_503(client: TestClient) -> None:
+    for rota in ("metricas", "estatisticas", "stream"):
+        assert client.get(f"{URL}/{rota}").status_code == 503, rota
+
+
+def test_dashboard_le_os_rollups(
+    client: TestClient, sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sqlite_db.add(Produto(sku="FAROL-01", nome="Farol Civic", preco=Decimal("300")))
+    sqlite_db.add(Cliente(nome="Ana"))
+    sqlite_db.commit()
+    vendas = VendaService(sqlite_db)
+    for canal in ("WhatsApp", "WhatsApp", "Mercado Livre"):
+        vendas.registrar(
+            VendaCreate(
+                canal=canal,
+                vendedor_id=7,
+                itens=[
+                    VendaItemCreate(
+                        sku="FAROL-01",
+                        quantidade=1,
+                        preco_unitario=Decimal("300.00"),
+                        custo_unitario=Decimal("200.00"),
+                    )
+                ],
+            )
+        )
+    contadores = ContadoresVendedorService(sqlite_db)
+    for _ in range(3):
+        contadores.registrar_orcamento_fechado(7)
+    contadores.registrar_orcamento_perdido(7)
+    sqlite_db.commit()
+    monkeypatch.setattr(dashboard, "get_session", lambda: sqlite_db)
+
+    metricas = client.get(f"{URL}/metricas").json()
+    assert metricas["faturamento"] == 900.0
+    assert metricas["vendas_hoje"] == 3
+    assert metricas["total_clientes"] == 1
+    assert metricas["taxa_conversao"] == 75.0
+
+    estatisticas = client.get(f"{URL}/estatisticas").json()
+    hoje = estatisticas["evolucao_semanal"][-1]
+    assert (hoje["vendas"], hoje["faturamento"], hoje["conversao"]) == (3, 900.0, 75.0)
+    assert all("conversao" in dia for dia in estatisticas["evolucao_semanal"])
+    assert {c["name"]: c["value"] for c in estatisticas["distribuicao_canais"]} == {
+        "WhatsApp": 2,
+        "Mercado Livre": 1,
+    }
+    assert estatisticas["performance_produtos"][0]["produto"] == "Farol Civic"
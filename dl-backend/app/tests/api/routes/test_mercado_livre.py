@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.api.routes import mercado_livre
+from app.domain import services
+from app.domain.models import AnuncioML
+
+# O router só é montado com FEATURE_MERCADO_LIVRE; o teste monta o seu
+app = FastAPI()
+app.include_router(mercado_livre.router, prefix="/anuncios")
+
+
+def test_meus_produtos_le_os_anuncios_sincronizados(
+    sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    client = TestClient(app)
+    assert client.get("/anuncios/ml/meus-produtos").status_code == 503
+
+    for numero in range(3):
+        sqlite_db.add(
+            AnuncioML(
+                id=f"MLB{numero}",
+                sku=f"SKU{numero}",
+                titulo=f"Farol {numero}",
+                preco=Decimal("689.90"),
+                estoque=numero,
+                status="active",
+                atualizado_ml_em=datetime.now(timezone.utc),
+            )
+        )
+    sqlite_db.commit()
+    monkeypatch.setattr(services, "get_session", lambda: sqlite_db)
+
+    r = client.get("/anuncios/ml/meus-produtos", params={"skip": 1, "limit": 5})
+    assert r.status_code == 200
+    dados = r.json()
+    assert dados["produtos_encontrados"] == 3
+    assert [p["id"] for p in dados["produtos"]] == ["MLB1", "MLB2"]
+    assert dados["produtos"][0]["preco"] == 689.9
@@ -0,0 +1,170 @@
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.domain import services
+from app.domain.models import Produto
+
+URL = f"{settings.API_V1_STR}/orcamentos"
+
+
+def test_rotas_de_orcamento_sem_banco_respondem_503(client: TestClient) -> None:
+    assert client.get(f"{URL}/").status_code == 503
+    assert client.patch(f"{URL}/1", json={"versao": 1}).status_code == 503
+    assert client.delete(f"{URL}/1").status_code == 503
+
+
+def test_autosave_de_versao_antiga_responde_409_com_a_versao_atual(
+    client: TestClient, sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(services, "get_session", lambda: sqlite_db)
+    criado = client.post(
+        f"{URL}/",
+        params={"vendedor_id": 3},
+        json={
+            "itens": [
+                {"produto_avulso": "Farol", "quantidade": 1, "valor_unitario": "100.00"}
+            ]
+        },
+    ).json()["orcamento"]
+
+    r = client.patch(
+        f"{URL}/{criado['id']}",
+        json={"versao": criado["versao"], "cabecalho": {"observacoes": "a"}},
+    )
+    assert r.status_code == 200
+    assert r.json()["versao"] == criado["versao"] + 1
+
+    r = client.patch(
+        f"{URL}/{criado['id']}",
+        json={"versao": criado["versao"], "cabecalho": {"observacoes": "b"}},
+    )
+    assert r.status_code == 409
+    assert r.json()["detail"]["versao_atual"] == criado["versao"] + 1
+
+    assert [
+        o["id"] for o in client.get(f"{URL}/", params={"vendedor_id": 3}).json()
+    ] == [criado["id"]]
+    assert client.get(f"{URL}/", params={"vendedor_id": 4}).json() == []
+    assert client.delete(f"{URL}/{criado['id']}").json() == {"ok": True}
+    assert client.delete(f"{URL}/{criado['id']}").status_code == 404
+
+
+def test_converter_em_venda_sem_estoque_responde_409_e_nao_grava(
+    client: TestClient, sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert client.post(f"{URL}/1/converter-venda", json={}).status_code == 503
+
+    produto = Produto(sku="FAROL-01", nome="Farol", preco=Decimal("300.00"), estoque=2)
+    sqlite_db.add(produto)
+    sqlite_db.commit()
+    monkeypatch.setattr(services, "get_session", lambda: sqlite_db)
+    criado = client.post(
+        f"{URL}/",
+        params={"vendedor_id": 3},
+        json={
+            "itens": [
+                {
+                    "produto_id": str(produto.id),
+                    "quantidade": 3,
+                    "valor_unitario": "300",
+                }
+            ]
+        },
+    ).json()["orcamento"]
+
+    r = client.post(f"{URL}/{criado['id']}/converter-venda", json={})
+    assert r.status_code == 409
+    assert [linha["status"] for linha in r.json()["detail"]["linhas"]] == [
+        "estoque_insuficiente"
+    ]
+    sqlite_db.refresh(produto)
+    assert produto.estoque == 2
+
+    linha = client.get(f"{URL}/{criado['id']}").json()["itens"][0]
+    client.patch(
+        f"{URL}/{criado['id']}",
+        json={
+            "versao": criado["versao"],
+            "operacoes": [{"op": "alterar", "id": linha["id"], "quantidade": 2}],
+        },
+    )
+    r = client.post(f"{URL}/{criado['id']}/converter-venda", json={})
+    assert r.status_code == 200
+    assert r.json()["sucesso"] is True
+    sqlite_db.refresh(produto)
+    assert produto.estoque == 0
+
+
+def _orcamento_com_uma_linha(client: TestClient) -> tuple[dict, str]:
+    criado = client.post(
+        f"{URL}/",
+        params={"vendedor_id": 3},
+        json={
+            "itens": [
+                {"produto_avulso": "Farol", "quantidade": 1, "valor_unitario": "100"}
+            ]
+        },
+    ).json()["orcamento"]
+    return criado, client.get(f"{URL}/{criado['id']}").json()["itens"][0]["id"]
+
+
+@pytest.mark.parametrize(
+    "campo", ["quantidade", "valor_unitario", "desconto_percentual", "desconto_valor"]
+)
+def test_alterar_linha_com_null_responde_422_e_nao_grava(
+    client: TestClient,
+    sqlite_db: Session,
+    monkeypatch: pytest.MonkeyPatch,
+    campo: str,
+) -> None:
+    monkeypatch.setattr(services, "get_session", lambda: sqlite_db)
+    criado, linha_id = _orcamento_com_uma_linha(client)
+
+    r = client.patch(
+        f"{URL}/{criado['id']}",
+        json={
+            "versao": criado["versao"],
+            "operacoes": [{"op": "alterar", "id": linha_id, campo: None}],
+        },
+    )
+    assert r.status_code == 422
+    assert client.get(f"{URL}/{criado['id']}").json()["versao"] == criado["versao"]
+
+    # `observacoes` pode ser apagada com null
+    r = client.patch(
+        f"{URL}/{criado['id']}",
+        json={
+            "versao": criado["versao"],
+            "operacoes": [{"op": "alterar", "id": linha_id, "observacoes": None}],
+        },
+    )
+    assert r.status_code == 200
+
+
+def test_prioridade_null_no_cabecalho_responde_422(
+    client: TestClient, sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(services, "get_session", lambda: sqlite_db)
+    criado, _ = _orcamento_com_uma_linha(client)
+
+    r = client.patch(
+        f"{URL}/{criado['id']}",
+        json={"versao": criado["versao"], "cabecalho": {"prioridade": None}},
+    )
+    assert r.status_code == 422
+    r = client.put(
+        f"{URL}/{criado['id']}",
+        json={"versao": criado["versao"], "prioridade": None},
+    )
+    assert r.status_code == 422
+
+    r = client.patch(
+        f"{URL}/{criado['id']}",
+        json={"versao": criado["versao"], "cabecalho": {"marca_veiculo": None}},
+    )
+    assert r.status_code == 200
+    assert client.get(f"{URL}/{criado['id']}").json()["prioridade"] == "media"
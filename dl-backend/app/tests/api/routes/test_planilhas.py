@@ -0,0 +1,29 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+URL = f"{settings.API_V1_STR}/parser/parse-spreadsheet"
+CSV = "sku;nome;preco\n" + "".join(f"P-{i};Peça {i};{i},50\n" for i in range(1, 6))
+
+
+def _previa(client: TestClient, pagina: int) -> dict:
+    r = client.post(
+        URL,
+        params={"pagina": pagina, "por_pagina": 2},
+        files={"file": ("lista.csv", CSV.encode(), "text/csv")},
+    )
+    assert r.status_code == 200
+    return r.json()
+
+
+def test_previa_conta_as_linhas_mesmo_alem_da_ultima_pagina(client: TestClient) -> None:
+    primeira = _previa(client, 1)
+    assert primeira["tem_mais"] is True
+    assert [linha["sku"] for linha in primeira["sample_data"]] == ["P-1", "P-2"]
+    assert primeira["validacao"] == {"validas": 2, "invalidas": 0, "linhas": []}
+
+    ultima = _previa(client, 3)
+    assert (ultima["tem_mais"], ultima["rows_count"]) == (False, 5)
+    # Página além do fim: nenhuma linha, mas a contagem continua exata
+    alem = _previa(client, 10)
+    assert (alem["sample_data"], alem["rows_count"]) == ([], 5)
@@ -0,0 +1,67 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.domain import services
+from app.domain.models import Produto
+
+URL = f"{settings.API_V1_STR}/produtos-estoque"
+
+
+def test_reservas_sem_banco_respondem_503(client: TestClient) -> None:
+    assert (
+        client.post(f"{URL}/reservar", json={"sku": "X", "quantidade": 1}).status_code
+        == 503
+    )
+    assert (
+        client.post(
+            f"{URL}/liberar", json={"reserva_id": str(uuid.uuid4())}
+        ).status_code
+        == 503
+    )
+    assert (
+        client.post(f"{URL}/reservas/{uuid.uuid4()}/renovar", json={}).status_code
+        == 503
+    )
+
+
+def test_reserva_alem_do_disponivel_responde_409(
+    client: TestClient, sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sqlite_db.add(
+        Produto(sku="RES-01", nome="Farol", preco=Decimal("300.00"), estoque=3)
+    )
+    sqlite_db.commit()
+    monkeypatch.setattr(services, "get_session", lambda: sqlite_db)
+
+    r = client.post(f"{URL}/reservar", json={"sku": "RES-01", "quantidade": 2})
+    assert r.status_code == 200
+    reserva = r.json()["reserva"]
+    assert reserva["disponivel"] == 1
+
+    r = client.post(f"{URL}/reservar", json={"sku": "RES-01", "quantidade": 2})
+    assert r.status_code == 409
+    assert r.json()["detail"]["disponivel"] == 1
+
+    r = client.post(
+        f"{URL}/reservas/{reserva['id']}/renovar", json={"ttl_segundos": 60}
+    )
+    assert r.status_code == 200
+    assert (
+        client.post(f"{URL}/liberar", json={"reserva_id": reserva["id"]}).status_code
+        == 200
+    )
+    assert (
+        client.post(f"{URL}/liberar", json={"reserva_id": reserva["id"]}).status_code
+        == 404
+    )
+    assert (
+        client.post(
+            f"{URL}/reservar", json={"sku": "RES-01", "quantidade": 3}
+        ).status_code
+        == 200
+    )
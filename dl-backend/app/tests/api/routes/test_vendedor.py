@@ -0,0 +1,42 @@
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.api.routes import vendedor
+from app.core.config import settings
+from app.domain import services
+from app.domain.contadores_vendedor import ContadoresVendedorService
+
+
+def test_rotas_do_vendedor_sem_banco_respondem_503(client: TestClient) -> None:
+    for rota in ("resumo-dia", "metricas-dia", "feedback", "orcamentos-perdidos"):
+        r = client.get(f"{settings.API_V1_STR}/vendedor/7/{rota}")
+        assert r.status_code == 503, rota
+
+
+def test_rotas_do_vendedor_leem_os_contadores_do_vendedor(
+    client: TestClient, sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    contadores = ContadoresVendedorService(sqlite_db)
+    contadores.registrar_venda(7, Decimal("1000.00"))
+    contadores.registrar_orcamento_fechado(7)
+    contadores.registrar_orcamento_perdido(7)
+    contadores.registrar_venda(8, Decimal("50.00"))
+    sqlite_db.commit()
+    monkeypatch.setattr(vendedor, "get_session", lambda: sqlite_db)
+    monkeypatch.setattr(services, "get_session", lambda: sqlite_db)
+
+    resumo = client.get(f"{settings.API_V1_STR}/vendedor/7/resumo-dia").json()
+    assert resumo["vendas_realizadas"] == 1000.0
+    assert resumo["num_vendas"] == 1
+
+    feedback = client.get(f"{settings.API_V1_STR}/vendedor/7/feedback").json()
+    assert feedback["metricas"]["taxa_fechamento"] == 50
+
+    metricas = client.get(f"{settings.API_V1_STR}/vendedor/8/metricas-dia").json()
+    assert metricas["vendas_dia"] == 50.0
+
+    r = client.get(f"{settings.API_V1_STR}/vendedor/7/orcamentos-perdidos")
+    assert r.json() == {"vendedor_id": 7, "orcamentos_perdidos": []}
@@ -8,6 +8,7 @@ from app.core.config import settings
 from app.core.db import engine, init_db
 from app.main import app
 from app.models import Item, User
+from app.tests.utils.db import sqlite_session
 from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import get_superuser_token_headers
 
@@ -17,6 +18,9 @@ def db() -> Generator[Session, None, None]:
     with Session(engine) as session:
         init_db(session)
         yield session
+        # TODO: Reverter para implementação real (sem engine, não há o que limpar)
+        if engine is None:
+            return
         statement = delete(Item)
         session.execute(statement)
         statement = delete(User)
@@ -24,6 +28,12 @@ def db() -> Generator[Session, None, None]:
         session.commit()
 
 
+@pytest.fixture()
+def sqlite_db() -> Generator[Session, None, None]:
+    with sqlite_session() as session:
+        yield session
+
+
 @pytest.fixture(scope="module")
 def client() -> Generator[TestClient, None, None]:
     with TestClient(app) as c:
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_do_executa_uma_vez_para_chamadas_concorrentes() -> None:
+    grupo = SingleFlight()
+    chamadas = 0
+    liberar = threading.Event()
+
+    def lenta() -> int:
+        nonlocal chamadas
+        chamadas += 1
+        liberar.wait(1)
+        return 42
+
+    resultados: list[int] = []
+    threads = [
+        threading.Thread(target=lambda: resultados.append(grupo.do("k", lenta)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    liberar.set()
+    for thread in threads:
+        thread.join()
+    assert resultados == [42] * 5
+    assert chamadas == 1
+
+
+def test_do_async_cancelamento_do_lider_nao_afeta_quem_aguarda() -> None:
+    grupo = SingleFlight()
+    chamadas = 0
+
+    async def consulta() -> int:
+        nonlocal chamadas
+        chamadas += 1
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def cenario() -> None:
+        lider = asyncio.create_task(grupo.do_async("k", consulta))
+        await asyncio.sleep(0)
+        seguidor = asyncio.create_task(grupo.do_async("k", consulta))
+        await asyncio.sleep(0)
+        lider.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await lider
+        assert await seguidor == 42
+
+    asyncio.run(cenario())
+    assert chamadas == 1
+
+
+def test_do_async_propaga_erro_sem_guardar_em_cache() -> None:
+    grupo = SingleFlight()
+    chamadas = 0
+
+    async def falha() -> int:
+        nonlocal chamadas
+        chamadas += 1
+        raise ValueError("indisponível")
+
+    async def cenario() -> None:
+        erros = await asyncio.gather(
+            grupo.do_async("k", falha, ttl=10),
+            grupo.do_async("k", falha, ttl=10),
+            return_exceptions=True,
+        )
+        assert all(isinstance(erro, ValueError) for erro in erros)
+        with pytest.raises(ValueError):
+            await grupo.do_async("k", falha, ttl=10)
+
+    asyncio.run(cenario())
+    assert chamadas == 2
+
+
+def test_do_async_reaproveita_resultado_dentro_do_ttl() -> None:
+    grupo = SingleFlight()
+    chamadas = 0
+
+    async def consulta() -> int:
+        nonlocal chamadas
+        chamadas += 1
+        return chamadas
+
+    async def cenario() -> None:
+        assert await grupo.do_async("k", consulta, ttl=60) == 1
+        assert await grupo.do_async("k", consulta, ttl=60) == 1
+        grupo.limpar()
+        assert await grupo.do_async("k", consulta, ttl=60) == 2
+
+    asyncio.run(cenario())
@@ -0,0 +1,56 @@
+import random
+
+from app.core.sorted_set import ConjuntoOrdenado
+
+
+def _esperado(pontuacoes: dict[int, float]) -> list[tuple[int, float]]:
+    return sorted(pontuacoes.items(), key=lambda item: (-item[1], item[0]))
+
+
+def test_ordena_da_maior_para_a_menor_com_empate_pelo_membro() -> None:
+    conjunto = ConjuntoOrdenado()
+    conjunto.adicionar("b", 10)
+    conjunto.adicionar("a", 10)
+    conjunto.adicionar("c", 30)
+    assert conjunto.intervalo(0, 10) == [("c", 30), ("a", 10), ("b", 10)]
+    assert [conjunto.posicao(m) for m in "abc"] == [1, 2, 0]
+    assert conjunto.posicao("x") is None
+
+
+def test_incrementar_e_remover_atualizam_posicoes() -> None:
+    conjunto = ConjuntoOrdenado()
+    for membro in range(5):
+        conjunto.adicionar(membro, membro)
+    assert conjunto.incrementar(0, 10) == 10
+    assert conjunto.posicao(0) == 0
+    assert conjunto.remover(4)
+    assert not conjunto.remover(4)
+    assert len(conjunto) == 4
+    assert conjunto.intervalo(1, 2) == [(3, 3), (2, 2)]
+    assert conjunto.intervalo(10, 2) == []
+
+
+def test_confere_com_ordenacao_completa_apos_operacoes_aleatorias() -> None:
+    aleatorio = random.Random(7)
+    conjunto = ConjuntoOrdenado()
+    pontuacoes: dict[int, float] = {}
+    for _ in range(5000):
+        membro = aleatorio.randrange(300)
+        operacao = aleatorio.random()
+        if operacao < 0.6:
+            delta = aleatorio.randrange(1, 100)
+            pontuacoes[membro] = conjunto.incrementar(membro, delta)
+        elif operacao < 0.8:
+            conjunto.adicionar(membro, aleatorio.randrange(1000))
+            pontuacoes[membro] = conjunto.pontuacao(membro)  # type: ignore[assignment]
+        else:
+            assert conjunto.remover(membro) == (
+                pontuacoes.pop(membro, None) is not None
+            )
+
+    esperado = _esperado(pontuacoes)
+    assert conjunto.intervalo(0, len(esperado)) == esperado
+    for posicao in (0, 17, len(esperado) // 2, len(esperado) - 1):
+        membro = esperado[posicao][0]
+        assert conjunto.posicao(membro) == posicao
+        assert conjunto.intervalo(posicao, 3) == esperado[posicao : posicao + 3]
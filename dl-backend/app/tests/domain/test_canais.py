@@ -0,0 +1,80 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.domain.canais import (
+    CANAL_MERCADO_LIVRE,
+    CANAL_SHOPIFY,
+    LoteAtualizacao,
+    MotorDiffCanais,
+)
+from app.domain.models import Produto
+
+
+class PublicadorFalso:
+    def __init__(self, recusar: set[str] | None = None):
+        self.recusar = recusar or set()
+        self.enviados: list[str] = []
+
+    async def __call__(self, lote: LoteAtualizacao) -> set[str]:
+        skus = {a.sku for a in lote.alteracoes}
+        self.enviados.extend(sorted(skus))
+        return skus - self.recusar
+
+
+@pytest.fixture()
+def motor(monkeypatch: pytest.MonkeyPatch) -> MotorDiffCanais:
+    monkeypatch.setattr(settings, "FEATURE_MERCADO_LIVRE", True)
+    monkeypatch.setattr(settings, "FEATURE_SHOPIFY", True)
+    monkeypatch.setattr(settings, "CHANNEL_SYNC_DEBOUNCE_SECONDS", 0)
+    return MotorDiffCanais()
+
+
+def _ciclo(motor: MotorDiffCanais, session: Session, skus: list[str]) -> None:
+    motor.marcar(skus)
+    asyncio.run(motor.processar(lambda: session))
+
+
+def _produtos(session: Session) -> None:
+    for sku in ("A", "B", "C"):
+        session.add(
+            Produto(sku=sku, nome=f"Peça {sku}", preco=Decimal("10"), estoque=5)
+        )
+    session.commit()
+
+
+def test_renomear_produto_nao_reenvia_para_canal_sem_titulo(
+    motor: MotorDiffCanais, sqlite_db: Session
+) -> None:
+    ml, shopify = PublicadorFalso(), PublicadorFalso()
+    motor.registrar_publicador(CANAL_MERCADO_LIVRE, ml, envia_titulo=False)
+    motor.registrar_publicador(CANAL_SHOPIFY, shopify)
+    _produtos(sqlite_db)
+    _ciclo(motor, sqlite_db, ["A", "B", "C"])
+    assert ml.enviados == shopify.enviados == ["A", "B", "C"]
+
+    produto = sqlite_db.exec(select(Produto).where(Produto.sku == "A")).one()
+    produto.nome = "Peça A (nova descrição)"
+    sqlite_db.commit()
+    _ciclo(motor, sqlite_db, ["A"])
+    assert ml.enviados == ["A", "B", "C"]
+    assert shopify.enviados == ["A", "B", "C", "A"]
+
+
+def test_so_os_skus_aceitos_sao_confirmados(
+    motor: MotorDiffCanais, sqlite_db: Session
+) -> None:
+    ml = PublicadorFalso(recusar={"B"})
+    motor.registrar_publicador(CANAL_MERCADO_LIVRE, ml, envia_titulo=False)
+    _produtos(sqlite_db)
+    _ciclo(motor, sqlite_db, ["A", "B", "C"])
+    assert motor.recusadas == 1
+    assert motor.alteracoes_enviadas == 2
+
+    # Só o recusado volta para a fila e é reenviado no ciclo seguinte
+    ml.recusar.clear()
+    asyncio.run(motor.processar(lambda: sqlite_db))
+    assert ml.enviados == ["A", "B", "C", "B"]
@@ -0,0 +1,129 @@
+from difflib import SequenceMatcher
+
+import pytest
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.domain.duplicidade_clientes import (
+    DuplicidadeClientes,
+    RegistroCliente,
+    ResultadoDuplicidade,
+    SugestoesMesclagemService,
+    pontuar,
+)
+from app.domain.models import SugestaoMesclagemCliente
+from app.domain.schemas import ClienteCreate, ClienteUpdate
+from app.domain.services import ClienteService
+
+
+def _registro(id_: int, nome: str, **campos: str) -> RegistroCliente:
+    vazio = dict.fromkeys(("documento", "telefone", "email", "placa", "cep"), "")
+    return RegistroCliente(id=id_, nome=nome, **{**vazio, **campos})
+
+
+def test_pontuar_descarta_documentos_diferentes() -> None:
+    a = _registro(1, "jose silva", documento="12345678909", telefone="87654321")
+    b = _registro(2, "jose silva", documento="98765432100", telefone="87654321")
+    assert pontuar(a, b) is None
+    pontos = pontuar(a, b._replace(documento=""))
+    assert pontos is not None
+    assert pontos == (0.8, ["telefone", "nome:1.00"])
+
+
+def test_pontuar_corta_pelo_quick_ratio_sem_calcular_ratio(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def ratio(_self: SequenceMatcher) -> float:
+        raise AssertionError("ratio não deveria ser calculado")
+
+    monkeypatch.setattr(SequenceMatcher, "ratio", ratio)
+    a = _registro(1, "ana paula", telefone="87654321")
+    b = _registro(2, "roberto gomes", telefone="87654321")
+    assert pontuar(a, b, minimo=0.7) is None
+    # Sem evidência que some 0,7 nem com nomes iguais: nem compara os nomes
+    assert pontuar(_registro(1, "ana"), _registro(2, "ana"), minimo=0.7) is None
+
+
+def test_blocos_grandes_demais_sao_pulados_e_contados(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "CUSTOMER_DEDUP_MAX_BLOCK_SIZE", 2)
+    registros = [_registro(i, f"cliente {i}") for i in range(6)]
+    linhas = [("loja", registros[0]), ("loja", registros[1]), ("loja", registros[2])]
+    linhas += [("a", registros[3]), ("a", registros[4]), ("b", registros[5])]
+    resultado = ResultadoDuplicidade()
+
+    pares = list(DuplicidadeClientes()._blocos(linhas, resultado))
+
+    assert [(a.id, b.id) for a, b in pares] == [(3, 4)]
+    assert (resultado.lidos, resultado.blocos_ignorados, resultado.maior_bloco) == (
+        6,
+        1,
+        2,
+    )
+
+
+def test_janela_compara_cada_cadastro_com_os_anteriores(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "CUSTOMER_DEDUP_NAME_WINDOW", 2)
+    linhas = [(None, _registro(i, f"cliente {i}")) for i in range(4)]
+    resultado = ResultadoDuplicidade()
+
+    pares = list(DuplicidadeClientes()._janela(linhas, resultado))
+
+    assert [(a.id, b.id) for a, b in pares] == [(0, 1), (0, 2), (1, 2), (1, 3), (2, 3)]
+    assert resultado.lidos == 4
+
+
+def _pares(sqlite_db: Session) -> dict[tuple[int, int], str]:
+    return {
+        (s.cliente_id, s.duplicado_id): s.status
+        for s in sqlite_db.exec(select(SugestaoMesclagemCliente)).all()
+    }
+
+
+def test_execucao_sugere_pares_e_mantem_os_descartados(sqlite_db: Session) -> None:
+    clientes = ClienteService(sqlite_db)
+    jose = clientes.create(
+        ClienteCreate(
+            nome="José da Silva", telefone="(11) 98765-4321", cpf_cnpj="123.456.789-09"
+        )
+    )
+    jose_sem_cpf = clientes.create(
+        ClienteCreate(nome="Jose Silva", telefone="11 8765-4321")
+    )
+    outro_jose = clientes.create(
+        ClienteCreate(
+            nome="José Silva", telefone="98765-4321", cpf_cnpj="987.654.321-00"
+        )
+    )
+    maria = clientes.create(
+        ClienteCreate(nome="Maria Souza", email="maria@x.com", placa_veiculo="ABC1D23")
+    )
+    maria_2 = clientes.create(
+        ClienteCreate(
+            nome="Maria Souza", email=" MARIA@x.com", placa_veiculo="abc-1d23"
+        )
+    )
+    clientes.create(ClienteCreate(nome="Roberto Gomes", telefone="11 3333-0000"))
+    job = DuplicidadeClientes()
+
+    resultado = job.executar_sync(sqlite_db)
+
+    assert _pares(sqlite_db) == {
+        (jose.id, jose_sem_cpf.id): "pendente",
+        (jose_sem_cpf.id, outro_jose.id): "pendente",
+        (maria.id, maria_2.id): "pendente",
+    }
+    assert resultado.sugestoes == 3
+    assert resultado.removidas == 0
+
+    SugestoesMesclagemService(sqlite_db).descartar(maria_2.id, maria.id)
+    # Telefone corrigido: os pares que dependiam dele deixam de valer
+    clientes.update(jose_sem_cpf.id, ClienteUpdate(telefone="11 2222-1111"))
+
+    resultado = job.executar_sync(sqlite_db)
+
+    assert _pares(sqlite_db) == {(maria.id, maria_2.id): "descartada"}
+    assert (resultado.sugestoes, resultado.removidas) == (0, 2)
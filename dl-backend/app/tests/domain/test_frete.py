@@ -0,0 +1,27 @@
+import asyncio
+
+from app.domain.frete import MotorFrete, faixa_valor, montar_pacote
+from app.tests.utils.transportadoras import TransportadoraFalsa
+
+
+def test_faixa_de_valor_declara_no_maximo_10_porcento_a_mais() -> None:
+    assert faixa_valor(0) == 0
+    assert faixa_valor(850) == 850
+    assert faixa_valor(850.01) == 860
+    assert faixa_valor(1234.56) == 1300
+    for valor in (0.4, 9.99, 10.01, 101, 4321.5, 99_999.99):
+        assert valor <= faixa_valor(valor) <= max(valor * 1.1, 1)
+
+
+def test_cache_separa_pacotes_de_valores_declarados_diferentes() -> None:
+    falsa = TransportadoraFalsa("Falsa", latencia=0)
+    motor = MotorFrete([falsa])
+
+    async def cotar(valor: float) -> None:
+        await motor.cotar(montar_pacote("01310-100", 2.0, valor_declarado=valor))
+
+    asyncio.run(cotar(100.0))
+    asyncio.run(cotar(99.5))  # mesma faixa: vem do cache
+    assert falsa.chamadas == 1
+    asyncio.run(cotar(5000.0))  # seguro diferente: nova cotação
+    assert falsa.chamadas == 2
@@ -0,0 +1,58 @@
+from decimal import Decimal
+
+from app.domain.importacao_produtos import (
+    MAX_NOME,
+    converter_numero,
+    mapear_colunas,
+    validar_linha,
+)
+
+MAPA = {"sku": "Código", "nome": "Descrição", "preco": "Preço"}
+
+
+def test_converter_numero_aceita_formatos_brasileiro_e_americano() -> None:
+    assert converter_numero("R$ 1.234,56") == Decimal("1234.56")
+    assert converter_numero("1,234.56") == Decimal("1234.56")
+    assert converter_numero("12,5") == Decimal("12.5")
+    assert converter_numero("1.234.567") == Decimal("1234567")
+    assert converter_numero(10.5) == Decimal("10.5")
+    assert converter_numero("") is None and converter_numero(True) is None
+
+
+def test_mapear_colunas_por_sinonimo_e_explicito() -> None:
+    colunas = ["Código", "Descrição", "Preço (R$)", "Valor", "Qtde"]
+    assert mapear_colunas(colunas) == {
+        "sku": "Código",
+        "nome": "Descrição",
+        "preco": "Preço (R$)",
+        "estoque": "Qtde",
+    }
+    assert mapear_colunas(colunas, {"preco": "Valor"})["preco"] == "Valor"
+
+
+def test_validar_linha_respeita_os_limites_da_tabela_produto() -> None:
+    longo = "Farol " * 100
+    ok = validar_linha(
+        1, {"Código": 123.0, "Descrição": longo, "Preço": "99.999.999,99"}, MAPA
+    )
+    assert ok.produto is not None and not ok.erros
+    assert ok.produto.sku == "123"
+    assert len(ok.produto.nome) <= MAX_NOME
+    assert ok.produto.preco == Decimal("99999999.99")
+
+    ruim = validar_linha(
+        2, {"Código": "X" * 101, "Descrição": "Farol", "Preço": "100.000.000"}, MAPA
+    )
+    assert ruim.produto is None
+    assert ruim.erros == [
+        "preço acima de 99999999.99",
+        "SKU com mais de 100 caracteres",
+    ]
+
+    # 99999999,995 arredonda para 100000000,00, que não cabe em NUMERIC(10, 2)
+    assert (
+        validar_linha(
+            3, {"Código": "A", "Descrição": "B", "Preço": "99999999.995"}, MAPA
+        ).produto
+        is None
+    )
@@ -0,0 +1,171 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlmodel import Session
+
+from app.domain.models import Orcamento
+from app.domain.schemas import (
+    OperacaoAdicionar,
+    OperacaoAlterar,
+    OperacaoRemover,
+    OrcamentoCreate,
+    OrcamentoItemCreate,
+    OrcamentoPatch,
+    OrcamentoUpdate,
+)
+from app.domain.services import ConflitoVersao, ErroOrcamento, OrcamentoService
+
+
+def _linha(
+    descricao: str, quantidade: int, valor: str, **extra: object
+) -> OrcamentoItemCreate:
+    return OrcamentoItemCreate(
+        produto_avulso=descricao,
+        quantidade=quantidade,
+        valor_unitario=Decimal(valor),
+        **extra,
+    )
+
+
+def _totais_do_zero(
+    servico: OrcamentoService, orcamento_id: int
+) -> tuple[Decimal, Decimal, int]:
+    """Subtotal, desconto e número de linhas recalculados a partir das linhas gravadas."""
+    orcamento = servico.get(orcamento_id)
+    assert orcamento is not None and orcamento.itens is not None
+    subtotal = sum(
+        (i.valor_unitario * i.quantidade for i in orcamento.itens), Decimal("0")
+    )
+    total = sum((i.valor_total for i in orcamento.itens), Decimal("0"))
+    return subtotal, subtotal - total, len(orcamento.itens)
+
+
+def test_patch_soma_as_diferencas_das_linhas_nos_totais(sqlite_db: Session) -> None:
+    servico = OrcamentoService(sqlite_db)
+    criado = servico.create(
+        OrcamentoCreate(
+            itens=[
+                _linha("Farol", 2, "300.00", desconto_valor=Decimal("50.00")),
+                _linha("Mão de obra", 1, "300.00"),
+            ]
+        ),
+        vendedor_id=1,
+    )
+    assert criado.itens is not None
+    farol, mao_de_obra = criado.itens
+    assert (criado.subtotal, criado.desconto_total, criado.valor_total) == (
+        Decimal("900.00"),
+        Decimal("50.00"),
+        Decimal("850.00"),
+    )
+
+    resultado = servico.aplicar_patch(
+        criado.id,
+        OrcamentoPatch(
+            versao=criado.versao,
+            operacoes=[
+                OperacaoAlterar(
+                    op="alterar",
+                    id=farol.id,
+                    quantidade=3,
+                    desconto_percentual=Decimal("10"),
+                ),
+                OperacaoRemover(op="remover", id=mao_de_obra.id),
+                OperacaoAdicionar(op="adicionar", item=_linha("Lâmpada", 4, "12.50")),
+            ],
+        ),
+    )
+    assert resultado is not None
+    assert resultado.versao == criado.versao + 1
+    assert resultado.linhas_gravadas == 3
+    subtotal, desconto, linhas = _totais_do_zero(servico, criado.id)
+    assert (resultado.subtotal, resultado.desconto_total, resultado.total_itens) == (
+        subtotal,
+        desconto,
+        linhas,
+    )
+    # 3 x 300 + 4 x 12,50; desconto de 50 + 10% de 900
+    assert resultado.subtotal == Decimal("950.00")
+    assert resultado.desconto_total == Decimal("140.00")
+    assert resultado.valor_total == Decimal("810.00")
+
+
+def test_update_completo_grava_so_as_linhas_que_mudaram(sqlite_db: Session) -> None:
+    servico = OrcamentoService(sqlite_db)
+    criado = servico.create(
+        OrcamentoCreate(
+            itens=[_linha("Farol", 1, "100.00"), _linha("Grade", 1, "80.00")]
+        ),
+        vendedor_id=1,
+    )
+    assert criado.itens is not None
+    farol = criado.itens[0]
+    atualizado = servico.update(
+        criado.id,
+        OrcamentoUpdate(
+            versao=criado.versao,
+            itens=[
+                _linha("Farol", 2, "100.00", id=farol.id),
+                _linha("Grade", 1, "80.00"),  # sem id: casa com a linha gravada
+            ],
+        ),
+    )
+    assert atualizado is not None and atualizado.itens is not None
+    assert atualizado.subtotal == Decimal("280.00")
+    assert [i.posicao for i in atualizado.itens] == [0, 1]
+    assert (
+        atualizado.subtotal,
+        atualizado.desconto_total,
+        atualizado.total_itens,
+    ) == _totais_do_zero(servico, criado.id)
+
+
+def test_patch_de_versao_antiga_informa_a_versao_atual(sqlite_db: Session) -> None:
+    servico = OrcamentoService(sqlite_db)
+    criado = servico.create(
+        OrcamentoCreate(itens=[_linha("Farol", 1, "100.00")]), vendedor_id=1
+    )
+    servico.aplicar_patch(
+        criado.id, OrcamentoPatch(versao=criado.versao, cabecalho={"observacoes": "a"})
+    )
+    with pytest.raises(ConflitoVersao) as erro:
+        servico.aplicar_patch(
+            criado.id,
+            OrcamentoPatch(versao=criado.versao, cabecalho={"observacoes": "b"}),
+        )
+    assert erro.value.versao_atual == criado.versao + 1
+
+
+def test_id_de_linha_de_outro_orcamento_e_recusado(sqlite_db: Session) -> None:
+    servico = OrcamentoService(sqlite_db)
+    outro = servico.create(
+        OrcamentoCreate(itens=[_linha("Farol", 1, "100.00")]), vendedor_id=1
+    )
+    assert outro.itens is not None
+    criado = servico.create(OrcamentoCreate(), vendedor_id=1)
+    with pytest.raises(ErroOrcamento, match="outro orçamento"):
+        servico.aplicar_patch(
+            criado.id,
+            OrcamentoPatch(
+                versao=criado.versao,
+                operacoes=[
+                    OperacaoAdicionar(
+                        op="adicionar",
+                        item=_linha("Grade", 1, "80.00", id=outro.itens[0].id),
+                    ),
+                    OperacaoAdicionar(
+                        op="adicionar",
+                        item=_linha("Lâmpada", 1, "10.00", id=uuid.uuid4()),
+                    ),
+                ],
+            ),
+        )
+    # Nada foi gravado em nenhum dos dois
+    orcamento = sqlite_db.get(Orcamento, criado.id)
+    assert (
+        orcamento is not None
+        and orcamento.versao == criado.versao
+        and orcamento.total_itens == 0
+    )
+    assert servico.get(outro.id).itens[0].descricao == "Farol"  # type: ignore[union-attr]
@@ -0,0 +1,102 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlmodel import Session
+
+from app.domain.models import ReservaEstoque
+from app.domain.reservas_estoque import ReservaEstoqueService, ReservasEstoque
+
+
+def test_reservado_por_sku_exclui_so_as_reservas_do_dono(sqlite_db: Session) -> None:
+    validade = datetime.now(timezone.utc) + timedelta(minutes=10)
+    for quantidade, origem, referencia in [
+        (1, "orcamento", "7"),
+        (2, "orcamento", None),
+        (4, "orcamento", "8"),
+        (8, "carrinho", "7"),
+    ]:
+        sqlite_db.add(
+            ReservaEstoque(
+                sku="FAROL-01",
+                quantidade=quantidade,
+                expira_em=validade,
+                origem=origem,
+                referencia=referencia,
+            )
+        )
+    sqlite_db.commit()
+    servico = ReservaEstoqueService(sqlite_db)
+
+    assert servico.reservado_por_sku(["FAROL-01"]) == {"FAROL-01": 15}
+    assert servico.reservado_por_sku(["FAROL-01"], exceto=("orcamento", "7")) == {
+        "FAROL-01": 14
+    }
+
+
+def test_vencidas_saem_do_total_na_leitura() -> None:
+    reservas = ReservasEstoque()
+    reservas.definir_estoque("FAROL-01", 10)
+    agora = datetime.now(timezone.utc)
+    reservas.adicionar(uuid.uuid4(), "FAROL-01", 3, agora - timedelta(seconds=1))
+    reservas.adicionar(uuid.uuid4(), "FAROL-01", 2, agora + timedelta(minutes=5))
+
+    assert reservas.disponivel("FAROL-01") == 8
+    assert reservas.reservado("FAROL-01") == 2
+    assert reservas.disponivel("OUTRO") is None
+    assert reservas.metricas()["reservas_ativas"] == 1
+
+
+def test_renovacao_substitui_a_entrada_antiga_do_heap() -> None:
+    reservas = ReservasEstoque()
+    reserva_id = uuid.uuid4()
+    base = datetime.now(timezone.utc) + timedelta(hours=1)
+    reservas.adicionar(reserva_id, "FAROL-01", 2, base)
+    reservas.adicionar(reserva_id, "FAROL-01", 2, base + timedelta(hours=1))
+    assert reservas.reservado("FAROL-01") == 2  # renovar não soma de novo
+
+    # O vencimento antigo sai do heap sem tirar a reserva renovada
+    reservas._vencer((base + timedelta(minutes=1)).timestamp())
+    assert reservas.reservado("FAROL-01") == 2
+
+    reservas._vencer((base + timedelta(hours=2)).timestamp())
+    assert reservas.reservado("FAROL-01") == 0
+    assert reservas._ativas == {} and reservas._vencimentos == []
+
+
+class _SessaoConcorrente:
+    """Sessão que registra uma reserva neste worker durante a leitura do banco."""
+
+    def __init__(self, session: Session, durante_leitura: Any):
+        self._session = session
+        self._durante_leitura = durante_leitura
+
+    def exec(self, statement: Any) -> Any:
+        self._durante_leitura()
+        return self._session.exec(statement)
+
+
+def test_releitura_mantem_as_reservas_feitas_durante_a_leitura(
+    sqlite_db: Session,
+) -> None:
+    agora = datetime.now(timezone.utc)
+    validade = agora + timedelta(minutes=10)
+    do_banco = ReservaEstoque(sku="FAROL-01", quantidade=1, expira_em=validade)
+    sqlite_db.add(do_banco)
+    sqlite_db.commit()
+    reservas = ReservasEstoque()
+    # Liberada por outro worker antes da leitura: some da memória
+    reservas.adicionar(uuid.uuid4(), "FAROL-01", 4, validade)
+    feita_agora = uuid.uuid4()
+
+    reservas._reler_reservas(
+        _SessaoConcorrente(  # type: ignore[arg-type]
+            sqlite_db,
+            lambda: reservas.adicionar(feita_agora, "GRADE-02", 2, validade),
+        ),
+        agora,
+    )
+
+    assert set(reservas._ativas) == {do_banco.id, feita_agora}
+    assert reservas.reservado("FAROL-01") == 1
+    assert reservas.reservado("GRADE-02") == 2
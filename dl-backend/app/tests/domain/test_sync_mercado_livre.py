@@ -0,0 +1,116 @@
+import asyncio
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import Engine
+from sqlmodel import Session, func, select
+
+from app.domain.models import AnuncioML
+from app.domain.sync_mercado_livre import (
+    ResultadoSincronizacao,
+    SincronizadorMercadoLivre,
+)
+from app.infra.mercado_livre import ClienteMercadoLivre, ErroMercadoLivre
+from app.tests.utils.db import sqlite_engine
+from app.tests.utils.mercado_livre import ServidorMercadoLivreFalso
+
+
+def _sincronizar(
+    servidor: ServidorMercadoLivreFalso,
+    engine: Engine,
+    completo: bool,
+    max_tentativas: int | None = None,
+) -> ResultadoSincronizacao:
+    async def executar() -> ResultadoSincronizacao:
+        cliente = ClienteMercadoLivre(
+            base_url="http://ml-falso",
+            access_token="teste",
+            concorrencia=8,
+            max_tentativas=max_tentativas,
+            transport=httpx.ASGITransport(app=servidor.app),
+        )
+        async with cliente:
+            sincronizador = SincronizadorMercadoLivre(
+                cliente, lambda: Session(engine), servidor.seller_id
+            )
+            return await sincronizador.executar(completo=completo)
+
+    return asyncio.run(executar())
+
+
+def _total(engine: Engine) -> int:
+    with Session(engine) as session:
+        return session.exec(select(func.count()).select_from(AnuncioML)).one()
+
+
+def test_sincronizacao_completa_e_incremental_de_50_mil_anuncios() -> None:
+    servidor = ServidorMercadoLivreFalso(total=50_000)
+    engine = sqlite_engine()
+
+    completa = _sincronizar(servidor, engine, completo=True)
+    assert completa.total_encontrados == 50_000
+    assert completa.gravados == 50_000
+    assert completa.erros == 0
+    assert _total(engine) == 50_000
+
+    alterados = servidor.alterar(300)
+    servidor.adicionar(200)
+    incremental = _sincronizar(servidor, engine, completo=False)
+    assert incremental.total_encontrados == 50_200
+    # Só os 300 alterados e os 200 novos são relidos e gravados
+    assert incremental.alterados == incremental.gravados == 500
+    assert incremental.erros == 0
+    assert _total(engine) == 50_200
+    with Session(engine) as session:
+        for id_ in alterados[:20]:
+            anuncio = session.get(AnuncioML, id_)
+            assert anuncio is not None
+            remoto = servidor.anuncios[id_]
+            assert anuncio.preco == Decimal(str(remoto["price"]))
+            assert anuncio.estoque == remoto["available_quantity"]
+
+
+def test_sincronizacao_repete_429_e_5xx_sem_perder_anuncios() -> None:
+    servidor = ServidorMercadoLivreFalso(
+        total=2_000, requisicoes_por_segundo=50, taxa_falhas=0.05
+    )
+    engine = sqlite_engine()
+
+    resultado = _sincronizar(servidor, engine, completo=True, max_tentativas=10)
+    assert servidor.respostas_429 > 0
+    assert servidor.respostas_5xx > 0
+    assert resultado.limitadas == servidor.respostas_429
+    assert resultado.repeticoes == servidor.respostas_429 + servidor.respostas_5xx
+    assert resultado.erros == 0
+    assert resultado.gravados == _total(engine) == 2_000
+
+
+def test_sincronizacao_desiste_quando_as_tentativas_acabam() -> None:
+    servidor = ServidorMercadoLivreFalso(total=200, taxa_falhas=1.0)
+    engine = sqlite_engine()
+
+    with pytest.raises(ErroMercadoLivre, match="desistindo após 2 tentativas"):
+        _sincronizar(servidor, engine, completo=True, max_tentativas=2)
+    assert servidor.respostas_5xx == 2
+    assert _total(engine) == 0
+
+
+def test_scan_sem_scroll_id_termina_sem_recomecar() -> None:
+    chamadas: list[httpx.Request] = []
+
+    def responder(request: httpx.Request) -> httpx.Response:
+        chamadas.append(request)
+        return httpx.Response(200, json={"results": ["MLB1", "MLB2"]})
+
+    async def executar() -> list[list[str]]:
+        cliente = ClienteMercadoLivre(
+            base_url="http://ml-falso",
+            access_token="teste",
+            transport=httpx.MockTransport(responder),
+        )
+        async with cliente:
+            return [ids async for ids in cliente.ids_do_vendedor("123")]
+
+    assert asyncio.run(executar()) == [["MLB1", "MLB2"]]
+    assert len(chamadas) == 1
@@ -0,0 +1,63 @@
+import io
+from decimal import Decimal
+
+import pytest
+
+from app.infra.nfe import ErroNFe, ItemNFe, LeitorNFe, NotaFiscal
+from app.tests.utils.nfe import escrever_lote_nfe
+
+
+def _lote(notas: int, itens_por_nota: int) -> io.BytesIO:
+    arquivo = io.BytesIO()
+    escrever_lote_nfe(arquivo, notas=notas, itens_por_nota=itens_por_nota)
+    arquivo.seek(0)
+    return arquivo
+
+
+def test_lote_emite_os_itens_e_depois_a_nota() -> None:
+    leitor = LeitorNFe(_lote(notas=3, itens_por_nota=4))
+    registros = list(leitor)
+
+    notas = [r for r in registros if isinstance(r, NotaFiscal)]
+    itens = [r for r in registros if isinstance(r, ItemNFe)]
+    assert len(notas) == 3 and len(itens) == 12
+    # Cada nota vem logo depois dos seus itens
+    assert [type(r).__name__ for r in registros[:5]] == ["ItemNFe"] * 4 + ["NotaFiscal"]
+    assert {i.chave_nfe for i in registros[:4]} == {notas[0].chave}
+
+    nota = notas[0]
+    assert (nota.numero, nota.serie, nota.modelo) == ("1", "1", "55")
+    assert nota.emitente_documento == "12345678000199"
+    assert nota.emitente_uf == "SP"
+    assert nota.destinatario_nome == "DL Auto Peças"
+    assert nota.quantidade_itens == 4
+    assert nota.valor_total == Decimal("80.00")
+    assert nota.valor_icms == Decimal("14.40")
+    assert nota.data_emissao is not None and nota.data_emissao.year == 2024
+
+    item = itens[0]
+    assert (item.numero, item.cfop, item.unidade) == (1, "5102", "UN")
+    assert item.quantidade == Decimal("2.0000")
+    assert (item.valor_icms, item.valor_pis, item.valor_cofins) == (
+        Decimal("3.60"),
+        Decimal("0.33"),
+        Decimal("1.52"),
+    )
+    # "SEM GTIN" vira None; os demais EANs são mantidos
+    assert {i.ean is None for i in itens} == {True, False}
+    assert leitor.raiz == "enviNFe"
+    assert leitor.elementos > 0
+
+
+def test_xml_que_nao_e_nfe_guarda_uma_amostra() -> None:
+    leitor = LeitorNFe(
+        io.BytesIO(b"<pedido><numero>42</numero><cliente>Ana</cliente></pedido>")
+    )
+    assert list(leitor) == []
+    assert leitor.raiz == "pedido"
+    assert leitor.amostra == {"numero": "42", "cliente": "Ana"}
+
+
+def test_xml_malformado_levanta_erro_nfe() -> None:
+    with pytest.raises(ErroNFe):
+        list(LeitorNFe(io.BytesIO(b"<nfeProc><NFe><infNFe>")))
@@ -0,0 +1,76 @@
+import os
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from app.infra.pdf_orcamento import CachePDF, _desconto_linha, _renderizar
+
+
+def _conteudo(**campos: Any) -> dict[str, Any]:
+    return {
+        "layout": 1,
+        "empresa": "DL Auto Peças",
+        "numero_orcamento": "ORC-2026-000001",
+        "data_criacao": "2026-10-19T09:00:00+00:00",
+        "validade_orcamento": "2026-10-26",
+        "subtotal": "100.00",
+        "desconto_total": "0.00",
+        "frete_valor": "0.00",
+        "valor_total": "100.00",
+        "itens": [
+            {
+                "descricao": "Farol <esquerdo> & lanterna",
+                "quantidade": 1,
+                "valor_unitario": "100.00",
+                "desconto_valor": "0",
+                "desconto_percentual": "0",
+                "valor_total": "100.00",
+            }
+        ],
+        **campos,
+    }
+
+
+def test_texto_com_marcacao_e_impresso_como_texto(tmp_path: Path) -> None:
+    destino = tmp_path / "orcamento.pdf"
+    _renderizar(
+        _conteudo(cliente_nome="Silva & Filhos <Ltda>", observacoes="<b>urgente"),
+        str(destino),
+    )
+    assert destino.read_bytes().startswith(b"%PDF")
+    # Só o PDF final fica no diretório: o temporário foi renomeado
+    assert [p.name for p in tmp_path.iterdir()] == ["orcamento.pdf"]
+
+
+def test_desconto_impresso_e_o_gravado_limitado_ao_bruto() -> None:
+    # R$ 50 de desconto numa linha de R$ 30: o serviço grava total 0
+    linha = {
+        "quantidade": 1,
+        "valor_unitario": "30.00",
+        "desconto_valor": "50.00",
+        "desconto_percentual": "0",
+        "valor_total": "0.00",
+    }
+    assert _desconto_linha(linha) == Decimal("30.00")
+    linha = {**linha, "quantidade": 3, "valor_unitario": "0.10", "valor_total": "0.27"}
+    assert _desconto_linha(linha) == Decimal("0.03")
+
+
+def test_poda_remove_os_antigos_e_poupa_os_acessados_agora(tmp_path: Path) -> None:
+    cache = CachePDF(raiz=tmp_path, limite_bytes=150)
+    antigo = time.time() - 3600
+    caminhos = []
+    for numero in range(3):
+        caminho = cache.caminho(f"{numero:02d}" + "a" * 62)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        caminho.write_bytes(b"x" * 100)
+        os.utime(caminho, (antigo + numero, antigo + numero))
+        caminhos.append(caminho)
+    # Acabou de ser servido: fica mesmo sendo o que passa do limite
+    assert cache._tocar(caminhos[2])
+
+    cache._podar(100)
+
+    assert [c.exists() for c in caminhos] == [False, False, True]
+    assert cache.removidos == 2
@@ -0,0 +1,43 @@
+import io
+
+import pytest
+
+from app.infra import planilhas
+from app.infra.planilhas import abrir_planilha
+
+
+def _ler(conteudo: bytes) -> tuple[str | None, list[dict[str, object]]]:
+    with abrir_planilha(io.BytesIO(conteudo), "lista.csv") as arquivo_planilha:
+        return arquivo_planilha.delimitador, list(arquivo_planilha.planilha())
+
+
+def test_csv_do_excel_em_portugues_usa_ponto_e_virgula_e_cp1252() -> None:
+    conteudo = "Código;Descrição;Preço (R$)\nF-01;Farol dianteiro;1.234,56\n".encode(
+        "cp1252"
+    )
+    delimitador, linhas = _ler(conteudo)
+    assert delimitador == ";"
+    assert linhas == [
+        {"Código": "F-01", "Descrição": "Farol dianteiro", "Preço (R$)": "1.234,56"}
+    ]
+
+
+def test_csv_com_virgula_bom_e_linhas_vazias() -> None:
+    conteudo = "\ufeffsku,nome,preco\n\nF-01,Farol,10.50\n,,\nG-02,Grade\n".encode()
+    delimitador, linhas = _ler(conteudo)
+    assert delimitador == ","
+    # Linhas vazias são puladas; linha curta fica só com as colunas que tem
+    assert linhas == [
+        {"sku": "F-01", "nome": "Farol", "preco": "10.50"},
+        {"sku": "G-02", "nome": "Grade"},
+    ]
+
+
+def test_amostra_cortando_caractere_no_meio_continua_utf8(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    conteudo = "sku;nome\nF-01;Farol é bom\n".encode()
+    # Corta a amostra no meio do "é" (2 bytes em UTF-8)
+    monkeypatch.setattr(planilhas, "AMOSTRA_CSV", conteudo.index("é".encode()) + 1)
+    _, linhas = _ler(conteudo)
+    assert linhas == [{"sku": "F-01", "nome": "Farol é bom"}]
@@ -0,0 +1,25 @@
+"""
+Banco SQLite em memória para testes de domínio que precisam de uma sessão
+real: as tabelas saem dos modelos (sem migrações) e somem com a engine.
+"""
+
+from sqlalchemy import Engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+import app.domain.models  # noqa: F401  (registra as tabelas no metadata)
+
+
+def sqlite_engine() -> Engine:
+    """Uma única conexão compartilhada, inclusive entre threads."""
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def sqlite_session() -> Session:
+    return Session(sqlite_engine())
@@ -0,0 +1,179 @@
+"""
+Servidor falso da API do Mercado Livre para testes e benchmarks da sincronização.
+
+Implementa apenas o que `ClienteMercadoLivre` usa: o scan de anúncios do
+vendedor (`/users/{id}/items/search`), o multiget (`/items?ids=...`, com
+`attributes`) e a atualização de um anúncio (`PUT /items/{id}`). Pode
+limitar a taxa (respondendo 429 com Retry-After) e injetar falhas 5xx para
+exercitar as repetições. Use com
+`httpx.ASGITransport(app=servidor.app)`.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi import Body, FastAPI, Query
+from fastapi.responses import JSONResponse
+
+SELLER_ID = "123456"
+
+
+def _iso(instante: datetime) -> str:
+    return (
+        instante.strftime("%Y-%m-%dT%H:%M:%S.") + f"{instante.microsecond // 1000:03d}Z"
+    )
+
+
+class ServidorMercadoLivreFalso:
+    def __init__(
+        self,
+        total: int = 50_000,
+        seller_id: str = SELLER_ID,
+        requisicoes_por_segundo: float | None = None,
+        taxa_falhas: float = 0.0,
+        semente: int = 42,
+    ):
+        self.seller_id = seller_id
+        self.requisicoes_por_segundo = requisicoes_por_segundo
+        self.taxa_falhas = taxa_falhas
+        self._aleatorio = random.Random(semente)
+        self._relogio = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.anuncios: dict[str, dict[str, Any]] = {}
+        for numero in range(1, total + 1):
+            self._criar(numero)
+        self._scrolls: dict[str, int] = {}
+        self._fichas = requisicoes_por_segundo or 0.0
+        self._ultima_recarga = time.monotonic()
+        self.requisicoes = 0
+        self.respostas_429 = 0
+        self.respostas_5xx = 0
+        self.atualizacoes = 0
+        self.app = self._criar_app()
+
+    def _tique(self) -> datetime:
+        self._relogio += timedelta(milliseconds=1)
+        return self._relogio
+
+    def _criar(self, numero: int) -> None:
+        id_ = f"MLB{1_000_000_000 + numero}"
+        self.anuncios[id_] = {
+            "id": id_,
+            "title": f"Peça automotiva {numero}",
+            "price": round(self._aleatorio.uniform(20, 2000), 2),
+            "available_quantity": self._aleatorio.randint(0, 50),
+            "status": "active",
+            "seller_custom_field": f"SKU{numero:06d}",
+            "permalink": f"https://produto.mercadolivre.com.br/{id_}",
+            "thumbnail": f"https://http2.mlstatic.com/{id_}.jpg",
+            "last_updated": _iso(self._tique()),
+        }
+
+    def alterar(self, quantidade: int) -> list[str]:
+        """Muda preço/estoque de `quantidade` anúncios e avança o last_updated deles."""
+        ids = self._aleatorio.sample(sorted(self.anuncios), quantidade)
+        for id_ in ids:
+            anuncio = self.anuncios[id_]
+            anuncio["price"] = round(anuncio["price"] * 1.05, 2)
+            anuncio["available_quantity"] = self._aleatorio.randint(0, 50)
+            anuncio["last_updated"] = _iso(self._tique())
+        return ids
+
+    def adicionar(self, quantidade: int) -> None:
+        inicio = len(self.anuncios) + 1
+        for numero in range(inicio, inicio + quantidade):
+            self._criar(numero)
+
+    def _limitar(self) -> JSONResponse | None:
+        self.requisicoes += 1
+        if self.requisicoes_por_segundo:
+            agora = time.monotonic()
+            self._fichas = min(
+                self.requisicoes_por_segundo,
+                self._fichas
+                + (agora - self._ultima_recarga) * self.requisicoes_por_segundo,
+            )
+            self._ultima_recarga = agora
+            if self._fichas < 1:
+                self.respostas_429 += 1
+                espera = (1 - self._fichas) / self.requisicoes_por_segundo
+                return JSONResponse(
+                    {"message": "too_many_requests"},
+                    status_code=429,
+                    headers={"Retry-After": f"{espera:.3f}"},
+                )
+            self._fichas -= 1
+        if self.taxa_falhas and self._aleatorio.random() < self.taxa_falhas:
+            self.respostas_5xx += 1
+            return JSONResponse({"message": "internal_error"}, status_code=503)
+        return None
+
+    def _criar_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.get("/users/{seller_id}/items/search")
+        def buscar(
+            seller_id: str,
+            search_type: str = "scan",
+            limit: int = Query(default=50, le=100),
+            scroll_id: str | None = None,
+        ) -> Any:
+            if (erro := self._limitar()) is not None:
+                return erro
+            if seller_id != self.seller_id:
+                return JSONResponse({"message": "forbidden"}, status_code=403)
+            if search_type != "scan":
+                # Sem scan, a API real para em 1000 resultados (offset)
+                return JSONResponse(
+                    {"message": "use search_type=scan"}, status_code=400
+                )
+            ids = sorted(self.anuncios)
+            posicao = self._scrolls.pop(scroll_id, 0) if scroll_id else 0
+            pagina = ids[posicao : posicao + limit]
+            proximo = f"scroll-{posicao + limit}"
+            self._scrolls[proximo] = posicao + limit
+            return {
+                "seller_id": seller_id,
+                "results": pagina,
+                "scroll_id": proximo,
+                "paging": {"total": len(ids), "limit": limit},
+            }
+
+        @app.get("/items")
+        def multiget(ids: str, attributes: str | None = None) -> Any:
+            if (erro := self._limitar()) is not None:
+                return erro
+            pedidos = ids.split(",")
+            if len(pedidos) > 20:
+                return JSONResponse({"message": "max 20 ids"}, status_code=400)
+            campos = attributes.split(",") if attributes else None
+            respostas = []
+            for id_ in pedidos:
+                anuncio = self.anuncios.get(id_)
+                if anuncio is None:
+                    respostas.append({"code": 404, "body": {"message": "not_found"}})
+                    continue
+                corpo = (
+                    {c: anuncio[c] for c in campos if c in anuncio}
+                    if campos
+                    else anuncio
+                )
+                respostas.append({"code": 200, "body": corpo})
+            return respostas
+
+        @app.put("/items/{item_id}")
+        def atualizar(item_id: str, corpo: dict[str, Any] = Body(...)) -> Any:
+            if (erro := self._limitar()) is not None:
+                return erro
+            anuncio = self.anuncios.get(item_id)
+            if anuncio is None:
+                return JSONResponse({"message": "not_found"}, status_code=404)
+            for campo in ("price", "available_quantity", "title"):
+                if campo in corpo:
+                    anuncio[campo] = corpo[campo]
+            anuncio["last_updated"] = _iso(self._tique())
+            self.atualizacoes += 1
+            return anuncio
+
+        return app
@@ -0,0 +1,56 @@
+"""
+Lotes sintéticos de NF-e para testes e benchmarks do leitor em fluxo.
+
+`escrever_lote_nfe(arquivo, notas=1000, itens_por_nota=50)` grava um
+<enviNFe> com `notas` notas de `itens_por_nota` itens cada, sem montar o
+XML em memória. Os códigos dos itens são SKU00001, SKU00002...; um em cada
+três itens traz EAN.
+"""
+
+from typing import IO
+
+NS = "http://www.portalfiscal.inf.br/nfe"
+
+
+def _item(n: int, codigo: int) -> str:
+    ean = f"789{codigo:010d}" if codigo % 3 == 0 else "SEM GTIN"
+    return (
+        f'<det nItem="{n}"><prod><cProd>SKU{codigo:05d}</cProd><cEAN>{ean}</cEAN>'
+        f"<xProd>Peça {codigo}</xProd><NCM>87089990</NCM><CFOP>5102</CFOP><uCom>UN</uCom>"
+        f"<qCom>2.0000</qCom><vUnCom>10.00</vUnCom><vProd>20.00</vProd></prod>"
+        f"<imposto><ICMS><ICMS00><orig>0</orig><CST>00</CST><vBC>20.00</vBC><pICMS>18.00</pICMS>"
+        f"<vICMS>3.60</vICMS></ICMS00></ICMS><PIS><PISAliq><CST>01</CST><vPIS>0.33</vPIS></PISAliq></PIS>"
+        f"<COFINS><COFINSAliq><CST>01</CST><vCOFINS>1.52</vCOFINS></COFINSAliq></COFINS></imposto></det>"
+    )
+
+
+def escrever_lote_nfe(
+    arquivo: IO[bytes], notas: int = 1000, itens_por_nota: int = 50
+) -> None:
+    arquivo.write(
+        f'<?xml version="1.0" encoding="UTF-8"?><enviNFe xmlns="{NS}" versao="4.00"><idLote>1</idLote>'.encode()
+    )
+    for nota in range(1, notas + 1):
+        chave = f"35240112345678000199550010{nota:09d}1{nota % 10**8:08d}"[:44]
+        partes = [
+            f'<NFe><infNFe Id="NFe{chave}" versao="4.00">'
+            f"<ide><cUF>35</cUF><natOp>Venda</natOp><mod>55</mod><serie>1</serie><nNF>{nota}</nNF>"
+            f"<dhEmi>2024-01-15T10:30:00-03:00</dhEmi></ide>"
+            f"<emit><CNPJ>12345678000199</CNPJ><xNome>Fornecedor de Peças Ltda</xNome>"
+            f"<enderEmit><UF>SP</UF></enderEmit></emit>"
+            f"<dest><CNPJ>98765432000155</CNPJ><xNome>DL Auto Peças</xNome></dest>"
+        ]
+        partes += [
+            _item(i, (nota * itens_por_nota + i) % 100000)
+            for i in range(1, itens_por_nota + 1)
+        ]
+        total = 20 * itens_por_nota
+        partes.append(
+            f"<total><ICMSTot><vProd>{total}.00</vProd><vFrete>0.00</vFrete><vDesc>0.00</vDesc>"
+            f"<vICMS>{3.6 * itens_por_nota:.2f}</vICMS><vIPI>0.00</vIPI><vPIS>{0.33 * itens_por_nota:.2f}</vPIS>"
+            f"<vCOFINS>{1.52 * itens_por_nota:.2f}</vCOFINS><vNF>{total}.00</vNF></ICMSTot></total>"
+            f"<transp><modFrete>0</modFrete></transp><infAdic><infCpl>Lote de teste</infCpl></infAdic>"
+            f"</infNFe></NFe>"
+        )
+        arquivo.write("".join(partes).encode())
+    arquivo.write(b"</enviNFe>")
@@ -0,0 +1,56 @@
+"""
+Transportadoras falsas para testes e benchmarks do motor de frete.
+
+Cada uma responde depois de `latencia` segundos (mais um jitter aleatório) e
+pode falhar numa fração das chamadas, para exercitar os timeouts, o cache e
+a coalescência de `MotorFrete`. Use com
+`MotorFrete([TransportadoraFalsa("Rápida", 0.05), TransportadoraFalsa("Lenta", 10)])`.
+"""
+
+import asyncio
+import random
+from decimal import Decimal
+
+from app.infra.transportadoras import ErroTransportadora, OpcaoFrete, PacoteFrete
+
+
+class TransportadoraFalsa:
+    def __init__(
+        self,
+        nome: str,
+        latencia: float = 0.1,
+        jitter: float = 0.0,
+        taxa_falhas: float = 0.0,
+        preco_por_kg: Decimal = Decimal("5.00"),
+        prazo: int = 5,
+        semente: int = 42,
+    ):
+        self.nome = nome
+        self.latencia = latencia
+        self.jitter = jitter
+        self.taxa_falhas = taxa_falhas
+        self.preco_por_kg = preco_por_kg
+        self.prazo = prazo
+        self._aleatorio = random.Random(semente)
+        self.chamadas = 0
+
+    async def cotar(self, pacote: PacoteFrete) -> list[OpcaoFrete]:
+        self.chamadas += 1
+        await asyncio.sleep(self.latencia + self._aleatorio.uniform(0, self.jitter))
+        if self._aleatorio.random() < self.taxa_falhas:
+            raise ErroTransportadora(f"{self.nome}: erro simulado")
+        valor = (
+            Decimal("10.00") + self.preco_por_kg * Decimal(str(pacote.peso_kg))
+        ).quantize(Decimal("0.01"))
+        return [
+            OpcaoFrete(
+                self.nome, "Padrão", self.prazo, valor, f"{self.nome.lower()}-padrao"
+            ),
+            OpcaoFrete(
+                self.nome,
+                "Expresso",
+                max(1, self.prazo // 2),
+                valor * 2,
+                f"{self.nome.lower()}-expresso",
+            ),
+        ]
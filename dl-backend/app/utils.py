@@ -4,9 +4,7 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-import emails  # type: ignore
 import jwt
-from jinja2 import Template
 from jwt.exceptions import InvalidTokenError
 
 from app.core import security
@@ -22,7 +20,11 @@ class EmailData:
     subject: str
 
 
+# `emails` e `jinja2` são importados dentro das funções: só os processos que
+# realmente enviam e-mail pagam o custo de carregá-los.
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
+    from jinja2 import Template
+
     template_str = (
         Path(__file__).parent / "email-templates" / "build" / template_name
     ).read_text()
@@ -36,6 +38,8 @@ def send_email(
     subject: str = "",
     html_content: str = "",
 ) -> None:
+    import emails  # type: ignore
+
     assert settings.emails_enabled, "no provided configuration for email variables"
     message = emails.Message(
         subject=subject,
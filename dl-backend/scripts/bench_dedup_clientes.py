@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Benchmark da detecção de clientes duplicados num cadastro sintético.
+
+Gera N clientes num SQLite temporário, com uma fração de recadastros do mesmo
+cliente (nome com erro de digitação ou sem acento, telefone sem DDD ou com
++55, CPF às vezes omitido), roda o job de duplicidade e mostra tempo,
+comparações feitas (contra as n²/2 da comparação ingênua), pico de memória e
+precisão/revocação das sugestões contra os recadastros gerados.
+
+Uso:
+    python scripts/bench_dedup_clientes.py --clientes 1000000
+    python scripts/bench_dedup_clientes.py --clientes 100000 --duplicados 0.05 --janela 12
+"""
+
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Valores mínimos para carregar as configurações fora do docker-compose
+for chave, valor in {
+    "PROJECT_NAME": "bench",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "bench",
+    "FIRST_SUPERUSER": "bench@example.com",
+    "FIRST_SUPERUSER_PASSWORD": "bench",
+}.items():
+    os.environ.setdefault(chave, valor)
+
+from sqlalchemy import event, insert  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine, select  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.domain.duplicidade_clientes import DuplicidadeClientes  # noqa: E402
+from app.domain.models import Cliente, SugestaoMesclagemCliente  # noqa: E402
+from app.domain.normalizacao import (  # noqa: E402
+    normalizar_documento,
+    normalizar_nome,
+    normalizar_telefone,
+)
+
+NOMES = (
+    "José",
+    "João",
+    "Antônio",
+    "Francisco",
+    "Carlos",
+    "Paulo",
+    "Pedro",
+    "Lucas",
+    "Luiz",
+    "Marcos",
+    "Luís",
+    "Gabriel",
+    "Rafael",
+    "Daniel",
+    "Marcelo",
+    "Bruno",
+    "Eduardo",
+    "Felipe",
+    "Raimundo",
+    "Rodrigo",
+    "Maria",
+    "Ana",
+    "Francisca",
+    "Antônia",
+    "Adriana",
+    "Juliana",
+    "Márcia",
+    "Fernanda",
+    "Patrícia",
+    "Aline",
+    "Sandra",
+    "Camila",
+    "Amanda",
+    "Bruna",
+    "Jéssica",
+    "Letícia",
+    "Júlia",
+    "Luciana",
+    "Vanessa",
+    "Mariana",
+)
+SOBRENOMES = (
+    "Silva",
+    "Santos",
+    "Oliveira",
+    "Souza",
+    "Rodrigues",
+    "Ferreira",
+    "Alves",
+    "Pereira",
+    "Lima",
+    "Gomes",
+    "Costa",
+    "Ribeiro",
+    "Martins",
+    "Carvalho",
+    "Almeida",
+    "Lopes",
+    "Soares",
+    "Fernandes",
+    "Vieira",
+    "Barbosa",
+    "Rocha",
+    "Dias",
+    "Nascimento",
+    "Andrade",
+    "Moreira",
+    "Nunes",
+    "Marques",
+    "Machado",
+    "Mendes",
+    "Freitas",
+    "Cardoso",
+    "Ramos",
+    "Gonçalves",
+    "Santana",
+    "Teixeira",
+    "Moura",
+    "Correia",
+    "Araújo",
+    "Pinto",
+    "Cavalcanti",
+)
+DDDS = ("11", "21", "31", "41", "51", "61", "71", "81", "85", "91")
+LOTE_INSERCAO = 10_000
+
+
+def cliente_sintetico(aleatorio: random.Random) -> dict:
+    nome = f"{aleatorio.choice(NOMES)} {aleatorio.choice(('da ', 'de ', ''))}{aleatorio.choice(SOBRENOMES)}"
+    if aleatorio.random() < 0.6:
+        nome += f" {aleatorio.choice(SOBRENOMES)}"
+    telefone = f"({aleatorio.choice(DDDS)}) 9{aleatorio.randrange(10**7, 10**8)}"
+    documento = (
+        str(aleatorio.randrange(10**10, 10**11)) if aleatorio.random() < 0.7 else None
+    )
+    return {
+        "nome": nome,
+        "telefone": telefone,
+        "cpf_cnpj": documento,
+        "email": f"{normalizar_nome(nome).replace(' ', '.')}{aleatorio.randrange(1000)}@example.com"
+        if aleatorio.random() < 0.4
+        else None,
+        "cep": f"{aleatorio.randrange(10**7, 10**8)}",
+        "placa_veiculo": f"ABC{aleatorio.randrange(1000, 10000)}"
+        if aleatorio.random() < 0.5
+        else None,
+    }
+
+
+def recadastro(original: dict, aleatorio: random.Random) -> dict:
+    """O mesmo cliente digitado de novo, com variações."""
+    copia = dict(original)
+    nome = copia["nome"]
+    sorteio = aleatorio.random()
+    if sorteio < 0.3:
+        nome = normalizar_nome(nome)  # sem acento, minúsculas
+    elif sorteio < 0.6:
+        i = aleatorio.randrange(1, len(nome))
+        nome = nome[:i] + nome[i + 1 :]  # letra faltando
+    elif sorteio < 0.8:
+        nome = nome.replace(" da ", " ").replace(" de ", " ")
+    copia["nome"] = nome.upper() if aleatorio.random() < 0.2 else nome
+    digitos = normalizar_telefone(copia["telefone"])
+    sorteio = aleatorio.random()
+    if sorteio < 0.3:
+        copia["telefone"] = digitos[2:]  # sem DDD
+    elif sorteio < 0.5:
+        copia["telefone"] = f"+55 {digitos[:2]} {digitos[2:7]}-{digitos[7:]}"
+    if aleatorio.random() < 0.4:
+        copia["cpf_cnpj"] = None
+    if aleatorio.random() < 0.5:
+        copia["email"] = None
+    return copia
+
+
+def linha(dados: dict) -> dict:
+    return {
+        **dados,
+        "nome_normalizado": normalizar_nome(dados["nome"]),
+        "telefone_digitos": normalizar_telefone(dados["telefone"]) or None,
+        "documento": normalizar_documento(dados["cpf_cnpj"]) or None,
+    }
+
+
+def gerar(
+    engine, total: int, fracao_duplicados: float, semente: int
+) -> set[tuple[int, int]]:
+    """Grava `total` clientes; devolve os pares de cadastros da mesma pessoa."""
+    aleatorio = random.Random(semente)
+    grupos: dict[int, list[int]] = {}  # original -> recadastros
+    recentes: list[tuple[int, dict]] = []  # originais que podem ser recadastrados
+    lote: list[dict] = []
+    with engine.begin() as conexao:
+        for cliente_id in range(1, total + 1):
+            if recentes and aleatorio.random() < fracao_duplicados:
+                original_id, original = recentes[aleatorio.randrange(len(recentes))]
+                dados = recadastro(original, aleatorio)
+                grupos.setdefault(original_id, [original_id]).append(cliente_id)
+            else:
+                dados = cliente_sintetico(aleatorio)
+                if len(recentes) < 50_000:
+                    recentes.append((cliente_id, dados))
+                else:
+                    recentes[aleatorio.randrange(len(recentes))] = (cliente_id, dados)
+            lote.append({"id": cliente_id, **linha(dados)})
+            if len(lote) >= LOTE_INSERCAO:
+                conexao.execute(insert(Cliente.__table__), lote)  # type: ignore[attr-defined]
+                lote.clear()
+        if lote:
+            conexao.execute(insert(Cliente.__table__), lote)  # type: ignore[attr-defined]
+    # Dois recadastros do mesmo original também são a mesma pessoa
+    return {
+        (a, b)
+        for ids in grupos.values()
+        for i, a in enumerate(ids)
+        for b in ids[i + 1 :]
+    }
+
+
+def memoria_mb() -> float:
+    # ru_maxrss é em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--clientes", type=int, default=1_000_000)
+    parser.add_argument(
+        "--duplicados", type=float, default=0.02, help="Fração de recadastros"
+    )
+    parser.add_argument(
+        "--janela", type=int, default=settings.CUSTOMER_DEDUP_NAME_WINDOW
+    )
+    parser.add_argument(
+        "--bloco", type=int, default=settings.CUSTOMER_DEDUP_MAX_BLOCK_SIZE
+    )
+    parser.add_argument(
+        "--minimo", type=float, default=settings.CUSTOMER_DEDUP_MIN_SCORE
+    )
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    settings.CUSTOMER_DEDUP_NAME_WINDOW = args.janela
+    settings.CUSTOMER_DEDUP_MAX_BLOCK_SIZE = args.bloco
+    settings.CUSTOMER_DEDUP_MIN_SCORE = args.minimo
+
+    with tempfile.TemporaryDirectory() as pasta:
+        engine = create_engine(f"sqlite:///{pasta}/bench_dedup.db")
+
+        # WAL: a leitura em fluxo e os commits das sugestões andam juntos
+        @event.listens_for(engine, "connect")
+        def _wal(conexao, _):
+            conexao.execute("PRAGMA journal_mode=WAL")
+
+        SQLModel.metadata.create_all(
+            engine,
+            tables=[Cliente.__table__, SugestaoMesclagemCliente.__table__],  # type: ignore[attr-defined]
+        )
+
+        inicio = time.perf_counter()
+        esperados = gerar(engine, args.clientes, args.duplicados, args.semente)
+        print(
+            f"gerados      {args.clientes} clientes ({len(esperados)} pares duplicados) em "
+            f"{time.perf_counter() - inicio:.1f}s"
+        )
+
+        memoria_antes = memoria_mb()
+        with Session(engine) as session:
+            r = DuplicidadeClientes().executar_sync(session)
+            sugeridos = {
+                (s.cliente_id, s.duplicado_id)
+                for s in session.exec(select(SugestaoMesclagemCliente))
+            }
+        ingenuo = args.clientes * (args.clientes - 1) // 2
+        print(
+            f"detecção     {r.duracao_s:.1f}s  leituras={r.lidos} comparações={r.comparacoes} "
+            f"({r.comparacoes / ingenuo:.2e} das {ingenuo:.2e} da comparação ingênua)"
+        )
+        print(f"blocos       maior={r.maior_bloco} ignorados={r.blocos_ignorados}")
+        print(
+            f"memória      pico {memoria_mb():.0f} MB (antes da detecção: {memoria_antes:.0f} MB)"
+        )
+
+        acertos = len(sugeridos & esperados)
+        precisao = acertos / len(sugeridos) if sugeridos else 0.0
+        revocacao = acertos / len(esperados) if esperados else 0.0
+        print(
+            f"sugestões    {len(sugeridos)}  precisão={precisao:.3f} revocação={revocacao:.3f}"
+        )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark da sincronização com o Mercado Livre contra o servidor falso.
+
+Roda uma sincronização completa de N anúncios num SQLite temporário, altera
+uma parte deles no servidor e roda a incremental, mostrando requisições,
+repetições (429/5xx) e tempo de cada etapa.
+
+Uso:
+    python scripts/bench_ml_sync.py --anuncios 50000 --alterados 500
+    python scripts/bench_ml_sync.py --rps 2000 --falhas 0.01 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Valores mínimos para carregar as configurações fora do docker-compose
+for chave, valor in {
+    "PROJECT_NAME": "bench",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "bench",
+    "FIRST_SUPERUSER": "bench@example.com",
+    "FIRST_SUPERUSER_PASSWORD": "bench",
+}.items():
+    os.environ.setdefault(chave, valor)
+
+import httpx  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine, func, select  # noqa: E402
+
+from app.domain.models import AnuncioML  # noqa: E402
+from app.domain.sync_mercado_livre import SincronizadorMercadoLivre  # noqa: E402
+from app.infra.mercado_livre import ClienteMercadoLivre  # noqa: E402
+from app.tests.utils.mercado_livre import ServidorMercadoLivreFalso  # noqa: E402
+
+
+async def sincronizar(servidor, engine, args, completo: bool):
+    cliente = ClienteMercadoLivre(
+        base_url="http://ml-falso",
+        access_token="bench",
+        concorrencia=args.concurrency,
+        transport=httpx.ASGITransport(app=servidor.app),
+    )
+    async with cliente:
+        sincronizador = SincronizadorMercadoLivre(
+            cliente, lambda: Session(engine), servidor.seller_id, args.lote
+        )
+        return await sincronizador.executar(completo=completo)
+
+
+def imprimir(etapa: str, r) -> None:
+    print(
+        f"{etapa:<12} {r.duracao_s:>8.2f}s  encontrados={r.total_encontrados} "
+        f"alterados={r.alterados} gravados={r.gravados} erros={r.erros} "
+        f"requisições={r.requisicoes} repetições={r.repeticoes} 429={r.limitadas}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--anuncios", type=int, default=50_000)
+    parser.add_argument("--alterados", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--lote", type=int, default=500)
+    parser.add_argument(
+        "--rps", type=float, help="Limite de requisições/s do servidor falso"
+    )
+    parser.add_argument(
+        "--falhas", type=float, default=0.0, help="Fração de respostas 503"
+    )
+    args = parser.parse_args()
+
+    servidor = ServidorMercadoLivreFalso(
+        total=args.anuncios, requisicoes_por_segundo=args.rps, taxa_falhas=args.falhas
+    )
+    with tempfile.TemporaryDirectory() as pasta:
+        engine = create_engine(f"sqlite:///{pasta}/bench_ml.db")
+        SQLModel.metadata.create_all(engine, tables=[AnuncioML.__table__])
+
+        imprimir("completa", await sincronizar(servidor, engine, args, completo=True))
+        imprimir(
+            "sem mudança", await sincronizar(servidor, engine, args, completo=False)
+        )
+        servidor.alterar(args.alterados)
+        imprimir(
+            "incremental", await sincronizar(servidor, engine, args, completo=False)
+        )
+
+        with Session(engine) as session:
+            total = session.exec(select(func.count()).select_from(AnuncioML)).one()
+        print(f"\nanuncioml: {total} linhas")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
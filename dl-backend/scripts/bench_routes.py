@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark de latência (p50/p99) e vazão das rotas quentes sob carga concorrente.
+
+Por padrão roda em processo, chamando a aplicação ASGI diretamente (inclui
+threadpool, middlewares e serialização, sem rede). Com --url mede um servidor
+já em execução.
+
+Uso:
+    python scripts/bench_routes.py --requests 2000 --concurrency 64
+    python scripts/bench_routes.py --url http://127.0.0.1:8001 --threadpool 80
+
+Para comparar antes/depois, rode o mesmo comando nas duas versões do código.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Valores mínimos para carregar as configurações fora do docker-compose
+for chave, valor in {
+    "PROJECT_NAME": "bench",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "bench",
+    "FIRST_SUPERUSER": "bench@example.com",
+    "FIRST_SUPERUSER_PASSWORD": "bench",
+}.items():
+    os.environ.setdefault(chave, valor)
+
+import httpx  # noqa: E402
+
+ROTAS_PADRAO = [
+    "/api/v1/dashboard/metricas",
+    "/api/v1/dashboard/estatisticas",
+    "/api/v1/anuncios/resumo",
+    "/api/v1/vendedor/1/resumo-dia",
+    "/api/v1/produtos-estoque/estatisticas",
+    "/api/v1/produtos-estoque/",
+]
+
+
+def percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+async def medir_rota(
+    client: httpx.AsyncClient, rota: str, total: int, concorrencia: int
+) -> dict:
+    latencias: list[float] = []
+    status: Counter[int] = Counter()
+    fila: asyncio.Queue[None] = asyncio.Queue()
+    for _ in range(total):
+        fila.put_nowait(None)
+
+    async def trabalhador() -> None:
+        while True:
+            try:
+                fila.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            inicio = time.perf_counter()
+            resposta = await client.get(rota)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            status[resposta.status_code] += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabalhador() for _ in range(concorrencia)))
+    duracao = time.perf_counter() - inicio
+    return {
+        "rota": rota,
+        "p50_ms": statistics.median(latencias),
+        "p99_ms": percentil(latencias, 99),
+        "rps": total / duracao,
+        "status": dict(status),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--url", help="Servidor em execução (padrão: em processo)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--threadpool", type=int, help="Sobrescreve THREADPOOL_SIZE")
+    parser.add_argument("--route", action="append", dest="rotas")
+    args = parser.parse_args()
+
+    if args.threadpool:
+        os.environ["THREADPOOL_SIZE"] = str(args.threadpool)
+    # O benchmark mede as rotas, não o descarte de carga nem o cache de coalescência
+    os.environ.setdefault("ADMISSION_CONTROL_ENABLED", "false")
+    os.environ.setdefault("COALESCE_TTL_SECONDS", "0")
+
+    cabecalhos = {"Authorization": "Bearer bench"}
+    limites = httpx.Limits(max_connections=args.concurrency)
+    if args.url:
+        client = httpx.AsyncClient(
+            base_url=args.url, headers=cabecalhos, limits=limites
+        )
+        contexto = None
+    else:
+        from app.main import app
+
+        contexto = app.router.lifespan_context(app)
+        await contexto.__aenter__()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://bench",
+            headers=cabecalhos,
+            limits=limites,
+        )
+
+    print(f"{'rota':<42} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>9}  status")
+    try:
+        async with client:
+            for rota in args.rotas or ROTAS_PADRAO:
+                r = await medir_rota(client, rota, args.requests, args.concurrency)
+                print(
+                    f"{r['rota']:<42} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+                    f"{r['rps']:>9.0f}  {r['status']}"
+                )
+    finally:
+        if contexto is not None:
+            await contexto.__aexit__(None, None, None)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Orçamento de tempo de importação da aplicação (cold start).
+
+Roda `python -X importtime -c "import app.main"` algumas vezes em processos
+novos, usa a mediana do tempo cumulativo de `app.main` e falha (exit 1) se ela
+passar do orçamento ou se algum módulo que deveria ser carregado sob demanda
+(Sentry, e-mail, templates) aparecer na importação.
+
+Uso:
+    python scripts/import_budget.py
+    python scripts/import_budget.py --budget-ms 1200 --runs 7 --top 15
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Módulos que não devem ser carregados no start de um worker comum
+ADIADOS_PADRAO = ["sentry_sdk", "emails", "jinja2"]
+
+ENV_MINIMO = {
+    "PROJECT_NAME": "import-budget",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "import-budget",
+    "FIRST_SUPERUSER": "import-budget@example.com",
+    "FIRST_SUPERUSER_PASSWORD": "import-budget",
+}
+
+
+def medir() -> dict[str, int]:
+    """Importa app.main num processo novo e retorna {módulo: cumulativo em µs}."""
+    env = {**ENV_MINIMO, **os.environ}
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if resultado.returncode != 0:
+        print(resultado.stderr, file=sys.stderr)
+        sys.exit(2)
+
+    tempos: dict[str, int] = {}
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, cumulativo, modulo = linha.split("|")
+        tempos[modulo.strip()] = int(cumulativo)
+    return tempos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("IMPORT_BUDGET_MS", "1500")),
+        help="Tempo máximo (mediana) para importar app.main",
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--top", type=int, default=10, help="Módulos mais pesados a listar"
+    )
+    parser.add_argument(
+        "--deferred",
+        nargs="*",
+        default=ADIADOS_PADRAO,
+        help="Módulos que não podem aparecer na importação",
+    )
+    args = parser.parse_args()
+
+    medicoes = [medir() for _ in range(args.runs)]
+    total_ms = statistics.median(m["app.main"] for m in medicoes) / 1000
+
+    ultima = medicoes[-1]
+    print(
+        f"app.main: {total_ms:.1f} ms (mediana de {args.runs}), orçamento {args.budget_ms:.0f} ms"
+    )
+    print("\nMódulos de primeiro nível mais pesados (última execução):")
+    primeiro_nivel = {m: t for m, t in ultima.items() if "." not in m and m != "app"}
+    for modulo, tempo in sorted(primeiro_nivel.items(), key=lambda i: -i[1])[
+        : args.top
+    ]:
+        print(f"  {tempo / 1000:>8.1f} ms  {modulo}")
+
+    falhas = []
+    carregados = sorted(m for m in args.deferred if m in ultima)
+    if carregados:
+        falhas.append(
+            f"módulos que deveriam ser adiados foram importados: {', '.join(carregados)}"
+        )
+    if total_ms > args.budget_ms:
+        falhas.append(
+            f"importação levou {total_ms:.1f} ms, acima do orçamento de {args.budget_ms:.0f} ms"
+        )
+
+    if falhas:
+        print("\nFALHOU:\n  " + "\n  ".join(falhas))
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Recalcula os rollups de vendas (tabela vendarollup) a partir do histórico bruto.
+
+Uso:
+    python scripts/rebuild_rollups.py                 # todo o histórico
+    python scripts/rebuild_rollups.py --desde 2025-08-01
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlmodel import Session, create_engine
+
+from app.core.config import settings
+from app.domain.rollups import RollupService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recalcula os rollups de vendas")
+    parser.add_argument(
+        "--desde",
+        type=date.fromisoformat,
+        help="Recalcula apenas a partir deste dia (AAAA-MM-DD)",
+    )
+    args = parser.parse_args()
+
+    engine = create_engine(settings.get_database_uri)
+    inicio = time.perf_counter()
+    with Session(engine) as session:
+        linhas = RollupService(session).rebuild(desde=args.desde)
+    duracao = time.perf_counter() - inicio
+    print(f"[rebuild_rollups] {linhas} linhas recalculadas em {duracao:.2f}s")
+
+
+if __name__ == "__main__":
+    main()